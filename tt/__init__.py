@@ -1,14 +1,122 @@
-from .definitions import *  # noqa
-from .errors import *  # noqa
-from .expressions import *  # noqa
-from .tables import *  # noqa
-from .transformations import *  # noqa
-from .trees import *  # noqa
-
-from .satisfiability import picosat  # noqa
+import sys
 
 # expose library version and version info tuple
 from .version import __version__ as _version, __version_info__ as _version_info
 __version__ = _version
 VERSION = _version
 __version_info__ = _version_info
+
+if sys.version_info >= (3, 7):
+    # the sub-packages whose public names are exposed at the top level, in
+    # order of increasing precedence when two of them share a name
+    _SUBPACKAGES = (
+        'definitions',
+        'errors',
+        'expressions',
+        'tables',
+        'transformations',
+        'trees')
+
+    # the sub-package defining each of the top-level names, so that
+    # accessing one of them only imports the sub-package it needs; the sub-
+    # packages cannot be imported to list their names without defeating the
+    # lazy loading, so tests check this table against star-importing them
+    _LAZY_ATTRIBUTES = dict(
+        [(name, 'definitions') for name in (
+            'BINARY_OPERATORS', 'BOOLEAN_VALUES', 'CONSTANT_VALUES',
+            'DELIMITERS', 'DONT_CARE_VALUE', 'MAX_OPERATOR_STR_LEN',
+            'NON_PRIMITIVE_OPERATORS', 'OPERATOR_MAPPING',
+            'PLAIN_ENGLISH_OPERATOR_MAPPING', 'SYMBOLIC_OPERATOR_MAPPING',
+            'TT_AND_OP', 'TT_IMPL_OP', 'TT_NAND_OP', 'TT_NOR_OP', 'TT_NOT_OP',
+            'TT_OR_OP', 'TT_XNOR_OP', 'TT_XOR_OP',
+            'boolean_variables_factory', 'is_valid_identifier')] +
+        [(name, 'errors') for name in (
+            'AlreadyConstrainedSymbolError', 'AlreadyFullTableError',
+            'ArgumentError', 'BadParenPositionError',
+            'ConflictingArgumentsError', 'DimacsFormatError',
+            'DuplicateSymbolError', 'EmptyExpressionError', 'EvaluationError',
+            'ExpressionOrderError', 'ExtraSymbolError', 'GrammarError',
+            'InvalidArgumentTypeError', 'InvalidArgumentValueError',
+            'InvalidBooleanValueError', 'InvalidIdentifierError',
+            'MissingSymbolError', 'NoEvaluationVariationError',
+            'RequiredArgumentError', 'RequiresFullTableError',
+            'RequiresNormalFormError', 'SolverError', 'SolverLimitError',
+            'StateError', 'SymbolError', 'TtError', 'UnbalancedParenError')] +
+        [(name, 'expressions') for name in (
+            'BooleanExpression', 'ClauseSet', 'CostProfile', 'CostThresholds',
+            'DEFAULT_COST_THRESHOLDS', 'ENGINE_BOUNDED_CNF', 'ENGINE_CNF',
+            'ENGINE_TRUTH_TABLE')] +
+        [(name, 'tables') for name in (
+            'TruthTable',)] +
+        [(name, 'transformations') for name in (
+            'ABSORPTION_LAW_RULES', 'AbstractTransformationModifier',
+            'CnfConversion', 'ComposedTransformation', 'DE_MORGANS_LAW_RULES',
+            'IDEMPOTENT_LAW_RULES', 'IDENTITY_LAW_RULES', 'INVERSE_LAW_RULES',
+            'NEGATION_RULES', 'RepeatableAction', 'RewriteRule', 'RuleSet',
+            'SIMPLIFICATION_RULES', 'apply_de_morgans',
+            'apply_idempotent_law', 'apply_identity_law', 'apply_inverse_law',
+            'coalesce_negations', 'distribute_ands', 'distribute_ors',
+            'ensure_bexpr', 'forever', 'repeat', 'simplify_cnf',
+            'to_bounded_cnf', 'to_cnf', 'to_dnf', 'to_primitives',
+            'tt_compose', 'twice')] +
+        [(name, 'trees') for name in (
+            'BinaryOperatorExpressionTreeNode', 'CacheInfo',
+            'ExpressionTreeNode', 'OperandExpressionTreeNode',
+            'clear_transformation_memos',
+            'TransformationMemo', 'UnaryOperatorExpressionTreeNode',
+            'get_transformation_memo', 'iter_transformation_memos')])
+
+    # the modules exposed at the top level, including the modules of each
+    # sub-package that star-importing them would have exposed; as with the
+    # sub-packages, later entries take precedence over earlier ones
+    _LAZY_MODULES = dict(
+        [(name, 'tt.' + name) for name in _SUBPACKAGES] +
+        [(name, 'tt.definitions.' + name) for name in (
+            'grammar', 'operands', 'operators')] +
+        [(name, 'tt.errors.' + name) for name in (
+            'arguments', 'base', 'evaluation', 'grammar', 'solver', 'state',
+            'symbols')] +
+        [(name, 'tt.expressions.' + name) for name in (
+            'bexpr', 'clause_set', 'cost')] +
+        [(name, 'tt.tables.' + name) for name in (
+            'truth_table',)] +
+        [(name, 'tt.transformations.' + name) for name in (
+            'bexpr', 'rewrite', 'utils')] +
+        [(name, 'tt.trees.' + name) for name in (
+            'memo', 'tree_node')] +
+        [('satisfiability', 'tt.satisfiability'),
+         ('picosat', 'tt.satisfiability.picosat')])
+
+    def _import(module_name):
+        """Import a module by its full name."""
+        __import__(module_name)
+        return sys.modules[module_name]
+
+    def __getattr__(name):
+        """Import top-level names on first access (see :pep:`562`)."""
+        if name in _LAZY_MODULES:
+            value = _import(_LAZY_MODULES[name])
+        elif name in _LAZY_ATTRIBUTES:
+            value = getattr(_import('tt.' + _LAZY_ATTRIBUTES[name]), name)
+        else:
+            raise AttributeError(
+                'module \'tt\' has no attribute \'{}\''.format(name))
+
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) |
+                      set(_LAZY_MODULES))
+
+    __all__ = sorted(
+        set(_LAZY_ATTRIBUTES) | {'picosat', 'VERSION'})
+else:
+    from .definitions import *  # noqa
+    from .errors import *  # noqa
+    from .expressions import *  # noqa
+    from .tables import *  # noqa
+    from .transformations import *  # noqa
+    from .trees import *  # noqa
+
+    from .satisfiability import picosat  # noqa
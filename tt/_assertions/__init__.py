@@ -1,5 +1,7 @@
 """Utilities for making internal assertions."""
 
+from .arguments import (  # noqa
+    assert_int_at_least)
 from .collections import (  # noqa
     assert_all_valid_keys,
     assert_iterable_contains_all_expr_symbols)
@@ -0,0 +1,28 @@
+"""Argument assertion helpers."""
+
+from tt.errors import (
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError)
+
+
+def assert_int_at_least(name, value, minimum):
+    """Assert that an argument is an integer of at least ``minimum``.
+
+    :param name: The name of the argument, used in error messages.
+    :type name: :class:`str <python:str>`
+
+    :param value: The value of the argument.
+
+    :param minimum: The smallest allowed value of the argument.
+    :type minimum: :class:`int <python:int>`
+
+    :raises InvalidArgumentTypeError: If ``value`` is not an integer (Booleans
+        do not count as integers here).
+    :raises InvalidArgumentValueError: If ``value`` is less than ``minimum``.
+
+    """
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise InvalidArgumentTypeError('`{}` must be an int'.format(name))
+    elif value < minimum:
+        raise InvalidArgumentValueError(
+            '`{}` must be at least {}'.format(name, minimum))
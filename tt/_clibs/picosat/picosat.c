@@ -7983,6 +7983,12 @@ picosat_decisions (PS * ps)
   return ps->decisions;
 }
 
+unsigned long long
+picosat_conflicts (PS * ps)
+{
+  return ps->conflicts;
+}
+
 int
 picosat_variables (PS * ps)
 {
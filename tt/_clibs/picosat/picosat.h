@@ -294,6 +294,7 @@ double picosat_time_stamp (void);                       /* ... in process */
 void picosat_stats (PicoSAT *);                         /* > output file */
 unsigned long long picosat_propagations (PicoSAT *);	/* #propagations */
 unsigned long long picosat_decisions (PicoSAT *);	/* #decisions */
+unsigned long long picosat_conflicts (PicoSAT *);	/* #conflicts */
 unsigned long long picosat_visits (PicoSAT *);		/* #visits */
 
 /* The time spent in calls to the library or in 'picosat_sat' respectively.
@@ -11,18 +11,44 @@
 
 #include <Python.h>
 
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <time.h>
+#endif
+
 #include "picosat.h"
 #include "_compat/tt_cpython_compat.h"
 
 //
-// Struct definition for solution iteration
+// Struct definitions for resource limits and solution iteration
 //
 
+// reasons for PicoSAT giving up on a search
+#define TT_LIMIT_NONE         0
+#define TT_LIMIT_DECISIONS    1
+#define TT_LIMIT_PROPAGATIONS 2
+#define TT_LIMIT_TIMEOUT      3
+
+typedef struct {
+    int decision_limit;                     // per search; -1 means unlimited
+    unsigned long long propagation_limit;   // per search; 0 means unlimited
+    double timeout;                         // per search; 0 means unlimited
+    double deadline;                        // of the current search
+} tt_limits;
+
 typedef struct {
     PyObject_HEAD
     PicoSAT * picosat;
     PyObject * assumptions;
-    signed char _temp_mem;
+    int * project;            // variables to block over; NULL means all
+    int num_project;
+    int batch_size;           // models per iteration; 0 means unbatched
+    int exhausted;            // whether all solutions have been produced
+    int limit_reached;        // TT_LIMIT_* reason the search was abandoned
+    unsigned long long searches;  // number of PicoSAT searches run
+    tt_limits limits;
+    signed char * _temp_mem;
 } soliter_obj;
 
 
@@ -49,12 +75,229 @@ _cpython_free(void * mmgr, void * ptr, size_t bytes)
 }
 
 
+//
+// Resource limit methods
+//
+
+/**
+ * Seconds on a monotonic clock, for measuring timeouts.
+ */
+static double
+_tt_monotonic_seconds(void)
+{
+#ifdef _WIN32
+    return GetTickCount64() / 1000.0;
+#else
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec + ts.tv_nsec / 1e9;
+#endif
+}
+
+/**
+ * PicoSAT interrupt callback, checked periodically during a search. The state
+ * is the tt_limits of the search.
+ */
+static int
+_tt_picosat_deadline_passed(void * state)
+{
+    return _tt_monotonic_seconds() >= ((tt_limits *)state)->deadline;
+}
+
+/**
+ * Run a single PicoSAT search within the passed limits, without holding the
+ * GIL. The propagation limit and timeout are counted from the start of this
+ * search, rather than the lifetime of the PicoSAT instance.
+ *
+ * Returns the PicoSAT result, setting `limit_reached` to the TT_LIMIT_*
+ * reason if the result is PICOSAT_UNKNOWN.
+ */
+static int
+_tt_run_picosat(PicoSAT * picosat, tt_limits * limits, int * limit_reached)
+{
+    int picosat_result;
+    unsigned long long propagations_before;
+
+    propagations_before = picosat_propagations(picosat);
+    if (limits->propagation_limit > 0)
+        picosat_set_propagation_limit(
+            picosat, propagations_before + limits->propagation_limit);
+
+    if (limits->timeout > 0)
+    {
+        limits->deadline = _tt_monotonic_seconds() + limits->timeout;
+        picosat_set_interrupt(picosat, limits, _tt_picosat_deadline_passed);
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    picosat_result = picosat_sat(picosat, limits->decision_limit);
+    Py_END_ALLOW_THREADS
+
+    *limit_reached = TT_LIMIT_NONE;
+    if (picosat_result == PICOSAT_UNKNOWN)
+    {
+        if (limits->timeout > 0 && _tt_picosat_deadline_passed(limits))
+            *limit_reached = TT_LIMIT_TIMEOUT;
+        else if (limits->propagation_limit > 0 &&
+                 picosat_propagations(picosat) - propagations_before >=
+                     limits->propagation_limit)
+            *limit_reached = TT_LIMIT_PROPAGATIONS;
+        else
+            *limit_reached = TT_LIMIT_DECISIONS;
+    }
+
+    return picosat_result;
+}
+
+/**
+ * Parse and validate resource limits from extension function arguments.
+ *
+ * Returns 0 on success, -1 on error.
+ */
+static int
+_tt_parse_limits(int decision_limit, long long propagation_limit,
+                 double timeout, tt_limits * limits)
+{
+    if (decision_limit == 0 || decision_limit < -1)
+    {
+        PyErr_SetString(PyExc_ValueError, "decision_limit must be positive");
+        return -1;
+    }
+
+    if (propagation_limit < 0)
+    {
+        PyErr_SetString(PyExc_ValueError, "propagation_limit must be positive");
+        return -1;
+    }
+
+    if (timeout < 0)
+    {
+        PyErr_SetString(PyExc_ValueError, "timeout must be positive");
+        return -1;
+    }
+
+    limits->decision_limit = decision_limit;
+    limits->propagation_limit = (unsigned long long)propagation_limit;
+    limits->timeout = timeout;
+    limits->deadline = 0;
+    return 0;
+}
+
+//
+// Solver statistics methods
+//
+
+/**
+ * Build a tt.satisfiability.picosat.SolverStats object from the statistics
+ * PicoSAT has accumulated over the lifetime of the passed instance, which
+ * ran `searches` searches.
+ *
+ * Returns NULL if an error occurs.
+ */
+static PyObject *
+_tt_picosat_stats(PicoSAT * picosat, unsigned long long searches)
+{
+    PyObject * picosat_module;
+    PyObject * stats_type;
+    PyObject * ret;
+
+    picosat_module = PyImport_ImportModule("tt.satisfiability.picosat");
+    if (picosat_module == NULL)
+        return NULL;
+
+    stats_type = PyObject_GetAttrString(picosat_module, "SolverStats");
+    Py_DECREF(picosat_module);
+    if (stats_type == NULL)
+        return NULL;
+
+    ret = PyObject_CallFunction(
+        stats_type, "KKKdnK",
+        picosat_decisions(picosat),
+        picosat_conflicts(picosat),
+        picosat_propagations(picosat),
+        picosat_seconds(picosat),
+        (Py_ssize_t)picosat_max_bytes_allocated(picosat),
+        searches);
+    Py_DECREF(stats_type);
+    return ret;
+}
+
+
+/**
+ * Raise the tt error for a search abandoned due to a resource limit.
+ *
+ * Unless `picosat` is NULL, the SolverStats of the `searches` searches run by
+ * it are attached to the error as its `stats` attribute.
+ *
+ * Always returns NULL.
+ */
+static PyObject *
+_tt_raise_limit_error(int limit_reached, PicoSAT * picosat,
+                      unsigned long long searches)
+{
+    PyObject * errors_module;
+    PyObject * error_type;
+    PyObject * error;
+    PyObject * stats_obj;
+    const char * msg;
+
+    switch (limit_reached)
+    {
+        case TT_LIMIT_TIMEOUT:
+            msg = "PicoSAT search timed out";
+            break;
+        case TT_LIMIT_PROPAGATIONS:
+            msg = "PicoSAT search reached its propagation limit";
+            break;
+        default:
+            msg = "PicoSAT search reached its decision limit";
+            break;
+    }
+
+    errors_module = PyImport_ImportModule("tt.errors.solver");
+    if (errors_module == NULL)
+        return NULL;
+
+    error_type = PyObject_GetAttrString(errors_module, "SolverLimitError");
+    Py_DECREF(errors_module);
+    if (error_type == NULL)
+        return NULL;
+
+    error = PyObject_CallFunction(error_type, "s", msg);
+    if (error == NULL)
+    {
+        Py_DECREF(error_type);
+        return NULL;
+    }
+
+    if (picosat != NULL)
+    {
+        stats_obj = _tt_picosat_stats(picosat, searches);
+        if (stats_obj == NULL ||
+                PyObject_SetAttrString(error, "stats", stats_obj) < 0)
+        {
+            Py_XDECREF(stats_obj);
+            Py_DECREF(error);
+            Py_DECREF(error_type);
+            return NULL;
+        }
+        Py_DECREF(stats_obj);
+    }
+
+    PyErr_SetObject(error_type, error);
+    Py_DECREF(error);
+    Py_DECREF(error_type);
+    return NULL;
+}
+
+
 //
 // PicoSAT functionality methods
 //
 
 /**
- * Add a clause to a PicoSAT instance. A clause is a list of non-zero ints.
+ * Add a clause to a PicoSAT instance. A clause is an iterable of non-zero
+ * ints.
  *
  * Returns 0 on success, -1 on error.
  */
@@ -64,14 +307,9 @@ _tt_add_picosat_clause(PicoSAT * picosat, PyObject * clause)
     PyObject * clause_iterator;  // clause is an iterable of ints
     PyObject * literal;          // each literal is an int
     int l;
+    int num_literals = 0;
 
-    if (!PyList_Check(clause))
-    {
-        PyErr_SetString(PyExc_TypeError, "clause must be a list of non-zero ints");
-        return -1;
-    }
-
-    if (PyList_Size(clause) < 1)
+    if (PyList_Check(clause) && PyList_Size(clause) < 1)
     {
         PyErr_SetString(PyExc_ValueError, "clause must be non-empty");
         return -1;
@@ -79,7 +317,10 @@ _tt_add_picosat_clause(PicoSAT * picosat, PyObject * clause)
 
     clause_iterator = PyObject_GetIter(clause);
     if (clause_iterator == NULL)
+    {
+        PyErr_SetString(PyExc_TypeError, "clause must be a list of non-zero ints");
         return -1;
+    }
 
     while ((literal = PyIter_Next(clause_iterator)) != NULL)
     {
@@ -102,19 +343,27 @@ _tt_add_picosat_clause(PicoSAT * picosat, PyObject * clause)
         }
 
         picosat_add(picosat, l);
+        num_literals++;
     }
 
     Py_DECREF(clause_iterator);
     if (PyErr_Occurred())
         return -1;
 
+    if (num_literals < 1)
+    {
+        PyErr_SetString(PyExc_ValueError, "clause must be non-empty");
+        return -1;
+    }
+
     picosat_add(picosat, 0);  // terminate clause
     return 0;
 }
 
 /**
- * Add clauses to a PicoSAT instance. Clauses are a Python iterator of
- * iterators of non-zero ints.
+ * Add clauses to a PicoSAT instance. Clauses are a Python iterable of
+ * iterables of non-zero ints; clauses are consumed one at a time, so
+ * generators can stream clauses into the solver.
  *
  * Returns 0 on success, -1 on error.
  */
@@ -123,22 +372,20 @@ _tt_add_picosat_clauses(PicoSAT * picosat, PyObject * clauses)
 {
     PyObject * clauses_iterator;  // clauses is iterable of iterable of ints
     PyObject * clause;            // each clause is iterable of ints
+    int num_clauses = 0;
 
-    if (!PyList_Check(clauses))
-    {
-        PyErr_SetString(PyExc_TypeError, "clauses must be a list of lists of non-zero ints");
-        return -1;
-    }
-
-    if (PyList_Size(clauses) < 1)
+    if (PyList_Check(clauses) && PyList_Size(clauses) < 1)
     {
-        PyErr_SetString(PyExc_ValueError, "clause musts be non-empty");
+        PyErr_SetString(PyExc_ValueError, "clauses must be non-empty");
         return -1;
     }
 
     clauses_iterator = PyObject_GetIter(clauses);
     if (clauses_iterator == NULL)
+    {
+        PyErr_SetString(PyExc_TypeError, "clauses must be a list of lists of non-zero ints");
         return -1;
+    }
 
     while ((clause = PyIter_Next(clauses_iterator)) != NULL)
     {
@@ -150,12 +397,19 @@ _tt_add_picosat_clauses(PicoSAT * picosat, PyObject * clauses)
         }
 
         Py_DECREF(clause);
+        num_clauses++;
     }
 
     Py_DECREF(clauses_iterator);
     if (PyErr_Occurred())
         return -1;
 
+    if (num_clauses < 1)
+    {
+        PyErr_SetString(PyExc_ValueError, "clauses must be non-empty");
+        return -1;
+    }
+
     return 0;
 }
 
@@ -264,27 +518,102 @@ _tt_add_picosat_assumptions(PicoSAT * picosat, PyObject * assumptions)
 }
 
 /**
- * Ensures the validity of Python args object, inits PicoSAT object, and adds
- * PicoSAT clauses + assumptions.
+ * Parse a Python list of non-zero ints into a newly-allocated array of
+ * (positive) variable indices, for projecting solutions onto a subset of
+ * variables. The array is written to `vars` and its length to `num_vars`;
+ * `vars` is left as NULL if no projection was specified.
+ *
+ * Returns 0 on success, -1 on error.
+ */
+static int
+_tt_parse_picosat_project(PyObject * project, int ** vars, int * num_vars)
+{
+    PyObject * literal;
+    Py_ssize_t i, n;
+    int v;
+
+    *vars = NULL;
+    *num_vars = 0;
+
+    if (project == NULL || project == Py_None)
+    {
+        // no projection provided
+        return 0;
+    }
+
+    if (!PyList_Check(project))
+    {
+        PyErr_SetString(PyExc_TypeError, "project must be a list of non-zero ints");
+        return -1;
+    }
+
+    n = PyList_Size(project);
+    if (n < 1)
+    {
+        PyErr_SetString(PyExc_ValueError, "project must be non-empty");
+        return -1;
+    }
+
+    *vars = PyMem_Malloc(n * sizeof(int));
+    if (*vars == NULL)
+    {
+        PyErr_NoMemory();
+        return -1;
+    }
+
+    for (i = 0; i < n; ++i)
+    {
+        literal = PyList_GET_ITEM(project, i);  // borrowed reference
+        if (!IS_INT(literal))
+        {
+            PyErr_SetString(PyExc_TypeError, "All project literals expected to be ints");
+            goto error;
+        }
+
+        v = PyLong_AsLong(literal);
+        if (v == -1 && PyErr_Occurred())
+            goto error;
+
+        if (v == 0)
+        {
+            PyErr_SetString(PyExc_ValueError, "All project literals must be non-zero");
+            goto error;
+        }
+
+        (*vars)[i] = abs(v);
+    }
+
+    *num_vars = (int)n;
+    return 0;
+
+error:
+    PyMem_Free(*vars);
+    *vars = NULL;
+    return -1;
+}
+
+/**
+ * Ensures the validity of the Python clauses and assumptions objects, inits
+ * PicoSAT object, and adds PicoSAT clauses + assumptions. If `iter` is
+ * non-NULL, its `batch_size` must already be set.
  *
  * Returns NULL if an error occurs.
  */
 static PicoSAT *
-_tt_setup_picosat(PyObject * args, PyObject * kwds, soliter_obj * iter)
+_tt_setup_picosat(PyObject * clauses, PyObject * assumptions,
+                  soliter_obj * iter)
 {
-    static char * keywords[] = {"clauses", "assumptions", NULL};
-
     PicoSAT * picosat;
-    PyObject * clauses;             // List[List[int]]
-    PyObject * assumptions = NULL;  // List[int]
-
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|O", keywords,
-                                     &clauses, &assumptions))
-        return NULL;
 
     picosat = picosat_minit(NULL,
                             _cpython_malloc, _cpython_realloc, _cpython_free);
 
+    if (iter != NULL && iter->batch_size > 0)
+    {
+        // partial (prime implicant) models require the original clauses
+        picosat_save_original_clauses(picosat);
+    }
+
     if (_tt_assert_picosat_assumptions(assumptions) < 0)
     {
         picosat_reset(picosat);
@@ -300,7 +629,7 @@ _tt_setup_picosat(PyObject * args, PyObject * kwds, soliter_obj * iter)
     if (iter != NULL)
     {
         iter->assumptions = assumptions;
-        Py_INCREF(assumptions);
+        Py_XINCREF(assumptions);
     }
 
     if (_tt_add_picosat_clauses(picosat, clauses) < 0)
@@ -326,10 +655,7 @@ _tt_picosat_sol_to_py_list(PicoSAT * picosat)
     num_vars = picosat_variables(picosat);
     list = PyList_New((Py_ssize_t)num_vars);
     if (list == NULL)
-    {
-        picosat_reset(picosat);
         return NULL;
-    }
 
     for (i = 1; i <= num_vars; ++i)
     {
@@ -337,9 +663,7 @@ _tt_picosat_sol_to_py_list(PicoSAT * picosat)
         literal = PyInt_FromLong((long) (v * i));
         if (PyList_SetItem(list, (Py_ssize_t)(i - 1), literal) < 0)
         {
-            Py_DECREF(literal);
             Py_DECREF(list);
-            picosat_reset(picosat);
             return NULL;
         }
     }
@@ -350,31 +674,38 @@ _tt_picosat_sol_to_py_list(PicoSAT * picosat)
 /**
  * Block a solution from being returned again in the passed PicoSAT instance.
  *
- * Returns 0 on success, -1 on error.
+ * If `project` is non-NULL, the blocking clause only covers the `num_project`
+ * variables it holds, so that any other solution agreeing on those variables
+ * is blocked, too. `mem` must have room for one entry per blocked variable.
  */
-static int
-_tt_block_sol(PicoSAT * picosat, signed char * mem)
+static void
+_tt_block_sol(PicoSAT * picosat, int * project, int num_project,
+              signed char * mem)
 {
-    int num_vars, i;
+    int num_vars, i, v;
 
-    num_vars = picosat_variables(picosat);
-    if (mem == NULL)
+    if (project == NULL)
     {
-        mem = PyMem_Malloc(num_vars + 1);
-        if (mem == NULL)
+        num_vars = picosat_variables(picosat);
+        for (i = 0; i < num_vars; ++i)
+            mem[i] = (picosat_deref(picosat, i + 1) > 0) ? 1 : -1;
+        for (i = 0; i < num_vars; ++i)
+            picosat_add(picosat, (mem[i] < 0) ? (i + 1) : -(i + 1));
+    }
+    else
+    {
+        // dereference everything before adding, as adding a literal resets
+        // the current assignment
+        for (i = 0; i < num_project; ++i)
+            mem[i] = (picosat_deref(picosat, project[i]) > 0) ? 1 : -1;
+        for (i = 0; i < num_project; ++i)
         {
-            PyErr_NoMemory();
-            return -1;
+            v = project[i];
+            picosat_add(picosat, (mem[i] < 0) ? v : -v);
         }
     }
 
-    for (i = 1; i <= num_vars; ++i)
-        mem[i] = (picosat_deref(picosat, i) > 0) ? 1 : -1;
-    for (i = 1; i <= num_vars; ++i)
-        picosat_add(picosat, (mem[i] < 0) ? i : -i);
     picosat_add(picosat, 0);
-
-    return 0;
 }
 
 
@@ -384,33 +715,190 @@ _tt_block_sol(PicoSAT * picosat, signed char * mem)
 
 static PyTypeObject SolIter_Type;
 
+/**
+ * Shrink the current model of the passed PicoSAT instance to a partial model
+ * (a cube of assignments that all satisfy the clauses), writing 1, -1, or 0
+ * (don't care) for each of the `num_vars` variables into `row`. Assumed
+ * literals are always kept in the cube.
+ *
+ * Returns 0 on success, -1 on error.
+ */
+static int
+_tt_picosat_partial_sol(PicoSAT * picosat, PyObject * assumptions,
+                        signed char * row, int num_vars)
+{
+    Py_ssize_t i, n;
+    long val;
+    int v;
+
+    for (v = 1; v <= num_vars; ++v)
+        row[v - 1] = (signed char)picosat_deref_partial(picosat, v);
+
+    if (assumptions == NULL || assumptions == Py_None)
+        return 0;
+
+    n = PyList_Size(assumptions);
+    for (i = 0; i < n; ++i)
+    {
+        val = PyLong_AsLong(PyList_GET_ITEM(assumptions, i));
+        if (val == -1 && PyErr_Occurred())
+            return -1;
+        v = abs((int)val);
+        if (v <= num_vars)
+            row[v - 1] = (signed char)picosat_deref(picosat, v);
+    }
+
+    return 0;
+}
+
+/**
+ * Block every solution covered by a partial model (as produced by
+ * `_tt_picosat_partial_sol`) in the passed PicoSAT instance, optionally only
+ * over the `num_project` variables in `project`.
+ */
+static void
+_tt_block_partial_sol(PicoSAT * picosat, int * project, int num_project,
+                      signed char * row, int num_vars)
+{
+    int i, v;
+
+    if (project == NULL)
+    {
+        for (v = 1; v <= num_vars; ++v)
+            if (row[v - 1])
+                picosat_add(picosat, (row[v - 1] < 0) ? v : -v);
+    }
+    else
+    {
+        for (i = 0; i < num_project; ++i)
+        {
+            v = project[i];
+            if (v <= num_vars && row[v - 1])
+                picosat_add(picosat, (row[v - 1] < 0) ? v : -v);
+        }
+    }
+
+    // an empty clause here means every remaining solution was covered
+    picosat_add(picosat, 0);
+}
+
+/**
+ * Produce the next batch of up to `batch_size` partial models, packed as a
+ * (row width, bytes) tuple where each row of the bytes holds one signed char
+ * (1, -1, or 0) per variable.
+ */
+static PyObject *
+_tt_soliter_next_batch(soliter_obj * iter)
+{
+    PyObject * ret = NULL;
+    signed char * buf;
+    int num_vars, num_rows, picosat_result;
+
+    num_vars = picosat_variables(iter->picosat);
+    buf = PyMem_Malloc((size_t)iter->batch_size * num_vars + 1);
+    if (buf == NULL)
+        return PyErr_NoMemory();
+
+    num_rows = 0;
+    while (num_rows < iter->batch_size)
+    {
+        picosat_result = _tt_run_picosat(iter->picosat, &iter->limits,
+                                         &iter->limit_reached);
+        ++iter->searches;
+
+        if (picosat_result == PICOSAT_UNSATISFIABLE ||
+                picosat_result == PICOSAT_UNKNOWN)
+        {
+            // exhausted all solutions (or gave up); the assumptions have been
+            // consumed by this call, so the solver must not be run again
+            iter->exhausted = 1;
+            break;
+        }
+        else if (picosat_result != PICOSAT_SATISFIABLE)
+        {
+            PyErr_SetString(PyExc_RuntimeError, "PicoSAT returned unexpected value");
+            goto done;
+        }
+
+        if (_tt_picosat_partial_sol(iter->picosat, iter->assumptions,
+                                    buf + (size_t)num_rows * num_vars,
+                                    num_vars) < 0)
+            goto done;
+
+        _tt_block_partial_sol(iter->picosat, iter->project, iter->num_project,
+                              buf + (size_t)num_rows * num_vars, num_vars);
+        if (_tt_add_picosat_assumptions(iter->picosat, iter->assumptions) < 0)
+            goto done;
+
+        ++num_rows;
+    }
+
+    if (num_rows > 0)
+        // a reached limit is reported on the following call, so that the
+        // models found so far are not lost
+        ret = Py_BuildValue("(iN)", num_vars, PyBytes_FromStringAndSize(
+            (const char *)buf, (Py_ssize_t)num_rows * num_vars));
+    else if (iter->limit_reached != TT_LIMIT_NONE)
+        _tt_raise_limit_error(iter->limit_reached, iter->picosat,
+                              iter->searches);
+
+done:
+    PyMem_Free(buf);
+    return ret;
+}
+
 static PyObject * _tt_soliter_next(soliter_obj * iter)
 {
     PyObject * ret = NULL;
-    int picosat_result;
+    int picosat_result, limit_reached;
 
     assert(PyObject_TypeCheck(iter, &SolIter_Type));
 
-    // run PicoSAT w/o the GIL
-    Py_BEGIN_ALLOW_THREADS
-    picosat_result = picosat_sat(iter->picosat, -1);
-    Py_END_ALLOW_THREADS
+    if (iter->exhausted)
+    {
+        if (iter->limit_reached != TT_LIMIT_NONE)
+        {
+            // report a limit deferred by the batch mode, once
+            limit_reached = iter->limit_reached;
+            iter->limit_reached = TT_LIMIT_NONE;
+            return _tt_raise_limit_error(limit_reached, iter->picosat,
+                                         iter->searches);
+        }
+        return NULL;
+    }
+
+    if (iter->batch_size > 0)
+        return _tt_soliter_next_batch(iter);
+
+    picosat_result = _tt_run_picosat(iter->picosat, &iter->limits,
+                                     &iter->limit_reached);
+    ++iter->searches;
 
     switch (picosat_result)
     {
         case PICOSAT_SATISFIABLE:
             ret = _tt_picosat_sol_to_py_list(iter->picosat);
-            if (_tt_block_sol(iter->picosat, iter->_temp_mem) < 0)
+            if (ret == NULL)
                 return NULL;
+            _tt_block_sol(iter->picosat, iter->project, iter->num_project,
+                          iter->_temp_mem);
             if (_tt_add_picosat_assumptions(iter->picosat, iter->assumptions) < 0)
+            {
+                Py_DECREF(ret);
                 return NULL;
+            }
             break;
         case PICOSAT_UNSATISFIABLE:
-        case PICOSAT_UNKNOWN:
             // exhausted all solutions, so stop iteration
+            iter->exhausted = 1;
             break;
+        case PICOSAT_UNKNOWN:
+            iter->exhausted = 1;
+            limit_reached = iter->limit_reached;
+            iter->limit_reached = TT_LIMIT_NONE;
+            return _tt_raise_limit_error(limit_reached, iter->picosat,
+                                         iter->searches);
         default:
-            picosat_reset(iter->picosat);
             PyErr_SetString(PyExc_RuntimeError, "PicoSAT returned unexpected value");
             return NULL;
     }
@@ -421,10 +909,13 @@ static PyObject * _tt_soliter_next(soliter_obj * iter)
 static void _tt_soliter_dealloc(soliter_obj * iter)
 {
     PyObject_GC_UnTrack(iter);
-    Py_DECREF(iter->assumptions);
+    Py_XDECREF(iter->assumptions);
+    if (iter->project)
+        PyMem_Free(iter->project);
     if (iter->_temp_mem)
         PyMem_Free(iter->_temp_mem);
-    picosat_reset(iter->picosat);
+    if (iter->picosat)
+        picosat_reset(iter->picosat);
     PyObject_GC_Del(iter);
 }
 
@@ -433,6 +924,20 @@ static int _tt_soliter_traverse(soliter_obj * iter, visitproc visit, void * arg)
     return 0;
 }
 
+/**
+ * Getter for the statistics of all searches run by the iterator so far.
+ */
+static PyObject * _tt_soliter_get_stats(soliter_obj * iter, void * closure)
+{
+    return _tt_picosat_stats(iter->picosat, iter->searches);
+}
+
+static PyGetSetDef _tt_soliter_getset[] = {
+    {(char *)"stats", (getter)_tt_soliter_get_stats, NULL,
+     (char *)"Statistics of the searches run so far.", NULL},
+    {NULL}  /* sentinel */
+};
+
 static PyTypeObject SolIter_Type = {
 
 #ifdef TT_IS_PYTHON_3
@@ -468,7 +973,9 @@ static PyTypeObject SolIter_Type = {
     0,                                        // tp_weaklistoffset
     PyObject_SelfIter,                        // tp_iter
     (iternextfunc) _tt_soliter_next,          // tp_iternext
-    0                                         // tp_methods
+    0,                                        // tp_methods
+    0,                                        // tp_members
+    _tt_soliter_getset                        // tp_getset
 
 };
 
@@ -483,41 +990,85 @@ static PyTypeObject SolIter_Type = {
  *  Returns:
  *    List[int] of literals if a solution was found.
  *    None, if no solution was found.
+ *    When `stats` is true, a tuple of the above and the SolverStats of the
+ *    search.
  *
  *  Raises:
  *    TypeError:  If non-integer are passed as literals.
- *    ValueError: If integers equal to zero are passed as literals.
+ *    ValueError: If integers equal to zero are passed as literals, or the
+ *                resource limits are not positive.
+ *    tt.errors.solver.SolverLimitError: If the search is abandoned after
+ *                reaching one of the resource limits; when `stats` is true,
+ *                the error's `stats` attribute holds the SolverStats of the
+ *                search.
  */
 static PyObject *
 sat_one(PyObject * self, PyObject * args, PyObject * kwds)
 {
+    static char * keywords[] = {"clauses", "assumptions", "decision_limit",
+                                "propagation_limit", "timeout", "stats",
+                                NULL};
+
     PicoSAT * picosat;
+    PyObject * clauses;             // List[List[int]]
+    PyObject * assumptions = NULL;  // List[int]
     PyObject * ret;
-    int picosat_result;
+    PyObject * stats_obj;
+    int picosat_result, limit_reached;
+    int decision_limit = -1;
+    long long propagation_limit = 0;
+    double timeout = 0;
+    int stats = 0;
+    tt_limits limits;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|OiLdi", keywords,
+                                     &clauses, &assumptions, &decision_limit,
+                                     &propagation_limit, &timeout, &stats))
+        return NULL;
 
-    picosat = _tt_setup_picosat(args, kwds, NULL);
+    if (_tt_parse_limits(decision_limit, propagation_limit, timeout,
+                         &limits) < 0)
+        return NULL;
+
+    picosat = _tt_setup_picosat(clauses, assumptions, NULL);
     if (picosat == NULL)
         return NULL;
 
-    // run PicoSAT w/o the GIL
-    Py_BEGIN_ALLOW_THREADS
-    picosat_result = picosat_sat(picosat, -1);
-    Py_END_ALLOW_THREADS
+    picosat_result = _tt_run_picosat(picosat, &limits, &limit_reached);
 
     switch (picosat_result)
     {
         case PICOSAT_SATISFIABLE:
-            ret = _tt_picosat_sol_to_py_list(picosat);
-            picosat_reset(picosat);
-            return ret;
-
         case PICOSAT_UNSATISFIABLE:
+            if (picosat_result == PICOSAT_SATISFIABLE)
+            {
+                ret = _tt_picosat_sol_to_py_list(picosat);
+            }
+            else
+            {
+                ret = Py_None;
+                Py_INCREF(ret);
+            }
+
+            if (ret != NULL && stats)
+            {
+                stats_obj = _tt_picosat_stats(picosat, 1);
+                if (stats_obj == NULL)
+                {
+                    Py_DECREF(ret);
+                    ret = NULL;
+                }
+                else
+                {
+                    ret = Py_BuildValue("(NN)", ret, stats_obj);
+                }
+            }
             picosat_reset(picosat);
-            Py_RETURN_NONE;
+            return ret;
 
         case PICOSAT_UNKNOWN:
+            _tt_raise_limit_error(limit_reached, stats ? picosat : NULL, 1);
             picosat_reset(picosat);
-            PyErr_SetString(PyExc_RuntimeError, "PicoSAT unable to solve");
             return NULL;
 
         default:
@@ -530,23 +1081,101 @@ sat_one(PyObject * self, PyObject * args, PyObject * kwds)
 /**
  * Return an instance of the custom solution iterator type.
  *
- * Accepts the same arguments as the `sat_one` method.
+ * Accepts the same arguments as the `sat_one` method, as well as an optional
+ * `project` list of variables. When specified, solutions are only blocked
+ * over the projected variables, so each distinct assignment of them is
+ * produced exactly once.
+ *
+ * A positive `batch_size` switches the iterator to producing packed batches
+ * of partial models, each of which covers a cube of solutions; see
+ * `_tt_soliter_next_batch`.
  */
 static PyObject *
 sat_all(PyObject * self, PyObject * args, PyObject * kwds)
 {
+    static char * keywords[] = {"clauses", "assumptions", "project",
+                                "batch_size", "decision_limit",
+                                "propagation_limit", "timeout", NULL};
+
     soliter_obj * iter;
+    PyObject * clauses;             // List[List[int]]
+    PyObject * assumptions = NULL;  // List[int]
+    PyObject * project = NULL;      // List[int]
+    int batch_size = 0;
+    int i, max_var, mem_size;
+    int decision_limit = -1;
+    long long propagation_limit = 0;
+    double timeout = 0;
+    tt_limits limits;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|OOiiLd", keywords,
+                                     &clauses, &assumptions, &project,
+                                     &batch_size, &decision_limit,
+                                     &propagation_limit, &timeout))
+        return NULL;
+
+    if (_tt_parse_limits(decision_limit, propagation_limit, timeout,
+                         &limits) < 0)
+        return NULL;
+
+    if (batch_size < 0)
+    {
+        PyErr_SetString(PyExc_ValueError, "batch_size must be positive");
+        return NULL;
+    }
 
     iter = PyObject_GC_New(soliter_obj, &SolIter_Type);
     if (iter == NULL)
         return NULL;
 
-    iter->picosat = _tt_setup_picosat(args, kwds, iter);
+    iter->picosat = NULL;
+    iter->assumptions = NULL;
+    iter->project = NULL;
+    iter->num_project = 0;
+    iter->batch_size = batch_size;
+    iter->exhausted = 0;
+    iter->limit_reached = TT_LIMIT_NONE;
+    iter->searches = 0;
+    iter->limits = limits;
+    iter->_temp_mem = NULL;
+    PyObject_GC_Track(iter);
+
+    if (_tt_parse_picosat_project(project, &iter->project,
+                                  &iter->num_project) < 0)
+    {
+        Py_DECREF(iter);
+        return NULL;
+    }
+
+    iter->picosat = _tt_setup_picosat(clauses, assumptions, iter);
     if (iter->picosat == NULL)
+    {
+        Py_DECREF(iter);
         return NULL;
+    }
 
-    iter->_temp_mem = NULL;
-    PyObject_GC_Track(iter);
+    if (iter->project != NULL)
+    {
+        // make sure projected variables absent from the clauses still exist
+        // within the solver, so that they are enumerated as free variables
+        max_var = 0;
+        for (i = 0; i < iter->num_project; ++i)
+            if (iter->project[i] > max_var)
+                max_var = iter->project[i];
+        picosat_adjust(iter->picosat, max_var);
+        mem_size = iter->num_project;
+    }
+    else
+    {
+        mem_size = picosat_variables(iter->picosat);
+    }
+
+    iter->_temp_mem = PyMem_Malloc(mem_size + 1);
+    if (iter->_temp_mem == NULL)
+    {
+        Py_DECREF(iter);
+        return PyErr_NoMemory();
+    }
 
     return (PyObject *)iter;
 }
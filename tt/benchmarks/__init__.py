@@ -0,0 +1,12 @@
+"""tt's performance benchmark suite."""
+
+from .core import main  # noqa
+from .runner import (  # noqa
+    Benchmark,
+    BenchmarkResult,
+    compare_results,
+    Comparison,
+    load_results,
+    run_benchmarks,
+    save_results)
+from .workloads import get_benchmarks  # noqa
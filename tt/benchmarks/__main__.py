@@ -0,0 +1,9 @@
+"""__main__ for the tt.benchmarks package."""
+
+import sys
+
+from tt.benchmarks import main
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""Command-line interface for running tt's benchmark suite."""
+
+from __future__ import print_function
+
+import sys
+
+from argparse import (
+    ArgumentParser,
+    ArgumentTypeError,
+    RawTextHelpFormatter)
+
+from tt.errors import TtError
+
+from .runner import (
+    compare_results,
+    load_results,
+    run_benchmarks,
+    save_results)
+from .workloads import get_benchmarks
+
+
+def _int_at_least(minimum):
+    """Get an argument type converting to an integer of at least minimum."""
+    def convert(value):
+        try:
+            i = int(value)
+        except ValueError:
+            i = minimum - 1
+
+        if i < minimum:
+            raise ArgumentTypeError(
+                '"{}" is not an integer of at least {}'.format(
+                    value, minimum))
+        return i
+
+    return convert
+
+
+def get_parsed_args(args=None):
+    """Get the parsed command line arguments.
+
+    :param args: The command-line args to parse; if omitted,
+        :data:`sys.argv <python:sys.argv>` will be used.
+    :type args: List[str], optional
+
+    :return: The :class:`Namespace <python:argparse.Namespace>` object holding
+        the parsed args.
+    :rtype: :class:`argparse.Namespace <python:argparse.Namespace>`
+
+    """
+    parser = ArgumentParser(
+        prog='python -m tt.benchmarks',
+        description='Run tt\'s performance benchmark suite.',
+        formatter_class=RawTextHelpFormatter)
+
+    parser.add_argument(
+        '--repeat',
+        type=_int_at_least(1),
+        default=5,
+        metavar='N',
+        help='the number of timed runs of each benchmark; defaults to 5')
+    parser.add_argument(
+        '--warmup',
+        type=_int_at_least(0),
+        default=1,
+        metavar='N',
+        help='the number of untimed runs made before the timed runs of\n'
+             'each benchmark; defaults to 1')
+    parser.add_argument(
+        '--filter',
+        metavar='REGEX',
+        help='only run the benchmarks whose names match REGEX')
+    parser.add_argument(
+        '--quick',
+        action='store_true',
+        help='use small parameters, to check that the suite works')
+    parser.add_argument(
+        '--json',
+        metavar='FILE',
+        help='write the results to FILE as JSON')
+    parser.add_argument(
+        '--compare',
+        metavar='FILE',
+        help='compare the results against a baseline written by --json,\n'
+             'exiting with a non-zero code if any benchmark regressed')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.1,
+        metavar='FRACTION',
+        help='the fraction by which a benchmark may be slower than its\n'
+             'baseline before being flagged as a regression; defaults\n'
+             'to 0.1')
+
+    if args is None:
+        args = sys.argv[1:]
+
+    return parser.parse_args(args)
+
+
+def _print_result(result, baseline):
+    """Print one benchmark result, with its comparison to a baseline."""
+    line = '{:<48} {:>10.6f}s {:>10.6f}s'.format(
+        result.name, result.best, result.median)
+    if baseline is not None:
+        comparisons = compare_results([result], baseline)
+        if comparisons:
+            line += ' {:>7.2f}x'.format(comparisons[0].ratio)
+    print(line)
+    sys.stdout.flush()
+
+
+def main(args=None):
+    """Run the benchmark suite.
+
+    :param args: The command-line arguments.
+    :type args: List[str], optional
+
+    :return: The exit code of the program; ``1`` if a regression was found
+        when comparing against a baseline, and ``0`` otherwise.
+    :rtype: int
+
+    """
+    opts = get_parsed_args(args)
+
+    baseline = None
+    if opts.compare is not None:
+        try:
+            with open(opts.compare) as f:
+                baseline = load_results(f)
+        except (IOError, TtError) as e:
+            print('Unable to load baseline:', e, file=sys.stderr)
+            return 2
+
+    header = '{:<48} {:>11} {:>11}'.format('benchmark', 'best', 'median')
+    if baseline is not None:
+        header += ' {:>8}'.format('ratio')
+    print(header)
+    print('-' * len(header))
+
+    results = run_benchmarks(
+        get_benchmarks(quick=opts.quick), repeat=opts.repeat,
+        warmup=opts.warmup, pattern=opts.filter,
+        on_result=lambda result: _print_result(result, baseline))
+
+    if opts.json is not None:
+        with open(opts.json, 'w') as f:
+            save_results(results, f)
+
+    if baseline is None:
+        return 0
+
+    regressions = [comparison for comparison in
+                   compare_results(results, baseline, opts.threshold)
+                   if comparison.is_regression]
+    print()
+    if not regressions:
+        print('No regressions beyond {:.0%} of the baseline.'.format(
+            opts.threshold))
+        return 0
+
+    print('Regressions beyond {:.0%} of the baseline:'.format(opts.threshold))
+    for comparison in regressions:
+        print('  {} ({:.6f}s -> {:.6f}s, {:.2f}x)'.format(
+            comparison.name, comparison.baseline, comparison.current,
+            comparison.ratio))
+    return 1
@@ -0,0 +1,325 @@
+"""Running benchmarks, and saving and comparing their results."""
+
+from __future__ import print_function
+
+import json
+import platform
+import re
+
+from collections import namedtuple
+
+from tt._assertions import assert_int_at_least
+from tt.errors import InvalidArgumentValueError
+from tt.trees import iter_transformation_memos
+from tt.version import __version__
+
+try:
+    from time import perf_counter as _timer
+except ImportError:
+    from time import time as _timer
+
+
+class Benchmark(object):
+
+    """A workload whose run time is measured.
+
+    A benchmark is made of an optional ``setup`` function, whose result is
+    passed to the timed ``func`` on each of its runs. Only the calls of
+    ``func`` are timed::
+
+        >>> from tt import BooleanExpression
+        >>> from tt.benchmarks import Benchmark
+        >>> benchmark = Benchmark(
+        ...     'sat_one', lambda b: b.sat_one(),
+        ...     setup=lambda: BooleanExpression('A and ~B'),
+        ...     params={'symbols': 2})
+        >>> benchmark.name
+        'sat_one[symbols=2]'
+        >>> result = benchmark.run(repeat=3, warmup=0)
+        >>> len(result.times)
+        3
+
+    :param group: The name of the group of benchmarks of which this is one
+        parametrization.
+    :type group: :class:`str <python:str>`
+
+    :param func: The function to time.
+    :type func: Callable
+
+    :param setup: A function run once before ``func`` is timed, returning the
+        argument ``func`` is called with; if omitted, ``func`` is called with
+        ``None``.
+    :type setup: Callable, optional
+
+    :param params: The parameters of this benchmark, which become part of its
+        name.
+    :type params: Dict{:class:`str <python:str>`: object}, optional
+
+    :param cold: Whether to clear the memos of tree transformations before
+        each run, so that each run transforms trees from scratch.
+    :type cold: :class:`bool <python:bool>`
+
+    """
+
+    def __init__(self, group, func, setup=None, params=None, cold=True):
+        self._group = group
+        self._func = func
+        self._setup = setup
+        self._params = dict(params or {})
+        self._cold = cold
+
+        if self._params:
+            self._name = '{}[{}]'.format(group, ', '.join(
+                '{}={}'.format(key, self._params[key])
+                for key in sorted(self._params)))
+        else:
+            self._name = group
+
+    @property
+    def name(self):
+        """The unique name of this benchmark and its parameters.
+
+        :type: :class:`str <python:str>`
+
+        """
+        return self._name
+
+    @property
+    def group(self):
+        """The name of the group of benchmarks this one belongs to.
+
+        :type: :class:`str <python:str>`
+
+        """
+        return self._group
+
+    @property
+    def params(self):
+        """The parameters of this benchmark.
+
+        :type: Dict{:class:`str <python:str>`: object}
+
+        """
+        return self._params
+
+    def run(self, repeat=5, warmup=1):
+        """Run this benchmark.
+
+        :param repeat: The number of timed runs.
+        :type repeat: :class:`int <python:int>`
+
+        :param warmup: The number of untimed runs made before the timed ones.
+        :type warmup: :class:`int <python:int>`
+
+        :returns: The times of each of the timed runs.
+        :rtype: :class:`BenchmarkResult`
+
+        :raises InvalidArgumentTypeError: If ``repeat`` or ``warmup`` is not
+            an integer.
+        :raises InvalidArgumentValueError: If ``repeat`` is less than one or
+            ``warmup`` is negative.
+
+        """
+        assert_int_at_least('repeat', repeat, 1)
+        assert_int_at_least('warmup', warmup, 0)
+
+        arg = self._setup() if self._setup is not None else None
+        for _ in range(warmup):
+            self._clear_memos()
+            self._func(arg)
+
+        times = []
+        for _ in range(repeat):
+            self._clear_memos()
+            start = _timer()
+            self._func(arg)
+            times.append(_timer() - start)
+
+        return BenchmarkResult(self._name, times)
+
+    def _clear_memos(self):
+        """Clear the transformation memos, if this benchmark is cold."""
+        if self._cold:
+            for memo in iter_transformation_memos():
+                memo.cache_clear()
+
+    def __repr__(self):
+        return '<Benchmark [{}]>'.format(self._name)
+
+
+class BenchmarkResult(namedtuple('BenchmarkResult', ['name', 'times'])):
+
+    """The times, in seconds, of the timed runs of a :class:`Benchmark`."""
+
+    __slots__ = ()
+
+    @property
+    def best(self):
+        """The fastest of the run times.
+
+        This is the figure compared between runs of the benchmarks, as it is
+        the least affected by other activity on the machine.
+
+        :type: :class:`float <python:float>`
+
+        """
+        return min(self.times)
+
+    @property
+    def median(self):
+        """The median of the run times.
+
+        :type: :class:`float <python:float>`
+
+        """
+        times = sorted(self.times)
+        mid = len(times) // 2
+        if len(times) % 2:
+            return times[mid]
+        return (times[mid - 1] + times[mid]) / 2
+
+
+Comparison = namedtuple(
+    'Comparison', ['name', 'baseline', 'current', 'ratio', 'is_regression'])
+"""The comparison of the best time of a benchmark against its baseline.
+
+``ratio`` is the current best time divided by the baseline best time, and
+``is_regression`` whether it exceeds the allowed threshold.
+
+"""
+
+
+def run_benchmarks(benchmarks, repeat=5, warmup=1, pattern=None,
+                   on_result=None):
+    """Run a sequence of benchmarks.
+
+    :param benchmarks: The benchmarks to run.
+    :type benchmarks: Iterable[:class:`Benchmark`]
+
+    :param repeat: The number of timed runs of each benchmark.
+    :type repeat: :class:`int <python:int>`
+
+    :param warmup: The number of untimed runs of each benchmark.
+    :type warmup: :class:`int <python:int>`
+
+    :param pattern: A regular expression; if specified, only benchmarks whose
+        names it matches are run.
+    :type pattern: :class:`str <python:str>`, optional
+
+    :param on_result: A function called with each result as it is produced.
+    :type on_result: Callable, optional
+
+    :returns: The results of the benchmarks run, in order.
+    :rtype: List[:class:`BenchmarkResult`]
+
+    """
+    regex = re.compile(pattern) if pattern is not None else None
+    results = []
+    for benchmark in benchmarks:
+        if regex is not None and not regex.search(benchmark.name):
+            continue
+
+        result = benchmark.run(repeat=repeat, warmup=warmup)
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    return results
+
+
+def save_results(results, f):
+    """Write benchmark results, and the environment they came from, as JSON.
+
+    :param results: The results to save.
+    :type results: Iterable[:class:`BenchmarkResult`]
+
+    :param f: The text file to write to.
+    :type f: file-like object
+
+    """
+    json.dump({
+        'tt_version': __version__,
+        'python': ' '.join((platform.python_implementation(),
+                            platform.python_version())),
+        'platform': platform.platform(),
+        'results': [
+            {'name': result.name,
+             'best': result.best,
+             'median': result.median,
+             'times': list(result.times)}
+            for result in results]}, f, indent=2)
+    f.write('\n')
+
+
+def load_results(f):
+    """Read benchmark results written by :func:`save_results`.
+
+    :param f: The text file to read from.
+    :type f: file-like object
+
+    :returns: The results, keyed by benchmark name.
+    :rtype: Dict{:class:`str <python:str>`: :class:`BenchmarkResult`}
+
+    :raises InvalidArgumentValueError: If the file does not hold benchmark
+        results.
+
+    """
+    try:
+        data = json.load(f)
+        return dict(
+            (entry['name'], BenchmarkResult(entry['name'], entry['times']))
+            for entry in data['results'])
+    except (ValueError, KeyError, TypeError):
+        raise InvalidArgumentValueError('Not a file of benchmark results')
+
+
+def compare_results(results, baseline, threshold=0.1):
+    """Compare benchmark results against a baseline.
+
+    Benchmarks are compared by their best times, and only those present in
+    both the results and the baseline are compared::
+
+        >>> from tt.benchmarks import BenchmarkResult, compare_results
+        >>> baseline = {'a': BenchmarkResult('a', [1.0, 1.2]),
+        ...             'b': BenchmarkResult('b', [2.0])}
+        >>> results = [BenchmarkResult('a', [1.05]),
+        ...            BenchmarkResult('b', [2.5, 3.0]),
+        ...            BenchmarkResult('c', [1.0])]
+        >>> for comparison in compare_results(results, baseline):
+        ...     print(comparison.name, comparison.ratio,
+        ...           comparison.is_regression)
+        a 1.05 False
+        b 1.25 True
+
+    :param results: The results of the current run.
+    :type results: Iterable[:class:`BenchmarkResult`]
+
+    :param baseline: The baseline results, keyed by benchmark name, as
+        returned by :func:`load_results`.
+    :type baseline: Dict{:class:`str <python:str>`: :class:`BenchmarkResult`}
+
+    :param threshold: The fraction by which a benchmark's best time may
+        exceed its baseline before it is flagged as a regression.
+    :type threshold: :class:`float <python:float>`
+
+    :returns: The comparisons, in the order of ``results``.
+    :rtype: List[:class:`Comparison`]
+
+    :raises InvalidArgumentValueError: If ``threshold`` is negative.
+
+    """
+    if threshold < 0:
+        raise InvalidArgumentValueError('`threshold` must be non-negative')
+
+    comparisons = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            continue
+
+        ratio = result.best / base.best if base.best else float('inf')
+        comparisons.append(Comparison(
+            result.name, base.best, result.best, ratio,
+            ratio > 1 + threshold))
+
+    return comparisons
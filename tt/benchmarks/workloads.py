@@ -0,0 +1,220 @@
+"""The parametrized workloads of tt's benchmark suite."""
+
+import itertools
+import random
+
+from tt.expressions import BooleanExpression
+from tt.generators import random_ksat
+from tt.tables import TruthTable
+from tt.transformations import to_bounded_cnf
+from tt.trees import ExpressionTreeNode
+
+from .runner import Benchmark
+
+
+_SEED = 0
+
+_BINARY_OPERATORS = ('and', 'or', 'xor', 'xnor', 'nand', 'nor', '->', 'iff')
+
+
+def get_benchmarks(quick=False):
+    """Get the benchmarks of tt's benchmark suite.
+
+    The suite covers parsing random expressions of varying size and depth,
+    evaluating them, filling wide truth tables, transforming and solving XOR
+    chains, solving large random CNFs, and operating on a deep chain of
+    ``and`` operators. All random inputs are generated from a fixed seed, so
+    that each benchmark works on the same input from run to run.
+
+    :param quick: Whether to use small parameters, for checking that the
+        suite works rather than for measuring it.
+    :type quick: :class:`bool <python:bool>`
+
+    :returns: The benchmarks of the suite.
+    :rtype: List[:class:`Benchmark <tt.benchmarks.runner.Benchmark>`]
+
+    """
+    if quick:
+        parse_sizes, parse_depths = (20,), (2,)
+        table_symbols, cnf_symbols = (6,), (20,)
+        xor_lengths, distributive_xor_lengths = (6,), (3,)
+        chain_length = 10**3
+    else:
+        parse_sizes, parse_depths = (100, 1000, 10000), (4, 32)
+        table_symbols, cnf_symbols = (10, 14), (100, 300)
+        xor_lengths, distributive_xor_lengths = (8, 12), (4, 5)
+        chain_length = 10**5
+
+    benchmarks = []
+    for size, depth in itertools.product(parse_sizes, parse_depths):
+        params = {'size': size, 'depth': depth}
+        benchmarks.append(Benchmark(
+            'parse', BooleanExpression,
+            setup=_random_expression_factory(size, depth, 26),
+            params=params))
+        benchmarks.append(Benchmark(
+            'evaluate', _evaluate_all_true,
+            setup=_random_bexpr_factory(size, depth, 26),
+            params=params))
+
+    for num_symbols in table_symbols:
+        benchmarks.append(Benchmark(
+            'truth_table', TruthTable,
+            setup=_random_bexpr_factory(4 * num_symbols, 8, num_symbols),
+            params={'symbols': num_symbols}))
+
+    for length in xor_lengths:
+        params = {'length': length}
+        setup = _xor_chain_factory(length)
+        benchmarks.extend([
+            Benchmark('xor_chain.to_primitives',
+                      lambda b: b.tree.to_primitives(),
+                      setup=setup, params=params),
+            Benchmark('xor_chain.to_bounded_cnf', to_bounded_cnf,
+                      setup=setup, params=params)])
+
+    # converting an xor chain to CNF by distribution grows exponentially
+    # with its length, so these are kept to short chains
+    for length in distributive_xor_lengths:
+        params = {'length': length}
+        setup = _xor_chain_factory(length)
+        benchmarks.extend([
+            Benchmark('xor_chain.to_cnf', lambda b: b.tree.to_cnf(),
+                      setup=setup, params=params),
+            Benchmark('xor_chain.sat_all', _count_solutions,
+                      setup=setup, params=params)])
+
+    for num_symbols in cnf_symbols:
+        params = {'symbols': num_symbols}
+        setup = _random_cnf_factory(num_symbols, 4 * num_symbols)
+        benchmarks.extend([
+            Benchmark('cnf.iter_cnf_clauses', _count_cnf_clauses,
+                      setup=setup, params=params),
+            Benchmark('cnf.sat_one', _sat_one,
+                      setup=setup, params=params)])
+
+    benchmarks.extend(_and_chain_benchmarks(chain_length))
+    return benchmarks
+
+
+def _random_expression(rng, num_operators, max_depth, num_symbols):
+    """Build the text of a random expression.
+
+    The expression holds ``num_operators`` binary operators, nested within at
+    most ``max_depth`` levels of parentheses; beyond that depth, operands and
+    operators are chained together without parentheses.
+
+    """
+    def operand():
+        symbol = 'A{}'.format(rng.randrange(num_symbols))
+        return 'not ' + symbol if rng.random() < 0.25 else symbol
+
+    def build(num_operators, depth):
+        if not num_operators:
+            return operand()
+        elif not depth:
+            parts = [operand()]
+            for _ in range(num_operators):
+                parts.extend((rng.choice(_BINARY_OPERATORS), operand()))
+            return ' '.join(parts)
+
+        num_left = rng.randrange(num_operators)
+        return '({}) {} ({})'.format(
+            build(num_left, depth - 1),
+            rng.choice(_BINARY_OPERATORS),
+            build(num_operators - 1 - num_left, depth - 1))
+
+    return build(num_operators, max_depth)
+
+
+def _random_expression_factory(num_operators, max_depth, num_symbols):
+    """Get a setup function building the text of a random expression."""
+    def setup():
+        rng = random.Random(_SEED)
+        return _random_expression(rng, num_operators, max_depth, num_symbols)
+    return setup
+
+
+def _random_bexpr_factory(num_operators, max_depth, num_symbols):
+    """Get a setup function building a random expression."""
+    build_text = _random_expression_factory(
+        num_operators, max_depth, num_symbols)
+    return lambda: BooleanExpression(build_text())
+
+
+def _xor_chain_factory(length):
+    """Get a setup function building a chain of ``xor`` operators."""
+    return lambda: BooleanExpression(
+        ' xor '.join('A{}'.format(i) for i in range(length)))
+
+
+def _random_cnf_factory(num_symbols, num_clauses):
+    """Get a setup function building a random CNF of 3-literal clauses."""
+    ratio = num_clauses / float(num_symbols)
+    return lambda: random_ksat(num_symbols, ratio=ratio,
+                               seed=_SEED).to_expression()
+
+
+def _and_chain_benchmarks(length):
+    """Get the benchmarks operating on a left-deep chain of ``and``s."""
+    symbols = ['A{}'.format(i) for i in range(length)]
+    postfix_tokens = [symbols[0]]
+    for symbol in symbols[1:]:
+        postfix_tokens.extend((symbol, 'and'))
+
+    build_tree = ExpressionTreeNode.build_tree
+    input_dict = dict.fromkeys(symbols, True)
+    params = {'length': length}
+
+    def build_trees():
+        return build_tree(postfix_tokens), build_tree(postfix_tokens)
+
+    def chain(name, func, cold=True):
+        return Benchmark('and_chain.' + name, func, setup=build_trees,
+                         params=params, cold=cold)
+
+    return [
+        Benchmark('and_chain.build_tree',
+                  lambda tokens: build_tree(tokens),
+                  setup=lambda: postfix_tokens, params=params),
+        chain('BooleanExpression', lambda trees: BooleanExpression(trees[0])),
+        chain('raw_expr',
+              lambda trees: BooleanExpression(trees[0]).raw_expr),
+        chain('evaluate', lambda trees: trees[0].evaluate(input_dict)),
+        chain('_copy', lambda trees: trees[0]._copy()),
+        chain('__eq__', lambda trees: trees[0] == trees[1]),
+        chain('to_primitives', lambda trees: trees[0].to_primitives()),
+        chain('to_primitives (memo)', lambda trees: trees[0].to_primitives(),
+              cold=False),
+        chain('distribute_ors', lambda trees: trees[0].distribute_ors()),
+        chain('iter_cnf_clauses',
+              lambda trees: sum(1 for _ in trees[0].iter_cnf_clauses()))]
+
+
+def _evaluate_all_true(b):
+    """Evaluate an expression with all of its symbols set to true."""
+    return b.tree.evaluate(dict.fromkeys(b.symbols, True))
+
+
+def _sat_one(b):
+    """Find a satisfying solution of an expression.
+
+    The expression's tree is adopted by a new expression, so that the clauses
+    cached by earlier runs are not reused.
+
+    """
+    return BooleanExpression(b.tree).sat_one()
+
+
+def _count_solutions(b):
+    """Count the satisfying solutions of an expression.
+
+    As in :func:`_sat_one`, a new expression is solved on each run.
+
+    """
+    return sum(1 for _ in BooleanExpression(b.tree).sat_all())
+
+
+def _count_cnf_clauses(b):
+    """Count the clauses of an expression in CNF."""
+    return sum(1 for _ in b.iter_cnf_clauses())
@@ -1,18 +1,32 @@
 """Core command-line interface for tt."""
 
+import itertools
 import sys
 
 from argparse import (
     ArgumentParser,
+    ArgumentTypeError,
+    FileType,
     RawTextHelpFormatter)
 
+try:
+    from time import perf_counter as _timer
+except ImportError:
+    from time import time as _timer
+
 from tt.errors import (
     EmptyExpressionError,
-    GrammarError)
+    GrammarError,
+    InvalidArgumentValueError,
+    TtError)
 from tt.expressions import BooleanExpression
 from tt.tables import TruthTable
+from tt.transformations import (
+    to_cnf,
+    to_primitives)
 from tt.version import __version__
 
+from .tables import iter_table_chunks, TABLE_FORMATS
 from .utils import print_err, print_info
 
 
@@ -25,28 +39,235 @@ def _add_expression_arg(parser):
              'avoid escaping control characters in your terminal')
 
 
-def _tokens(opts):
-    """Run the ``tokens`` command."""
-    b = BooleanExpression(opts.expression)
-    print_info('\n'.join(b.tokens))
+def _add_batch_args(parser):
+    """Add the mutually exclusive batch-processing options to a parser."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        '--batch',
+        metavar='FILE',
+        type=FileType('r'),
+        help='process each line of FILE as a separate expression; a\n'
+             'FILE of - reads from standard input')
+    group.add_argument(
+        '--stdin',
+        action='store_true',
+        help='process each line of standard input as a separate\n'
+             'expression')
+
+
+def _add_time_arg(parser):
+    """Add the option to report the time taken by a command to a parser."""
+    parser.add_argument(
+        '--time',
+        action='store_true',
+        help='report the time taken to process each expression on\n'
+             'stderr')
+
+
+def _non_negative_int(value):
+    """Convert a command-line argument to a non-negative integer."""
+    try:
+        i = int(value)
+    except ValueError:
+        i = -1
+
+    if i < 0:
+        raise ArgumentTypeError(
+            '"{}" is not a non-negative integer'.format(value))
+    return i
+
+
+def _positive_float(value):
+    """Convert a command-line argument to a positive number."""
+    try:
+        f = float(value)
+    except ValueError:
+        f = 0
+
+    if not 0 < f < float('inf'):
+        raise ArgumentTypeError('"{}" is not a positive number'.format(value))
+    return f
+
+
+def _tokens(expr, opts):
+    """Get the output of the ``tokens`` command."""
+    b = BooleanExpression(expr)
+    return ['\n'.join(b.tokens) + '\n']
+
+
+def _postfix_tokens(expr, opts):
+    """Get the output of the ``postfix-tokens`` command."""
+    b = BooleanExpression(expr)
+    return ['\n'.join(b.postfix_tokens) + '\n']
+
+
+def _tree(expr, opts):
+    """Get the output of the ``tree`` command."""
+    b = BooleanExpression(expr)
+    return [str(b.tree) + '\n']
+
+
+def _table(expr, opts):
+    """Get the output of the ``table`` command."""
+    b = BooleanExpression(expr)
+    return iter_table_chunks(b, opts.format)
+
+
+def _sat_one(expr, opts):
+    """Get the output of the ``sat-one`` command."""
+    b = BooleanExpression(expr)
+    solution = b.sat_one()
+    return ['{}\n'.format('UNSAT' if solution is None else solution)]
+
+
+def _sat_all(expr, opts):
+    """Get the output of the ``sat-all`` command."""
+    b = BooleanExpression(expr)
+    solutions = itertools.islice(b.sat_all(), opts.limit)
+    return ('{}\n'.format(solution) for solution in solutions)
+
+
+def _equiv(expr, opts):
+    """Get the output of the ``equiv`` command.
+
+    The two expressions to compare are separated by a tab. Their truth tables
+    are built over the union of their symbols, so that expressions which do
+    not depend on the symbols missing from the other, such as ``A`` and
+    ``A or (B and not B)``, are still found equivalent.
+
+    """
+    exprs = [e for e in expr.split('\t') if e.strip()]
+    if len(exprs) != 2:
+        raise InvalidArgumentValueError(
+            'Expected two tab-separated expressions')
+
+    b1, b2 = (BooleanExpression(e) for e in exprs)
+    symbols = b1.symbols + [s for s in b2.symbols if s not in b1.symbols]
+    if not symbols:
+        is_equivalent = b1.tree.evaluate({}) == b2.tree.evaluate({})
+    else:
+        t1 = TruthTable(_with_symbols(b1, symbols), ordering=symbols)
+        t2 = TruthTable(_with_symbols(b2, symbols), ordering=symbols)
+        is_equivalent = t1.equivalent_to(t2)
+
+    return ['{}\n'.format(is_equivalent)]
+
+
+def _with_symbols(b, symbols):
+    """Get an equivalent expression that also contains the given symbols."""
+    missing = [s for s in symbols if s not in b.symbols]
+    if not missing:
+        return b
+
+    contradictions = ' or '.join(
+        '({0} and not {0})'.format(s) for s in missing)
+    return BooleanExpression('({}) or {}'.format(b, contradictions))
+
+
+def _to_cnf(expr, opts):
+    """Get the output of the ``to-cnf`` command."""
+    return ['{}\n'.format(to_cnf(expr, simplify=opts.simplify))]
 
 
-def _postfix_tokens(opts):
-    """Run the ``postfix-tokens`` command."""
-    b = BooleanExpression(opts.expression)
-    print_info('\n'.join(b.postfix_tokens))
+def _to_primitives(expr, opts):
+    """Get the output of the ``to-primitives`` command."""
+    return ['{}\n'.format(to_primitives(expr))]
 
 
-def _tree(opts):
-    """Run the ``tree`` command."""
-    b = BooleanExpression(opts.expression)
-    print_info(b.tree)
+def _serve(opts):
+    """Run the ``serve`` command."""
+    if sys.version_info < (3, 5):
+        print_err('The serve command requires Python 3.5 or later.')
+        return 1
+
+    from .server import serve
+
+    def on_start(server):
+        address = server.address
+        if opts.unix is None:
+            address = '{}:{}'.format(*address[:2])
+        print_err('Serving on', address)
+        sys.stderr.flush()
+
+    serve(host=opts.host, port=opts.port, path=opts.unix,
+          workers=opts.workers, cache_size=opts.cache_size,
+          solver_timeout=opts.solver_timeout, on_start=on_start)
+    return 0
 
 
-def _table(opts):
-    """Run the ``table`` command."""
-    t = TruthTable(opts.expression)
-    print_info(t)
+def _write_output(chunks):
+    """Write the chunks of text output by a command to stdout."""
+    for chunk in chunks:
+        print_info(chunk, end='')
+
+
+def _line_prefix(line_num):
+    """Get the prefix locating a message on a line of batch input."""
+    return '' if line_num is None else 'Line {}: '.format(line_num)
+
+
+def _print_error(e, line_num=None):
+    """Report an error, optionally located on a line of batch input."""
+    prefix = _line_prefix(line_num)
+    if isinstance(e, EmptyExpressionError):
+        print_err(prefix, 'Empty expressions are invalid!', sep='')
+    elif isinstance(e, GrammarError):
+        print_err(prefix, 'Error! ', e.message, ':', sep='')
+        print_err(e.expr_str)
+        print_err(' ' * e.error_pos, '^', sep='')
+    elif isinstance(e, TtError):
+        print_err(prefix, 'Error! ', e.message, sep='')
+    else:
+        print_err(prefix, 'Unexpected error! ', type(e).__name__, ': ', e,
+                  sep='')
+
+
+def _print_elapsed(start, line_num=None):
+    """Report the time elapsed since ``start`` on stderr."""
+    print_err(_line_prefix(line_num),
+              'Elapsed time: {:.3f} ms'.format(1000 * (_timer() - start)),
+              sep='')
+
+
+def _run_batch(func, opts, lines):
+    """Run a command on each line of batch input.
+
+    Lines are read and results written one at a time, so no more than a
+    single expression and its output are held in memory regardless of the
+    size of the input. Blank lines are skipped, and the results of
+    consecutive expressions are separated by an empty line. Lines that fail
+    to be processed, whether with a tt error or an unexpected one (such as a
+    :exc:`RecursionError <python:RecursionError>` or :exc:`ValueError \
+    <python:ValueError>`), are reported on stderr along with their line
+    number, without interrupting the processing of the lines that follow them.
+
+    :return: The exit code of the program; ``1`` if any line failed, and
+        ``0`` otherwise.
+    :rtype: int
+
+    """
+    exit_code = 0
+    is_first = True
+    for line_num, line in enumerate(lines, start=1):
+        expr = line.strip()
+        if not expr:
+            continue
+
+        try:
+            start = _timer()
+            chunks = func(expr, opts)
+            if not is_first:
+                print_info()
+            is_first = False
+
+            _write_output(chunks)
+            if opts.time:
+                _print_elapsed(start, line_num)
+        except Exception as e:
+            _print_error(e, line_num)
+            exit_code = 1
+
+    return exit_code
 
 
 def get_parsed_args(args=None):
@@ -83,6 +304,8 @@ def get_parsed_args(args=None):
         'tokens',
         help='print the expression\'s tokens in order of appearance')
     _add_expression_arg(parser_tokens)
+    _add_batch_args(parser_tokens)
+    _add_time_arg(parser_tokens)
     parser_tokens.set_defaults(func=_tokens)
 
     # postfix-tokens sub-parser
@@ -90,6 +313,8 @@ def get_parsed_args(args=None):
         'postfix-tokens',
         help='print the expression\'s tokens in postfix order')
     _add_expression_arg(parser_postfix_tokens)
+    _add_batch_args(parser_postfix_tokens)
+    _add_time_arg(parser_postfix_tokens)
     parser_postfix_tokens.set_defaults(func=_postfix_tokens)
 
     # tree sub-parser
@@ -97,6 +322,8 @@ def get_parsed_args(args=None):
         'tree',
         help='print the expression\'s tree representation')
     _add_expression_arg(parser_tree)
+    _add_batch_args(parser_tree)
+    _add_time_arg(parser_tree)
     parser_tree.set_defaults(func=_tree)
 
     # table sub-parser
@@ -104,8 +331,118 @@ def get_parsed_args(args=None):
         'table',
         help='print the expression\'s truth table')
     _add_expression_arg(parser_table)
+    _add_batch_args(parser_table)
+    _add_time_arg(parser_table)
+    parser_table.add_argument(
+        '--format',
+        choices=TABLE_FORMATS,
+        default='table',
+        help='the output format of the table; all formats but the\n'
+             'default of table stream rows as they are evaluated')
     parser_table.set_defaults(func=_table)
 
+    # sat-one sub-parser
+    parser_sat_one = sub_parsers.add_parser(
+        'sat-one',
+        help='print a satisfying solution of the expression, or UNSAT if\n'
+             'there is none')
+    _add_expression_arg(parser_sat_one)
+    _add_batch_args(parser_sat_one)
+    _add_time_arg(parser_sat_one)
+    parser_sat_one.set_defaults(func=_sat_one)
+
+    # sat-all sub-parser
+    parser_sat_all = sub_parsers.add_parser(
+        'sat-all',
+        help='print the satisfying solutions of the expression')
+    _add_expression_arg(parser_sat_all)
+    _add_batch_args(parser_sat_all)
+    _add_time_arg(parser_sat_all)
+    parser_sat_all.add_argument(
+        '--limit',
+        type=_non_negative_int,
+        metavar='N',
+        help='print at most N solutions')
+    parser_sat_all.set_defaults(func=_sat_all)
+
+    # equiv sub-parser
+    parser_equiv = sub_parsers.add_parser(
+        'equiv',
+        help='print whether two expressions are logically equivalent')
+    parser_equiv.add_argument(
+        'expression',
+        nargs='*',
+        metavar='expressions',
+        help='the two Boolean expressions to compare, each surrounded\n'
+             'in quotes; in batch mode, each line holds two\n'
+             'expressions separated by a tab')
+    _add_batch_args(parser_equiv)
+    _add_time_arg(parser_equiv)
+    parser_equiv.set_defaults(func=_equiv, num_expressions=2)
+
+    # to-cnf sub-parser
+    parser_to_cnf = sub_parsers.add_parser(
+        'to-cnf',
+        help='print the expression in conjunctive normal form')
+    _add_expression_arg(parser_to_cnf)
+    _add_batch_args(parser_to_cnf)
+    _add_time_arg(parser_to_cnf)
+    parser_to_cnf.add_argument(
+        '--simplify',
+        action='store_true',
+        help='remove redundant clauses and literals from the result')
+    parser_to_cnf.set_defaults(func=_to_cnf)
+
+    # to-primitives sub-parser
+    parser_to_primitives = sub_parsers.add_parser(
+        'to-primitives',
+        help='print the expression using only the and, or, and not\n'
+             'operators')
+    _add_expression_arg(parser_to_primitives)
+    _add_batch_args(parser_to_primitives)
+    _add_time_arg(parser_to_primitives)
+    parser_to_primitives.set_defaults(func=_to_primitives)
+
+    # serve sub-parser
+    parser_serve = sub_parsers.add_parser(
+        'serve',
+        help='run a server answering newline-delimited JSON requests')
+    parser_serve.add_argument(
+        '--host',
+        default='127.0.0.1',
+        help='the host to listen on; defaults to 127.0.0.1')
+    parser_serve.add_argument(
+        '--port',
+        type=_non_negative_int,
+        default=0,
+        help='the TCP port to listen on; defaults to a free port, which\n'
+             'is reported on stderr')
+    parser_serve.add_argument(
+        '--unix',
+        metavar='PATH',
+        help='listen on a Unix socket at PATH instead of a TCP port')
+    parser_serve.add_argument(
+        '--workers',
+        type=_non_negative_int,
+        metavar='N',
+        help='the number of worker processes for expensive requests;\n'
+             'defaults to the number of CPUs, and 0 answers all\n'
+             'requests in the server process')
+    parser_serve.add_argument(
+        '--cache-size',
+        type=_non_negative_int,
+        default=1024,
+        metavar='N',
+        help='the number of parsed expressions to cache; defaults to\n'
+             '1024')
+    parser_serve.add_argument(
+        '--solver-timeout',
+        type=_positive_float,
+        metavar='SECONDS',
+        help='the maximum time the solver may spend in each search of a\n'
+             'sat request; defaults to no limit')
+    parser_serve.set_defaults(run=_serve)
+
     if args is None:
         args = sys.argv[1:]
 
@@ -127,22 +464,44 @@ def main(args=None):
             args = sys.argv[1:]
 
         opts = get_parsed_args(args)
+        run = getattr(opts, 'run', None)
+        if run is not None:
+            return run(opts)
+
         func = getattr(opts, 'func', None)
         if func is None:
             print_err('No command specified; use `tt --help` for options.')
             return 2
 
-        opts.expression = ' '.join(opts.expression)
-        func(opts)
+        if opts.batch is not None or opts.stdin:
+            if opts.expression:
+                print_err('Expressions cannot be passed as arguments in '
+                          'batch mode.')
+                return 2
+
+            lines = sys.stdin if opts.stdin else opts.batch
+            try:
+                return _run_batch(func, opts, lines)
+            finally:
+                if lines is not sys.stdin:
+                    lines.close()
+
+        if getattr(opts, 'num_expressions', None) == 2:
+            if len(opts.expression) != 2:
+                print_err('Exactly two expressions must be specified.')
+                return 2
+            expr = '\t'.join(opts.expression)
+        else:
+            expr = ' '.join(opts.expression)
+
+        start = _timer()
+        _write_output(func(expr, opts))
+        if opts.time:
+            _print_elapsed(start)
 
         return 0
-    except EmptyExpressionError as e:
-        print_err('Empty expressions are invalid!')
-        return 1
-    except GrammarError as e:
-        print_err('Error! ', e.message, ':', sep='')
-        print_err(e.expr_str)
-        print_err(' ' * e.error_pos, '^', sep='')
+    except TtError as e:
+        _print_error(e)
         return 1
     except Exception as e:
         print_err('Received unexpected error; re-raising it!')
@@ -0,0 +1,540 @@
+"""A long-lived server answering requests about expressions.
+
+The server is started with the ``tt serve`` command and listens on either a
+localhost TCP port or a Unix socket. Clients send requests as JSON objects,
+one per line, and receive one JSON object per line in response. Each request
+names an ``op`` and the ``expr`` it applies to, and may carry an ``id`` that
+is echoed back in its response::
+
+    {"id": 1, "op": "evaluate", "expr": "A or B", "values": {"A": 0, "B": 1}}
+    {"id": 1, "ok": true, "result": 1}
+
+The supported operations, and their results, are:
+
+* ``parse``, an object holding the ``symbols``, ``tokens``, and
+  ``postfix_tokens`` of the expression.
+* ``evaluate``, the ``0`` or ``1`` result of evaluating the expression with
+  the symbol values in ``values``.
+* ``table``, an object holding the ``symbols`` of the expression and the
+  ``bits`` of its truth table, in the form accepted by the ``from_values``
+  argument of :class:`TruthTable <tt.tables.truth_table.TruthTable>`.
+* ``sat``, a satisfying solution mapping symbols to ``0`` or ``1`` values, or
+  ``null`` if there is none; if ``all`` is true, a list of all solutions
+  instead, of at most ``limit`` solutions if a ``limit`` is given. The
+  ``decision_limit``, ``propagation_limit``, and ``timeout`` of each search
+  may be given as for :meth:`BooleanExpression.sat_one
+  <tt.expressions.bexpr.BooleanExpression.sat_one>`; a search reaching one
+  of them fails with a ``SolverLimitError``.
+* ``transform``, the string of the expression produced by the transformation
+  from :mod:`tt.transformations` named by ``name``, such as ``"to_cnf"``.
+
+Failed requests are answered with an ``error`` object instead of a
+``result``, holding the ``type`` and ``message`` of the error, and for
+grammar errors the ``position`` in the expression at which it occurred::
+
+    {"id": 2, "op": "parse", "expr": "A or"}
+    {"id": 2, "ok": false, "error": {"type": "ExpressionOrderError", ...}}
+
+Requests on a connection are served concurrently, so responses may arrive in
+a different order than their requests were sent. Parsed expressions are kept
+in a cache keyed by their text. Satisfiability and transformation requests,
+whose cost can grow exponentially with the size of the expression, and the
+tables of wide expressions are offloaded to a pool of worker processes, so
+that they never hold up the requests served in the meantime. Workers are sent
+the postfix tokens of the cached expression, from which they rebuild its tree
+without tokenizing or parsing the expression's text again. The server's
+``solver_timeout`` bounds the searches of every ``sat`` request, so that no
+request can hold a worker indefinitely, and the pool is replaced if one of its
+workers dies.
+
+This module requires Python 3.5 or later.
+
+"""
+
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from tt.errors import (
+    GrammarError,
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError,
+    TtError)
+from tt.expressions import BooleanExpression
+from tt.trees import (
+    CacheInfo,
+    ExpressionTreeNode)
+from tt.transformations import (
+    apply_de_morgans,
+    apply_idempotent_law,
+    apply_identity_law,
+    apply_inverse_law,
+    coalesce_negations,
+    distribute_ands,
+    distribute_ors,
+    simplify_cnf,
+    to_cnf,
+    to_dnf,
+    to_primitives)
+
+from .tables import iter_table_chunks
+
+
+_DEFAULT_CACHE_SIZE = 1024
+
+_MAX_PENDING_REQUESTS = 64
+
+_MAX_LINE_LENGTH = 2**20
+
+_MAX_INLINE_TABLE_SYMBOLS = 12
+
+_SOLVER_LIMITS = ('decision_limit', 'propagation_limit', 'timeout')
+
+_TRANSFORMATIONS = {
+    f.__name__: f for f in (
+        apply_de_morgans,
+        apply_idempotent_law,
+        apply_identity_law,
+        apply_inverse_law,
+        coalesce_negations,
+        distribute_ands,
+        distribute_ors,
+        simplify_cnf,
+        to_cnf,
+        to_dnf,
+        to_primitives)}
+
+
+def _parse(b, request):
+    """Answer a ``parse`` request."""
+    return {
+        'symbols': b.symbols,
+        'tokens': b.tokens,
+        'postfix_tokens': b.postfix_tokens}
+
+
+def _evaluate(b, request):
+    """Answer an ``evaluate`` request."""
+    values = request.get('values', {})
+    if not isinstance(values, dict):
+        raise InvalidArgumentTypeError('`values` must be an object')
+    return int(b.evaluate(**values))
+
+
+def _table(b, request):
+    """Answer a ``table`` request."""
+    bits = ''.join(iter_table_chunks(b, 'bits'))
+    return {'symbols': b.symbols, 'bits': bits.rstrip('\n')}
+
+
+def _sat(b, request):
+    """Answer a ``sat`` request."""
+    limits = {name: request[name] for name in _SOLVER_LIMITS
+              if request.get(name) is not None}
+    if not request.get('all', False):
+        return _solution_as_dict(b.sat_one(**limits))
+
+    limit = request.get('limit')
+    if limit is not None:
+        if isinstance(limit, bool) or not isinstance(limit, int):
+            raise InvalidArgumentTypeError('`limit` must be an integer')
+        elif limit < 0:
+            raise InvalidArgumentValueError('`limit` must be non-negative')
+
+    solutions = itertools.islice(b.sat_all(**limits), limit)
+    return [_solution_as_dict(solution) for solution in solutions]
+
+
+def _solution_as_dict(solution):
+    """Convert a SAT solution to a JSON-serializable dict."""
+    if solution is None:
+        return None
+    return OrderedDict(
+        (symbol, int(value)) for symbol, value in solution._asdict().items())
+
+
+def _transform(b, request):
+    """Answer a ``transform`` request."""
+    return str(_get_transformation(request)(b))
+
+
+def _get_transformation(request):
+    """Get the transformation named by a ``transform`` request."""
+    name = request.get('name')
+    transformation = _TRANSFORMATIONS.get(name) if isinstance(
+        name, str) else None
+    if transformation is None:
+        raise InvalidArgumentValueError(
+            'Unknown transformation "{}"'.format(name))
+    return transformation
+
+
+_OPS = {
+    'evaluate': _evaluate,
+    'parse': _parse,
+    'sat': _sat,
+    'table': _table,
+    'transform': _transform}
+
+
+def _with_solver_timeout(request, solver_timeout):
+    """Cap the ``timeout`` of a ``sat`` request at the server's timeout."""
+    timeout = request.get('timeout')
+    if timeout is None or (isinstance(timeout, (int, float)) and
+                           not isinstance(timeout, bool) and
+                           timeout > solver_timeout):
+        request = dict(request, timeout=solver_timeout)
+    return request
+
+
+def _is_expensive(op, b):
+    """Whether a request should be offloaded to the worker pool."""
+    return (op == 'sat' or op == 'transform' or
+            (op == 'table' and len(b.symbols) > _MAX_INLINE_TABLE_SYMBOLS))
+
+
+def _new_executor(workers):
+    """Create a pool of worker processes.
+
+    Where possible, workers are forked from a server process started along
+    with the first pool, so that a pool replacing a broken one does not
+    inherit the sockets of the connections open when it is created. Before
+    Python 3.7, the pool's start method cannot be chosen, so workers forked
+    to replace a broken pool keep those connections open for their lifetime.
+
+    """
+    if (sys.version_info >= (3, 7) and
+            'forkserver' in multiprocessing.get_all_start_methods()):
+        return ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context('forkserver'))
+    return ProcessPoolExecutor(workers)
+
+
+def _start_worker():
+    """Do nothing, so that a worker process is started."""
+
+
+def _run_in_worker(op, postfix_tokens, request):
+    """Answer a request within a worker process."""
+    b = BooleanExpression(ExpressionTreeNode.build_tree(postfix_tokens))
+    return _OPS[op](b, request)
+
+
+def _error_as_dict(e):
+    """Convert an error to a JSON-serializable dict."""
+    if isinstance(e, TtError):
+        error = {'type': type(e).__name__, 'message': e.message}
+        if isinstance(e, GrammarError) and e.error_pos is not None:
+            error['position'] = e.error_pos
+    else:
+        error = {'type': type(e).__name__, 'message': str(e)}
+    return error
+
+
+class EvaluationServer(object):
+
+    """A server answering newline-delimited JSON requests about expressions.
+
+    See the documentation of this module for the protocol spoken by the
+    server. A server is started within a running event loop with
+    :meth:`start`, and stopped with :meth:`close`; the :func:`serve` function
+    takes care of both for the ``tt serve`` command.
+
+    :param workers: The number of worker processes to which expensive
+        requests are offloaded; ``None`` for one per CPU, or ``0`` to answer
+        every request within the server's process.
+    :type workers: :class:`int <python:int>`
+
+    :param cache_size: The maximum number of parsed expressions to cache; ``0``
+        disables the cache.
+    :type cache_size: :class:`int <python:int>`
+
+    :param solver_timeout: The maximum number of seconds the solver may
+        spend in each search of a ``sat`` request, capping any ``timeout``
+        given by the request; unlimited if ``None``.
+    :type solver_timeout: :class:`float <python:float>`
+
+    :raises InvalidArgumentTypeError: If ``workers`` or ``cache_size`` is not
+        an integer, or ``solver_timeout`` is not a number.
+    :raises InvalidArgumentValueError: If ``workers`` or ``cache_size`` is
+        negative, or ``solver_timeout`` is not positive.
+
+    """
+
+    def __init__(self, workers=None, cache_size=_DEFAULT_CACHE_SIZE,
+                 solver_timeout=None):
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        for name, value in (('workers', workers), ('cache_size', cache_size)):
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise InvalidArgumentTypeError(
+                    '`{}` must be an int'.format(name))
+            elif value < 0:
+                raise InvalidArgumentValueError(
+                    '`{}` must be non-negative'.format(name))
+
+        if solver_timeout is not None:
+            if (isinstance(solver_timeout, bool) or
+                    not isinstance(solver_timeout, (int, float))):
+                raise InvalidArgumentTypeError(
+                    '`solver_timeout` must be a number')
+            elif solver_timeout <= 0:
+                raise InvalidArgumentValueError(
+                    '`solver_timeout` must be positive')
+
+        self._workers = workers
+        self._cache_size = cache_size
+        self._solver_timeout = solver_timeout
+        self._cache = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._executor = None
+        self._loop = None
+        self._server = None
+
+    @property
+    def address(self):
+        """The address the server is listening on, or ``None`` if stopped.
+
+        This is a ``(host, port)`` tuple for TCP servers, and the path of the
+        socket for Unix socket servers.
+
+        """
+        if self._server is None or not self._server.sockets:
+            return None
+        return self._server.sockets[0].getsockname()
+
+    def cache_info(self):
+        """Get the hit and miss counts and current size of the cache of parsed
+        expressions.
+
+        :rtype: :class:`CacheInfo <tt.trees.memo.CacheInfo>`
+
+        """
+        return CacheInfo(
+            self._hits, self._misses, self._cache_size, len(self._cache))
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        """Start listening for connections.
+
+        :param host: The host of the TCP server.
+        :type host: :class:`str <python:str>`
+
+        :param port: The port of the TCP server; ``0`` picks a free port,
+            which can then be found in :attr:`address`.
+        :type port: :class:`int <python:int>`
+
+        :param path: The path of a Unix socket to listen on instead of a TCP
+            port.
+        :type path: :class:`str <python:str>`
+
+        """
+        # get_running_loop is only available from Python 3.7; before then,
+        # get_event_loop returns the running loop within a coroutine
+        self._loop = getattr(
+            asyncio, 'get_running_loop', asyncio.get_event_loop)()
+        if self._workers:
+            await self._start_executor()
+
+        if path is not None:
+            self._server = await asyncio.start_unix_server(
+                self._handle_connection, path=path, limit=_MAX_LINE_LENGTH)
+        else:
+            self._server = await asyncio.start_server(
+                self._handle_connection, host, port, limit=_MAX_LINE_LENGTH)
+
+    async def close(self):
+        """Stop listening for connections and shut down the worker pool."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        self._loop = None
+
+    async def _start_executor(self):
+        """Start a pool of worker processes."""
+        # start the worker processes before they are needed, rather than on
+        # demand as requests are offloaded
+        self._executor = _new_executor(self._workers)
+        await asyncio.gather(*(
+            self._loop.run_in_executor(self._executor, _start_worker)
+            for _ in range(self._workers)))
+
+    async def handle_request(self, request):
+        """Answer a single decoded request.
+
+        :param request: The decoded JSON request.
+        :type request: Dict
+
+        :returns: The JSON-serializable response to the request.
+        :rtype: Dict
+
+        """
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            result = await self._dispatch(request)
+        except Exception as e:
+            return {'id': request_id, 'ok': False, 'error': _error_as_dict(e)}
+
+        return {'id': request_id, 'ok': True, 'result': result}
+
+    async def _dispatch(self, request):
+        """Compute the result of a request."""
+        if not isinstance(request, dict):
+            raise InvalidArgumentTypeError('Requests must be JSON objects')
+
+        op = request.get('op')
+        func = _OPS.get(op) if isinstance(op, str) else None
+        if func is None:
+            raise InvalidArgumentValueError('Unknown op "{}"'.format(op))
+
+        expr = request.get('expr')
+        if not isinstance(expr, str):
+            raise InvalidArgumentTypeError('`expr` must be a string')
+
+        if op == 'sat' and self._solver_timeout is not None:
+            request = _with_solver_timeout(request, self._solver_timeout)
+
+        b = self._get_expression(expr)
+        if self._executor is not None and _is_expensive(op, b):
+            if op == 'transform':
+                # fail fast on unknown transformations
+                _get_transformation(request)
+
+            executor = self._executor
+            try:
+                return await self._loop.run_in_executor(
+                    executor, _run_in_worker, op, b.postfix_tokens, request)
+            except BrokenProcessPool:
+                # a worker died, taking the pool with it; replace the pool
+                # once, however many requests were running in it
+                if self._executor is executor:
+                    executor.shutdown(wait=False)
+                    await self._start_executor()
+                raise
+
+        return func(b, request)
+
+    def _get_expression(self, expr):
+        """Get the parsed expression for some text, using the cache."""
+        b = self._cache.pop(expr, None)
+        if b is None:
+            self._misses += 1
+            b = BooleanExpression(expr)
+        else:
+            self._hits += 1
+
+        if self._cache_size:
+            self._cache[expr] = b
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+        return b
+
+    async def _handle_connection(self, reader, writer):
+        """Serve the requests arriving on a connection."""
+        lock = asyncio.Lock()
+        semaphore = asyncio.Semaphore(_MAX_PENDING_REQUESTS)
+        pending = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    error = InvalidArgumentValueError(
+                        'Requests must be at most {} bytes long'.format(
+                            _MAX_LINE_LENGTH))
+                    await self._write_response(
+                        writer, lock,
+                        {'id': None, 'ok': False,
+                         'error': _error_as_dict(error)})
+                    break
+
+                if not line:
+                    break
+                elif not line.strip():
+                    continue
+
+                await semaphore.acquire()
+                task = asyncio.ensure_future(
+                    self._respond(line, writer, lock, semaphore))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            if pending:
+                await asyncio.wait(pending)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, line, writer, lock, semaphore):
+        """Answer one line of a connection."""
+        try:
+            try:
+                request = json.loads(line.decode('utf-8'))
+            except ValueError:
+                error = InvalidArgumentValueError('Request is not valid JSON')
+                response = {
+                    'id': None, 'ok': False, 'error': _error_as_dict(error)}
+            else:
+                response = await self.handle_request(request)
+
+            await self._write_response(writer, lock, response)
+        except ConnectionError:
+            pass
+        finally:
+            semaphore.release()
+
+    async def _write_response(self, writer, lock, response):
+        """Write a response to a connection."""
+        async with lock:
+            writer.write(json.dumps(response).encode('utf-8') + b'\n')
+            await writer.drain()
+
+
+def serve(host='127.0.0.1', port=0, path=None, workers=None,
+          cache_size=_DEFAULT_CACHE_SIZE, solver_timeout=None, on_start=None):
+    """Run an :class:`EvaluationServer` until interrupted.
+
+    :param on_start: A function called with the server once it is listening.
+    :type on_start: Callable
+
+    See :class:`EvaluationServer` and :meth:`EvaluationServer.start` for the
+    remaining parameters.
+
+    """
+    server = EvaluationServer(workers=workers, cache_size=cache_size,
+                              solver_timeout=solver_timeout)
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(server.start(host, port, path))
+    except BaseException:
+        loop.run_until_complete(server.close())
+        loop.close()
+        raise
+
+    try:
+        if on_start is not None:
+            on_start(server)
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.run_until_complete(server.close())
+        loop.close()
+        if path is not None and os.path.exists(path):
+            os.remove(path)
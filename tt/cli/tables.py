@@ -0,0 +1,99 @@
+"""Streaming truth table output formats for the command-line interface."""
+
+import json
+
+from tt.errors import NoEvaluationVariationError
+from tt.tables import TruthTable
+
+
+TABLE_FORMATS = ('table', 'csv', 'jsonl', 'bits')
+"""The names of the output formats supported by the ``table`` command."""
+
+_ROWS_PER_CHUNK = 4096
+
+
+def iter_table_chunks(b, fmt):
+    """Iterate over the chunks of text making up a formatted truth table.
+
+    Apart from the default ``'table'`` format, rows are evaluated as the
+    chunks are consumed, so neither the results of the table nor its full
+    text are ever held in memory; each chunk holds the text of at most
+    ``_ROWS_PER_CHUNK`` rows. The formats are:
+
+    * ``csv``, a header row of the expression's symbols followed by
+      ``result``, and one row of ``0`` and ``1`` values per input combination.
+    * ``jsonl``, one JSON object per input combination, of the form
+      ``{"inputs": {"A": 0, "B": 1}, "result": 1}``.
+    * ``bits``, the results in order of their input combinations, as a
+      single line of ``0`` and ``1`` characters; this is the form accepted by
+      the ``from_values`` argument of :class:`TruthTable \
+      <tt.tables.truth_table.TruthTable>`.
+
+    :param b: The expression whose truth table is formatted.
+    :type b: :class:`BooleanExpression \
+        <tt.expressions.bexpr.BooleanExpression>`
+
+    :param fmt: One of the names in :data:`TABLE_FORMATS`.
+    :type fmt: :class:`str <python:str>`
+
+    :returns: An iterator of strings, each ending with a newline.
+    :rtype: Iterator[:class:`str <python:str>`]
+
+    :raises NoEvaluationVariationError: If the expression is composed only of
+        constant values.
+
+    """
+    if fmt == 'table':
+        return iter([str(TruthTable(b)) + '\n'])
+
+    symbols = b.symbols
+    if not symbols:
+        raise NoEvaluationVariationError(
+            'This expression is composed only of constant values')
+
+    if fmt == 'bits':
+        return _iter_bits_chunks(b)
+    elif fmt == 'csv':
+        header = ','.join(symbols + ['result']) + '\n'
+        row_template = ','.join(['%d'] * (len(symbols) + 1)) + '\n'
+    else:
+        header = ''
+        row_template = (
+            '{"inputs": {' +
+            ', '.join(json.dumps(symbol) + ': %d' for symbol in symbols) +
+            '}, "result": %d}\n')
+
+    return _iter_row_chunks(b, header, row_template)
+
+
+def _iter_results(b):
+    """Iterate over the input combinations and results of an expression."""
+    symbols = b.symbols
+    evaluate = b.tree.evaluate
+    for combo in TruthTable.input_combos(len(symbols)):
+        yield combo, evaluate(dict(zip(symbols, combo)))
+
+
+def _iter_row_chunks(b, header, row_template):
+    """Iterate over chunks of rows, each formatted with a template."""
+    rows = [header] if header else []
+    for combo, result in _iter_results(b):
+        rows.append(row_template % (combo + (result,)))
+        if len(rows) >= _ROWS_PER_CHUNK:
+            yield ''.join(rows)
+            rows = []
+
+    if rows:
+        yield ''.join(rows)
+
+
+def _iter_bits_chunks(b):
+    """Iterate over chunks of the result bits of an expression."""
+    bits = []
+    for _, result in _iter_results(b):
+        bits.append('1' if result else '0')
+        if len(bits) >= _ROWS_PER_CHUNK:
+            yield ''.join(bits)
+            bits = []
+
+    yield ''.join(bits) + '\n'
@@ -5,6 +5,7 @@ from .arguments import ArgumentError  # noqa
 from .base import TtError  # noqa
 from .evaluation import EvaluationError  # noqa
 from .grammar import GrammarError  # noqa
+from .solver import SolverError  # noqa
 from .state import StateError  # noqa
 from .symbols import SymbolError  # noqa
 
@@ -19,10 +20,13 @@ from .evaluation import(  # noqa
     NoEvaluationVariationError)
 from .grammar import (  # noqa
     BadParenPositionError,
+    DimacsFormatError,
     EmptyExpressionError,
     ExpressionOrderError,
     InvalidIdentifierError,
     UnbalancedParenError)
+from .solver import (  # noqa
+    SolverLimitError)
 from .state import (  # noqa
     AlreadyConstrainedSymbolError,
     AlreadyFullTableError,
@@ -55,6 +55,23 @@ class BadParenPositionError(GrammarError):
     """
 
 
+class DimacsFormatError(GrammarError):
+    """An exception type for malformed DIMACS CNF input.
+
+    The offending line is stored in :data:`expr_str \
+    <tt.errors.grammar.GrammarError.expr_str>`. Here's an example with a bad
+    literal::
+
+        >>> from io import StringIO
+        >>> from tt.satisfiability import dimacs
+        >>> clauses = list(dimacs.iter_clauses(StringIO(u'p cnf 2 1\\n1 x 0')))
+        Traceback (most recent call last):
+            ...
+        tt.errors.grammar.DimacsFormatError: Invalid literal on line 2
+
+    """
+
+
 class EmptyExpressionError(GrammarError):
     """An exception type for when an empty expression is received.
 
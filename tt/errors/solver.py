@@ -0,0 +1,38 @@
+"""Exception type definitions related to the SAT solver."""
+
+from .base import TtError
+
+
+class SolverError(TtError):
+    """An exception type for errors occurring in the SAT solver. This exception
+    type should be sub-classed and is not meant to be raised explicitly.
+
+    """
+
+
+class SolverLimitError(SolverError):
+    """An exception type for when the solver gives up on a search.
+
+    This occurs when a search reaches one of the resource limits (a decision
+    limit, propagation limit, or timeout) before it could determine whether a
+    solution exists. Here's an example with a deliberately tiny limit::
+
+        >>> from tt import BooleanExpression
+        >>> b = BooleanExpression('(A or B) and (C or D)')
+        >>> b.sat_one(decision_limit=1)
+        Traceback (most recent call last):
+            ...
+        tt.errors.solver.SolverLimitError: PicoSAT search reached its \
+decision limit
+
+    The work the solver did before giving up is kept in the ``stats``
+    attribute of the error, as the :class:`SolverStats \
+    <tt.satisfiability.picosat.SolverStats>` of the abandoned search (or, for
+    the iterators of :func:`sat_all <tt.satisfiability.picosat.sat_all>`, of
+    all of the iterator's searches). It is ``None`` for calls to
+    :func:`picosat.sat_one <tt.satisfiability.picosat.sat_one>` that did not
+    collect statistics.
+
+    """
+
+    stats = None
@@ -1,3 +1,11 @@
 """Tools for working with Boolean expressions."""
 
 from .bexpr import BooleanExpression  # noqa
+from .clause_set import ClauseSet  # noqa
+from .cost import (  # noqa
+    CostProfile,
+    CostThresholds,
+    DEFAULT_COST_THRESHOLDS,
+    ENGINE_BOUNDED_CNF,
+    ENGINE_CNF,
+    ENGINE_TRUTH_TABLE)
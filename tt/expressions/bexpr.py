@@ -1,5 +1,6 @@
 """Tools for interacting with Boolean expressions."""
 
+import itertools
 import re
 
 from contextlib import contextmanager
@@ -20,11 +21,16 @@ from tt.errors import (
     BadParenPositionError,
     EmptyExpressionError,
     ExpressionOrderError,
+    ExtraSymbolError,
     InvalidArgumentTypeError,
     InvalidArgumentValueError,
     InvalidIdentifierError,
     NoEvaluationVariationError,
+    SolverLimitError,
     UnbalancedParenError)
+from tt.expressions.clause_set import ClauseSet
+from tt.expressions.cost import CostProfile
+from tt.instrumentation import recorder as _instrumentation
 from tt.satisfiability import (
     picosat)
 from tt.trees import (
@@ -34,6 +40,11 @@ from tt.trees import (
     UnaryOperatorExpressionTreeNode)
 
 
+# the values of the symbols in partial solutions, by their value in the
+# batches produced by picosat.sat_all
+_PARTIAL_VALUES = {1: True, -1: False, 0: None}
+
+
 class BooleanExpression(object):
 
     """An interface for interacting with a Boolean expression.
@@ -110,99 +121,140 @@ class BooleanExpression(object):
 
         self._symbols = []
         self._symbol_set = set()
-        self._tokens = []
-        self._postfix_tokens = []
+        self._symbol_vals_factory_cache = None
 
         if isinstance(expr, str):
+            self._tokens = []
+            self._postfix_tokens = []
             self._init_from_str(expr)
+            self._tree = ExpressionTreeNode.build_tree(self._postfix_tokens)
         elif isinstance(expr, ExpressionTreeNode):
             self._init_from_expr_node(expr)
 
-        self._symbol_vals_factory = boolean_variables_factory(self._symbols)
-        self._tree = ExpressionTreeNode.build_tree(self._postfix_tokens)
         self._constraints = {}
         self._constrained_symbol_set = set()
+        self._cnf_clause_set = None
+        self._dnf_clause_set = None
+        self._solver_stats = picosat.SolverStats()
 
     def _init_from_expr_node(self, expr_node):
-        """Initalize this object from an expression node."""
-        self._raw_expr = ''
+        """Initalize this object from an expression node.
 
-        with self._symbol_set_includes_constant_values():
-            self._init_from_expr_node_recursive_helper(expr_node)
+        Trees are immutable, so the passed tree is adopted as this expression's
+        tree. The string and token representations of the expression are only
+        generated from it when first accessed.
 
-    def _init_from_expr_node_recursive_helper(self, expr_node, parent=None):
-        """Recursive helper for initializing from an expression node.
+        """
+        self._tree = expr_node
+        self._raw_expr = None
+        self._tokens = None
+        self._postfix_tokens = None
+
+        # collect symbols in order of appearance, from left to right
+        stack = [expr_node]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, OperandExpressionTreeNode):
+                operand_str = node.symbol_name
+                if (operand_str not in self._symbol_set and
+                        operand_str not in CONSTANT_VALUES):
+                    self._symbols.append(operand_str)
+                    self._symbol_set.add(operand_str)
+            else:
+                if node.r_child is not None:
+                    stack.append(node.r_child)
+                stack.append(node.l_child)
 
-        This method will populate the ``_symbols``, ``_symbol_set``,
-        ``_postfix_tokens``, ``_tokens``, and ``_raw_expr`` attributes of this
-         object.
+    def _ensure_serialized(self):
+        """Generate the string and token representations of the tree."""
+        if self._raw_expr is not None:
+            return
 
-        """
-        if isinstance(expr_node, OperandExpressionTreeNode):
-            operand_str = expr_node.symbol_name
-
-            self._tokens.append(operand_str)
-            self._postfix_tokens.append(operand_str)
-            self._raw_expr += operand_str
-            if operand_str not in self._symbol_set:
-                self._symbols.append(operand_str)
-                self._symbol_set.add(operand_str)
-        elif isinstance(expr_node, UnaryOperatorExpressionTreeNode):
-            operator_str = expr_node.symbol_name
-
-            self._tokens.append(operator_str)
-
-            self._raw_expr += operator_str
-            if operator_str not in SYMBOLIC_OPERATOR_MAPPING:
-                self._raw_expr += ' '
-
-            self._init_from_expr_node_recursive_helper(
-                expr_node.l_child, parent=expr_node)
-            self._postfix_tokens.append(operator_str)
-        elif isinstance(expr_node, BinaryOperatorExpressionTreeNode):
-            operator_str = expr_node.symbol_name
-            include_parens = True
-
-            if parent is None:
-                include_parens = False
-            elif isinstance(parent, BinaryOperatorExpressionTreeNode):
-                this_operator = OPERATOR_MAPPING[operator_str]
-                parent_operator = OPERATOR_MAPPING[parent.symbol_name]
-                if (expr_node is parent.r_child and
-                        this_operator == parent_operator):
-                    include_parens = False
-                elif (expr_node is parent.l_child and
-                        this_operator == parent_operator and
-                        (parent.r_child.is_really_unary or
-                            this_operator == parent.r_child.operator)):
-                    include_parens = False
-
-            if include_parens:
-                self._tokens.append('(')
-                self._raw_expr += '('
-
-            self._init_from_expr_node_recursive_helper(
-                expr_node.l_child, parent=expr_node)
-
-            self._tokens.append(operator_str)
-            self._raw_expr += (' ' + operator_str + ' ')
-
-            self._init_from_expr_node_recursive_helper(
-                expr_node.r_child, parent=expr_node)
-
-            if include_parens:
-                self._tokens.append(')')
-                self._raw_expr += ')'
-
-            self._postfix_tokens.append(operator_str)
+        tokens = []
+        postfix_tokens = []
+        raw_expr_parts = []
+
+        # the stack holds nodes still to be visited, as (node, parent,
+        # is_r_child) tuples, interleaved with the strings to emit after a
+        # node's children have been visited, as (token, raw_expr_part,
+        # postfix_token) tuples
+        stack = [(self._tree, None, False)]
+        while stack:
+            item = stack.pop()
+            if not isinstance(item[0], ExpressionTreeNode):
+                token, raw_expr_part, postfix_token = item
+                if token is not None:
+                    tokens.append(token)
+                    raw_expr_parts.append(raw_expr_part)
+                if postfix_token is not None:
+                    postfix_tokens.append(postfix_token)
+                continue
+
+            expr_node, parent, is_r_child = item
+            if isinstance(expr_node, OperandExpressionTreeNode):
+                operand_str = expr_node.symbol_name
+
+                tokens.append(operand_str)
+                postfix_tokens.append(operand_str)
+                raw_expr_parts.append(operand_str)
+            elif isinstance(expr_node, UnaryOperatorExpressionTreeNode):
+                operator_str = expr_node.symbol_name
+
+                tokens.append(operator_str)
+
+                raw_expr_parts.append(operator_str)
+                if operator_str not in SYMBOLIC_OPERATOR_MAPPING:
+                    raw_expr_parts.append(' ')
+
+                stack.append((None, None, operator_str))
+                stack.append((expr_node.l_child, expr_node, False))
+            elif isinstance(expr_node, BinaryOperatorExpressionTreeNode):
+                operator_str = expr_node.symbol_name
+                include_parens = self._needs_parens(
+                    expr_node, parent, is_r_child)
+
+                if include_parens:
+                    tokens.append('(')
+                    raw_expr_parts.append('(')
+
+                stack.append((None, None, operator_str))
+                if include_parens:
+                    stack.append((')', ')', None))
+                stack.append((expr_node.r_child, expr_node, True))
+                stack.append((operator_str, ' ' + operator_str + ' ', None))
+                stack.append((expr_node.l_child, expr_node, False))
+
+        self._tokens = tokens
+        self._postfix_tokens = postfix_tokens
+        self._raw_expr = ''.join(raw_expr_parts)
+
+    @staticmethod
+    def _needs_parens(expr_node, parent, is_r_child):
+        """Whether a binary node must be parenthesized when serialized."""
+        if parent is None:
+            return False
+        elif isinstance(parent, BinaryOperatorExpressionTreeNode):
+            this_operator = OPERATOR_MAPPING[expr_node.symbol_name]
+            parent_operator = OPERATOR_MAPPING[parent.symbol_name]
+            if is_r_child and this_operator == parent_operator:
+                return False
+            elif (not is_r_child and
+                    this_operator == parent_operator and
+                    (parent.r_child.is_really_unary or
+                        this_operator == parent.r_child.operator)):
+                return False
+
+        return True
 
     def _init_from_str(self, raw_expr_str):
         """Initalize this object from a raw expression string."""
         self._raw_expr = raw_expr_str.strip()
 
         with self._symbol_set_includes_constant_values():
-            self._tokenize()
-            self._to_postfix()
+            with _instrumentation.phase('tokenize'):
+                self._tokenize()
+            with _instrumentation.phase('to_postfix'):
+                self._to_postfix()
 
     @property
     def is_cnf(self):
@@ -258,7 +310,11 @@ class BooleanExpression(object):
             >>> b.raw_expr
             'A nand B'
 
+        For expressions built from a tree, this string is generated from the
+        tree the first time it is needed.
+
         """
+        self._ensure_serialized()
         return self._raw_expr
 
     @property
@@ -294,6 +350,7 @@ class BooleanExpression(object):
             ['A', 'xor', '(', 'B', 'or', 'C', ')']
 
         """
+        self._ensure_serialized()
         return self._tokens
 
     @property
@@ -310,6 +367,7 @@ class BooleanExpression(object):
             ['A', 'B', 'C', 'or', 'xor']
 
         """
+        self._ensure_serialized()
         return self._postfix_tokens
 
     @property
@@ -333,6 +391,34 @@ class BooleanExpression(object):
         """
         return self._tree
 
+    @property
+    def solver_stats(self):
+        """The work done by the solver over this expression's SAT calls.
+
+        Statistics are added up over every search run by :func:`sat_one`,
+        including searches abandoned at a limit, and every search run by the
+        iterators of :func:`sat_all`; an iterator's searches are added once it
+        is exhausted, closed, or raises an error. Calls answered without
+        running the solver, such as when every symbol is constrained, add
+        nothing.
+
+        :type: :class:`SolverStats <tt.satisfiability.picosat.SolverStats>`
+
+        .. code-block:: python
+
+            >>> from tt import BooleanExpression
+            >>> b = BooleanExpression('(A or B) and (~A or ~B)')
+            >>> b.solver_stats.searches == 0
+            True
+            >>> solutions = list(b.sat_all())
+            >>> b.sat_one() is not None
+            True
+            >>> b.solver_stats.searches == 4
+            True
+
+        """
+        return self._solver_stats
+
     def __eq__(self, other):
         if isinstance(other, BooleanExpression):
             return self._tree == other._tree
@@ -343,10 +429,18 @@ class BooleanExpression(object):
         return not (self == other)
 
     def __str__(self):
-        return self._raw_expr
+        return self.raw_expr
 
     def __repr__(self):
-        return '<BooleanExpression "{}">'.format(self._raw_expr)
+        return '<BooleanExpression "{}">'.format(self.raw_expr)
+
+    @property
+    def _symbol_vals_factory(self):
+        """The type of the values produced by satisfiability methods."""
+        if self._symbol_vals_factory_cache is None:
+            self._symbol_vals_factory_cache = boolean_variables_factory(
+                self._symbols)
+        return self._symbol_vals_factory_cache
 
     @contextmanager
     def constrain(self, **kwargs):
@@ -418,7 +512,8 @@ class BooleanExpression(object):
         self._constrained_symbol_set -= kwarg_key_set
         self._constraints = {}
 
-    def sat_one(self):
+    def sat_one(self, decision_limit=None, propagation_limit=None,
+                timeout=None):
         """Find a combination of inputs that satisfies this expression.
 
         Under the hood, this method is using the functionality exposed in tt's
@@ -447,6 +542,18 @@ class BooleanExpression(object):
             ...
             True
 
+        :param decision_limit: The maximum number of decisions the solver may
+            make; unlimited if omitted.
+        :type decision_limit: :class:`int <python:int>`, optional
+
+        :param propagation_limit: The maximum number of propagations the solver
+            may perform; unlimited if omitted.
+        :type propagation_limit: :class:`int <python:int>`, optional
+
+        :param timeout: The maximum number of (wall clock) seconds the solver
+            may spend; unlimited if omitted.
+        :type timeout: :class:`float <python:float>`, optional
+
         :returns: :func:`namedtuple <python:collections.namedtuple>`-like
             object representing a satisfying set of values (see
             :func:`boolean_variables_factory \
@@ -458,6 +565,9 @@ class BooleanExpression(object):
 
         :raises NoEvaluationVariationError: If this is an expression of only
             constants.
+        :raises SolverLimitError: If the solver gives up after reaching one of
+            the limits; see :func:`picosat.sat_one \
+            <tt.satisfiability.picosat.sat_one>` for more information.
 
         """
         if not self._symbols:
@@ -471,21 +581,31 @@ class BooleanExpression(object):
             else:
                 return None
 
-        clauses, assumptions, symbol_to_index_map, index_to_symbol_map = \
-            self._to_picosat_clauses_assumptions_and_symbol_mappings()
-        if not assumptions:
-            # cannot pass empty list of assumptions to picosat
-            assumptions = None
+        clauses, assumptions, symbol_to_index_map = \
+            self._to_picosat_clauses_assumptions_and_symbol_mapping()
+        if clauses is None:
+            return None
 
-        picosat_result = picosat.sat_one(clauses, assumptions=assumptions)
+        try:
+            picosat_result, stats = picosat.sat_one(
+                clauses, assumptions=assumptions,
+                decision_limit=decision_limit,
+                propagation_limit=propagation_limit, timeout=timeout,
+                stats=True)
+        except SolverLimitError as e:
+            self._solver_stats += e.stats
+            raise
+
+        self._solver_stats += stats
         if picosat_result is None:
             return None
 
-        result_dict = self._picosat_result_as_dict(
-            picosat_result, symbol_to_index_map, index_to_symbol_map)
-        return self._symbol_vals_factory(**result_dict)
+        return self._symbol_vals_factory._make(
+            [picosat_result[symbol_to_index_map[symbol_str] - 1] > 0 for
+             symbol_str in self._symbols])
 
-    def sat_all(self):
+    def sat_all(self, project=None, batch_size=None, decision_limit=None,
+                propagation_limit=None, timeout=None):
         """Find all combinations of inputs that satisfy this expression.
 
         Under the hood, this method is using the functionality exposed in tt's
@@ -511,101 +631,265 @@ class BooleanExpression(object):
             ...
             A=1, B=0, C=0, D=1
 
+        When only the values of some of the symbols are of interest, the
+        solutions can be projected onto those symbols. Each distinct
+        combination of the projected symbols' values is then produced exactly
+        once::
+
+            >>> for solution in b.sat_all(project=['A', 'B']):
+            ...     print(solution)
+            ...
+            A=1, B=0
+            A=0, B=1
+
+        For expressions with many solutions, the batched mode is much faster.
+        The solver then finds partial solutions, in which the symbols whose
+        values do not matter are ``None``; every completion of a partial
+        solution satisfies the expression, and no two partial solutions cover
+        the same solution. Lists of up to ``batch_size`` partial solutions are
+        produced at a time (this mode requires Python 3)::
+
+            >>> b = BooleanExpression('A or B or C')
+            >>> for batch in b.sat_all(batch_size=8):  # doctest: +SKIP
+            ...     for solution in batch:
+            ...         print(solution)
+            ...
+            A=1, B=None, C=None
+            A=0, B=1, C=None
+            A=0, B=0, C=1
+
+        :param project: The names of the symbols onto which solutions should be
+            projected; if omitted, solutions will include all symbols in this
+            expression.
+        :type project: List[:class:`str <python:str>`], optional
+
+        :param batch_size: If specified, lists of up to this many partial
+            solutions will be produced at a time, rather than single
+            solutions; see :func:`picosat.sat_all \
+            <tt.satisfiability.picosat.sat_all>` for more information.
+        :type batch_size: :class:`int <python:int>`, optional
+
+        :param decision_limit: The maximum number of decisions the solver may
+            make in each search for a solution; unlimited if omitted.
+        :type decision_limit: :class:`int <python:int>`, optional
+
+        :param propagation_limit: The maximum number of propagations the solver
+            may perform in each search for a solution; unlimited if omitted.
+        :type propagation_limit: :class:`int <python:int>`, optional
+
+        :param timeout: The maximum number of (wall clock) seconds the solver
+            may spend in each search for a solution; unlimited if omitted.
+        :type timeout: :class:`float <python:float>`, optional
+
         :returns: An iterator of
             :func:`namedtuple <python:collections.namedtuple>`-like objects
-            representing satisfying combinations of inputs; if no satisfying
+            representing satisfying combinations of inputs, or of lists of
+            them when ``batch_size`` is specified; if no satisfying
             solutions exist, the iterator will be empty.
         :rtype: Iterator[:func:`namedtuple <python:collections.namedtuple>`
             -like objects]
 
+        :raises ExtraSymbolError: If a symbol not in this expression is passed
+            through ``project``.
+        :raises InvalidArgumentTypeError: If ``project`` is not a list of
+            strings, or ``batch_size`` is not an int.
+        :raises InvalidArgumentValueError: If ``project`` is an empty list,
+            ``batch_size`` is less than 1, or ``batch_size`` is specified on
+            Python 2.
         :raises NoEvaluationVariationError: If this is an expression of only
             constants.
+        :raises SolverLimitError: From the iterator, if the solver gives up
+            after reaching one of the limits; see :func:`picosat.sat_all \
+            <tt.satisfiability.picosat.sat_all>` for more information.
 
         """
         if not self._symbols:
             raise NoEvaluationVariationError(
                 'Cannot attempt to satisfy an expression of only constants')
 
+        if project is None:
+            vals_factory = self._symbol_vals_factory
+        else:
+            project = self._ordered_projected_symbols(project)
+            vals_factory = boolean_variables_factory(project)
+
         if not (self._symbol_set - self._constrained_symbol_set):
             # shortcut if all symbols are constrained
             if self.evaluate_unchecked(**self._constraints):
-                yield self._symbol_vals_factory(**self._constraints)
+                vals = vals_factory(
+                    **{symbol_str: self._constraints[symbol_str] for
+                       symbol_str in vals_factory._fields})
+                yield vals if batch_size is None else [vals]
             else:
                 # empty iterator
                 while False:
                     yield None
             return
 
-        clauses, assumptions, symbol_to_index_map, index_to_symbol_map = \
-            self._to_picosat_clauses_assumptions_and_symbol_mappings()
-        if not assumptions:
-            # cannot pass empty list of assumptions to picosat
-            assumptions = None
-
-        for picosat_sol in picosat.sat_all(clauses, assumptions=assumptions):
-            result_dict = self._picosat_result_as_dict(
-                picosat_sol, symbol_to_index_map, index_to_symbol_map)
-            yield self._symbol_vals_factory(**result_dict)
-
-    def _picosat_result_as_dict(self, results, symbol_to_index_map,
-                                index_to_symbol_map):
-        """Convert a PicoSAT result into a BooleanValues tuple."""
-        result_dict = {}
-        signed_symbol_indices = (index for index in results if abs(index) in
-                                 index_to_symbol_map)
-        for index in signed_symbol_indices:
-            symbol_name = index_to_symbol_map[abs(index)]
-            result_dict[symbol_name] = index > 0
-
-        return result_dict
-
-    def _to_picosat_clauses_assumptions_and_symbol_mappings(self):
-        """Return a PicoSAT-compatible representation and helpful metadata."""
-        cnf_tree = self.tree if self.is_cnf else self.tree.to_cnf()
-        index = 1
-        symbol_to_index_map = {}
-        index_to_symbol_map = {}
-        clauses = []
-        assumptions = []
+        clauses, assumptions, symbol_to_index_map = \
+            self._to_picosat_clauses_assumptions_and_symbol_mapping()
+        if clauses is None:
+            return
 
-        for clause_root in cnf_tree.iter_cnf_clauses():
-            clause_indices = []
-            for node in clause_root.iter_dnf_clauses():
-                is_negated = isinstance(node, UnaryOperatorExpressionTreeNode)
-                symbol_str = (node.l_child.symbol_name if is_negated else
-                              node.symbol_name)
-
-                if symbol_str in symbol_to_index_map:
-                    pos = symbol_to_index_map[symbol_str]
-                    if is_negated:
-                        clause_indices.append(-pos)
-                    else:
-                        clause_indices.append(pos)
-                elif symbol_str == '0':
-                    clause_indices.append(index)
-                    if is_negated:
-                        assumptions.append(index)
-                    else:
-                        assumptions.append(-index)
-                    index += 1
-                elif symbol_str == '1':
-                    clause_indices.append(index)
-                    if is_negated:
-                        assumptions.append(-index)
-                    else:
-                        assumptions.append(index)
-                    index += 1
-                else:
-                    symbol_to_index_map[symbol_str] = index
-                    index_to_symbol_map[index] = symbol_str
-                    if is_negated:
-                        clause_indices.append(-index)
-                    else:
-                        clause_indices.append(index)
-                    index += 1
+        picosat_project = None
+        if project is not None:
+            picosat_project = sorted(
+                symbol_to_index_map[symbol_str] for symbol_str in project)
+
+        # picosat solutions hold the literal for variable index i at position
+        # i - 1, so the values can be read out directly in field order
+        positions = [symbol_to_index_map[symbol_str] - 1 for symbol_str in
+                     vals_factory._fields]
+        make_vals = vals_factory._make
+        sol_iter = picosat.sat_all(
+            clauses, assumptions=assumptions, project=picosat_project,
+            batch_size=batch_size, decision_limit=decision_limit,
+            propagation_limit=propagation_limit, timeout=timeout)
+        try:
+            if batch_size is None:
+                for picosat_sol in sol_iter:
+                    yield make_vals(
+                        [picosat_sol[pos] > 0 for pos in positions])
+            else:
+                for batch in sol_iter:
+                    yield [make_vals([_PARTIAL_VALUES[row[pos]] for
+                                      pos in positions]) for
+                           row in batch.tolist()]
+        finally:
+            self._solver_stats += sol_iter.stats
+
+    def _ordered_projected_symbols(self, project):
+        """Validate symbols to project onto, ordered by symbol appearance."""
+        if (not isinstance(project, list) or
+                not all(isinstance(elt, str) for elt in project)):
+            raise InvalidArgumentTypeError('project must be a list of strings')
+        elif not project:
+            raise InvalidArgumentValueError('project cannot be empty')
+
+        project_set = set(project)
+        for symbol_str in project:
+            if symbol_str not in self._symbol_set:
+                raise ExtraSymbolError(
+                    '"{}" is not a symbol in this expression'.format(
+                        symbol_str))
+
+        return [symbol_str for symbol_str in self._symbols if
+                symbol_str in project_set]
+
+    def cost_profile(self):
+        """Estimate the cost of working with this expression.
+
+        The metrics are gathered in a single walk of this expression's tree,
+        which is not transformed, so a profile is cheap to get even for
+        expressions that would be very costly to convert or solve::
+
+            >>> from tt import BooleanExpression
+            >>> b = BooleanExpression('(A xor B) -> ~(C or D)')
+            >>> profile = b.cost_profile()
+            >>> profile.num_nodes, profile.depth, profile.num_symbols
+            (8, 3, 4)
+            >>> profile.num_xors, profile.num_xnors, profile.num_impls
+            (1, 0, 1)
+            >>> profile.estimated_cnf_clauses, profile.estimated_table_size
+            (8.0, 16)
+
+        The profile's thresholds then help to pick the engine to solve the
+        expression with; see :func:`CostProfile.choose_engine \
+        <tt.expressions.cost.CostProfile.choose_engine>`.
+
+        :returns: The metrics of this expression.
+        :rtype: :class:`CostProfile <tt.expressions.cost.CostProfile>`
+
+        """
+        (num_nodes, depth, num_xors, num_xnors, num_impls, cnf_clauses,
+         _) = self._tree._cost_metrics()
+        num_symbols = len(self._symbols)
+        return CostProfile(num_nodes, depth, num_symbols, num_xors,
+                           num_xnors, num_impls, cnf_clauses,
+                           2 ** num_symbols)
+
+    def to_clause_set(self, is_cnf=True):
+        """Get the clauses of this expression in a normal form.
+
+        The expression is converted to CNF or DNF (if it is not already in it)
+        the first time this method is called for that form, and the result is
+        re-used for subsequent calls and, for CNF, satisfiability checks.
 
-            clauses.append(clause_indices)
+        Here's a simple example::
 
+            >>> from tt import BooleanExpression
+            >>> b = BooleanExpression('(A or ~B) and (B or 0)')
+            >>> cs = b.to_clause_set()
+            >>> cs.symbols
+            ['A', 'B']
+            >>> [list(clause) for clause in cs]
+            [[1, -2], [2]]
+            >>> [list(clause) for clause in b.to_clause_set(is_cnf=False)]
+            [[1, 2]]
+
+        :param is_cnf: Whether to get the clauses in conjunctive normal form;
+            if ``False``, disjunctive normal form is used.
+        :type is_cnf: :class:`bool <python:bool>`, optional
+
+        :returns: The clauses of this expression, with its constant operands
+            simplified away.
+        :rtype: :class:`ClauseSet <tt.expressions.clause_set.ClauseSet>`
+
+        """
+        if is_cnf:
+            if self._cnf_clause_set is None:
+                cnf_tree = self._tree if self.is_cnf else self._tree.to_cnf()
+                self._cnf_clause_set = ClauseSet.from_tree(cnf_tree)
+            return self._cnf_clause_set
+
+        if self._dnf_clause_set is None:
+            dnf_tree = self._tree if self.is_dnf else self._tree.to_dnf()
+            self._dnf_clause_set = ClauseSet.from_tree(dnf_tree, is_cnf=False)
+        return self._dnf_clause_set
+
+    def _to_picosat_clauses_assumptions_and_symbol_mapping(self):
+        """Return a PicoSAT-compatible representation of this expression.
+
+        The clauses are ``None`` if they can never be satisfied. Constrained
+        symbols are represented as assumptions, which are ``None`` (as PicoSAT
+        requires) rather than an empty list.
+
+        """
+        clause_set = self.to_clause_set()
+        if clause_set.has_empty_clause:
+            return None, None, None
+
+        symbol_to_index_map = self._picosat_symbol_to_index_map(clause_set)
+        clauses = clause_set
+        if len(symbol_to_index_map) > len(clause_set.symbols):
+            # symbols were eliminated in the CNF transformation, but they still
+            # need (free) variables in the solver, which are introduced by a
+            # tautology over the highest index
+            max_index = len(symbol_to_index_map)
+            clauses = itertools.chain(clause_set, [[max_index, -max_index]])
+
+        assumptions = self._picosat_assumptions(symbol_to_index_map)
+        return clauses, assumptions or None, symbol_to_index_map
+
+    def _picosat_symbol_to_index_map(self, clause_set):
+        """Map each symbol in this expression to a PicoSAT variable index.
+
+        Symbols in the passed clause set keep their literal indices, and any
+        symbols eliminated from it follow them.
+
+        """
+        symbol_to_index_map = dict(
+            (symbol_str, i) for i, symbol_str in
+            enumerate(clause_set.symbols, start=1))
+        for symbol_str in self._symbols:
+            if symbol_str not in symbol_to_index_map:
+                symbol_to_index_map[symbol_str] = len(symbol_to_index_map) + 1
+
+        return symbol_to_index_map
+
+    def _picosat_assumptions(self, symbol_to_index_map):
+        """Get the PicoSAT assumptions for this expression's constraints."""
+        assumptions = []
         for symbol_str, assumed_val in self._constraints.items():
             index = symbol_to_index_map[symbol_str]
             if assumed_val:
@@ -613,7 +897,7 @@ class BooleanExpression(object):
             else:
                 assumptions.append(-index)
 
-        return clauses, assumptions, symbol_to_index_map, index_to_symbol_map
+        return assumptions
 
     def evaluate(self, **kwargs):
         """Evaluate the Boolean expression for the passed keyword arguments.
@@ -0,0 +1,449 @@
+"""A compact representation of the clauses of normal form expressions."""
+
+import heapq
+
+from array import array
+
+from tt.definitions import (
+    CONSTANT_VALUES,
+    TT_AND_OP,
+    TT_NOT_OP,
+    TT_OR_OP)
+from tt.errors import (
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError,
+    RequiresNormalFormError)
+from tt.instrumentation import recorder as _instrumentation
+from tt.trees import (
+    OperandExpressionTreeNode,
+    UnaryOperatorExpressionTreeNode)
+from tt.trees.tree_node import _join_right
+
+
+class ClauseSet(object):
+
+    """The clauses of an expression in conjunctive or disjunctive normal form.
+
+    Each clause is stored as a run of integer literals within a single
+    :class:`array <python:array.array>`, with a second array recording the
+    offset at which each clause begins. A literal ``i`` refers to the ``i``-th
+    symbol in :attr:`symbols` (counting from 1), and ``-i`` to its negation.
+    This mirrors the representation used by SAT solvers, so a clause set can be
+    passed straight to the functions in the :mod:`satisfiability.picosat \
+    <tt.satisfiability.picosat>` module.
+
+    Clause sets are usually produced from expressions, via
+    :func:`BooleanExpression.to_clause_set \
+    <tt.expressions.bexpr.BooleanExpression.to_clause_set>` or
+    :func:`from_tree`::
+
+        >>> from tt import BooleanExpression
+        >>> cs = BooleanExpression('(A or ~B) and (B or C)').to_clause_set()
+        >>> cs.symbols
+        ['A', 'B', 'C']
+        >>> [list(clause) for clause in cs]
+        [[1, -2], [2, 3]]
+
+    They can also be built directly from lists of literals, and are converted
+    back to an expression only when one is requested::
+
+        >>> from tt import ClauseSet
+        >>> cs = ClauseSet(['A', 'B'], [[1, 2], [-1]])
+        >>> cs.bexpr
+        <BooleanExpression "(A or B) and not A">
+
+    Constant operands are simplified away as a clause set is built from a
+    tree, so a clause that can never be satisfied is stored as an empty
+    clause, and an expression that is always true has no clauses at all.
+
+    :param symbols: The names of the symbols referred to by the literals.
+    :type symbols: List[:class:`str <python:str>`]
+
+    :param clauses: The clauses, each an iterable of non-zero ints.
+    :type clauses: Iterable[Iterable[:class:`int <python:int>`]]
+
+    :param is_cnf: Whether the clauses are joined in conjunctive normal form
+        (an *AND* of *ORs*); if ``False``, they are joined in disjunctive
+        normal form (an *OR* of *ANDs*).
+    :type is_cnf: :class:`bool <python:bool>`, optional
+
+    :raises InvalidArgumentTypeError: If ``symbols`` is not a list of strings
+        or a clause contains something other than ints.
+    :raises InvalidArgumentValueError: If a literal is zero or refers to a
+        symbol outside of ``symbols``.
+
+    """
+
+    def __init__(self, symbols, clauses, is_cnf=True):
+        if (not isinstance(symbols, list) or
+                not all(isinstance(elt, str) for elt in symbols)):
+            raise InvalidArgumentTypeError('symbols must be a list of strings')
+
+        self._symbols = list(symbols)
+        self._is_cnf = bool(is_cnf)
+        self._literals = array('i')
+        self._offsets = array('l', [0])
+        self._bexpr = None
+
+        try:
+            for clause in clauses:
+                self._literals.extend(clause)
+                self._offsets.append(len(self._literals))
+        except TypeError:
+            raise InvalidArgumentTypeError(
+                'clauses must be an iterable of iterables of ints')
+
+        num_symbols = len(self._symbols)
+        for literal in self._literals:
+            if not literal or abs(literal) > num_symbols:
+                raise InvalidArgumentValueError(
+                    'Literal {} does not refer to a symbol'.format(literal))
+
+    @classmethod
+    def from_tree(cls, root, is_cnf=True):
+        """Build a clause set from a tree in normal form.
+
+        Symbols are numbered in the order in which they first appear in the
+        clauses of the tree.
+
+        :param root: The root of a tree in conjunctive (or, if ``is_cnf`` is
+            ``False``, disjunctive) normal form.
+        :type root: :class:`ExpressionTreeNode \
+            <tt.trees.tree_node.ExpressionTreeNode>`
+
+        :param is_cnf: Whether to read the tree's clauses in conjunctive
+            normal form, rather than disjunctive normal form.
+        :type is_cnf: :class:`bool <python:bool>`, optional
+
+        :returns: The clauses of the tree.
+        :rtype: :class:`ClauseSet`
+
+        :raises RequiresNormalFormError: If the tree is not in the requested
+            normal form.
+
+        """
+        if is_cnf and not root.is_cnf:
+            raise RequiresNormalFormError(
+                'Must be in conjunctive normal form to build CNF clauses')
+        elif not is_cnf and not root.is_dnf:
+            raise RequiresNormalFormError(
+                'Must be in disjunctive normal form to build DNF clauses')
+
+        outer_op, inner_op = \
+            (TT_AND_OP, TT_OR_OP) if is_cnf else (TT_OR_OP, TT_AND_OP)
+
+        symbols = []
+        symbol_to_index_map = {}
+        clauses = []
+        with _instrumentation.phase('clause_set'):
+            for clause_root in root._flatten(outer_op):
+                clause_literals = []
+                for node in clause_root._flatten(inner_op):
+                    is_negated = isinstance(
+                        node, UnaryOperatorExpressionTreeNode)
+                    symbol_str = (node._l_child.symbol_name if is_negated
+                                  else node.symbol_name)
+
+                    if symbol_str not in CONSTANT_VALUES:
+                        clause_literals.append((symbol_str, is_negated))
+                    elif ((symbol_str == '1') != is_negated) == is_cnf:
+                        # a true literal satisfies a whole CNF clause, and a
+                        # false literal falsifies a whole DNF clause
+                        break
+                else:
+                    clause = []
+                    for symbol_str, is_negated in clause_literals:
+                        index = symbol_to_index_map.get(symbol_str)
+                        if index is None:
+                            symbols.append(symbol_str)
+                            index = symbol_to_index_map[symbol_str] = \
+                                len(symbols)
+                        clause.append(-index if is_negated else index)
+                    clauses.append(clause)
+
+            clause_set = cls(symbols, clauses, is_cnf=is_cnf)
+
+        if _instrumentation.enabled:
+            _instrumentation.count('clauses', len(clause_set))
+            _instrumentation.count('variables', len(symbols))
+        return clause_set
+
+    @property
+    def symbols(self):
+        """The names of the symbols referred to by this set's literals.
+
+        The literal ``i`` refers to ``symbols[i - 1]``.
+
+        :type: List[:class:`str <python:str>`]
+
+        """
+        return self._symbols
+
+    @property
+    def is_cnf(self):
+        """Whether this set's clauses are joined in conjunctive normal form.
+
+        :type: :class:`bool <python:bool>`
+
+        """
+        return self._is_cnf
+
+    @property
+    def is_dnf(self):
+        """Whether this set's clauses are joined in disjunctive normal form.
+
+        :type: :class:`bool <python:bool>`
+
+        """
+        return not self._is_cnf
+
+    @property
+    def literals(self):
+        """The literals of every clause in this set, stored end to end.
+
+        :type: :class:`array <python:array.array>`
+
+        """
+        return self._literals
+
+    @property
+    def offsets(self):
+        """The offsets into :attr:`literals` at which each clause begins.
+
+        There is one more offset than there are clauses; the final offset is
+        the total number of literals.
+
+        :type: :class:`array <python:array.array>`
+
+        """
+        return self._offsets
+
+    @property
+    def has_empty_clause(self):
+        """Whether this set contains a clause without any literals.
+
+        An empty clause can never be satisfied in conjunctive normal form, and
+        is always satisfied in disjunctive normal form.
+
+        :type: :class:`bool <python:bool>`
+
+        """
+        offsets = self._offsets
+        return any(offsets[i] == offsets[i + 1] for i in range(len(self)))
+
+    @property
+    def tree(self):
+        """An expression tree equivalent to this clause set.
+
+        :type: :class:`ExpressionTreeNode \
+            <tt.trees.tree_node.ExpressionTreeNode>`
+
+        """
+        return self.bexpr.tree
+
+    @property
+    def bexpr(self):
+        """An expression equivalent to this clause set.
+
+        The expression is built the first time it is requested.
+
+        :type: :class:`BooleanExpression \
+            <tt.expressions.bexpr.BooleanExpression>`
+
+        """
+        if self._bexpr is None:
+            # imported here, as expressions themselves build clause sets
+            from tt.expressions.bexpr import BooleanExpression
+            self._bexpr = BooleanExpression(self._build_tree())
+
+        return self._bexpr
+
+    def simplify(self):
+        """Return an equivalent, simplified clause set.
+
+        The following equivalence-preserving simplifications are applied until
+        none of them changes the clauses any further:
+
+        * Duplicate literals within a clause, duplicate clauses, and clauses
+          containing both a literal and its negation are removed.
+        * *Subsumption*: a clause containing every literal of another clause
+          is removed.
+        * *Self-subsuming resolution*: if a clause would subsume another were
+          one of its literals negated, that negated literal is removed from
+          the other clause.
+        * *Unit propagation*: as a special case of the above, a single-literal
+          clause removes every other clause containing its literal, and the
+          negation of its literal from every clause.
+
+        The descriptions above are for CNF, but each simplification applies
+        equally to the terms of a DNF. Here's an example::
+
+            >>> from tt import ClauseSet
+            >>> cs = ClauseSet(['A', 'B', 'C'],
+            ...                [[1, 2], [1, 2, 3], [-1, 2], [-2, 3]])
+            >>> [list(clause) for clause in cs.simplify()]
+            [[2], [3]]
+
+        If a clause ends up without any literals, it is the only clause
+        returned.
+
+        :returns: A new clause set, over the same symbols as this one.
+        :rtype: :class:`ClauseSet`
+
+        """
+        clauses, sigs = [], []
+        for clause in self:
+            literals = list(_unique(clause))
+            literal_set = set(literals)
+            if not any(-literal in literal_set for literal in literals):
+                clauses.append(literals)
+                sigs.append(_signature(literals))
+
+        # occurrence lists of the clauses containing each literal
+        occurrences = {}
+        for i, literals in enumerate(clauses):
+            for literal in literals:
+                occurrences.setdefault(literal, set()).add(i)
+
+        # clauses are processed from shortest to longest, so unit clauses are
+        # propagated first; strengthened clauses are pushed again with their
+        # new length, and their old entries skipped
+        heap = [(len(literals), i) for i, literals in enumerate(clauses)]
+        heapq.heapify(heap)
+        while heap:
+            length, i = heapq.heappop(heap)
+            literals = clauses[i]
+            if literals is None or len(literals) != length:
+                continue
+            elif not literals:
+                return ClauseSet(self._symbols, [[]], is_cnf=self._is_cnf)
+
+            # any clause this one subsumes or strengthens contains one of the
+            # polarities of each of its literals; check the rarest
+            literal = min(
+                literals,
+                key=lambda lit: (len(occurrences[lit]) +
+                                 len(occurrences.get(-lit, ()))))
+            candidates = (occurrences[literal] |
+                          occurrences.get(-literal, set()))
+            candidates.discard(i)
+
+            sig = sigs[i]
+            for j in candidates:
+                other_literals = clauses[j]
+                if other_literals is None or len(other_literals) < length:
+                    continue
+
+                other_sig = sigs[j]
+                missing = sig & ~other_sig
+                if not missing:
+                    # subsumption
+                    for other_literal in other_literals:
+                        occurrences[other_literal].discard(j)
+                    clauses[j] = None
+                elif not missing & (missing - 1):
+                    # a single literal is missing; if its negation is in the
+                    # other clause, that negation can be removed from it
+                    negated_bit = (missing.bit_length() - 1) ^ 1
+                    if other_sig >> negated_bit & 1:
+                        negated_literal = _literal(negated_bit)
+                        other_literals.remove(negated_literal)
+                        occurrences[negated_literal].discard(j)
+                        sigs[j] = other_sig & ~(1 << negated_bit)
+                        heapq.heappush(heap, (len(other_literals), j))
+
+        return ClauseSet(
+            self._symbols,
+            (literals for literals in clauses if literals is not None),
+            is_cnf=self._is_cnf)
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __iter__(self):
+        literals, offsets = self._literals, self._offsets
+        for i in range(len(self)):
+            yield literals[offsets[i]:offsets[i + 1]]
+
+    def __eq__(self, other):
+        if not isinstance(other, ClauseSet):
+            return NotImplemented
+
+        return (self._is_cnf == other._is_cnf and
+                self._symbols == other._symbols and
+                self._literals == other._literals and
+                self._offsets == other._offsets)
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def __repr__(self):
+        return '<ClauseSet ({}) of {} clause{} over {} symbol{}>'.format(
+            'CNF' if self._is_cnf else 'DNF',
+            len(self), '' if len(self) == 1 else 's',
+            len(self._symbols), '' if len(self._symbols) == 1 else 's')
+
+    def _build_tree(self):
+        """Build an expression tree from this set's clauses."""
+        not_str = TT_NOT_OP.default_plain_english_str
+        and_str = TT_AND_OP.default_plain_english_str
+        or_str = TT_OR_OP.default_plain_english_str
+        outer_str, inner_str = \
+            (and_str, or_str) if self._is_cnf else (or_str, and_str)
+
+        # the values of an empty clause and of an empty set of clauses
+        empty_clause_str, empty_set_str = \
+            ('0', '1') if self._is_cnf else ('1', '0')
+
+        symbols = self._symbols
+        clause_roots = []
+        for clause in self:
+            literal_nodes = []
+            for literal in clause:
+                node = OperandExpressionTreeNode(symbols[abs(literal) - 1])
+                if literal < 0:
+                    node = UnaryOperatorExpressionTreeNode(not_str, node)
+                literal_nodes.append(node)
+
+            clause_roots.append(
+                _join_right(inner_str, literal_nodes) if literal_nodes else
+                OperandExpressionTreeNode(empty_clause_str))
+
+        if not clause_roots:
+            return OperandExpressionTreeNode(empty_set_str)
+
+        return _join_right(outer_str, clause_roots)
+
+
+def _signature(literals):
+    """Get the bit set of a collection of literals.
+
+    Bit ``2 * (i - 1)`` of a signature stands for the literal ``i``, and the
+    following bit for ``-i``, so signatures are exact representations of
+    (duplicate-free) clauses.
+
+    """
+    sig = 0
+    for literal in literals:
+        sig |= 1 << _bit_index(literal)
+    return sig
+
+
+def _bit_index(literal):
+    """Get the position of a literal's bit within a signature."""
+    return 2 * (abs(literal) - 1) + (literal < 0)
+
+
+def _literal(bit_index):
+    """Get the literal represented by a bit position within a signature."""
+    index = (bit_index >> 1) + 1
+    return -index if bit_index & 1 else index
+
+
+def _unique(literals):
+    """Yield each distinct literal, in order of first appearance."""
+    seen = set()
+    for literal in literals:
+        if literal not in seen:
+            seen.add(literal)
+            yield literal
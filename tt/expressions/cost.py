@@ -0,0 +1,152 @@
+"""Static estimates of the cost of working with an expression."""
+
+from collections import namedtuple
+
+
+ENGINE_TRUTH_TABLE = 'truth_table'
+"""The engine of enumerating every input combination in a truth table.
+
+:type: :class:`str <python:str>`
+
+"""
+
+ENGINE_CNF = 'to_cnf'
+"""The engine of converting to CNF by distribution and running the solver.
+
+This is the engine behind :func:`BooleanExpression.sat_one \
+<tt.expressions.bexpr.BooleanExpression.sat_one>` and :func:`sat_all \
+<tt.expressions.bexpr.BooleanExpression.sat_all>`.
+
+:type: :class:`str <python:str>`
+
+"""
+
+ENGINE_BOUNDED_CNF = 'to_bounded_cnf'
+"""The engine of converting to CNF within a budget and running the solver.
+
+See :func:`to_bounded_cnf <tt.transformations.bexpr.to_bounded_cnf>`; the
+result only preserves satisfiability, but its size grows linearly with the
+expression.
+
+:type: :class:`str <python:str>`
+
+"""
+
+
+class CostThresholds(namedtuple('CostThresholds', [
+        'max_table_size', 'max_cnf_clauses'])):
+
+    """The largest workloads considered cheap enough for each engine.
+
+    :param max_table_size: The largest number of rows a truth table may have.
+    :type max_table_size: :class:`int <python:int>`, optional
+
+    :param max_cnf_clauses: The largest number of clauses that converting to
+        CNF by distribution may produce.
+    :type max_cnf_clauses: :class:`int <python:int>`, optional
+
+    """
+
+    __slots__ = ()
+
+
+CostThresholds.__new__.__defaults__ = (2**16, 10**4)
+
+DEFAULT_COST_THRESHOLDS = CostThresholds()
+"""The thresholds used when none are specified.
+
+:type: :class:`CostThresholds`
+
+"""
+
+
+class CostProfile(namedtuple('CostProfile', [
+        'num_nodes', 'depth', 'num_symbols', 'num_xors', 'num_xnors',
+        'num_impls', 'estimated_cnf_clauses', 'estimated_table_size'])):
+
+    """Static metrics of an expression, predicting the cost of its engines.
+
+    Profiles are produced by :func:`BooleanExpression.cost_profile \
+    <tt.expressions.bexpr.BooleanExpression.cost_profile>`. The fields are:
+
+    * ``num_nodes``, the number of nodes in the expression's tree;
+    * ``depth``, the number of operators on the longest path from the root of
+      the tree to an operand;
+    * ``num_symbols``, the number of distinct symbols;
+    * ``num_xors``, ``num_xnors``, and ``num_impls``, the numbers of *XOR*,
+      *XNOR*, and *IMPL* operators, which are the ones that grow the most
+      when converted to primitive operators;
+    * ``estimated_cnf_clauses``, the number of clauses that distributing *ORs*
+      over *ANDs* would produce before any simplification, as a
+      :class:`float <python:float>` that is infinite when too large to
+      represent; this is an upper bound, and for expressions that are already
+      in CNF it is exact;
+    * ``estimated_table_size``, the number of rows in the expression's truth
+      table.
+
+    """
+
+    __slots__ = ()
+
+    def fits_truth_table(self, thresholds=None):
+        """Whether a truth table of the expression is within the thresholds.
+
+        :param thresholds: The thresholds to check against; defaults to
+            :data:`DEFAULT_COST_THRESHOLDS`.
+        :type thresholds: :class:`CostThresholds`, optional
+
+        :rtype: :class:`bool <python:bool>`
+
+        """
+        thresholds = thresholds or DEFAULT_COST_THRESHOLDS
+        return self.estimated_table_size <= thresholds.max_table_size
+
+    def fits_cnf(self, thresholds=None):
+        """Whether converting to CNF by distribution is within the thresholds.
+
+        :param thresholds: The thresholds to check against; defaults to
+            :data:`DEFAULT_COST_THRESHOLDS`.
+        :type thresholds: :class:`CostThresholds`, optional
+
+        :rtype: :class:`bool <python:bool>`
+
+        """
+        thresholds = thresholds or DEFAULT_COST_THRESHOLDS
+        return self.estimated_cnf_clauses <= thresholds.max_cnf_clauses
+
+    def choose_engine(self, thresholds=None):
+        """Choose the cheapest engine for finding the expression's solutions.
+
+        A truth table is chosen when it is small enough, as it answers every
+        question about the expression at once; otherwise, conversion to CNF
+        by distribution, if it stays within the clause threshold; and
+        otherwise bounded conversion to CNF, which never blows up::
+
+            >>> from tt import BooleanExpression
+            >>> from tt.expressions import CostThresholds
+            >>> b = BooleanExpression('A xor B xor C xor D')
+            >>> b.cost_profile().choose_engine()
+            'truth_table'
+            >>> thresholds = CostThresholds(max_table_size=8)
+            >>> b.cost_profile().choose_engine(thresholds)
+            'to_cnf'
+            >>> thresholds = CostThresholds(max_table_size=8,
+            ...                             max_cnf_clauses=100)
+            >>> b.cost_profile().choose_engine(thresholds)
+            'to_bounded_cnf'
+
+        :param thresholds: The thresholds deciding between engines; defaults
+            to :data:`DEFAULT_COST_THRESHOLDS`.
+        :type thresholds: :class:`CostThresholds`, optional
+
+        :returns: One of :data:`ENGINE_TRUTH_TABLE`, :data:`ENGINE_CNF`, or
+            :data:`ENGINE_BOUNDED_CNF`.
+        :rtype: :class:`str <python:str>`
+
+        """
+        if self.fits_truth_table(thresholds):
+            return ENGINE_TRUTH_TABLE
+        elif self.fits_cnf(thresholds):
+            return ENGINE_CNF
+        else:
+            return ENGINE_BOUNDED_CNF
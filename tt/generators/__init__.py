@@ -0,0 +1,12 @@
+"""Generators of random and structured workloads for stress and benchmarks."""
+
+from .cnf import (  # noqa
+    CnfInstance,
+    parity_chain,
+    pigeonhole,
+    random_ksat,
+    ripple_carry_adder)
+from .expressions import (  # noqa
+    DEFAULT_OPERATORS,
+    iter_random_expression,
+    random_expression)
@@ -0,0 +1,392 @@
+"""Generators of CNF problem instances.
+
+Each generator returns a :class:`CnfInstance`, whose clauses are produced
+anew each time it is iterated over, rather than stored. Instances of any size
+can therefore be written to DIMACS files, converted to expression text, or
+passed to the solver while only ever holding one clause in memory.
+
+"""
+
+import random
+
+from itertools import combinations, product
+
+from tt._assertions import assert_int_at_least
+from tt.errors import (
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError)
+from tt.expressions import BooleanExpression
+from tt.satisfiability import dimacs
+
+
+class CnfInstance(object):
+
+    """A re-iterable stream of CNF clauses over numbered variables.
+
+    Clauses are lists of non-zero ints in the same form used by the
+    :mod:`picosat <tt.satisfiability.picosat>` and :mod:`dimacs \
+    <tt.satisfiability.dimacs>` modules, where ``i`` is the ``i``-th
+    variable and ``-i`` its negation. In expression form, the ``i``-th
+    variable is the symbol ``x<i>``::
+
+        >>> from tt.generators import pigeonhole
+        >>> instance = pigeonhole(1)
+        >>> instance
+        <CnfInstance [2 variables, 3 clauses]>
+        >>> list(instance)
+        [[1], [2], [-1, -2]]
+        >>> print(instance.to_expression())
+        (x1) and (x2) and (~x1 or ~x2)
+
+    :param num_vars: The number of variables of the instance.
+    :type num_vars: :class:`int <python:int>`
+
+    :param num_clauses: The number of clauses ``clause_factory`` produces.
+    :type num_clauses: :class:`int <python:int>`
+
+    :param clause_factory: A function returning a new iterator over the
+        clauses of the instance each time it is called.
+    :type clause_factory: Callable
+
+    """
+
+    def __init__(self, num_vars, num_clauses, clause_factory):
+        self._num_vars = num_vars
+        self._num_clauses = num_clauses
+        self._clause_factory = clause_factory
+
+    @property
+    def num_vars(self):
+        """The number of variables of this instance.
+
+        :type: :class:`int <python:int>`
+
+        """
+        return self._num_vars
+
+    @property
+    def num_clauses(self):
+        """The number of clauses of this instance.
+
+        :type: :class:`int <python:int>`
+
+        """
+        return self._num_clauses
+
+    def __iter__(self):
+        return iter(self._clause_factory())
+
+    def __repr__(self):
+        return '<CnfInstance [{} variables, {} clauses]>'.format(
+            self._num_vars, self._num_clauses)
+
+    def iter_expression_text(self):
+        """Iterate over the text of this instance as an expression.
+
+        Each chunk holds one clause, along with the ``and`` joining it to the
+        previous one; the chunks joined together make up the whole
+        expression.
+
+        :returns: An iterator of strings.
+        :rtype: Iterator[:class:`str <python:str>`]
+
+        """
+        for i, clause in enumerate(self):
+            yield '{}({})'.format(' and ' if i else '', ' or '.join(
+                'x{}'.format(lit) if lit > 0 else '~x{}'.format(-lit)
+                for lit in clause))
+
+    def to_expression(self):
+        """Build this instance as an expression.
+
+        Unlike the other ways of consuming an instance, the expression holds
+        all of its clauses at once.
+
+        :returns: The expression, with the ``i``-th variable as ``x<i>``.
+        :rtype: :class:`BooleanExpression \
+            <tt.expressions.bexpr.BooleanExpression>`
+
+        """
+        return BooleanExpression(''.join(self.iter_expression_text()))
+
+    def write_dimacs(self, f, comments=None):
+        """Write this instance to a DIMACS CNF file, one clause at a time.
+
+        :param f: The path of the file to write, or a writable text-mode file
+            object.
+        :type f: :class:`str <python:str>` or file object
+
+        :param comments: Lines of comments to write before the problem line.
+        :type comments: Iterable[:class:`str <python:str>`], optional
+
+        Here's an example::
+
+            >>> import sys
+            >>> from tt.generators import parity_chain
+            >>> parity_chain(2).write_dimacs(sys.stdout)
+            p cnf 3 5
+            -1 -2 -3 0
+            1 2 -3 0
+            1 -2 3 0
+            -1 2 3 0
+            3 0
+
+        """
+        dimacs.write_clauses(f, iter(self), num_vars=self._num_vars,
+                             num_clauses=self._num_clauses, comments=comments)
+
+
+def random_ksat(num_vars, ratio=4.26, k=3, seed=None):
+    """Generate a uniform random k-SAT instance.
+
+    Each of the ``round(ratio * num_vars)`` clauses holds ``k`` distinct
+    variables chosen uniformly at random, each negated with probability one
+    half. For 3-SAT, instances near the default ratio of ``4.26`` are the
+    hardest to solve, with those well below it almost always satisfiable and
+    those well above it almost always unsatisfiable::
+
+        >>> from tt.generators import random_ksat
+        >>> instance = random_ksat(100, ratio=2, seed=1)
+        >>> instance.num_clauses
+        200
+        >>> list(instance) == list(instance)
+        True
+
+    :param num_vars: The number of variables.
+    :type num_vars: :class:`int <python:int>`
+
+    :param ratio: The ratio of clauses to variables.
+    :type ratio: :class:`float <python:float>`, optional
+
+    :param k: The number of literals in each clause.
+    :type k: :class:`int <python:int>`, optional
+
+    :param seed: The seed of the random clauses; if omitted, one is chosen at
+        random. Either way, each iteration over the instance produces the
+        same clauses.
+    :type seed: :class:`int <python:int>`, optional
+
+    :returns: The instance.
+    :rtype: :class:`CnfInstance`
+
+    :raises InvalidArgumentTypeError: If ``num_vars`` or ``k`` is not an
+        integer, or ``ratio`` is not a number.
+    :raises InvalidArgumentValueError: If ``num_vars`` or ``k`` is less than
+        one, ``k`` exceeds ``num_vars``, or ``ratio`` is negative.
+
+    """
+    assert_int_at_least('num_vars', num_vars, 1)
+    assert_int_at_least('k', k, 1)
+    if k > num_vars:
+        raise InvalidArgumentValueError('`k` must not exceed `num_vars`')
+
+    if isinstance(ratio, bool) or not isinstance(ratio, (int, float)):
+        raise InvalidArgumentTypeError('`ratio` must be a number')
+    elif ratio < 0:
+        raise InvalidArgumentValueError('`ratio` must be non-negative')
+
+    if seed is None:
+        seed = random.randrange(1 << 32)
+    num_clauses = int(round(ratio * num_vars))
+
+    def iter_clauses():
+        rng = random.Random(seed)
+        variables = range(1, num_vars + 1)
+        for _ in range(num_clauses):
+            yield [var if rng.random() < 0.5 else -var
+                   for var in rng.sample(variables, k)]
+
+    return CnfInstance(num_vars, num_clauses, iter_clauses)
+
+
+def parity_chain(length, parity=True):
+    """Generate an instance constraining the parity of a chain of variables.
+
+    The instance is satisfied when an odd number (or an even number, if
+    ``parity`` is false) of the variables ``1`` to ``length`` are true. The
+    XOR of the chain is encoded with one extra variable per link, each
+    holding the XOR of the chain up to that point, so the instance grows
+    linearly with ``length``; the extra variables take the numbers following
+    the chain's own. Of the ``2 ** length`` assignments of the chain's
+    variables, half are solutions::
+
+        >>> from tt.generators import parity_chain
+        >>> from tt.satisfiability.picosat import sat_all
+        >>> instance = parity_chain(4)
+        >>> sum(1 for _ in sat_all(instance, project=[1, 2, 3, 4]))
+        8
+
+    :param length: The number of variables in the chain.
+    :type length: :class:`int <python:int>`
+
+    :param parity: Whether the XOR of the chain must be true or false.
+    :type parity: :class:`bool <python:bool>`, optional
+
+    :returns: The instance.
+    :rtype: :class:`CnfInstance`
+
+    :raises InvalidArgumentTypeError: If ``length`` is not an integer.
+    :raises InvalidArgumentValueError: If ``length`` is less than one.
+
+    """
+    assert_int_at_least('length', length, 1)
+
+    def iter_clauses():
+        prefix = 1
+        for i in range(2, length + 1):
+            link = length + i - 1
+            for clause in _xor_clauses(link, prefix, i):
+                yield clause
+            prefix = link
+
+        yield [prefix if parity else -prefix]
+
+    return CnfInstance(2 * length - 1, 4 * (length - 1) + 1, iter_clauses)
+
+
+def pigeonhole(holes, pigeons=None):
+    """Generate a pigeonhole principle instance.
+
+    The instance places each pigeon in at least one hole, with no two
+    pigeons sharing a hole; variable ``p * holes + h + 1`` means that pigeon
+    ``p`` sits in hole ``h``, counting both from zero. With more pigeons than
+    holes it is unsatisfiable, yet notoriously hard for resolution-based
+    solvers to prove so::
+
+        >>> from tt.generators import pigeonhole
+        >>> from tt.satisfiability.picosat import sat_one
+        >>> print(sat_one(pigeonhole(4)))
+        None
+        >>> sat_one(pigeonhole(4, pigeons=4)) is not None
+        True
+
+    :param holes: The number of holes.
+    :type holes: :class:`int <python:int>`
+
+    :param pigeons: The number of pigeons; defaults to one more than
+        ``holes``.
+    :type pigeons: :class:`int <python:int>`, optional
+
+    :returns: The instance.
+    :rtype: :class:`CnfInstance`
+
+    :raises InvalidArgumentTypeError: If ``holes`` or ``pigeons`` is not an
+        integer.
+    :raises InvalidArgumentValueError: If ``holes`` or ``pigeons`` is less
+        than one.
+
+    """
+    assert_int_at_least('holes', holes, 1)
+    if pigeons is None:
+        pigeons = holes + 1
+    assert_int_at_least('pigeons', pigeons, 1)
+
+    def var(pigeon, hole):
+        return pigeon * holes + hole + 1
+
+    def iter_clauses():
+        for pigeon in range(pigeons):
+            yield [var(pigeon, hole) for hole in range(holes)]
+        for hole in range(holes):
+            for first, second in combinations(range(pigeons), 2):
+                yield [-var(first, hole), -var(second, hole)]
+
+    num_clauses = pigeons + holes * (pigeons * (pigeons - 1) // 2)
+    return CnfInstance(pigeons * holes, num_clauses, iter_clauses)
+
+
+def ripple_carry_adder(num_bits, total=None):
+    """Generate an instance encoding a ripple-carry adder.
+
+    The instance relates two ``num_bits``-bit addends to their
+    ``num_bits + 1``-bit sum through a chain of full adders, with bits
+    ordered from least to most significant:
+
+    * variables ``1`` to ``num_bits`` are the bits of the first addend;
+    * variables ``num_bits + 1`` to ``2 * num_bits`` those of the second;
+    * variables ``2 * num_bits + 1`` to ``3 * num_bits + 1`` the carries
+      into each full adder, the first fixed false and the last being the most
+      significant bit of the sum;
+    * variables ``3 * num_bits + 2`` to ``4 * num_bits + 1`` the remaining
+      bits of the sum.
+
+    If ``total`` is given, the bits of the sum are fixed to it, leaving one
+    solution per pair of addends adding up to ``total``::
+
+        >>> from tt.generators import ripple_carry_adder
+        >>> from tt.satisfiability.picosat import sat_all
+        >>> instance = ripple_carry_adder(3, total=5)
+        >>> sum(1 for _ in sat_all(instance))
+        6
+
+    :param num_bits: The number of bits of each addend.
+    :type num_bits: :class:`int <python:int>`
+
+    :param total: The value the sum is fixed to.
+    :type total: :class:`int <python:int>`, optional
+
+    :returns: The instance.
+    :rtype: :class:`CnfInstance`
+
+    :raises InvalidArgumentTypeError: If ``num_bits`` or ``total`` is not an
+        integer.
+    :raises InvalidArgumentValueError: If ``num_bits`` is less than one, or
+        ``total`` is negative or too large to be a sum of ``num_bits + 1``
+        bits.
+
+    """
+    assert_int_at_least('num_bits', num_bits, 1)
+    if total is not None:
+        assert_int_at_least('total', total, 0)
+        if total >> (num_bits + 1):
+            raise InvalidArgumentValueError(
+                '`total` does not fit in {} bits'.format(num_bits + 1))
+
+    def iter_clauses():
+        first_carry = 2 * num_bits + 1
+        yield [-first_carry]
+        for i in range(num_bits):
+            a, b = i + 1, num_bits + i + 1
+            carry_in, carry_out = first_carry + i, first_carry + i + 1
+            for clause in _full_adder_clauses(
+                    a, b, carry_in, 3 * num_bits + 2 + i, carry_out):
+                yield clause
+
+        if total is not None:
+            sum_bits = list(range(3 * num_bits + 2, 4 * num_bits + 2))
+            sum_bits.append(3 * num_bits + 1)
+            for i, var in enumerate(sum_bits):
+                yield [var if (total >> i) & 1 else -var]
+
+    num_clauses = 1 + 14 * num_bits
+    if total is not None:
+        num_clauses += num_bits + 1
+    return CnfInstance(4 * num_bits + 1, num_clauses, iter_clauses)
+
+
+def _xor_clauses(out, a, b):
+    """Get the clauses constraining ``out`` to be ``a xor b``."""
+    return [[-a, -b, -out], [a, b, -out], [a, -b, out], [-a, b, out]]
+
+
+def _full_adder_clauses(a, b, carry_in, sum_bit, carry_out):
+    """Get the clauses of a full adder.
+
+    ``sum_bit`` is constrained to the XOR of the inputs, and ``carry_out`` to
+    their majority.
+
+    """
+    clauses = []
+    for signs in product((1, -1), repeat=3):
+        # the clause excluding this combination of inputs unless the sum bit
+        # matches their parity
+        lits = [-sign * var for sign, var in zip(signs, (a, b, carry_in))]
+        odd = signs.count(1) % 2
+        lits.append(sum_bit if odd else -sum_bit)
+        clauses.append(lits)
+
+    for x, y in combinations((a, b, carry_in), 2):
+        clauses.append([-x, -y, carry_out])
+        clauses.append([x, y, -carry_out])
+
+    return clauses
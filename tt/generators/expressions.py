@@ -0,0 +1,201 @@
+"""Generators of random Boolean expressions."""
+
+import bisect
+import random
+
+from tt._assertions import assert_int_at_least
+from tt.definitions import OPERATOR_MAPPING, TT_NOT_OP
+from tt.errors import (
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError)
+from tt.expressions import BooleanExpression
+
+
+DEFAULT_OPERATORS = ('and', 'or', 'xor', 'xnor', 'nand', 'nor', 'impl')
+"""The binary operators mixed into random expressions by default.
+
+:type: Tuple[:class:`str <python:str>`]
+
+"""
+
+
+def iter_random_expression(num_symbols, depth, operators=None,
+                           negation_probability=0.25, balanced=False,
+                           seed=None):
+    """Iterate over the text of a random expression.
+
+    The expression is a tree of binary operators exactly ``depth`` levels
+    deep, whose operands are drawn uniformly from the symbols ``x1`` to
+    ``x<num_symbols>``. Below each operator, one operand is a subtree one
+    level shallower and the other a subtree of random depth, unless
+    ``balanced`` is true, in which case every operand at the same level has
+    the same depth and the expression holds ``2 ** depth`` symbols. Every
+    operand, symbol or subtree, is negated with probability
+    ``negation_probability``, and every subtree is parenthesized.
+
+    The text is produced in small chunks as the tree is generated, holding
+    only the path from the root to the current operand in memory, so
+    expressions too large to parse can still be written to a file. Here's the
+    shape of a balanced expression::
+
+        >>> from tt.generators import iter_random_expression
+        >>> chunks = iter_random_expression(1, 2, operators=['and'],
+        ...                                 negation_probability=0,
+        ...                                 balanced=True)
+        >>> print(''.join(chunks))
+        (x1 and x1) and (x1 and x1)
+
+    :param num_symbols: The number of symbols operands are drawn from.
+    :type num_symbols: :class:`int <python:int>`
+
+    :param depth: The number of levels of binary operators.
+    :type depth: :class:`int <python:int>`
+
+    :param operators: The binary operators to draw from, as strings from
+        :data:`OPERATOR_MAPPING <tt.definitions.operators.OPERATOR_MAPPING>`;
+        either a collection of operators, drawn from uniformly, or a dict
+        mapping operators to their relative weights. Defaults to
+        :data:`DEFAULT_OPERATORS`.
+    :type operators: Iterable[:class:`str <python:str>`] or
+        Dict{:class:`str <python:str>`: :class:`float <python:float>`},
+        optional
+
+    :param negation_probability: The probability of negating each operand.
+    :type negation_probability: :class:`float <python:float>`, optional
+
+    :param balanced: Whether to generate a full tree of operators.
+    :type balanced: :class:`bool <python:bool>`, optional
+
+    :param seed: The seed of the random choices; expressions generated with
+        the same arguments and seed are the same.
+    :type seed: :class:`int <python:int>`, optional
+
+    :returns: An iterator of strings, which joined together make up the
+        expression.
+    :rtype: Iterator[:class:`str <python:str>`]
+
+    :raises InvalidArgumentTypeError: If ``num_symbols`` or ``depth`` is not
+        an integer, or ``operators`` is not made of strings with numeric
+        weights.
+    :raises InvalidArgumentValueError: If ``num_symbols`` is less than one,
+        ``depth`` is negative, ``operators`` is empty or holds a string that
+        is not a binary operator or a weight that is not positive, or
+        ``negation_probability`` is not between zero and one.
+
+    """
+    assert_int_at_least('num_symbols', num_symbols, 1)
+    assert_int_at_least('depth', depth, 0)
+    choose_operator = _operator_chooser(operators)
+    if not 0 <= negation_probability <= 1:
+        raise InvalidArgumentValueError(
+            '`negation_probability` must be between 0 and 1')
+
+    return _iter_random_expression(num_symbols, depth, choose_operator,
+                                   negation_probability, balanced,
+                                   random.Random(seed))
+
+
+def random_expression(num_symbols, depth, operators=None,
+                      negation_probability=0.25, balanced=False, seed=None):
+    """Generate a random expression.
+
+    See :func:`iter_random_expression` for a description of the arguments
+    and the expressions generated::
+
+        >>> from tt.generators import random_expression
+        >>> b = random_expression(4, 3, seed=0)
+        >>> set(b.symbols) <= {'x1', 'x2', 'x3', 'x4'}
+        True
+        >>> b.raw_expr == random_expression(4, 3, seed=0).raw_expr
+        True
+
+    :returns: The expression.
+    :rtype: :class:`BooleanExpression \
+        <tt.expressions.bexpr.BooleanExpression>`
+
+    """
+    return BooleanExpression(''.join(iter_random_expression(
+        num_symbols, depth, operators=operators,
+        negation_probability=negation_probability, balanced=balanced,
+        seed=seed)))
+
+
+def _operator_chooser(operators):
+    """Get a function drawing a random operator from a weighted mix."""
+    if operators is None:
+        operators = DEFAULT_OPERATORS
+    elif isinstance(operators, str):
+        raise InvalidArgumentTypeError(
+            '`operators` must be a collection of strings, not a string')
+
+    if isinstance(operators, dict):
+        weighted = sorted(operators.items())
+    else:
+        weighted = [(operator, 1) for operator in operators]
+
+    if not weighted:
+        raise InvalidArgumentValueError('`operators` must not be empty')
+
+    names, cumulative_weights, total = [], [], 0
+    for operator, weight in weighted:
+        if not isinstance(operator, str):
+            raise InvalidArgumentTypeError('operators must be strings')
+        elif OPERATOR_MAPPING.get(operator) in (None, TT_NOT_OP):
+            raise InvalidArgumentValueError(
+                '"{}" is not a binary operator'.format(operator))
+
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+            raise InvalidArgumentTypeError('operator weights must be numbers')
+        elif weight <= 0:
+            raise InvalidArgumentValueError(
+                'operator weights must be positive')
+
+        total += weight
+        names.append(operator)
+        cumulative_weights.append(total)
+
+    def choose(rng):
+        i = bisect.bisect_right(cumulative_weights, rng.random() * total)
+        return names[min(i, len(names) - 1)]
+
+    return choose
+
+
+def _iter_random_expression(num_symbols, depth, choose_operator,
+                            negation_probability, balanced, rng):
+    """Generate the chunks of a random expression.
+
+    Rather than recursing, which would be limited by Python's recursion
+    limit, the tree is generated from an explicit stack holding the chunks
+    and subtrees still to be produced, as strings and integer depths
+    respectively.
+
+    """
+    stack = [depth]
+    is_root = True
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+            continue
+
+        negated = rng.random() < negation_probability
+        prefix = '~' if negated else ''
+        if not item:
+            yield '{}x{}'.format(prefix, rng.randrange(num_symbols) + 1)
+            continue
+
+        if balanced:
+            left_depth = right_depth = item - 1
+        else:
+            left_depth, right_depth = item - 1, rng.randrange(item)
+            if rng.random() < 0.5:
+                left_depth, right_depth = right_depth, left_depth
+
+        operator = ' {} '.format(choose_operator(rng))
+        if is_root and not negated:
+            stack.extend((right_depth, operator, left_depth))
+        else:
+            stack.extend((')', right_depth, operator, left_depth))
+            yield prefix + '('
+        is_root = False
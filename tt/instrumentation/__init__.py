@@ -0,0 +1,10 @@
+"""Opt-in instrumentation of tt's hot paths."""
+
+from .recorder import (  # noqa
+    add_hook,
+    count,
+    instrument,
+    InstrumentationRecord,
+    phase,
+    record_timing,
+    remove_hook)
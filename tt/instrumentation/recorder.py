@@ -0,0 +1,306 @@
+"""Opt-in recording of the time spent in, and the work done by, tt's hot paths.
+
+Instrumentation is disabled by default. While it is, each instrumented phase
+or counter, including the count of each tree node allocated, costs a single
+check of the module-level :data:`enabled` flag. It is enabled for
+as long as an :func:`instrument` block is active or a hook added with
+:func:`add_hook` is registered.
+
+The phases timed by tt itself are:
+
+* ``tokenize`` and ``to_postfix``, parsing the text of an expression;
+* ``build_tree``, building an expression tree from postfix tokens;
+* ``to_cnf``, converting a tree to CNF by distribution (timings include the
+  ``to_primitives`` conversion it starts with);
+* ``clause_set``, collecting the clauses of a tree in normal form;
+* ``picosat.sat_one`` and ``picosat.sat_all``, running the solver; for
+  ``sat_all``, the time spent producing each solution is included.
+
+The counters incremented by tt itself are:
+
+* ``trees.nodes``, the expression tree nodes allocated;
+* ``to_cnf.iterations.<law>``, the passes made applying each law until it no
+  longer changes the tree, where ``<law>`` is the name of the tree method,
+  such as ``distribute_ors``;
+* ``clauses`` and ``variables``, the clauses and distinct symbols of the
+  clause sets built;
+* ``solver.calls`` and ``solver.solutions``, the calls made to the solver
+  and the solutions it produced (counting each partial solution of a batch
+  produced by :func:`picosat.sat_all <tt.satisfiability.picosat.sat_all>`).
+* ``solver.decisions``, ``solver.conflicts`` and ``solver.propagations``,
+  the work done by the solver in its searches (see
+  :class:`SolverStats <tt.satisfiability.picosat.SolverStats>`).
+
+Recording is not isolated per thread; activity on all threads is recorded
+while instrumentation is enabled.
+
+Results found in the memo of a transformation (see
+:class:`TransformationMemo <tt.trees.memo.TransformationMemo>`) are returned
+without redoing the work they save, so none of it is recorded;
+converting the same tree to CNF twice records the ``to_cnf`` phase and
+iteration counters only once. Clear the memos with
+:meth:`cache_clear <tt.trees.memo.TransformationMemo.cache_clear>` to
+measure a conversion from scratch.
+
+"""
+
+from contextlib import contextmanager
+
+from tt.errors import (
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError)
+
+try:
+    from time import perf_counter as _timer
+except ImportError:
+    from time import time as _timer
+
+
+enabled = False
+"""Whether instrumentation is currently enabled.
+
+Instrumented code checks this flag before doing any work to record an event,
+so it must be read from this module each time rather than imported by name.
+
+:type: :class:`bool <python:bool>`
+
+"""
+
+_records = []
+_hooks = []
+
+
+class InstrumentationRecord(object):
+
+    """The timings and counters recorded within an :func:`instrument` block.
+
+    Timings are inclusive; a phase running within another phase counts
+    towards the timings of both.
+
+    """
+
+    def __init__(self):
+        self._timings = {}
+        self._calls = {}
+        self._counters = {}
+
+    @property
+    def timings(self):
+        """The total time spent in each phase, in seconds.
+
+        :type: Dict{:class:`str <python:str>`: :class:`float <python:float>`}
+
+        """
+        return self._timings
+
+    @property
+    def calls(self):
+        """The number of times each phase was entered.
+
+        :type: Dict{:class:`str <python:str>`: :class:`int <python:int>`}
+
+        """
+        return self._calls
+
+    @property
+    def counters(self):
+        """The total of each counter.
+
+        :type: Dict{:class:`str <python:str>`: :class:`int <python:int>`}
+
+        """
+        return self._counters
+
+    def _add_timing(self, name, seconds):
+        self._timings[name] = self._timings.get(name, 0.0) + seconds
+        self._calls[name] = self._calls.get(name, 0) + 1
+
+    def _add_count(self, name, amount):
+        self._counters[name] = self._counters.get(name, 0) + amount
+
+    def __str__(self):
+        lines = []
+        for name in sorted(self._timings):
+            lines.append('{:<40} {:>12.6f}s {:>8} calls'.format(
+                name, self._timings[name], self._calls[name]))
+        for name in sorted(self._counters):
+            lines.append('{:<40} {:>13}'.format(name, self._counters[name]))
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return '<InstrumentationRecord [{} phases, {} counters]>'.format(
+            len(self._timings), len(self._counters))
+
+
+@contextmanager
+def instrument():
+    """Record the timings and counters of the code run within a block.
+
+    Blocks may be nested, in which case each records everything run within
+    it::
+
+        >>> from tt import BooleanExpression
+        >>> from tt.instrumentation import instrument
+        >>> with instrument() as record:
+        ...     b = BooleanExpression('(A or B) and ~C')
+        ...
+        >>> sorted(record.timings)
+        ['build_tree', 'to_postfix', 'tokenize']
+        >>> record.counters
+        {'trees.nodes': 6}
+
+    :returns: A context manager producing the record the block's activity is
+        added to.
+    :rtype: :class:`InstrumentationRecord`
+
+    """
+    record = InstrumentationRecord()
+    _records.append(record)
+    _update_enabled()
+    try:
+        yield record
+    finally:
+        _records.remove(record)
+        _update_enabled()
+
+
+def add_hook(hook):
+    """Register a function to be called with each instrumentation event.
+
+    The hook is called as ``hook(kind, name, value)``, where ``kind`` is
+    either ``'timing'``, with the time spent in the phase ``name`` in seconds
+    as ``value``, or ``'count'``, with the amount added to the counter
+    ``name`` as ``value``. Hooks run synchronously in the instrumented code,
+    so they should be quick::
+
+        >>> from tt import to_cnf
+        >>> from tt.instrumentation import add_hook, remove_hook
+        >>> def log_slow_conversions(kind, name, value):
+        ...     if kind == 'timing' and name == 'to_cnf' and value > 1:
+        ...         print('slow CNF conversion!')
+        ...
+        >>> add_hook(log_slow_conversions)
+        >>> b = to_cnf('A xor B')
+        >>> remove_hook(log_slow_conversions)
+
+    :param hook: The function to call.
+    :type hook: Callable
+
+    :raises InvalidArgumentTypeError: If ``hook`` is not callable.
+
+    """
+    if not callable(hook):
+        raise InvalidArgumentTypeError('hook must be callable')
+
+    _hooks.append(hook)
+    _update_enabled()
+
+
+def remove_hook(hook):
+    """Unregister a function registered with :func:`add_hook`.
+
+    :param hook: The function to unregister.
+    :type hook: Callable
+
+    :raises InvalidArgumentValueError: If ``hook`` is not registered.
+
+    """
+    try:
+        _hooks.remove(hook)
+    except ValueError:
+        raise InvalidArgumentValueError('hook is not registered')
+    finally:
+        _update_enabled()
+
+
+def count(name, amount=1):
+    """Add to a counter, if instrumentation is enabled.
+
+    :param name: The name of the counter.
+    :type name: :class:`str <python:str>`
+
+    :param amount: The amount to add.
+    :type amount: :class:`int <python:int>`, optional
+
+    """
+    if not enabled:
+        return
+
+    for record in _records:
+        record._add_count(name, amount)
+    for hook in list(_hooks):
+        hook('count', name, amount)
+
+
+def record_timing(name, seconds):
+    """Record time spent in a phase, if instrumentation is enabled.
+
+    :param name: The name of the phase.
+    :type name: :class:`str <python:str>`
+
+    :param seconds: The time spent in the phase.
+    :type seconds: :class:`float <python:float>`
+
+    """
+    if not enabled:
+        return
+
+    for record in _records:
+        record._add_timing(name, seconds)
+    for hook in list(_hooks):
+        hook('timing', name, seconds)
+
+
+def phase(name):
+    """Time the code run within a ``with`` block as a phase.
+
+    When instrumentation is disabled, a shared context manager that does
+    nothing is returned.
+
+    :param name: The name of the phase.
+    :type name: :class:`str <python:str>`
+
+    :returns: A context manager timing its block.
+
+    """
+    return _Phase(name) if enabled else _NULL_PHASE
+
+
+class _Phase(object):
+
+    """A context manager recording the time spent within it."""
+
+    __slots__ = ('_name', '_start')
+
+    def __init__(self, name):
+        self._name = name
+
+    def __enter__(self):
+        self._start = _timer()
+        return self
+
+    def __exit__(self, *exc_info):
+        record_timing(self._name, _timer() - self._start)
+        return False
+
+
+class _NullPhase(object):
+
+    """A context manager doing nothing, for when instrumentation is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+def _update_enabled():
+    """Enable instrumentation while any record or hook is active."""
+    global enabled
+    enabled = bool(_records or _hooks)
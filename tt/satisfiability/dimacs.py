@@ -0,0 +1,321 @@
+"""Reading and writing of DIMACS CNF files.
+
+Clauses are streamed in both directions: reading produces clauses one at a
+time, which the PicoSAT extension consumes without the whole problem ever
+existing as a list of lists, and writing emits clauses as they are generated.
+
+"""
+
+from contextlib import contextmanager
+
+from tt.errors import (
+    DimacsFormatError,
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError,
+    RequiredArgumentError)
+from tt.satisfiability import picosat
+from tt.transformations.utils import ensure_bexpr
+
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+"""The default number of characters read from a file at a time.
+
+:type: :class:`int <python:int>`
+
+"""
+
+
+def iter_clauses(f, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Iterate over the clauses of a DIMACS CNF file.
+
+    The file is read in chunks of ``chunk_size`` characters and each clause is
+    produced as soon as its terminating ``0`` is read, so memory use does not
+    depend on the size of the file. Comment lines (starting with ``c``) are
+    skipped, the problem line (``p cnf <vars> <clauses>``) is validated if
+    present, and a line starting with ``%`` ends the input.
+
+    :param f: The path of the file to read, or a readable file object (in
+        either text or binary mode).
+    :type f: :class:`str <python:str>` or file object
+
+    :param chunk_size: The number of characters to read at a time.
+    :type chunk_size: :class:`int <python:int>`, optional
+
+    :returns: An iterator of clauses, each a list of non-zero ints.
+    :rtype: Iterator[List[:class:`int <python:int>`]]
+
+    :raises DimacsFormatError: If the input contains a malformed problem line
+        or a non-integer literal.
+
+    Here's a quick example::
+
+        >>> from io import StringIO
+        >>> from tt.satisfiability import dimacs
+        >>> cnf = StringIO(u'c an example\\np cnf 3 2\\n1 -2 0\\n2 3\\n0\\n')
+        >>> for clause in dimacs.iter_clauses(cnf):
+        ...     print(clause)
+        ...
+        [1, -2]
+        [2, 3]
+
+    """
+    _assert_valid_chunk_size(chunk_size)
+    return _iter_clauses(f, chunk_size)
+
+
+def write_clauses(f, clauses, num_vars=None, num_clauses=None,
+                  comments=None):
+    """Write clauses to a DIMACS CNF file.
+
+    The problem line must precede the clauses, so its counts are either
+    passed explicitly or computed by iterating over ``clauses`` an extra time.
+
+    :param f: The path of the file to write, or a writable text-mode file
+        object.
+    :type f: :class:`str <python:str>` or file object
+
+    :param clauses: The clauses to write, each an iterable of non-zero ints.
+    :type clauses: Iterable[Iterable[:class:`int <python:int>`]]
+
+    :param num_vars: The number of variables for the problem line.
+    :type num_vars: :class:`int <python:int>`, optional
+
+    :param num_clauses: The number of clauses for the problem line.
+    :type num_clauses: :class:`int <python:int>`, optional
+
+    :param comments: Lines of comments to write before the problem line.
+    :type comments: Iterable[:class:`str <python:str>`], optional
+
+    :raises RequiredArgumentError: If ``clauses`` is an iterator (which cannot
+        be iterated over twice) and either count is omitted.
+
+    Here's a simple example::
+
+        >>> import sys
+        >>> from tt.satisfiability import dimacs
+        >>> dimacs.write_clauses(sys.stdout, [[1, -2], [2, 3]])
+        p cnf 3 2
+        1 -2 0
+        2 3 0
+
+    """
+    if num_vars is None or num_clauses is None:
+        if iter(clauses) is clauses:
+            raise RequiredArgumentError(
+                'num_vars and num_clauses are required when writing clauses '
+                'from an iterator')
+
+        counted_vars, counted_clauses = 0, 0
+        for clause in clauses:
+            counted_vars = max(counted_vars, max(abs(lit) for lit in clause))
+            counted_clauses += 1
+
+        if num_vars is None:
+            num_vars = counted_vars
+        if num_clauses is None:
+            num_clauses = counted_clauses
+
+    # lines are written as unicode, which the text-mode files of Python 2
+    # require and its byte-mode files accept
+    with _opened(f, 'w') as fobj:
+        for comment in comments or []:
+            fobj.write(u'c {}\n'.format(comment))
+        fobj.write(u'p cnf {} {}\n'.format(num_vars, num_clauses))
+        for clause in clauses:
+            fobj.write(u' '.join(map(str, clause)))
+            fobj.write(u' 0\n')
+
+
+def write_expression(f, expr):
+    """Write an expression to a DIMACS CNF file.
+
+    The expression's :func:`clause set \
+    <tt.expressions.bexpr.BooleanExpression.to_clause_set>` is streamed to the
+    file, with constant operands simplified away and constrained symbols
+    written as unit clauses. A comment line mapping each variable to its
+    symbol is written ahead of the problem line.
+
+    :param f: The path of the file to write, or a writable text-mode file
+        object.
+    :type f: :class:`str <python:str>` or file object
+
+    :param expr: The expression to write.
+    :type expr: :class:`str <python:str>` or :class:`BooleanExpression \
+        <tt.expressions.bexpr.BooleanExpression>`
+
+    :returns: A mapping of variable indices to the symbols they represent.
+    :rtype: Dict[:class:`int <python:int>`, :class:`str <python:str>`]
+
+    Here's an example::
+
+        >>> import sys
+        >>> from tt.satisfiability import dimacs
+        >>> index_to_symbol = dimacs.write_expression(sys.stdout,
+        ...                                           '(A or ~B) and (B or 0)')
+        c 1 A
+        c 2 B
+        p cnf 2 2
+        1 -2 0
+        2 0
+        >>> index_to_symbol
+        {1: 'A', 2: 'B'}
+
+    """
+    bexpr = ensure_bexpr(expr)
+    clause_set = bexpr.to_clause_set()
+    symbol_to_index_map = bexpr._picosat_symbol_to_index_map(clause_set)
+    assumptions = bexpr._picosat_assumptions(symbol_to_index_map)
+
+    def iter_all_clauses():
+        for clause in clause_set:
+            yield clause
+        for assumption in assumptions:
+            yield [assumption]
+
+    index_to_symbol_map = dict(
+        (index, symbol_str) for symbol_str, index in
+        symbol_to_index_map.items())
+    comments = ['{} {}'.format(index, index_to_symbol_map[index]) for
+                index in sorted(index_to_symbol_map)]
+    write_clauses(f, iter_all_clauses(), num_vars=len(index_to_symbol_map),
+                  num_clauses=len(clause_set) + len(assumptions),
+                  comments=comments)
+
+    return index_to_symbol_map
+
+
+def sat_one(f, assumptions=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Find a solution to the clauses of a DIMACS CNF file.
+
+    Clauses are streamed from the file directly into the solver. See
+    :func:`picosat.sat_one <tt.satisfiability.picosat.sat_one>` for a
+    description of the arguments and result.
+
+    :param f: The path of the file to read, or a readable file object.
+    :type f: :class:`str <python:str>` or file object
+
+    Here's an example::
+
+        >>> from io import StringIO
+        >>> from tt.satisfiability import dimacs
+        >>> dimacs.sat_one(StringIO(u'p cnf 2 2\\n1 2 0\\n-1 0\\n'))
+        [-1, 2]
+
+    """
+    return picosat.sat_one(iter_clauses(f, chunk_size),
+                           assumptions=assumptions)
+
+
+def sat_all(f, assumptions=None, project=None, batch_size=None,
+            chunk_size=DEFAULT_CHUNK_SIZE):
+    """Find all solutions to the clauses of a DIMACS CNF file.
+
+    All clauses are streamed from the file into the solver before this
+    function returns. See :func:`picosat.sat_all \
+    <tt.satisfiability.picosat.sat_all>` for a description of the arguments
+    and result.
+
+    :param f: The path of the file to read, or a readable file object.
+    :type f: :class:`str <python:str>` or file object
+
+    Here's an example::
+
+        >>> from io import StringIO
+        >>> from tt.satisfiability import dimacs
+        >>> for solution in dimacs.sat_all(StringIO(u'p cnf 2 1\\n1 2 0\\n')):
+        ...     print(solution)
+        ...
+        [1, 2]
+        [1, -2]
+        [-1, 2]
+
+    """
+    return picosat.sat_all(iter_clauses(f, chunk_size),
+                           assumptions=assumptions, project=project,
+                           batch_size=batch_size)
+
+
+@contextmanager
+def _opened(f, mode):
+    """Open a path in the specified mode, or pass a file object through."""
+    if isinstance(f, str):
+        with open(f, mode) as fobj:
+            yield fobj
+    else:
+        yield f
+
+
+def _iter_clauses(f, chunk_size):
+    """Yield the clauses of a DIMACS CNF file."""
+    with _opened(f, 'rb') as fobj:
+        clause = []
+        seen_header = False
+        for line_num, line in _iter_lines(fobj, chunk_size):
+            tokens = line.split()
+            if not tokens or tokens[0].startswith('c'):
+                continue
+            elif tokens[0] == 'p':
+                if seen_header or not _is_valid_header(tokens):
+                    raise DimacsFormatError(
+                        'Invalid problem line on line {}'.format(line_num),
+                        line)
+                seen_header = True
+                continue
+            elif tokens[0] == '%':
+                break
+
+            try:
+                literals = [int(token) for token in tokens]
+            except ValueError:
+                raise DimacsFormatError(
+                    'Invalid literal on line {}'.format(line_num), line)
+
+            start = 0
+            for i, literal in enumerate(literals):
+                if not literal:
+                    clause.extend(literals[start:i])
+                    yield clause
+                    clause = []
+                    start = i + 1
+            clause.extend(literals[start:])
+
+        if clause:
+            # tolerate a missing terminator on the final clause
+            yield clause
+
+
+def _iter_lines(fobj, chunk_size):
+    """Yield numbered lines from a file, reading it in fixed-size chunks."""
+    line_num = 0
+    remainder = ''
+    while True:
+        chunk = fobj.read(chunk_size)
+        if not chunk:
+            break
+        elif isinstance(chunk, bytes):
+            # DIMACS is ASCII; latin-1 cannot fail mid-character at a chunk
+            # boundary and leaves the digits of literals untouched
+            chunk = chunk.decode('latin-1')
+
+        lines = (remainder + chunk).split('\n')
+        remainder = lines.pop()
+        for line in lines:
+            line_num += 1
+            yield line_num, line
+
+    if remainder:
+        yield line_num + 1, remainder
+
+
+def _is_valid_header(tokens):
+    """Whether the tokens of a problem line are well-formed."""
+    return (len(tokens) == 4 and tokens[1] == 'cnf' and
+            tokens[2].isdigit() and tokens[3].isdigit())
+
+
+def _assert_valid_chunk_size(chunk_size):
+    """Validate the chunk_size argument."""
+    if not isinstance(chunk_size, int) or isinstance(chunk_size, bool):
+        raise InvalidArgumentTypeError('chunk_size must be an int')
+    elif chunk_size < 1:
+        raise InvalidArgumentValueError('chunk_size must be at least 1')
@@ -0,0 +1,196 @@
+"""Parallel satisfiability solving, built on the PicoSAT wrapper."""
+
+import itertools
+import math
+import multiprocessing
+
+from collections import Counter
+
+from tt._assertions import assert_int_at_least
+from tt.errors.arguments import (
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError)
+from tt.satisfiability import picosat
+
+
+_CUBES_PER_WORKER = 4
+
+# clauses shared with each worker process, set by _init_worker
+_worker_clauses = None
+
+
+def sat_all_parallel(clauses, assumptions=None, split_vars=None,
+                     num_split_vars=None, workers=None, ordered=False):
+    """Find all solutions to the specified clauses, across multiple processes.
+
+    The search space is split into ``2**k`` disjoint cubes, one for each
+    combination of values of ``k`` splitting variables. The solutions within
+    each cube are enumerated by :func:`sat_all \
+    <tt.satisfiability.picosat.sat_all>` in a pool of worker processes, with
+    the cube passed along as assumptions. Since the cubes are disjoint, the
+    union of their solutions contains each solution exactly once.
+
+    :param clauses: CNF (AND of ORs) clauses; positive integers represent
+        non-negated terms and negative integers represent negated terms.
+    :type clauses: List[List[:class:`int <python:int>`]]
+
+    :param assumptions: Assumed terms, applied to every cube; same negation
+        logic from ``clauses`` applies here.
+    :type assumptions: List[:class:`int <python:int>`], optional
+
+    :param split_vars: The variables on which to split the search space. If
+        omitted, the ``num_split_vars`` variables occurring most frequently in
+        ``clauses`` (and not appearing in ``assumptions``) will be used.
+    :type split_vars: List[:class:`int <python:int>`], optional
+
+    :param num_split_vars: The number of splitting variables to pick when
+        ``split_vars`` is omitted; defaults to enough variables to produce a
+        few cubes per worker.
+    :type num_split_vars: :class:`int <python:int>`, optional
+
+    :param workers: The number of worker processes to use; defaults to the
+        number of CPUs on the machine. A value of ``1`` solves all cubes in
+        the calling process.
+    :type workers: :class:`int <python:int>`, optional
+
+    :param ordered: Whether solutions should be produced in a deterministic
+        order (cube by cube); by default, solutions are produced as soon as
+        any worker finishes its cube.
+    :type ordered: :class:`bool <python:bool>`, optional
+
+    :returns: An iterator of solutions; if no satisfiable solutions exist, the
+        iterator will be empty.
+    :rtype: Iterator[List[:class:`int <python:int>`]]
+
+    :raises InvalidArgumentTypeError: If ``clauses`` is not a list of lists of
+        ints, ``assumptions`` or ``split_vars`` is not a list of ints, or
+        ``num_split_vars`` or ``workers`` is not an int.
+    :raises InvalidArgumentValueError: If any literal ints are equal to zero,
+        ``split_vars`` overlaps with ``assumptions``, ``num_split_vars`` is
+        negative, or ``workers`` is less than 1.
+
+    Here's a simple example, solving each of the four cubes over variables
+    ``1`` and ``2`` in the calling process::
+
+        >>> from tt.satisfiability.parallel import sat_all_parallel
+        >>> for solution in sat_all_parallel([[1, 2, 3], [-1, -3]],
+        ...                                  split_vars=[1, 2], workers=1,
+        ...                                  ordered=True):
+        ...     print(solution)
+        ...
+        [-1, -2, 3]
+        [-1, 2, -3]
+        [-1, 2, 3]
+        [1, -2, -3]
+        [1, 2, -3]
+
+    """
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    elif not isinstance(workers, int):
+        raise InvalidArgumentTypeError('workers must be an int')
+    elif workers < 1:
+        raise InvalidArgumentValueError('workers must be at least 1')
+
+    occurrences = _count_var_occurrences(clauses)
+    assumed_vars = set(abs(a) for a in _validated_literals(
+        assumptions, 'assumptions'))
+
+    if split_vars is None:
+        if num_split_vars is None:
+            num_split_vars = int(math.ceil(
+                math.log(workers * _CUBES_PER_WORKER, 2)))
+        else:
+            assert_int_at_least('num_split_vars', num_split_vars, 0)
+
+        split_vars = [var for var, _ in occurrences.most_common() if
+                      var not in assumed_vars][:num_split_vars]
+    else:
+        split_vars = [abs(v) for v in
+                      _validated_literals(split_vars, 'split_vars')]
+        if assumed_vars & set(split_vars):
+            raise InvalidArgumentValueError(
+                'split_vars cannot include assumed variables')
+
+    cubes = [[sign * var for sign, var in zip(signs, split_vars)] for
+             signs in itertools.product((-1, 1), repeat=len(split_vars))]
+    cube_assumptions = [cube + list(assumptions or []) for cube in cubes]
+    return _iter_cube_solutions(clauses, cube_assumptions, workers, ordered)
+
+
+def _iter_cube_solutions(clauses, cube_assumptions, workers, ordered):
+    """Yield the solutions of each cube, solved in a pool of processes."""
+    if workers == 1:
+        _init_worker(clauses)
+        try:
+            for solutions in map(_solve_cube, cube_assumptions):
+                for solution in solutions:
+                    yield solution
+        finally:
+            _init_worker(None)
+        return
+
+    pool = multiprocessing.Pool(
+        workers, initializer=_init_worker, initargs=(clauses,))
+    try:
+        results = (pool.imap(_solve_cube, cube_assumptions) if ordered else
+                   pool.imap_unordered(_solve_cube, cube_assumptions))
+        for solutions in results:
+            for solution in solutions:
+                yield solution
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _init_worker(clauses):
+    """Store the clauses to solve within a worker process."""
+    global _worker_clauses
+    _worker_clauses = clauses
+
+
+def _solve_cube(cube_assumptions):
+    """Enumerate all solutions within a single cube."""
+    return list(picosat.sat_all(_worker_clauses,
+                                assumptions=cube_assumptions or None))
+
+
+def _count_var_occurrences(clauses):
+    """Validate clauses, returning a counter of variable occurrences."""
+    if not isinstance(clauses, list):
+        raise InvalidArgumentTypeError(
+            'clauses must be a list of lists of non-zero ints')
+    elif not clauses:
+        raise InvalidArgumentValueError('clauses must be non-empty')
+
+    occurrences = Counter()
+    for clause in clauses:
+        if not isinstance(clause, list):
+            raise InvalidArgumentTypeError(
+                'clause must be a list of non-zero ints')
+        elif not clause:
+            raise InvalidArgumentValueError('clause must be non-empty')
+        occurrences.update(abs(lit) for lit in
+                           _validated_literals(clause, 'clause'))
+
+    return occurrences
+
+
+def _validated_literals(literals, name):
+    """Validate a list of non-zero int literals; ``None`` is accepted."""
+    if literals is None:
+        return []
+    elif not isinstance(literals, list):
+        raise InvalidArgumentTypeError(
+            '{} must be a list of non-zero ints'.format(name))
+
+    for lit in literals:
+        if not isinstance(lit, int) or isinstance(lit, bool):
+            raise InvalidArgumentTypeError(
+                'All {} literals expected to be ints'.format(name))
+        elif lit == 0:
+            raise InvalidArgumentValueError(
+                'All {} literals must be non-zero'.format(name))
+
+    return literals
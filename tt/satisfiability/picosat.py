@@ -1,17 +1,108 @@
 """Python wrapper around the _clibs PicoSAT extension."""
 
 import os
+import sys
 
+from collections import namedtuple
+
+from tt._assertions import assert_int_at_least
 from tt.errors.arguments import (
     InvalidArgumentTypeError,
     InvalidArgumentValueError)
+from tt.errors.solver import SolverLimitError
+from tt.instrumentation import recorder as _instrumentation
+
+_c_picosat = None
+
+# the largest values of the C int and long long arguments of the extension
+_C_INT_MAX = 2**31 - 1
+_C_LLONG_MAX = 2**63 - 1
+
+
+def _load_c_picosat():
+    """Import the PicoSAT C-extension, the first time it is needed."""
+    global _c_picosat
+    if _c_picosat is None:
+        from tt._clibs import picosat as _c_picosat
+    return _c_picosat
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        """Load the ``VERSION`` of PicoSAT on first access."""
+        if name == 'VERSION':
+            return _load_c_picosat().VERSION
+        raise AttributeError(
+            'module \'{}\' has no attribute \'{}\''.format(__name__, name))
+elif os.environ.get('READTHEDOCS') != 'True':
+    VERSION = _load_c_picosat().VERSION
+
+
+class SolverStats(namedtuple('SolverStats', [
+        'decisions', 'conflicts', 'propagations', 'seconds', 'max_bytes',
+        'searches'])):
+
+    """The work done by PicoSAT over one or more searches.
+
+    Statistics of several calls to the solver can be added together; counts
+    and times are summed, while ``max_bytes`` is the largest of the
+    two::
+
+        >>> from tt.satisfiability.picosat import SolverStats
+        >>> a = SolverStats(decisions=3, conflicts=1, propagations=10,
+        ...                 seconds=0.5, max_bytes=2048, searches=1)
+        >>> b = SolverStats(decisions=2, conflicts=0, propagations=4,
+        ...                 seconds=0.25, max_bytes=1024, searches=1)
+        >>> a + b
+        SolverStats(decisions=5, conflicts=1, propagations=14, seconds=0.75, \
+max_bytes=2048, searches=2)
+        >>> SolverStats()
+        SolverStats(decisions=0, conflicts=0, propagations=0, seconds=0.0, \
+max_bytes=0, searches=0)
+
+    The fields are:
+
+    * ``decisions``, the number of decisions made;
+    * ``conflicts``, the number of conflicts analyzed;
+    * ``propagations``, the number of literals propagated;
+    * ``seconds``, the process time spent searching, as measured by PicoSAT;
+    * ``max_bytes``, the most memory allocated by the solver at once;
+    * ``searches``, the number of searches run.
+
+    """
+
+    __slots__ = ()
+
+    def __add__(self, other):
+        if not isinstance(other, SolverStats):
+            return NotImplemented
+
+        return SolverStats(
+            self.decisions + other.decisions,
+            self.conflicts + other.conflicts,
+            self.propagations + other.propagations,
+            self.seconds + other.seconds,
+            max(self.max_bytes, other.max_bytes),
+            self.searches + other.searches)
+
+    def __sub__(self, other):
+        if not isinstance(other, SolverStats):
+            return NotImplemented
 
-if os.environ.get('READTHEDOCS') != 'True':
-    from tt._clibs import picosat as _c_picosat
-    VERSION = _c_picosat.VERSION
+        return SolverStats(
+            self.decisions - other.decisions,
+            self.conflicts - other.conflicts,
+            self.propagations - other.propagations,
+            self.seconds - other.seconds,
+            self.max_bytes,
+            self.searches - other.searches)
 
 
-def sat_one(clauses, assumptions=None):
+SolverStats.__new__.__defaults__ = (0, 0, 0, 0.0, 0, 0)
+
+
+def sat_one(clauses, assumptions=None, decision_limit=None,
+            propagation_limit=None, timeout=None, stats=False):
     """Find a solution that satisfies the specified clauses and assumptions.
 
     This provides a light Python wrapper around the same method in the PicoSAT
@@ -22,21 +113,49 @@ def sat_one(clauses, assumptions=None):
     class.
 
     :param clauses: CNF (AND of ORs) clauses; positive integers represent
-        non-negated terms and negative integers represent negated terms.
-    :type clauses: List[List[:class:`int <python:int>`]]
+        non-negated terms and negative integers represent negated terms. Any
+        iterable of clauses may be used, including a generator; clauses are
+        consumed one at a time as they are added to the solver.
+    :type clauses: Iterable[Iterable[:class:`int <python:int>`]]
 
     :param assumptions: Assumed terms; same negation logic from ``clauses``
         applies here. Note that assumptions *cannot* be an empty list; leave it
         as ``None`` if there are no assumptions to include.
     :type assumptions: List[:class:`int <python:int>`]
 
+    :param decision_limit: The maximum number of decisions the solver may
+        make in a search; unlimited if omitted.
+    :type decision_limit: :class:`int <python:int>`
+
+    :param propagation_limit: The maximum number of propagations the solver
+        may perform in a search; unlimited if omitted. This tends to track
+        execution time more closely than ``decision_limit``.
+    :type propagation_limit: :class:`int <python:int>`
+
+    :param timeout: The maximum number of (wall clock) seconds the solver may
+        spend in a search; unlimited if omitted. The clock is checked
+        periodically, so a search may slightly overrun its timeout.
+    :type timeout: :class:`float <python:float>`
+
+    :param stats: Whether to also return the statistics of the search.
+    :type stats: :class:`bool <python:bool>`
+
     :returns: If solution is found, a list of ints representing the terms of
-        the solution; otherwise, if no solution found, ``None``.
-    :rtype: List[:class:`int <python:int>`] or ``None``
+        the solution; otherwise, if no solution found, ``None``. When
+        ``stats`` is true, a tuple of the above and the :class:`SolverStats`
+        of the search.
+    :rtype: List[:class:`int <python:int>`] or ``None``, or a tuple of that
+        and :class:`SolverStats`
 
-    :raises InvalidArgumentTypeError: If ``clauses`` is not a list of lists of
-        ints or ``assumptions`` is not a list of ints.
-    :raises InvalidArgumentValueError: If any literal ints are equal to zero.
+    :raises InvalidArgumentTypeError: If ``clauses`` is not an iterable of
+        iterables of ints, ``assumptions`` is not a list of ints, or any limit
+        is not a number.
+    :raises InvalidArgumentValueError: If any literal ints are equal to zero,
+        any limit is not positive, ``decision_limit`` exceeds
+        ``2**31 - 1``, or ``propagation_limit`` exceeds ``2**63 - 1``.
+    :raises SolverLimitError: If the search is abandoned after reaching one of
+        the limits; when ``stats`` is true, the error's ``stats`` attribute
+        holds the :class:`SolverStats` of the abandoned search.
 
     Let's look at a simple example with no satisfiable solution::
 
@@ -49,21 +168,60 @@ def sat_one(clauses, assumptions=None):
         >>> picosat.sat_one([[1, 2, 3], [-2, -3], [1, -2], [2, -3], [-2]])
         [1, -2, -3]
 
-    Finally, here's an example using assumptions::
+    Here's an example using assumptions::
 
         >>> picosat.sat_one([[1, 2, 3], [2, 3]], assumptions=[-1, -3])
         [-1, 2, -3]
 
+    The work the solver did can be returned alongside its answer::
+
+        >>> solution, stats = picosat.sat_one([[1, 2], [-1, -2]], stats=True)
+        >>> solution
+        [-1, 2]
+        >>> stats.searches == 1 and stats.decisions == 1
+        True
+
+    Finally, a search that runs into one of its limits raises an error,
+    rather than producing an answer that may be wrong::
+
+        >>> picosat.sat_one([[1, 2], [3, 4]], decision_limit=1)
+        Traceback (most recent call last):
+            ...
+        tt.errors.solver.SolverLimitError: PicoSAT search reached its \
+decision limit
+
     """
+    limits = _validated_limits(decision_limit, propagation_limit, timeout)
+    instrumented = _instrumentation.enabled
+    if stats or instrumented:
+        limits['stats'] = True
+
     try:
-        return _c_picosat.sat_one(clauses, assumptions=assumptions)
+        with _instrumentation.phase('picosat.sat_one'):
+            result = _load_c_picosat().sat_one(
+                clauses, assumptions=assumptions, **limits)
     except TypeError as e:
         raise InvalidArgumentTypeError(str(e))
     except ValueError as e:
         raise InvalidArgumentValueError(str(e))
+    except SolverLimitError as e:
+        if instrumented:
+            _instrumentation.count('solver.calls')
+            _count_search_stats(e.stats)
+        raise
+
+    if instrumented:
+        solution, search_stats = result
+        _instrumentation.count('solver.calls')
+        _instrumentation.count('solver.solutions', int(solution is not None))
+        _count_search_stats(search_stats)
+        if not stats:
+            return solution
+    return result
 
 
-def sat_all(clauses, assumptions=None):
+def sat_all(clauses, assumptions=None, project=None, batch_size=None,
+            decision_limit=None, propagation_limit=None, timeout=None):
     """Find all solutions that satisfy the specified clauses and assumptions.
 
     This provides a light Python wrapper around the same method in the PicoSAT
@@ -74,21 +232,64 @@ def sat_all(clauses, assumptions=None):
     class.
 
     :param clauses: CNF (AND of ORs) clauses; positive integers represent
-        non-negated terms and negative integers represent negated terms.
-    :type clauses: List[List[:class:`int <python:int>`]]
+        non-negated terms and negative integers represent negated terms. Any
+        iterable of clauses may be used, including a generator; clauses are
+        consumed one at a time as they are added to the solver.
+    :type clauses: Iterable[Iterable[:class:`int <python:int>`]]
 
     :param assumptions: Assumed terms; same negation logic from ``clauses``
         applies here. Note that assumptions *cannot* be an empty list; leave it
         as ``None`` if there are no assumptions to include.
     :type assumptions: List[:class:`int <python:int>`]
 
+    :param project: Variables onto which solutions are projected; when
+        specified, each distinct assignment of these variables will be
+        produced exactly once, regardless of how many assignments of the
+        remaining variables extend it. The sign of these ints is ignored. Like
+        ``assumptions``, this *cannot* be an empty list; leave it as ``None``
+        to enumerate every solution over all variables.
+    :type project: List[:class:`int <python:int>`]
+
+    :param batch_size: If specified, the returned iterator will produce batches
+        of up to this many partial solutions at a time, rather than single
+        solutions; see below for more information. The batched mode is only
+        available on Python 3, where :class:`memoryview <python:memoryview>`
+        objects can be cast to 2-D views.
+    :type batch_size: :class:`int <python:int>`
+
+    :param decision_limit: The maximum number of decisions the solver may
+        make in each search for a solution; unlimited if omitted.
+    :type decision_limit: :class:`int <python:int>`
+
+    :param propagation_limit: The maximum number of propagations the solver
+        may perform in each search for a solution; unlimited if omitted. This
+        tends to track execution time more closely than ``decision_limit``.
+    :type propagation_limit: :class:`int <python:int>`
+
+    :param timeout: The maximum number of (wall clock) seconds the solver may
+        spend in each search for a solution; unlimited if omitted. The clock
+        is checked periodically, so a search may slightly overrun its timeout.
+    :type timeout: :class:`float <python:float>`
+
     :returns: An iterator of solutions; if no satisfiable solutions exist, the
-        iterator will be empty.
-    :rtype: Iterator[List[:class:`int <python:int>`]]
+        iterator will be empty. The iterator's ``stats`` attribute holds the
+        :class:`SolverStats` of the searches it has run so far.
+    :rtype: Iterator[List[:class:`int <python:int>`]], or
+        Iterator[:class:`memoryview <python:memoryview>`] when ``batch_size``
+        is specified
 
-    :raises InvalidArgumentTypeError: If ``clauses`` is not a list of lists of
-        ints or ``assumptions`` is not a list of ints.
-    :raises InvalidArgumentValueError: If any literal ints are equal to zero.
+    :raises InvalidArgumentTypeError: If ``clauses`` is not an iterable of
+        iterables of ints, ``assumptions`` or ``project`` is not a list of
+        ints, ``batch_size`` is not an int, or any limit is not a number.
+    :raises InvalidArgumentValueError: If any literal ints are equal to zero,
+        ``batch_size`` is less than 1, ``batch_size`` is specified on Python
+        2, or any limit is not positive. Also if ``batch_size`` or
+        ``decision_limit`` exceeds ``2**31 - 1``, or ``propagation_limit``
+        exceeds ``2**63 - 1``.
+    :raises SolverLimitError: From the iterator, if a search is abandoned
+        after reaching one of the limits. No further solutions are produced
+        after this error. In batched mode, the partial models already found
+        are produced before the error is raised.
 
     Here's an example showing the basic usage::
 
@@ -112,10 +313,164 @@ def sat_all(clauses, assumptions=None):
         [1, 2, -3, 4]
         [1, 2, -3, -4]
 
+    If we only care about the values of a few of the variables, projecting the
+    solutions onto them avoids enumerating every combination of the others::
+
+        >>> for solution in picosat.sat_all([[1], [2, 3, 4], [2, 3]],
+        ...                                 project=[2, 3]):
+        ...     print(solution[1:3])
+        ...
+        [2, 3]
+        [2, -3]
+        [-2, 3]
+
+    For solution spaces with many solutions, the batched mode is much faster.
+    Each model found by the solver is first shrunk to a partial model, in
+    which variables whose values do not matter are marked with ``0``; every
+    completion of a partial model is a solution, and no two partial models
+    cover the same solution. Up to ``batch_size`` partial models are packed
+    into each 2-D :class:`memoryview <python:memoryview>` (with one row per
+    model and one signed char column per variable) produced by the
+    iterator (this mode requires Python 3)::
+
+        >>> for batch in picosat.sat_all([[1, 2, 3], [-1, -2]],
+        ...                              batch_size=8):  # doctest: +SKIP
+        ...     print(batch.tolist())
+        ...
+        [[-1, 0, 1], [-1, 1, -1], [1, -1, 0]]
+
+    The work done by the solver can be inspected from the iterator; each
+    solution takes a search, plus a last one to find that there are no
+    more::
+
+        >>> sol_iter = picosat.sat_all([[1, 2], [-1, -2]])
+        >>> len(list(sol_iter))
+        2
+        >>> sol_iter.stats.searches == 3
+        True
+
     """
+    if batch_size is not None:
+        _assert_c_int_in_range('batch_size', batch_size, _C_INT_MAX)
+        if sys.version_info < (3,):
+            raise InvalidArgumentValueError(
+                'batch_size requires Python 3')
+
+    limits = _validated_limits(decision_limit, propagation_limit, timeout)
+
     try:
-        return _c_picosat.sat_all(clauses, assumptions=assumptions)
+        sol_iter = _load_c_picosat().sat_all(
+            clauses, assumptions=assumptions, project=project,
+            batch_size=batch_size or 0, **limits)
     except TypeError as e:
         raise InvalidArgumentTypeError(str(e))
     except ValueError as e:
         raise InvalidArgumentValueError(str(e))
+
+    if _instrumentation.enabled:
+        _instrumentation.count('solver.calls')
+        return _InstrumentedSolutionIterator(sol_iter, batch_size is not None)
+    elif batch_size is not None:
+        return _BatchIterator(sol_iter)
+    else:
+        return sol_iter
+
+
+class _BatchIterator(object):
+
+    """Unpack the batches produced by the extension's solution iterator."""
+
+    __slots__ = ('_sol_iter',)
+
+    def __init__(self, sol_iter):
+        self._sol_iter = sol_iter
+
+    @property
+    def stats(self):
+        """The statistics of the searches run so far.
+
+        :type: :class:`SolverStats`
+
+        """
+        return self._sol_iter.stats
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row_width, packed_rows = next(self._sol_iter)
+        return memoryview(packed_rows).cast(
+            'b', [len(packed_rows) // row_width, row_width])
+
+    next = __next__
+
+
+class _InstrumentedSolutionIterator(_BatchIterator):
+
+    """Time and count the production of each solution (or batch)."""
+
+    __slots__ = ('_is_batched', '_last_stats')
+
+    def __init__(self, sol_iter, is_batched):
+        super(_InstrumentedSolutionIterator, self).__init__(sol_iter)
+        self._is_batched = is_batched
+        self._last_stats = SolverStats()
+
+    def __next__(self):
+        try:
+            with _instrumentation.phase('picosat.sat_all'):
+                item = next(self._sol_iter)
+        finally:
+            stats = self._sol_iter.stats
+            _count_search_stats(stats - self._last_stats)
+            self._last_stats = stats
+
+        if not self._is_batched:
+            _instrumentation.count('solver.solutions')
+            return item
+
+        row_width, packed_rows = item
+        _instrumentation.count(
+            'solver.solutions', len(packed_rows) // row_width)
+        return memoryview(packed_rows).cast(
+            'b', [len(packed_rows) // row_width, row_width])
+
+    next = __next__
+
+
+def _count_search_stats(stats):
+    """Add the work done in solver searches to the instrumentation counters."""
+    _instrumentation.count('solver.decisions', stats.decisions)
+    _instrumentation.count('solver.conflicts', stats.conflicts)
+    _instrumentation.count('solver.propagations', stats.propagations)
+
+
+def _assert_c_int_in_range(name, value, maximum):
+    """Assert that an argument is a positive int the extension can store."""
+    assert_int_at_least(name, value, 1)
+    if value > maximum:
+        raise InvalidArgumentValueError(
+            '`{}` must be at most {}'.format(name, maximum))
+
+
+def _validated_limits(decision_limit, propagation_limit, timeout):
+    """Validate solver limits, returning them as extension keyword args."""
+    limits = {}
+
+    for name, limit, maximum in (
+            ('decision_limit', decision_limit, _C_INT_MAX),
+            ('propagation_limit', propagation_limit, _C_LLONG_MAX)):
+        if limit is None:
+            continue
+        _assert_c_int_in_range(name, limit, maximum)
+        limits[name] = limit
+
+    if timeout is not None:
+        if (not isinstance(timeout, (int, float)) or
+                isinstance(timeout, bool)):
+            raise InvalidArgumentTypeError('timeout must be a number')
+        elif timeout <= 0:
+            raise InvalidArgumentValueError('timeout must be positive')
+        limits['timeout'] = float(timeout)
+
+    return limits
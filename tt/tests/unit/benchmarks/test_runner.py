@@ -0,0 +1,194 @@
+"""Tests for running, saving, and comparing benchmarks."""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+from tt.benchmarks import (
+    Benchmark,
+    BenchmarkResult,
+    compare_results,
+    get_benchmarks,
+    load_results,
+    main,
+    run_benchmarks,
+    save_results)
+from tt.errors import (
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError)
+from tt.expressions import BooleanExpression
+from tt.trees import get_transformation_memo
+
+if sys.version_info[0] >= 3:
+    from io import StringIO
+else:
+    from StringIO import StringIO
+
+
+class TestBenchmarkRunner(unittest.TestCase):
+
+    def test_name_includes_sorted_params(self):
+        """Test that benchmark names list their parameters in order."""
+        benchmark = Benchmark('group', bool, params={'b': 2, 'a': 1})
+        self.assertEqual(benchmark.name, 'group[a=1, b=2]')
+        self.assertEqual(benchmark.group, 'group')
+        self.assertEqual(Benchmark('group', bool).name, 'group')
+
+    def test_setup_runs_once(self):
+        """Test that setup runs once, and func once per run."""
+        setup_calls, func_args = [], []
+
+        def setup():
+            setup_calls.append(None)
+            return 'arg'
+
+        result = Benchmark('b', func_args.append, setup=setup).run(
+            repeat=3, warmup=2)
+        self.assertEqual(len(setup_calls), 1)
+        self.assertEqual(func_args, ['arg'] * 5)
+        self.assertEqual(result.name, 'b')
+        self.assertEqual(len(result.times), 3)
+
+    def test_cold_benchmarks_clear_memos(self):
+        """Test that cold benchmarks run without memoized transformations."""
+        memo = get_transformation_memo('to_primitives')
+        hits = []
+
+        def func(b):
+            b.tree.to_primitives()
+            hits.append(memo.cache_info().hits)
+
+        def setup():
+            return BooleanExpression('A xor B')
+
+        Benchmark('cold', func, setup=setup).run(repeat=2, warmup=0)
+        self.assertEqual(hits, [0, 0])
+
+        del hits[:]
+        Benchmark('warm', func, setup=setup, cold=False).run(
+            repeat=2, warmup=0)
+        self.assertGreater(hits[-1], 0)
+
+    def test_run_argument_checks(self):
+        """Test the checks on the number of runs."""
+        benchmark = Benchmark('b', bool)
+        with self.assertRaises(InvalidArgumentTypeError):
+            benchmark.run(repeat='3')
+        with self.assertRaises(InvalidArgumentValueError):
+            benchmark.run(repeat=0)
+        with self.assertRaises(InvalidArgumentValueError):
+            benchmark.run(warmup=-1)
+
+    def test_result_statistics(self):
+        """Test the best and median times of results."""
+        self.assertEqual(BenchmarkResult('r', [3.0, 1.0, 2.0]).best, 1.0)
+        self.assertEqual(BenchmarkResult('r', [3.0, 1.0, 2.0]).median, 2.0)
+        self.assertEqual(BenchmarkResult('r', [4.0, 1.0, 2.0, 3.0]).median,
+                         2.5)
+
+    def test_run_benchmarks_pattern(self):
+        """Test filtering benchmarks by a pattern on their names."""
+        seen = []
+        results = run_benchmarks(
+            [Benchmark('parse', bool, params={'size': 1}),
+             Benchmark('evaluate', bool, params={'size': 1}),
+             Benchmark('parse', bool, params={'size': 2})],
+            repeat=1, warmup=0, pattern='^parse', on_result=seen.append)
+        self.assertEqual([result.name for result in results],
+                         ['parse[size=1]', 'parse[size=2]'])
+        self.assertEqual(seen, results)
+
+    def test_save_and_load_results(self):
+        """Test that saved results load back with their times."""
+        results = [BenchmarkResult('a', [0.5, 0.25]),
+                   BenchmarkResult('b[n=1]', [1.0])]
+        f = StringIO()
+        save_results(results, f)
+
+        data = json.loads(f.getvalue())
+        self.assertIn('tt_version', data)
+        self.assertEqual(data['results'][0]['best'], 0.25)
+
+        f.seek(0)
+        self.assertEqual(load_results(f),
+                         dict((result.name, result) for result in results))
+
+    def test_load_invalid_results(self):
+        """Test that loading a file not holding results raises an error."""
+        for text in ('not json', '{}', '{"results": [{"times": []}]}'):
+            with self.assertRaises(InvalidArgumentValueError):
+                load_results(StringIO(text))
+
+    def test_compare_results(self):
+        """Test flagging regressions against a baseline."""
+        baseline = {'a': BenchmarkResult('a', [1.0]),
+                    'b': BenchmarkResult('b', [1.0])}
+        comparisons = compare_results(
+            [BenchmarkResult('a', [1.5]), BenchmarkResult('b', [0.5])],
+            baseline, threshold=0.4)
+        self.assertEqual([c.is_regression for c in comparisons],
+                         [True, False])
+        self.assertEqual(comparisons[1].ratio, 0.5)
+
+        with self.assertRaises(InvalidArgumentValueError):
+            compare_results([], baseline, threshold=-0.1)
+
+    def test_suite_names_are_unique(self):
+        """Test that each benchmark of the suite has its own name."""
+        for quick in (True, False):
+            names = [benchmark.name for benchmark in get_benchmarks(quick)]
+            self.assertEqual(len(names), len(set(names)))
+
+
+class TestBenchmarkMain(unittest.TestCase):
+
+    def setUp(self):
+        self._stdout, self._stderr = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = StringIO(), StringIO()
+
+    def tearDown(self):
+        sys.stdout, sys.stderr = self._stdout, self._stderr
+
+    def test_quick_run_and_compare(self):
+        """Test a quick run of part of the suite against a baseline."""
+        fd, path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        try:
+            args = ['--quick', '--repeat', '1', '--warmup', '0',
+                    '--filter', r'^(parse|cnf\.sat_one)\[']
+            self.assertEqual(main(args + ['--json', path]), 0)
+            with io.open(path) as f:
+                self.assertEqual(
+                    sorted(load_results(f)),
+                    ['cnf.sat_one[symbols=20]', 'parse[depth=2, size=20]'])
+
+            # a huge threshold cannot be exceeded
+            self.assertEqual(
+                main(args + ['--compare', path, '--threshold', '1e9']), 0)
+            self.assertIn('No regressions', sys.stdout.getvalue())
+        finally:
+            os.remove(path)
+
+    def test_regression_exit_code(self):
+        """Test that a regression against a baseline exits with 1."""
+        fd, path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        try:
+            with io.open(path, 'w') as f:
+                f.write(u'{"results": [{"name": "parse[depth=2, size=20]", '
+                        u'"times": [1e-12]}]}')
+            self.assertEqual(
+                main(['--quick', '--repeat', '1', '--filter', '^parse',
+                      '--compare', path]), 1)
+            self.assertIn('Regressions', sys.stdout.getvalue())
+        finally:
+            os.remove(path)
+
+    def test_bad_baseline_exit_code(self):
+        """Test that an unreadable baseline exits with 2."""
+        self.assertEqual(
+            main(['--quick', '--compare', '/nonexistent/baseline.json']), 2)
+        self.assertIn('Unable to load baseline', sys.stderr.getvalue())
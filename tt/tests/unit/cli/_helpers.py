@@ -0,0 +1,48 @@
+import sys
+import unittest
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+from tt.cli import main
+
+
+class CliTestCase(unittest.TestCase):
+
+    """An extended TestCase capturing the standard streams of the CLI."""
+
+    def setUp(self):
+        self.stdin, self.stdout, self.stderr = (
+            sys.stdin, sys.stdout, sys.stderr)
+        self.reset_output()
+
+    def tearDown(self):
+        sys.stdin, sys.stdout, sys.stderr = (
+            self.stdin, self.stdout, self.stderr)
+
+    def reset_output(self):
+        """Swap in empty buffers to capture stdout and stderr."""
+        sys.stdout = StringIO()
+        sys.stderr = StringIO()
+
+    def run_cli(self, args, stdin_text=''):
+        """Run the CLI with ``stdin_text`` as its standard input.
+
+        :returns: The exit code of the CLI.
+        :rtype: int
+
+        """
+        sys.stdin = StringIO(stdin_text)
+        return main(args)
+
+    @property
+    def out(self):
+        """The text written to stdout."""
+        return sys.stdout.getvalue()
+
+    @property
+    def err(self):
+        """The text written to stderr."""
+        return sys.stderr.getvalue()
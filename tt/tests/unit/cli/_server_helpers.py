@@ -0,0 +1,23 @@
+"""Helpers for the server tests, which require Python 3.5 or later."""
+
+import asyncio
+import json
+
+
+async def exchange(address, lines):
+    """Send lines to a server and collect its decoded responses."""
+    if isinstance(address, str):
+        reader, writer = await asyncio.open_unix_connection(address)
+    else:
+        reader, writer = await asyncio.open_connection(*address[:2])
+
+    writer.write(b''.join(line + b'\n' for line in lines))
+    writer.write_eof()
+    responses = []
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        responses.append(json.loads(line.decode('utf-8')))
+    writer.close()
+    return responses
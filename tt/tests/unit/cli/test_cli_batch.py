@@ -0,0 +1,86 @@
+"""Tests for the batch modes of the command-line interface."""
+
+import os
+import tempfile
+
+from argparse import Namespace
+
+from tt.cli.core import _run_batch
+
+from ._helpers import CliTestCase
+
+
+class TestCliBatch(CliTestCase):
+
+    def test_stdin(self):
+        """Test processing expressions read from standard input."""
+        exit_code = self.run_cli(
+            ['postfix-tokens', '--stdin'], 'A and B\n\n  ~C  \n')
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(self.out, 'A\nB\nand\n\nC\n~\n')
+        self.assertEqual(self.err, '')
+
+    def test_batch_file(self):
+        """Test processing expressions read from a file."""
+        fd, path = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write('A or B\nA\n')
+            exit_code = self.run_cli(['tree', '--batch', path])
+        finally:
+            os.remove(path)
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(
+            self.out, 'or\n`----A\n`----B\n\nA\n')
+
+    def test_batch_dash_reads_stdin(self):
+        """Test that a batch file of ``-`` reads from standard input."""
+        exit_code = self.run_cli(['tokens', '--batch', '-'], 'A nand B')
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(self.out, 'A\nnand\nB\n')
+
+    def test_errors_do_not_abort_stream(self):
+        """Test that invalid lines are reported and later lines processed."""
+        exit_code = self.run_cli(
+            ['table', '--stdin'], 'A or\n(B\n~A\n')
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(
+            self.out,
+            '+---+---+\n'
+            '| A |   |\n'
+            '+---+---+\n'
+            '| 0 | 1 |\n'
+            '+---+---+\n'
+            '| 1 | 0 |\n'
+            '+---+---+\n')
+
+        errors = self.err.splitlines()
+        self.assertTrue(errors[0].startswith('Line 1: Error! '))
+        self.assertEqual(errors[1:3], ['A or', '  ^'])
+        self.assertTrue(errors[3].startswith('Line 2: Error! '))
+
+    def test_unexpected_errors_do_not_abort_stream(self):
+        """Test that lines failing with errors other than tt's are reported
+        and later lines processed."""
+        def func(expr, opts):
+            if expr == 'deep':
+                raise RuntimeError('maximum recursion depth exceeded')
+            elif expr == 'bad':
+                raise ValueError('bad value')
+            return [expr, '\n']
+
+        exit_code = _run_batch(
+            func, Namespace(time=False), ['A\n', 'deep\n', 'bad\n', 'B\n'])
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(self.out, 'A\n\nB\n')
+        self.assertEqual(
+            self.err.splitlines(),
+            ['Line 2: Unexpected error! RuntimeError: maximum recursion '
+             'depth exceeded',
+             'Line 3: Unexpected error! ValueError: bad value'])
+
+    def test_expression_args_rejected(self):
+        """Test that expressions cannot be passed alongside batch input."""
+        self.assertEqual(self.run_cli(['tree', '--stdin', 'A'], 'B\n'), 2)
+        self.assertEqual(self.out, '')
@@ -0,0 +1,110 @@
+"""Tests for the satisfiability, equivalence and transformation commands."""
+
+import re
+import sys
+import unittest
+
+from ._helpers import CliTestCase
+
+
+class TestCliCommands(CliTestCase):
+
+    def test_sat_one(self):
+        """Test the sat-one command."""
+        self.assertEqual(self.run_cli(['sat-one', 'A and ~B']), 0)
+        self.assertEqual(self.out, 'A=1, B=0\n')
+
+    def test_sat_one_unsat(self):
+        """Test the sat-one command on an unsatisfiable expression."""
+        self.assertEqual(self.run_cli(['sat-one', 'A and ~A']), 0)
+        self.assertEqual(self.out, 'UNSAT\n')
+
+    def test_sat_all(self):
+        """Test the sat-all command, with and without a limit."""
+        self.assertEqual(self.run_cli(['sat-all', 'A xor B']), 0)
+        self.assertEqual(
+            sorted(self.out.splitlines()), ['A=0, B=1', 'A=1, B=0'])
+
+        self.reset_output()
+        self.assertEqual(
+            self.run_cli(['sat-all', '--limit', '1', 'A xor B']), 0)
+        self.assertEqual(len(self.out.splitlines()), 1)
+
+    def test_sat_all_invalid_limit(self):
+        """Test passing a negative limit to the sat-all command."""
+        with self.assertRaises(SystemExit):
+            self.run_cli(['sat-all', '--limit', '-1', 'A'])
+
+    def test_equiv(self):
+        """Test the equiv command."""
+        for expr1, expr2, expected in [
+                ('A and ~B', '~B and A', 'True'),
+                ('A', 'A or (B and ~B)', 'True'),
+                ('A -> B', '~B -> ~A', 'True'),
+                ('A', 'B', 'False'),
+                ('1', '~0', 'True')]:
+            self.reset_output()
+            self.assertEqual(self.run_cli(['equiv', expr1, expr2]), 0)
+            self.assertEqual(self.out, expected + '\n')
+
+    def test_equiv_requires_two_expressions(self):
+        """Test passing the wrong number of expressions to equiv."""
+        self.assertEqual(self.run_cli(['equiv', 'A', 'or', 'B']), 2)
+        self.assertEqual(self.out, '')
+
+    def test_equiv_batch(self):
+        """Test the equiv command on tab-separated lines of batch input."""
+        exit_code = self.run_cli(
+            ['equiv', '--stdin'], 'A\tA or A\nA\nA nand B\t~A or ~B\n')
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(self.out, 'True\n\nTrue\n')
+        self.assertEqual(
+            self.err,
+            'Line 2: Error! Expected two tab-separated expressions\n')
+
+    def test_to_cnf(self):
+        """Test the to-cnf command."""
+        self.assertEqual(self.run_cli(['to-cnf', 'A -> (B and C)']), 0)
+        self.assertEqual(self.out, r'(~A \/ B) /\ (~A \/ C)' + '\n')
+
+    def test_to_cnf_simplify(self):
+        """Test the to-cnf command with simplification."""
+        self.assertEqual(
+            self.run_cli(['to-cnf', '--simplify', '(A and B) or (A and C)']),
+            0)
+        self.assertEqual(self.out, 'A and (B or C)\n')
+
+    def test_to_primitives(self):
+        """Test the to-primitives command."""
+        self.assertEqual(self.run_cli(['to-primitives', 'A xor B']), 0)
+        self.assertEqual(self.out, '(A and not B) or (not A and B)\n')
+
+    def test_time(self):
+        """Test reporting the time taken by commands."""
+        self.assertEqual(self.run_cli(['sat-one', '--time', 'A']), 0)
+        self.assertEqual(self.out, 'A=1\n')
+        self.assertTrue(
+            re.match(r'^Elapsed time: \d+\.\d{3} ms\n$', self.err))
+
+        self.reset_output()
+        self.assertEqual(
+            self.run_cli(['to-primitives', '--stdin', '--time'], 'A\n\nB\n'),
+            0)
+        self.assertEqual(
+            [line.split(':')[0] for line in self.err.splitlines()],
+            ['Line 1', 'Line 3'])
+
+    def test_library_errors_are_reported(self):
+        """Test that errors other than grammar errors are reported."""
+        self.assertEqual(self.run_cli(['table', '1 or 0']), 1)
+        self.assertEqual(
+            self.err,
+            'Error! This expression is composed only of constant values\n')
+
+    @unittest.skipIf(sys.version_info >= (3, 5),
+                     'The serve command is supported')
+    def test_serve_unsupported(self):
+        """Test running the serve command on older versions of Python."""
+        self.assertEqual(self.run_cli(['serve']), 1)
+        self.assertEqual(
+            self.err, 'The serve command requires Python 3.5 or later.\n')
@@ -0,0 +1,228 @@
+"""Tests for the server run by the serve command."""
+
+import json
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import unittest
+
+from tt.errors import (
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError)
+
+if sys.version_info >= (3, 5):
+    import asyncio
+
+    from tt.cli.server import (
+        EvaluationServer,
+        _with_solver_timeout)
+
+    from ._server_helpers import exchange
+
+
+@unittest.skipIf(sys.version_info < (3, 5),
+                 'The server requires Python 3.5 or later')
+class TestEvaluationServer(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.server = None
+
+    def tearDown(self):
+        if self.server is not None:
+            self.run_async(self.server.close())
+        self.loop.close()
+
+    def run_async(self, coro):
+        """Run a coroutine to completion, with a timeout."""
+        return self.loop.run_until_complete(asyncio.wait_for(coro, 30))
+
+    def start_server(self, path=None, **kwargs):
+        """Start a server on localhost with the given options."""
+        self.server = EvaluationServer(**kwargs)
+        self.run_async(self.server.start(path=path))
+
+    def send_lines(self, lines):
+        """Send lines to the server and collect the decoded responses."""
+        return self.run_async(exchange(self.server.address, lines))
+
+    def send(self, *requests):
+        """Send requests to the server, returning responses in id order."""
+        responses = self.send_lines(
+            [json.dumps(dict(request, id=i)).encode('utf-8')
+             for i, request in enumerate(requests)])
+        self.assertEqual(len(responses), len(requests))
+        return sorted(responses, key=lambda response: response['id'])
+
+    def assert_results(self, requests_and_results):
+        """Assert that each request succeeds with the expected result."""
+        requests, expected = zip(*requests_and_results)
+        for response, result in zip(self.send(*requests), expected):
+            self.assertTrue(response['ok'], response)
+            self.assertEqual(response['result'], result)
+
+    def test_operations(self):
+        """Test each of the supported operations."""
+        self.start_server(workers=0)
+        self.assert_results([
+            ({'op': 'parse', 'expr': 'A or ~B'},
+             {'symbols': ['A', 'B'],
+              'tokens': ['A', 'or', '~', 'B'],
+              'postfix_tokens': ['A', 'B', '~', 'or']}),
+            ({'op': 'evaluate', 'expr': 'A -> B',
+              'values': {'A': 1, 'B': False}}, 0),
+            ({'op': 'table', 'expr': 'A xor B'},
+             {'symbols': ['A', 'B'], 'bits': '0110'}),
+            ({'op': 'sat', 'expr': 'A and ~B'}, {'A': 1, 'B': 0}),
+            ({'op': 'sat', 'expr': 'A and ~A'}, None),
+            ({'op': 'sat', 'expr': 'A or B', 'all': True, 'limit': 2},
+             [{'A': 1, 'B': 1}, {'A': 1, 'B': 0}]),
+            ({'op': 'transform', 'expr': 'A xor B', 'name': 'to_primitives'},
+             '(A and not B) or (not A and B)')])
+
+    def test_errors(self):
+        """Test that failed requests are answered with errors."""
+        self.start_server(workers=0)
+        responses = self.send(
+            {'op': 'parse', 'expr': 'A or'},
+            {'op': 'unknown', 'expr': 'A'},
+            {'op': 'parse', 'expr': 1},
+            {'op': 'evaluate', 'expr': 'A', 'values': {'B': 1}},
+            {'op': 'transform', 'expr': 'A', 'name': 'to_bounded_cnf'},
+            {'op': 'sat', 'expr': 'A', 'all': True, 'limit': -1})
+        self.assertFalse(any(response['ok'] for response in responses))
+        self.assertEqual(
+            [response['error']['type'] for response in responses],
+            ['ExpressionOrderError', 'InvalidArgumentValueError',
+             'InvalidArgumentTypeError', 'ExtraSymbolError',
+             'InvalidArgumentValueError', 'InvalidArgumentValueError'])
+        self.assertEqual(responses[0]['error']['position'], 2)
+
+        responses = self.send_lines([b'not json', b'[1, 2]', b'', b'\xff'])
+        self.assertEqual(len(responses), 3)
+        self.assertTrue(all(
+            response['id'] is None and not response['ok']
+            for response in responses))
+
+    def test_oversized_request(self):
+        """Test that a request beyond the line limit closes the connection."""
+        self.start_server(workers=0)
+        responses = self.send_lines([b'A' * (2**20 + 1)])
+        self.assertEqual(len(responses), 1)
+        self.assertEqual(
+            responses[0]['error']['type'], 'InvalidArgumentValueError')
+
+    def test_expression_cache(self):
+        """Test that parsed expressions are cached by their text."""
+        self.start_server(workers=0, cache_size=2)
+        self.send(
+            {'op': 'parse', 'expr': 'A'},
+            {'op': 'evaluate', 'expr': 'A', 'values': {'A': 1}},
+            {'op': 'parse', 'expr': 'B'},
+            {'op': 'parse', 'expr': 'C'},
+            {'op': 'parse', 'expr': 'A'})
+        self.assertEqual(self.server.cache_info(), (1, 4, 2, 2))
+
+    def test_worker_pool(self):
+        """Test offloading expensive requests to worker processes."""
+        self.start_server(workers=2)
+        wide_expr = ' xor '.join('A{}'.format(i) for i in range(13))
+        requests = [{'op': 'sat', 'expr': 'A{0} and ~B{0}'.format(i)}
+                    for i in range(20)]
+        requests.append({'op': 'table', 'expr': wide_expr})
+        requests.append({'op': 'sat', 'expr': 'A or'})
+        requests.append(
+            {'op': 'transform', 'expr': '~(B or A) -> C', 'name': 'to_cnf'})
+        requests.append({'op': 'transform', 'expr': 'A', 'name': 'unknown'})
+        responses = self.send(*requests)
+
+        for i, response in enumerate(responses[:20]):
+            self.assertEqual(
+                response['result'],
+                {'A{}'.format(i): 1, 'B{}'.format(i): 0})
+        self.assertEqual(
+            responses[20]['result']['bits'].count('1'), 2**12)
+        self.assertEqual(
+            responses[21]['error']['type'], 'ExpressionOrderError')
+        self.assertEqual(responses[22]['result'], r'B \/ A \/ C')
+        self.assertEqual(
+            responses[23]['error']['type'], 'InvalidArgumentValueError')
+
+    def test_solver_limits(self):
+        """Test passing solver limits with sat requests."""
+        self.start_server(workers=0, solver_timeout=10)
+        responses = self.send(
+            {'op': 'sat', 'expr': 'A and ~B', 'decision_limit': 10,
+             'propagation_limit': 10**6, 'timeout': 100},
+            {'op': 'sat', 'expr': 'A or B', 'all': True, 'timeout': 1.5},
+            {'op': 'sat', 'expr': 'A', 'decision_limit': 0},
+            {'op': 'sat', 'expr': 'A', 'timeout': 'never'})
+        self.assertEqual(responses[0]['result'], {'A': 1, 'B': 0})
+        self.assertEqual(len(responses[1]['result']), 3)
+        self.assertEqual(
+            [response['error']['type'] for response in responses[2:]],
+            ['InvalidArgumentValueError', 'InvalidArgumentTypeError'])
+
+    def test_solver_timeout_caps_requests(self):
+        """Test that the server's solver timeout caps request timeouts."""
+        self.assertEqual(
+            _with_solver_timeout({'op': 'sat'}, 5),
+            {'op': 'sat', 'timeout': 5})
+        self.assertEqual(
+            _with_solver_timeout({'timeout': 60}, 5), {'timeout': 5})
+        self.assertEqual(
+            _with_solver_timeout({'timeout': 0.5}, 5), {'timeout': 0.5})
+        self.assertEqual(
+            _with_solver_timeout({'timeout': 'x'}, 5), {'timeout': 'x'})
+
+    @unittest.skipIf(sys.version_info < (3, 7),
+                     'Replacement workers keep connections open')
+    def test_broken_worker_pool_replaced(self):
+        """Test that the worker pool is replaced when a worker dies."""
+        self.start_server(workers=1)
+        executor = self.server._executor
+        for process in list(executor._processes.values()):
+            os.kill(process.pid, signal.SIGKILL)
+            process.join()
+
+        responses = self.send({'op': 'sat', 'expr': 'A'})
+        self.assertEqual(responses[0]['error']['type'], 'BrokenProcessPool')
+        self.assertIsNot(self.server._executor, executor)
+
+        responses = self.send({'op': 'sat', 'expr': 'A and ~B'})
+        self.assertEqual(responses[0]['result'], {'A': 1, 'B': 0})
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'),
+                         'Unix sockets are not supported')
+    def test_unix_socket(self):
+        """Test serving on a Unix socket."""
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, 'tt.sock')
+            self.start_server(path=path, workers=0)
+            self.assertEqual(self.server.address, path)
+            self.assert_results([({'op': 'parse', 'expr': 'A'},
+                                  {'symbols': ['A'], 'tokens': ['A'],
+                                   'postfix_tokens': ['A']})])
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_invalid_arguments(self):
+        """Test creating servers with invalid arguments."""
+        with self.assertRaises(InvalidArgumentTypeError):
+            EvaluationServer(workers='1')
+
+        with self.assertRaises(InvalidArgumentTypeError):
+            EvaluationServer(cache_size=True)
+
+        with self.assertRaises(InvalidArgumentValueError):
+            EvaluationServer(cache_size=-1)
+
+        with self.assertRaises(InvalidArgumentTypeError):
+            EvaluationServer(solver_timeout='1')
+
+        with self.assertRaises(InvalidArgumentValueError):
+            EvaluationServer(solver_timeout=0)
@@ -0,0 +1,74 @@
+"""Tests for the streaming output formats of the table command."""
+
+import json
+
+from tt.cli import tables
+from tt.errors import NoEvaluationVariationError
+from tt.expressions import BooleanExpression
+
+from ._helpers import CliTestCase
+
+
+class TestCliTableFormats(CliTestCase):
+
+    def test_default_format(self):
+        """Test that the box-drawn table remains the default format."""
+        self.assertEqual(self.run_cli(['table', '~A']), 0)
+        self.assertEqual(
+            self.out,
+            '+---+---+\n'
+            '| A |   |\n'
+            '+---+---+\n'
+            '| 0 | 1 |\n'
+            '+---+---+\n'
+            '| 1 | 0 |\n'
+            '+---+---+\n')
+
+    def test_csv(self):
+        """Test the csv format."""
+        self.assertEqual(
+            self.run_cli(['table', '--format', 'csv', 'A', 'or', '~B']), 0)
+        self.assertEqual(
+            self.out, 'A,B,result\n0,0,1\n0,1,0\n1,0,1\n1,1,1\n')
+
+    def test_jsonl(self):
+        """Test the jsonl format."""
+        self.assertEqual(
+            self.run_cli(['table', '--format', 'jsonl', 'A nand 1']), 0)
+        rows = [json.loads(line) for line in self.out.splitlines()]
+        self.assertEqual(rows, [
+            {'inputs': {'A': 0}, 'result': 1},
+            {'inputs': {'A': 1}, 'result': 0}])
+
+    def test_bits(self):
+        """Test the bits format."""
+        self.assertEqual(
+            self.run_cli(['table', '--format', 'bits', 'A xor B xor C']), 0)
+        self.assertEqual(self.out, '01101001\n')
+
+    def test_rows_are_written_in_chunks(self):
+        """Test tables spanning several chunks of output."""
+        expr = ' or '.join('A{}'.format(i) for i in range(13))
+        chunks = list(tables.iter_table_chunks(
+            BooleanExpression(expr), 'bits'))
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(''.join(chunks), '0' + '1' * (2**13 - 1) + '\n')
+
+        chunks = list(tables.iter_table_chunks(
+            BooleanExpression(expr), 'csv'))
+        self.assertEqual(len(chunks), 3)
+        lines = ''.join(chunks).splitlines()
+        self.assertEqual(len(lines), 2**13 + 1)
+        self.assertEqual(lines[1], ','.join(['0'] * 14))
+
+    def test_batch(self):
+        """Test streaming formats in batch mode."""
+        exit_code = self.run_cli(
+            ['table', '--stdin', '--format', 'bits'], 'A and B\nA or\n~A\n')
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(self.out, '0001\n\n10\n')
+
+    def test_constant_expression(self):
+        """Test formatting an expression without any symbols."""
+        with self.assertRaises(NoEvaluationVariationError):
+            tables.iter_table_chunks(BooleanExpression('1 or 0'), 'csv')
@@ -0,0 +1,91 @@
+"""Tests for the cost profiles of expressions."""
+
+import unittest
+
+from tt.expressions import (
+    BooleanExpression as be,
+    CostThresholds,
+    ENGINE_BOUNDED_CNF,
+    ENGINE_CNF,
+    ENGINE_TRUTH_TABLE)
+from tt.trees import ExpressionTreeNode
+
+
+class TestExpressionCostProfile(unittest.TestCase):
+
+    def test_single_operand(self):
+        """Test the profile of an expression of a single symbol."""
+        profile = be('A').cost_profile()
+        self.assertEqual(1, profile.num_nodes)
+        self.assertEqual(0, profile.depth)
+        self.assertEqual(1, profile.num_symbols)
+        self.assertEqual(1, profile.estimated_cnf_clauses)
+        self.assertEqual(2, profile.estimated_table_size)
+
+    def test_structure_metrics(self):
+        """Test counting the nodes, depth, and costly operators."""
+        profile = be('(A xor B) or ~(C xnor (A -> D)) or (B impl 1)') \
+            .cost_profile()
+        self.assertEqual(14, profile.num_nodes)
+        self.assertEqual(5, profile.depth)
+        self.assertEqual(4, profile.num_symbols)
+        self.assertEqual(1, profile.num_xors)
+        self.assertEqual(1, profile.num_xnors)
+        self.assertEqual(2, profile.num_impls)
+        self.assertEqual(16, profile.estimated_table_size)
+
+    def test_cnf_estimate_exact_for_cnf(self):
+        """Test that the clause estimate of an expression in CNF is exact."""
+        b = be('(A or B) and (~A or C) and D and (B or ~C or ~D)')
+        self.assertEqual(4, b.cost_profile().estimated_cnf_clauses)
+
+    def test_cnf_estimate_bounds_distribution(self):
+        """Test that the clause estimate bounds the converted clauses."""
+        for expr in ('(A and B) or (C and D)',
+                     'A nand (B nor C)',
+                     '~((A or B) and (C -> D))',
+                     'A xor B xor C'):
+            b = be(expr)
+            num_clauses = sum(1 for _ in b.tree.to_cnf().iter_cnf_clauses())
+            self.assertLessEqual(
+                num_clauses, b.cost_profile().estimated_cnf_clauses, expr)
+
+        self.assertEqual(
+            4, be('(A and B) or (C and D)').cost_profile()
+            .estimated_cnf_clauses)
+
+    def test_cnf_estimate_overflows_to_infinity(self):
+        """Test that huge clause estimates become infinite."""
+        b = be(' xor '.join('A{}'.format(i) for i in range(64)))
+        self.assertEqual(float('inf'),
+                         b.cost_profile().estimated_cnf_clauses)
+
+    def test_deep_tree(self):
+        """Test profiling a tree too deep to walk recursively."""
+        postfix_tokens = ['A0']
+        for i in range(1, 10000):
+            postfix_tokens.extend(('A{}'.format(i), 'and'))
+        b = be(ExpressionTreeNode.build_tree(postfix_tokens))
+        profile = b.cost_profile()
+        self.assertEqual(19999, profile.num_nodes)
+        self.assertEqual(9999, profile.depth)
+        self.assertEqual(10000, profile.estimated_cnf_clauses)
+        self.assertEqual(2**10000, profile.estimated_table_size)
+
+    def test_choose_engine(self):
+        """Test choosing engines with default and custom thresholds."""
+        self.assertEqual(ENGINE_TRUTH_TABLE,
+                         be('A and B').cost_profile().choose_engine())
+
+        wide = be(' and '.join('A{}'.format(i) for i in range(20)))
+        self.assertFalse(wide.cost_profile().fits_truth_table())
+        self.assertTrue(wide.cost_profile().fits_cnf())
+        self.assertEqual(ENGINE_CNF, wide.cost_profile().choose_engine())
+
+        chain = be(' xor '.join('A{}'.format(i) for i in range(20)))
+        self.assertEqual(ENGINE_BOUNDED_CNF,
+                         chain.cost_profile().choose_engine())
+        self.assertEqual(
+            ENGINE_TRUTH_TABLE,
+            chain.cost_profile().choose_engine(
+                CostThresholds(max_table_size=2**20)))
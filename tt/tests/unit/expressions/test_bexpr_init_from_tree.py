@@ -357,3 +357,31 @@ class TestBooleanExpressionInitFromTrees(unittest.TestCase):
             b.raw_expr,
             'A and B and C and D and E')
         self.assertTrue(b.tree is not None)
+
+    def test_tree_is_adopted(self):
+        """Test that the passed tree is used directly, not rebuilt."""
+        tree = ExpressionTreeNode.build_tree(['A', 'B', 'or', 'C', 'and'])
+        b = BooleanExpression(tree)
+        self.assertIs(tree, b.tree)
+
+        sub_b = BooleanExpression(tree.l_child)
+        self.assertIs(tree.l_child, sub_b.tree)
+        self.assertEqual('A or B', str(sub_b))
+
+    def test_serialization_is_deferred(self):
+        """Test that string forms are generated on first access only."""
+        b = self._bexpr_from_postfix_tokens(
+            ['B', '1', 'or', 'A', '~', 'B', 'xor', 'and'])
+        self.assertEqual(['B', 'A'], b.symbols)
+        self.assertIsNone(b._raw_expr)
+
+        self.assertEqual('<BooleanExpression "(B or 1) and (~A xor B)">',
+                         repr(b))
+        tokens = b.tokens
+        self.assertIs(tokens, b.tokens)
+        self.assertEqual(
+            ['(', 'B', 'or', '1', ')', 'and', '(', '~', 'A', 'xor', 'B', ')'],
+            tokens)
+        self.assertEqual(
+            ['B', '1', 'or', 'A', '~', 'B', 'xor', 'and'],
+            b.postfix_tokens)
@@ -1,6 +1,15 @@
 """Tests for expression sat_all functionality."""
 
-from tt.errors import NoEvaluationVariationError
+import itertools
+import sys
+import unittest
+
+from tt.errors import (
+    ExtraSymbolError,
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError,
+    NoEvaluationVariationError,
+    SolverLimitError)
 from tt.expressions import BooleanExpression as be
 
 from ._helpers import ExpressionTestCase
@@ -101,3 +110,136 @@ class TestExpressionSatAll(ExpressionTestCase):
         with be('A or B or C or D').constrain(A=0, B=0, C=0, D=0) as b:
             res = list(str(sol) for sol in b.sat_all())
         self.assertEqual(0, len(res))
+
+    def test_symbol_eliminated_in_cnf(self):
+        """Test a symbol that does not constrain the solutions."""
+        b = be('~(A and ~A) and B')
+        res = list(str(sol) for sol in b.sat_all())
+        self.assertEqual(2, len(res))
+        self.assertIn('A=0, B=1', res)
+        self.assertIn('A=1, B=1', res)
+
+    def test_project_onto_subset_of_symbols(self):
+        """Test projecting solutions onto a subset of the symbols."""
+        b = be('(A or B) and (C or D or E)')
+        res = list(str(sol) for sol in b.sat_all(project=['A', 'B']))
+        self.assertEqual(3, len(res))
+        self.assertIn('A=1, B=0', res)
+        self.assertIn('A=0, B=1', res)
+        self.assertIn('A=1, B=1', res)
+
+    def test_project_symbols_ordered_by_appearance(self):
+        """Test projected solutions keep the expression's symbol order."""
+        b = be('A and ~B and C')
+        res = list(str(sol) for sol in b.sat_all(project=['C', 'A']))
+        self.assertEqual(['A=1, C=1'], res)
+
+    def test_project_with_constraints(self):
+        """Test projecting solutions of a constrained expression."""
+        b = be('(A xor B) and (C or D)')
+        with b.constrain(C=0):
+            res = list(str(sol) for sol in b.sat_all(project=['A', 'D']))
+        self.assertEqual(2, len(res))
+        self.assertIn('A=1, D=1', res)
+        self.assertIn('A=0, D=1', res)
+
+    def test_project_all_symbols_constrained(self):
+        """Test projecting when all symbols are constrained."""
+        with be('A or B').constrain(A=1, B=0) as b:
+            res = list(str(sol) for sol in b.sat_all(project=['B']))
+        self.assertEqual(['B=0'], res)
+
+    def test_project_onto_symbol_eliminated_in_cnf(self):
+        """Test projecting onto a symbol not constraining the solutions."""
+        b = be('(A or ~A) and B')
+        res = list(str(sol) for sol in b.sat_all(project=['A']))
+        self.assertEqual(2, len(res))
+        self.assertIn('A=0', res)
+        self.assertIn('A=1', res)
+
+    def test_project_invalid_arguments(self):
+        """Test passing invalid symbols to project onto."""
+        b = be('A or B')
+        with self.assertRaises(ExtraSymbolError):
+            list(b.sat_all(project=['A', 'C']))
+
+        with self.assertRaises(InvalidArgumentTypeError):
+            list(b.sat_all(project='A'))
+
+        with self.assertRaises(InvalidArgumentValueError):
+            list(b.sat_all(project=[]))
+
+    def test_solver_limits(self):
+        """Test passing solver resource limits through."""
+        b = be('(A or B) and (C or D)')
+        with self.assertRaises(SolverLimitError):
+            list(b.sat_all(decision_limit=1))
+
+        self.assertEqual(
+            9, len(list(b.sat_all(decision_limit=10, propagation_limit=100,
+                                  timeout=10))))
+
+    def test_solver_stats(self):
+        """Test that solver statistics include sat_all searches."""
+        b = be('(A or B) and (C or D)')
+        self.assertEqual(9, len(list(b.sat_all())))
+        self.assertEqual(10, b.solver_stats.searches)
+
+        sols = b.sat_all()
+        next(sols)
+        sols.close()
+        self.assertEqual(11, b.solver_stats.searches)
+
+        with self.assertRaises(SolverLimitError):
+            list(b.sat_all(decision_limit=1))
+        self.assertEqual(12, b.solver_stats.searches)
+
+    @unittest.skipIf(sys.version_info < (3,),
+                     'Batched solutions require Python 3')
+    def test_batches_cover_all_solutions_once(self):
+        """Test that batched partial solutions cover each solution once."""
+        b = be('(A or B or C) and (~A or D)')
+        batches = list(b.sat_all(batch_size=2))
+        self.assertTrue(all(1 <= len(batch) <= 2 for batch in batches))
+
+        expanded = []
+        for solution in itertools.chain.from_iterable(batches):
+            self.assertEqual(('A', 'B', 'C', 'D'), solution._fields)
+            options = [[val] if val is not None else [False, True] for
+                       val in solution]
+            expanded.extend(itertools.product(*options))
+        expected = [tuple(solution) for solution in b.sat_all()]
+        self.assertEqual(sorted(expected), sorted(expanded))
+
+    @unittest.skipIf(sys.version_info < (3,),
+                     'Batched solutions require Python 3')
+    def test_batches_with_project_and_constraints(self):
+        """Test batched solutions of a projected, constrained expression."""
+        b = be('(A xor B) and (C or D)')
+        with b.constrain(C=0):
+            res = [str(solution) for batch in
+                   b.sat_all(project=['A', 'D'], batch_size=4) for
+                   solution in batch]
+        self.assertEqual(['A=0, D=1', 'A=1, D=1'], sorted(res))
+
+        with be('A or B').constrain(A=1, B=0) as b:
+            res = [[str(solution) for solution in batch] for
+                   batch in b.sat_all(batch_size=4)]
+        self.assertEqual([['A=1, B=0']], res)
+
+        self.assertEqual([], list(be('A and ~A').sat_all(batch_size=4)))
+
+    def test_batches_invalid_batch_size(self):
+        """Test passing invalid values as the batch_size argument."""
+        with self.assertRaises(InvalidArgumentTypeError):
+            list(be('A or B').sat_all(batch_size='1'))
+
+        with self.assertRaises(InvalidArgumentValueError):
+            list(be('A or B').sat_all(batch_size=0))
+
+    @unittest.skipUnless(sys.version_info < (3,),
+                         'Batched solutions are supported')
+    def test_batches_unsupported(self):
+        """Test that batched solutions are rejected on Python 2."""
+        with self.assertRaises(InvalidArgumentValueError):
+            list(be('A or B').sat_all(batch_size=1))
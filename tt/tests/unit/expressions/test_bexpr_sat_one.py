@@ -1,6 +1,8 @@
 """Tests for expression sat_one functionality."""
 
-from tt.errors import NoEvaluationVariationError
+from tt.errors import (
+    NoEvaluationVariationError,
+    SolverLimitError)
 from tt.expressions import BooleanExpression as be
 
 from ._helpers import ExpressionTestCase
@@ -83,3 +85,36 @@ class TestExpressionSatOne(ExpressionTestCase):
             with b.constrain(C=1):
                 res = b.sat_one()
                 self.assertEqual('A=0, B=1, C=1, D=1', str(res))
+
+    def test_solver_limits(self):
+        """Test passing solver resource limits through."""
+        b = be('(A or B) and (C or D)')
+        with self.assertRaises(SolverLimitError):
+            b.sat_one(decision_limit=1)
+
+        res = b.sat_one(decision_limit=10, propagation_limit=100, timeout=10)
+        self.assertTrue(b.evaluate(**res._asdict()))
+
+    def test_solver_stats(self):
+        """Test that solver statistics add up over calls."""
+        b = be('(A or B) and (C or D)')
+        self.assertEqual(0, b.solver_stats.searches)
+        b.sat_one()
+        first = b.solver_stats
+        self.assertEqual(1, first.searches)
+        b.sat_one()
+        self.assertEqual(2, b.solver_stats.searches)
+        self.assertEqual(2 * first.decisions, b.solver_stats.decisions)
+
+        with b.constrain(A=1, B=0, C=1, D=0):
+            b.sat_one()
+        self.assertEqual(2, b.solver_stats.searches)
+
+    def test_solver_stats_after_limit_error(self):
+        """Test that searches abandoned at a limit are counted."""
+        b = be('(A or B) and (C or D)')
+        with self.assertRaises(SolverLimitError) as cm:
+            b.sat_one(decision_limit=1)
+        self.assertEqual(1, cm.exception.stats.searches)
+        self.assertEqual(cm.exception.stats, b.solver_stats)
+        self.assertGreater(b.solver_stats.decisions, 0)
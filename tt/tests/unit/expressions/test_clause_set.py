@@ -0,0 +1,146 @@
+"""Tests for the ClauseSet representation of normal form expressions."""
+
+import unittest
+
+from tt.errors import (
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError,
+    RequiresNormalFormError)
+from tt.expressions import (
+    BooleanExpression,
+    ClauseSet)
+
+
+class TestClauseSet(unittest.TestCase):
+
+    def assert_clauses(self, clause_set, expected_symbols, expected_clauses):
+        """Assert the symbols and clauses of a clause set."""
+        self.assertEqual(clause_set.symbols, expected_symbols)
+        self.assertEqual([list(clause) for clause in clause_set],
+                         expected_clauses)
+        self.assertEqual(len(clause_set), len(expected_clauses))
+
+    def test_from_cnf_tree(self):
+        """Test building CNF clauses from a tree."""
+        tree = BooleanExpression('(A or ~B) and (C or A) and ~C').tree
+        clause_set = ClauseSet.from_tree(tree)
+        self.assertTrue(clause_set.is_cnf)
+        self.assert_clauses(
+            clause_set, ['A', 'B', 'C'], [[1, -2], [3, 1], [-3]])
+        self.assertEqual(list(clause_set.literals), [1, -2, 3, 1, -3])
+        self.assertEqual(list(clause_set.offsets), [0, 2, 4, 5])
+
+    def test_from_dnf_tree(self):
+        """Test building DNF clauses from a tree."""
+        tree = BooleanExpression('(A and ~B) or C').tree
+        clause_set = ClauseSet.from_tree(tree, is_cnf=False)
+        self.assertTrue(clause_set.is_dnf)
+        self.assert_clauses(clause_set, ['A', 'B', 'C'], [[1, -2], [3]])
+
+    def test_from_tree_not_in_normal_form(self):
+        """Test building clauses from a tree not in the requested form."""
+        with self.assertRaises(RequiresNormalFormError):
+            ClauseSet.from_tree(BooleanExpression('(A and B) or C').tree)
+
+        with self.assertRaises(RequiresNormalFormError):
+            ClauseSet.from_tree(BooleanExpression('(A or B) and C').tree,
+                                is_cnf=False)
+
+    def test_from_cnf_tree_with_constants(self):
+        """Test that constants are simplified away from CNF clauses."""
+        tree = BooleanExpression('(A or 0) and (B or 1) and (~1 or ~A)').tree
+        self.assert_clauses(ClauseSet.from_tree(tree), ['A'], [[1], [-1]])
+
+        clause_set = ClauseSet.from_tree(
+            BooleanExpression('A and (0 or ~1)').tree)
+        self.assert_clauses(clause_set, ['A'], [[1], []])
+        self.assertTrue(clause_set.has_empty_clause)
+
+        clause_set = ClauseSet.from_tree(BooleanExpression('1').tree)
+        self.assert_clauses(clause_set, [], [])
+        self.assertFalse(clause_set.has_empty_clause)
+
+    def test_from_dnf_tree_with_constants(self):
+        """Test that constants are simplified away from DNF clauses."""
+        tree = BooleanExpression('(A and 1) or (B and 0) or ~A').tree
+        self.assert_clauses(
+            ClauseSet.from_tree(tree, is_cnf=False), ['A'], [[1], [-1]])
+
+    def test_init_from_lists(self):
+        """Test building a clause set directly from lists of literals."""
+        clause_set = ClauseSet(['A', 'B'], [[1, 2], (-2,)], is_cnf=False)
+        self.assert_clauses(clause_set, ['A', 'B'], [[1, 2], [-2]])
+        self.assertTrue(clause_set.is_dnf)
+
+    def test_init_invalid_symbols(self):
+        """Test passing invalid symbols."""
+        with self.assertRaises(InvalidArgumentTypeError):
+            ClauseSet('AB', [[1]])
+
+        with self.assertRaises(InvalidArgumentTypeError):
+            ClauseSet(['A', 1], [[1]])
+
+    def test_init_invalid_literals(self):
+        """Test passing invalid literals."""
+        with self.assertRaises(InvalidArgumentTypeError):
+            ClauseSet(['A'], [['A']])
+
+        with self.assertRaises(InvalidArgumentValueError):
+            ClauseSet(['A'], [[1, 0]])
+
+        with self.assertRaises(InvalidArgumentValueError):
+            ClauseSet(['A'], [[-2]])
+
+    def test_bexpr(self):
+        """Test converting clause sets back to expressions."""
+        clause_set = ClauseSet(['A', 'B', 'C'], [[1, -2], [3]])
+        b = clause_set.bexpr
+        self.assertEqual(b.raw_expr, '(A or not B) and C')
+        self.assertIs(clause_set.bexpr, b)
+        self.assertEqual(clause_set.tree, b.tree)
+
+        clause_set = ClauseSet(['A', 'B'], [[1, -2], [2]], is_cnf=False)
+        self.assertEqual(clause_set.bexpr.raw_expr, '(A and not B) or B')
+
+    def test_bexpr_round_trip(self):
+        """Test that clause sets and the trees they are built from agree."""
+        b = BooleanExpression('(A or ~B or C) and (~A or D) and B')
+        self.assertEqual(ClauseSet.from_tree(b.tree).tree, b.tree)
+
+    def test_bexpr_of_empty_clauses(self):
+        """Test converting empty clauses and clause sets to expressions."""
+        self.assertEqual(ClauseSet(['A'], []).bexpr.raw_expr, '1')
+        self.assertEqual(ClauseSet(['A'], [[1], []]).bexpr.raw_expr,
+                         'A and 0')
+        self.assertEqual(ClauseSet(['A'], [], is_cnf=False).bexpr.raw_expr,
+                         '0')
+        self.assertEqual(
+            ClauseSet(['A'], [[]], is_cnf=False).bexpr.raw_expr, '1')
+
+    def test_eq(self):
+        """Test comparing clause sets."""
+        self.assertEqual(ClauseSet(['A', 'B'], [[1, 2]]),
+                         ClauseSet(['A', 'B'], [[1, 2]]))
+        self.assertNotEqual(ClauseSet(['A', 'B'], [[1, 2]]),
+                            ClauseSet(['A', 'B'], [[1], [2]]))
+        self.assertNotEqual(ClauseSet(['A', 'B'], [[1, 2]]),
+                            ClauseSet(['B', 'A'], [[1, 2]]))
+        self.assertNotEqual(ClauseSet(['A', 'B'], [[1, 2]]),
+                            ClauseSet(['A', 'B'], [[1, 2]], is_cnf=False))
+
+    def test_bexpr_to_clause_set_is_cached(self):
+        """Test that expressions convert to CNF clauses only once."""
+        b = BooleanExpression('A xor B')
+        clause_set = b.to_clause_set()
+        self.assertTrue(clause_set.is_cnf)
+        self.assertIs(b.to_clause_set(), clause_set)
+        self.assertEqual(dict(clause_set.bexpr.sat_one()._asdict()),
+                         dict(b.sat_one()._asdict()))
+
+    def test_bexpr_to_dnf_clause_set(self):
+        """Test getting the DNF clauses of an expression."""
+        b = BooleanExpression('(A or B) and (A or C)')
+        clause_set = b.to_clause_set(is_cnf=False)
+        self.assertTrue(clause_set.is_dnf)
+        self.assertIs(b.to_clause_set(is_cnf=False), clause_set)
+        self.assert_clauses(clause_set, ['A', 'B', 'C'], [[1], [2, 3]])
@@ -0,0 +1,165 @@
+"""Tests for the generators of CNF problem instances."""
+
+import unittest
+
+from io import StringIO
+
+from tt.errors import (
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError)
+from tt.generators import (
+    parity_chain,
+    pigeonhole,
+    random_ksat,
+    ripple_carry_adder)
+from tt.satisfiability import dimacs
+from tt.satisfiability.picosat import sat_all, sat_one
+from tt.tables import TruthTable
+
+
+class TestCnfGenerators(unittest.TestCase):
+
+    def assert_counts(self, instance):
+        """Assert that an instance produces as many clauses as it claims."""
+        clauses = list(instance)
+        self.assertEqual(len(clauses), instance.num_clauses)
+        for clause in clauses:
+            self.assertTrue(clause)
+            self.assertTrue(all(
+                0 < abs(lit) <= instance.num_vars for lit in clause))
+
+    def count_solutions(self, instance, num_projected):
+        """Count the solutions of an instance over its first variables."""
+        project = list(range(1, num_projected + 1))
+        return sum(1 for _ in sat_all(instance, project=project))
+
+    def test_random_ksat(self):
+        """Test the shape and reproducibility of random k-SAT instances."""
+        instance = random_ksat(50, ratio=3.5, k=4, seed=7)
+        self.assert_counts(instance)
+        self.assertEqual(instance.num_clauses, 175)
+        self.assertEqual(instance.num_vars, 50)
+        for clause in instance:
+            self.assertEqual(len(set(abs(lit) for lit in clause)), 4)
+
+        self.assertEqual(list(instance), list(random_ksat(50, 3.5, 4, 7)))
+        self.assertNotEqual(list(instance), list(random_ksat(50, 3.5, 4, 8)))
+
+        unseeded = random_ksat(20)
+        self.assertEqual(list(unseeded), list(unseeded))
+
+    def test_random_ksat_density(self):
+        """Test that sparse instances are satisfiable and dense ones not."""
+        self.assertIsNotNone(sat_one(random_ksat(100, ratio=1, seed=0)))
+        self.assertIsNone(sat_one(random_ksat(100, ratio=10, seed=0)))
+
+    def test_random_ksat_argument_checks(self):
+        """Test the checks on the arguments of random_ksat."""
+        with self.assertRaises(InvalidArgumentTypeError):
+            random_ksat(10.0)
+        with self.assertRaises(InvalidArgumentTypeError):
+            random_ksat(10, ratio='4')
+        with self.assertRaises(InvalidArgumentValueError):
+            random_ksat(0)
+        with self.assertRaises(InvalidArgumentValueError):
+            random_ksat(2, k=3)
+        with self.assertRaises(InvalidArgumentValueError):
+            random_ksat(10, ratio=-1)
+
+    def test_parity_chain(self):
+        """Test that parity chains are satisfied by half the assignments."""
+        for length in (1, 2, 5):
+            for parity in (True, False):
+                instance = parity_chain(length, parity=parity)
+                self.assert_counts(instance)
+                self.assertEqual(self.count_solutions(instance, length),
+                                 2 ** (length - 1))
+                for solution in sat_all(instance):
+                    num_true = sum(1 for lit in solution[:length] if lit > 0)
+                    self.assertEqual(num_true % 2 == 1, parity)
+
+        with self.assertRaises(InvalidArgumentValueError):
+            parity_chain(0)
+
+    def test_parity_chain_expression(self):
+        """Test a parity chain against its truth table."""
+        b = parity_chain(3).to_expression()
+        table = TruthTable(b)
+        for inputs, result in table:
+            # the chain's own symbols come first in the expression
+            chain = [inputs.x1, inputs.x2, inputs.x3]
+            links = [inputs.x4, inputs.x5]
+            expected = (links[0] == (chain[0] != chain[1]) and
+                        links[1] == (links[0] != chain[2]) and
+                        links[1])
+            self.assertEqual(bool(result), bool(expected))
+
+    def test_pigeonhole(self):
+        """Test that pigeonhole instances are unsatisfiable when crowded."""
+        for holes in (1, 2, 3):
+            instance = pigeonhole(holes)
+            self.assert_counts(instance)
+            self.assertEqual(instance.num_vars, holes * (holes + 1))
+            self.assertIsNone(sat_one(instance))
+
+        roomy = pigeonhole(3, pigeons=2)
+        self.assert_counts(roomy)
+        # pigeons may sit in several holes, so long as they share none
+        self.assertEqual(self.count_solutions(roomy, roomy.num_vars), 12)
+
+        with self.assertRaises(InvalidArgumentValueError):
+            pigeonhole(0)
+        with self.assertRaises(InvalidArgumentTypeError):
+            pigeonhole(2, pigeons='3')
+
+    def test_ripple_carry_adder(self):
+        """Test that adders relate their addends to their sum."""
+        num_bits = 3
+        instance = ripple_carry_adder(num_bits)
+        self.assert_counts(instance)
+        self.assertEqual(self.count_solutions(instance, 2 * num_bits),
+                         2 ** (2 * num_bits))
+
+        def value(solution, variables):
+            return sum(1 << i for i, var in enumerate(variables)
+                       if solution[var - 1] > 0)
+
+        a_vars = range(1, num_bits + 1)
+        b_vars = range(num_bits + 1, 2 * num_bits + 1)
+        sum_vars = (list(range(3 * num_bits + 2, 4 * num_bits + 2)) +
+                    [3 * num_bits + 1])
+        for solution in sat_all(instance):
+            self.assertEqual(value(solution, a_vars) + value(solution, b_vars),
+                             value(solution, sum_vars))
+
+    def test_ripple_carry_adder_total(self):
+        """Test fixing the sum of an adder."""
+        for total, num_solutions in ((0, 1), (6, 7), (9, 6), (14, 1)):
+            instance = ripple_carry_adder(3, total=total)
+            self.assert_counts(instance)
+            self.assertEqual(self.count_solutions(instance, 6), num_solutions)
+
+        with self.assertRaises(InvalidArgumentValueError):
+            ripple_carry_adder(3, total=16)
+        with self.assertRaises(InvalidArgumentValueError):
+            ripple_carry_adder(3, total=-1)
+
+    def test_write_dimacs_round_trip(self):
+        """Test that instances written as DIMACS read back the same."""
+        instance = random_ksat(30, seed=3)
+        f = StringIO()
+        instance.write_dimacs(f, comments=['random 3-SAT'])
+        self.assertTrue(f.getvalue().startswith(
+            'c random 3-SAT\np cnf 30 128\n'))
+
+        f.seek(0)
+        self.assertEqual(list(dimacs.iter_clauses(f)), list(instance))
+
+    def test_expression_text(self):
+        """Test the expression form of an instance."""
+        instance = pigeonhole(2, pigeons=1)
+        self.assertEqual(list(instance.iter_expression_text()),
+                         ['(x1 or x2)'])
+        b = random_ksat(10, ratio=2, seed=1).to_expression()
+        self.assertTrue(b.is_cnf)
+        self.assertEqual(len(list(b.iter_cnf_clauses())), 20)
@@ -0,0 +1,102 @@
+"""Tests for the generators of random expressions."""
+
+import itertools
+import re
+import unittest
+
+from tt.definitions import OPERATOR_MAPPING
+from tt.errors import (
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError)
+from tt.generators import (
+    DEFAULT_OPERATORS,
+    iter_random_expression,
+    random_expression)
+from tt.trees import (
+    OperandExpressionTreeNode,
+    UnaryOperatorExpressionTreeNode)
+
+
+class TestRandomExpressions(unittest.TestCase):
+
+    def test_depth(self):
+        """Test that expressions have exactly the requested depth."""
+        for depth in (0, 1, 4, 9):
+            for seed in range(5):
+                b = random_expression(6, depth, seed=seed)
+                self.assertEqual(self.depth_of(b.tree), depth)
+
+    def depth_of(self, node):
+        """Get the number of levels of binary operators in a tree."""
+        if isinstance(node, OperandExpressionTreeNode):
+            return 0
+        elif isinstance(node, UnaryOperatorExpressionTreeNode):
+            return self.depth_of(node.l_child)
+        return 1 + max(self.depth_of(node.l_child),
+                       self.depth_of(node.r_child))
+
+    def test_balanced(self):
+        """Test that balanced expressions hold 2 ** depth symbols."""
+        text = ''.join(iter_random_expression(4, 6, balanced=True, seed=2))
+        self.assertEqual(len(re.findall(r'x\d+', text)), 2 ** 6)
+
+    def test_symbols(self):
+        """Test that operands are drawn from the requested symbols."""
+        b = random_expression(3, 8, seed=1)
+        self.assertTrue(set(b.symbols) <= set(['x1', 'x2', 'x3']))
+
+    def test_seed(self):
+        """Test that the seed determines the expression."""
+        self.assertEqual(random_expression(5, 6, seed=4).raw_expr,
+                         random_expression(5, 6, seed=4).raw_expr)
+        self.assertNotEqual(random_expression(5, 6, seed=4).raw_expr,
+                            random_expression(5, 6, seed=5).raw_expr)
+
+    def test_operator_mix(self):
+        """Test restricting and weighting the operators drawn from."""
+        text = ''.join(iter_random_expression(
+            4, 8, operators=['->', '&&'], balanced=True, seed=0))
+        operators = set(re.findall(r' (\S+) ', text))
+        self.assertEqual(operators, set(['->', '&&']))
+
+        text = ''.join(iter_random_expression(
+            4, 8, operators={'and': 1, 'or': 99}, balanced=True, seed=0))
+        self.assertGreater(text.count(' or '), 10 * text.count(' and '))
+
+        for operator in DEFAULT_OPERATORS:
+            self.assertIn(operator, OPERATOR_MAPPING)
+
+    def test_negation_probability(self):
+        """Test the extremes of the negation probability."""
+        self.assertNotIn('~', ''.join(iter_random_expression(
+            4, 6, negation_probability=0, seed=0)))
+
+        b = random_expression(2, 0, negation_probability=1, seed=0)
+        self.assertIn(b.raw_expr, ('~x1', '~x2'))
+
+    def test_streams_deep_expressions(self):
+        """Test that very deep expressions stream without recursing."""
+        chunks = iter_random_expression(10, 10000, seed=0)
+        head = ''.join(itertools.islice(chunks, 100))
+        self.assertGreater(head.count('('), 25)
+
+    def test_argument_checks(self):
+        """Test the checks on the arguments of the generators."""
+        with self.assertRaises(InvalidArgumentValueError):
+            iter_random_expression(0, 2)
+        with self.assertRaises(InvalidArgumentValueError):
+            iter_random_expression(2, -1)
+        with self.assertRaises(InvalidArgumentTypeError):
+            iter_random_expression(2, 2.0)
+        with self.assertRaises(InvalidArgumentValueError):
+            iter_random_expression(2, 2, operators=['not'])
+        with self.assertRaises(InvalidArgumentValueError):
+            iter_random_expression(2, 2, operators=['implies'])
+        with self.assertRaises(InvalidArgumentValueError):
+            iter_random_expression(2, 2, operators=[])
+        with self.assertRaises(InvalidArgumentTypeError):
+            iter_random_expression(2, 2, operators='and')
+        with self.assertRaises(InvalidArgumentValueError):
+            iter_random_expression(2, 2, operators={'and': 0})
+        with self.assertRaises(InvalidArgumentValueError):
+            iter_random_expression(2, 2, negation_probability=1.5)
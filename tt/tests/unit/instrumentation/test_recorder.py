@@ -0,0 +1,163 @@
+"""Tests for the instrumentation of tt's hot paths."""
+
+import sys
+import unittest
+
+from tt.errors import (
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError)
+from tt.expressions import BooleanExpression
+from tt.instrumentation import (
+    add_hook,
+    instrument,
+    remove_hook)
+from tt.instrumentation import recorder
+from tt.satisfiability import picosat
+from tt.trees import (
+    ExpressionTreeNode,
+    iter_transformation_memos)
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        # transformations are memoized, so start each test from scratch
+        for memo in iter_transformation_memos():
+            memo.cache_clear()
+
+    def test_disabled_by_default(self):
+        """Test that nothing is enabled or patched in outside a block."""
+        self.assertFalse(recorder.enabled)
+        self.assertIs(recorder.phase('x'), recorder._NULL_PHASE)
+
+        init = ExpressionTreeNode.__dict__['__init__']
+        with instrument() as record:
+            self.assertTrue(recorder.enabled)
+            self.assertIs(ExpressionTreeNode.__dict__['__init__'], init)
+        self.assertFalse(recorder.enabled)
+
+        BooleanExpression('A or B')
+        self.assertEqual(record.counters, {})
+
+    def test_memo_hits_record_nothing(self):
+        """Test that a conversion found in the memo records no phase."""
+        b = BooleanExpression('A xor B')
+        with instrument() as record:
+            b.tree.to_cnf()
+            b.tree.to_cnf()
+
+        self.assertEqual(record.calls['to_cnf'], 1)
+
+    def test_parse_phases(self):
+        """Test the phases and node count of parsing an expression."""
+        with instrument() as record:
+            BooleanExpression('A or ~B')
+
+        self.assertEqual(sorted(record.timings),
+                         ['build_tree', 'to_postfix', 'tokenize'])
+        self.assertEqual(record.calls['tokenize'], 1)
+        self.assertTrue(all(t >= 0 for t in record.timings.values()))
+        self.assertEqual(record.counters, {'trees.nodes': 4})
+
+    def test_sat_counters(self):
+        """Test the counters of converting and solving an expression."""
+        b = BooleanExpression('(A xor B) or C')
+        with instrument() as record:
+            self.assertIsNotNone(b.sat_one())
+            self.assertEqual(sum(1 for _ in b.sat_all()), 6)
+
+        for name in ('to_cnf', 'clause_set', 'picosat.sat_one',
+                     'picosat.sat_all'):
+            self.assertIn(name, record.timings)
+        counters = record.counters
+        self.assertEqual(counters['solver.calls'], 2)
+        self.assertEqual(counters['solver.solutions'], 7)
+        self.assertEqual(counters['variables'], 3)
+        self.assertGreater(counters['clauses'], 0)
+        self.assertGreaterEqual(
+            counters['to_cnf.iterations.distribute_ors'], 1)
+        self.assertGreater(counters['trees.nodes'], 0)
+
+    @unittest.skipIf(sys.version_info < (3,),
+                     'Batched solutions require Python 3')
+    def test_batched_solutions_counted(self):
+        """Test that the solutions in batches are counted individually."""
+        with instrument() as record:
+            batches = list(picosat.sat_all([[1, 2]], batch_size=1))
+        self.assertEqual(len(batches), 2)
+        self.assertEqual(record.counters['solver.solutions'], 2)
+        self.assertEqual(record.calls['picosat.sat_all'], 3)
+
+        with instrument() as record:
+            batches = list(picosat.sat_all([[1, 2]], batch_size=2))
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(record.counters['solver.solutions'], 2)
+
+    def test_unsatisfiable_sat_one(self):
+        """Test that failing to find a solution counts no solutions."""
+        with instrument() as record:
+            self.assertIsNone(picosat.sat_one([[1], [-1]]))
+        self.assertEqual(record.counters['solver.solutions'], 0)
+
+    def test_solver_work_counted(self):
+        """Test that the work done by the solver is added to counters."""
+        with instrument() as record:
+            _, one_stats = picosat.sat_one([[1, 2], [-1, -2]], stats=True)
+            sols = picosat.sat_all([[1, 2], [-1, -2]])
+            list(sols)
+        total = one_stats + sols.stats
+        counters = record.counters
+        self.assertEqual(counters['solver.decisions'], total.decisions)
+        self.assertEqual(counters['solver.conflicts'], total.conflicts)
+        self.assertEqual(
+            counters['solver.propagations'], total.propagations)
+
+    def test_nested_blocks(self):
+        """Test that nested blocks each record what ran within them."""
+        with instrument() as outer:
+            BooleanExpression('A')
+            with instrument() as inner:
+                BooleanExpression('B and C')
+        self.assertEqual(outer.counters['trees.nodes'], 4)
+        self.assertEqual(inner.counters['trees.nodes'], 3)
+        self.assertEqual(outer.calls['tokenize'], 2)
+        self.assertEqual(inner.calls['tokenize'], 1)
+
+    def test_hooks(self):
+        """Test that hooks receive each event while registered."""
+        events = []
+
+        def hook(kind, name, value):
+            events.append((kind, name))
+
+        add_hook(hook)
+        try:
+            self.assertTrue(recorder.enabled)
+            BooleanExpression('A')
+        finally:
+            remove_hook(hook)
+
+        self.assertFalse(recorder.enabled)
+        self.assertIn(('timing', 'tokenize'), events)
+        self.assertIn(('count', 'trees.nodes'), events)
+
+        del events[:]
+        BooleanExpression('A')
+        self.assertEqual(events, [])
+
+    def test_hook_argument_checks(self):
+        """Test the checks on hooks."""
+        with self.assertRaises(InvalidArgumentTypeError):
+            add_hook('not callable')
+        with self.assertRaises(InvalidArgumentValueError):
+            remove_hook(len)
+
+    def test_record_str(self):
+        """Test the report of a record."""
+        with instrument() as record:
+            BooleanExpression('A')
+        report = str(record)
+        self.assertIn('tokenize', report)
+        self.assertIn('trees.nodes', report)
+        self.assertEqual(
+            repr(record), '<InstrumentationRecord [3 phases, 1 counters]>')
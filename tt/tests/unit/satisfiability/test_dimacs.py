@@ -0,0 +1,148 @@
+"""Tests for reading and writing DIMACS CNF files."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from io import BytesIO, StringIO
+
+from tt.errors import (
+    DimacsFormatError,
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError,
+    RequiredArgumentError)
+from tt.expressions import BooleanExpression
+from tt.satisfiability import dimacs
+
+
+class TestDimacs(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def read(self, cnf_str, **kwargs):
+        """Helper to read all clauses from a DIMACS string."""
+        return list(dimacs.iter_clauses(StringIO(cnf_str), **kwargs))
+
+    def test_iter_clauses_one_per_line(self):
+        """Test reading a simple file with one clause per line."""
+        self.assertEqual(
+            [[1, -2], [2, 3, -4], [4]],
+            self.read(u'c comment\np cnf 4 3\n1 -2 0\n2 3 -4 0\n4 0\n'))
+
+    def test_iter_clauses_spanning_lines(self):
+        """Test clauses that span lines, or share a line."""
+        self.assertEqual(
+            [[1, -2], [2, 3], [-1]],
+            self.read(u'p cnf 3 3\n1\n-2 0 2 3\n0 -1 0'))
+
+    def test_iter_clauses_small_chunks(self):
+        """Test that chunk boundaries do not split literals or clauses."""
+        cnf_str = u'c header\np cnf 12 3\n10 -11 0\n12 1 0\n-10 0\n'
+        for chunk_size in (1, 2, 3, 7):
+            self.assertEqual(
+                [[10, -11], [12, 1], [-10]],
+                self.read(cnf_str, chunk_size=chunk_size))
+
+    def test_iter_clauses_missing_final_terminator(self):
+        """Test that the last clause does not require a terminating zero."""
+        self.assertEqual([[1], [2, 3]], self.read(u'1 0\n2 3'))
+
+    def test_iter_clauses_percent_ends_input(self):
+        """Test that a percent line ends the input, as in SATLIB files."""
+        self.assertEqual([[1, 2]], self.read(u'1 2 0\n%\n0\n'))
+
+    def test_iter_clauses_binary_file(self):
+        """Test reading from a binary file object."""
+        self.assertEqual(
+            [[1, -2]],
+            list(dimacs.iter_clauses(BytesIO(b'p cnf 2 1\r\n1 -2 0\r\n'))))
+
+    def test_iter_clauses_invalid_literal(self):
+        """Test that a non-integer literal raises an error."""
+        with self.assertRaises(DimacsFormatError) as cm:
+            self.read(u'p cnf 2 2\n1 2 0\n1 b 0\n')
+        self.assertEqual('1 b 0', cm.exception.expr_str)
+        self.assertIn('line 3', cm.exception.message)
+
+    def test_iter_clauses_invalid_problem_line(self):
+        """Test that malformed or repeated problem lines raise an error."""
+        with self.assertRaises(DimacsFormatError):
+            self.read(u'p dnf 2 2\n1 2 0\n')
+
+        with self.assertRaises(DimacsFormatError):
+            self.read(u'p cnf 2\n1 2 0\n')
+
+        with self.assertRaises(DimacsFormatError):
+            self.read(u'p cnf 2 1\np cnf 2 1\n1 2 0\n')
+
+    def test_iter_clauses_invalid_chunk_size(self):
+        """Test that an invalid chunk size raises an error immediately."""
+        with self.assertRaises(InvalidArgumentTypeError):
+            dimacs.iter_clauses(StringIO(u'1 0'), chunk_size='1')
+
+        with self.assertRaises(InvalidArgumentValueError):
+            dimacs.iter_clauses(StringIO(u'1 0'), chunk_size=0)
+
+    def test_sat_one_and_sat_all_from_path(self):
+        """Test solving a file on disk, by path."""
+        path = os.path.join(self.tmp_dir, 'problem.cnf')
+        with open(path, 'w') as f:
+            f.write('c example\np cnf 3 2\n1 2 3 0\n-1 -2 0\n')
+
+        self.assertIsNotNone(dimacs.sat_one(path))
+        self.assertEqual(None, dimacs.sat_one(path, assumptions=[1, 2]))
+        self.assertEqual(5, len(list(dimacs.sat_all(path))))
+        self.assertEqual(
+            sorted([[1, -2, 3], [1, -2, -3]]),
+            sorted(dimacs.sat_all(path, assumptions=[1])))
+
+    def test_sat_one_format_error_propagates(self):
+        """Test that parse errors surface from the solver functions."""
+        with self.assertRaises(DimacsFormatError):
+            dimacs.sat_one(StringIO(u'1 2 0\nx 0\n'))
+
+    def test_write_clauses(self):
+        """Test writing clauses, with and without explicit counts."""
+        out = StringIO()
+        dimacs.write_clauses(out, [[1, -2], [3]], comments=[u'hello'])
+        self.assertEqual(u'c hello\np cnf 3 2\n1 -2 0\n3 0\n', out.getvalue())
+
+        out = StringIO()
+        dimacs.write_clauses(out, iter([[1, -2], [3]]), num_vars=5,
+                             num_clauses=2)
+        self.assertEqual(u'p cnf 5 2\n1 -2 0\n3 0\n', out.getvalue())
+
+    def test_write_clauses_iterator_requires_counts(self):
+        """Test that counts are required when writing from an iterator."""
+        with self.assertRaises(RequiredArgumentError):
+            dimacs.write_clauses(StringIO(), iter([[1]]), num_vars=1)
+
+    def test_write_then_read_round_trip(self):
+        """Test that written clauses are read back unchanged."""
+        path = os.path.join(self.tmp_dir, 'round_trip.cnf')
+        clauses = [[1, -2, 3], [-3], [2, 4]]
+        dimacs.write_clauses(path, clauses)
+        self.assertEqual(clauses, list(dimacs.iter_clauses(path)))
+
+    def test_write_expression_preserves_solutions(self):
+        """Test that a written expression has the same solutions."""
+        b = BooleanExpression('(A xor B) -> (C and ~0) or D')
+        b.constrain(D=0)
+
+        out = StringIO()
+        index_to_symbol = dimacs.write_expression(out, b)
+        self.assertEqual(set(b.symbols), set(index_to_symbol.values()))
+
+        out.seek(0)
+        expected = set(tuple(sol) for sol in b.sat_all())
+        actual = set()
+        for sol in dimacs.sat_all(out):
+            vals = {symbol: sol[i - 1] > 0 for i, symbol in
+                    index_to_symbol.items()}
+            actual.add(tuple(vals[symbol] for symbol in b.symbols))
+        self.assertEqual(expected, actual)
@@ -0,0 +1,115 @@
+"""Tests for parallel satisfiability solving."""
+
+import unittest
+
+from tt.errors import (
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError)
+from tt.satisfiability import parallel
+from tt.satisfiability.parallel import sat_all_parallel
+from tt.satisfiability.picosat import sat_all
+
+
+class TestSatAllParallel(unittest.TestCase):
+
+    clauses = [[1, 2, 3, 4, 5], [-1, -2], [3, -4, 6], [-5, -6, 7]]
+
+    def assert_same_solutions(self, clauses, **kwargs):
+        """Assert parallel and sequential enumeration produce the same sols."""
+        expected = sorted(sat_all(clauses,
+                                  assumptions=kwargs.get('assumptions')))
+        actual = list(sat_all_parallel(clauses, **kwargs))
+        self.assertEqual(len(actual), len(set(tuple(s) for s in actual)))
+        self.assertEqual(expected, sorted(actual))
+
+    def test_in_process_matches_sat_all(self):
+        """Test solving all cubes in the calling process."""
+        self.assert_same_solutions(self.clauses, workers=1)
+
+    def test_process_pool_matches_sat_all(self):
+        """Test solving cubes in a pool of worker processes."""
+        self.assert_same_solutions(self.clauses, workers=2)
+        self.assert_same_solutions(self.clauses, workers=3, num_split_vars=4)
+
+    def test_with_assumptions(self):
+        """Test that assumptions apply to every cube."""
+        self.assert_same_solutions(self.clauses, assumptions=[-3, 1],
+                                   workers=2)
+
+    def test_explicit_split_vars(self):
+        """Test splitting on explicitly chosen variables."""
+        self.assert_same_solutions(self.clauses, split_vars=[7, -2],
+                                   workers=2)
+
+    def test_no_split_vars(self):
+        """Test that zero splitting variables produce a single cube."""
+        self.assert_same_solutions(self.clauses, num_split_vars=0, workers=2)
+
+    def test_more_split_vars_than_variables(self):
+        """Test requesting more splitting variables than exist."""
+        self.assert_same_solutions([[1, 2]], num_split_vars=5, workers=2)
+
+    def test_not_satisfiable(self):
+        """Test that an unsatisfiable problem produces no solutions."""
+        self.assertEqual(
+            [], list(sat_all_parallel([[1], [-1, 2], [-2]], workers=2)))
+
+    def test_ordered_is_deterministic(self):
+        """Test that ordered enumeration is independent of pool size."""
+        self.assertEqual(
+            list(sat_all_parallel(self.clauses, num_split_vars=3, workers=1,
+                                  ordered=True)),
+            list(sat_all_parallel(self.clauses, num_split_vars=3, workers=3,
+                                  ordered=True)))
+
+    def test_in_process_clauses_released(self):
+        """Test that solving in the calling process does not keep hold of the
+        clauses."""
+        sols = sat_all_parallel(self.clauses, workers=1)
+        next(sols)
+        self.assertIs(parallel._worker_clauses, self.clauses)
+        sols.close()
+        self.assertIsNone(parallel._worker_clauses)
+
+        list(sat_all_parallel(self.clauses, workers=1))
+        self.assertIsNone(parallel._worker_clauses)
+
+    def test_early_exit(self):
+        """Test that abandoning the iterator part-way is handled."""
+        sols = sat_all_parallel(self.clauses, workers=2)
+        self.assertEqual(7, len(next(sols)))
+        sols.close()
+
+    def test_invalid_arguments_raise_at_call(self):
+        """Test that invalid arguments are reported before iteration."""
+        with self.assertRaises(InvalidArgumentTypeError):
+            sat_all_parallel([[1, 2]], workers='2')
+
+        with self.assertRaises(InvalidArgumentValueError):
+            sat_all_parallel([[1, 2]], workers=0)
+
+        with self.assertRaises(InvalidArgumentTypeError):
+            sat_all_parallel([[1, 2]], num_split_vars=1.5)
+
+        with self.assertRaises(InvalidArgumentValueError):
+            sat_all_parallel([[1, 2]], num_split_vars=-1)
+
+        with self.assertRaises(InvalidArgumentTypeError):
+            sat_all_parallel([[1, 'a']])
+
+        with self.assertRaises(InvalidArgumentValueError):
+            sat_all_parallel([[1, 0]])
+
+        with self.assertRaises(InvalidArgumentValueError):
+            sat_all_parallel([[]])
+
+        with self.assertRaises(InvalidArgumentTypeError):
+            sat_all_parallel([[1, 2]], assumptions=(1,))
+
+        with self.assertRaises(InvalidArgumentTypeError):
+            sat_all_parallel([[1, 2]], split_vars=[True])
+
+    def test_split_vars_overlapping_assumptions(self):
+        """Test that splitting on an assumed variable is disallowed."""
+        with self.assertRaises(InvalidArgumentValueError):
+            sat_all_parallel([[1, 2]], assumptions=[1], split_vars=[-1])
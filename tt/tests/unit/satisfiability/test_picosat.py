@@ -1,16 +1,39 @@
 """Tests for the Python wrapper around the PicoSAT C-extension."""
 
+import itertools
+import sys
+import time
 import unittest
 
 from tt.errors import (
     InvalidArgumentTypeError,
-    InvalidArgumentValueError)
+    InvalidArgumentValueError,
+    SolverLimitError)
 from tt.satisfiability.picosat import (
     sat_all,
     sat_one,
+    SolverStats,
     VERSION)
 
 
+def _pigeonhole_clauses(num_holes, offset=0):
+    """Clauses placing num_holes + 1 pigeons in num_holes holes (UNSAT)."""
+    def var(pigeon, hole):
+        return offset + pigeon * num_holes + hole + 1
+
+    clauses = [[var(p, h) for h in range(num_holes)] for
+               p in range(num_holes + 1)]
+    for h in range(num_holes):
+        for p1, p2 in itertools.combinations(range(num_holes + 1), 2):
+            clauses.append([-var(p1, h), -var(p2, h)])
+
+    return clauses
+
+
+_requires_batching = unittest.skipIf(
+    sys.version_info < (3,), 'Batched solutions require Python 3')
+
+
 class TestPicosat(unittest.TestCase):
 
     def test_version(self):
@@ -111,6 +134,305 @@ class TestPicosat(unittest.TestCase):
             count += 1
         self.assertEqual(2, count)
 
+    def test_sat_all_project_produces_each_projected_assignment_once(self):
+        """Test sat_all projecting solutions onto a subset of variables."""
+        projected = [(sol[0], sol[1]) for sol in
+                     sat_all([[1, 2, 3, 4], [-1, -2]], project=[1, 2])]
+        self.assertEqual(3, len(projected))
+        self.assertEqual({(1, -2), (-1, 2), (-1, -2)}, set(projected))
+
+    def test_sat_all_project_ignores_sign(self):
+        """Test that the sign of projected variables is ignored."""
+        projected = [sol[1] for sol in
+                     sat_all([[1, 2, 3], [-1]], project=[-2])]
+        self.assertEqual(2, len(projected))
+        self.assertEqual({2, -2}, set(projected))
+
+    def test_sat_all_project_with_assumptions(self):
+        """Test sat_all projecting solutions, with assumptions."""
+        projected = [sol[2] for sol in
+                     sat_all([[1, 2, 3], [-2, -3]], assumptions=[-1],
+                             project=[3])]
+        self.assertEqual(2, len(projected))
+        self.assertEqual({3, -3}, set(projected))
+
+    def test_sat_all_project_variable_not_in_clauses(self):
+        """Test projecting onto a variable not present in any clause."""
+        solutions = list(sat_all([[1], [-2]], project=[3]))
+        self.assertEqual(2, len(solutions))
+        self.assertEqual({3, -3}, set(sol[2] for sol in solutions))
+
+    def test_passing_invalid_project(self):
+        """Test passing invalid values as the project argument."""
+        with self.assertRaises(InvalidArgumentTypeError):
+            sat_all([[1, 2]], project=1)
+
+        with self.assertRaises(InvalidArgumentTypeError):
+            sat_all([[1, 2]], project=[1, 'string'])
+
+        with self.assertRaises(InvalidArgumentValueError):
+            sat_all([[1, 2]], project=[])
+
+        with self.assertRaises(InvalidArgumentValueError):
+            sat_all([[1, 2]], project=[1, 0])
+
+    def _expand_rows(self, rows):
+        """Expand rows of partial solutions into a list of solutions."""
+        solutions = []
+        for row in rows:
+            expanded = [[]]
+            for i, val in enumerate(row, start=1):
+                options = [val * i] if val else [i, -i]
+                expanded = [sol + [lit] for sol in expanded for
+                            lit in options]
+            solutions.extend(expanded)
+        return solutions
+
+    def _expand_batches(self, batches):
+        """Expand batches of partial solutions into a list of solutions."""
+        return self._expand_rows(
+            row for batch in batches for row in batch.tolist())
+
+    @_requires_batching
+    def test_sat_all_batches_cover_all_solutions_once(self):
+        """Test that batched partial solutions cover each solution once."""
+        clauses = [[1, 2, 3, 4], [-1, -2], [2, 3, -4]]
+        expected = sorted(sat_all(clauses))
+        actual = self._expand_batches(sat_all(clauses, batch_size=2))
+        self.assertEqual(expected, sorted(actual))
+
+    @_requires_batching
+    def test_sat_all_batch_shape(self):
+        """Test the shape of the batches of partial solutions."""
+        batches = list(sat_all([[1, 2, 3, 4, 5]], batch_size=3))
+        self.assertTrue(all(b.ndim == 2 for b in batches))
+        self.assertTrue(all(b.shape[1] == 5 for b in batches))
+        self.assertTrue(all(b.shape[0] <= 3 for b in batches))
+        self.assertEqual(5, sum(b.shape[0] for b in batches))
+
+    @_requires_batching
+    def test_sat_all_batches_with_assumptions(self):
+        """Test that batched partial solutions respect assumptions."""
+        clauses = [[1, 2, 3, 4]]
+        expected = sorted(sat_all(clauses, assumptions=[-1, 3]))
+        actual = self._expand_batches(
+            sat_all(clauses, assumptions=[-1, 3], batch_size=4))
+        self.assertEqual(expected, sorted(actual))
+
+    @_requires_batching
+    def test_sat_all_batches_with_project(self):
+        """Test batched partial solutions, projected onto some variables."""
+        rows = [row for batch in
+                sat_all([[1, 2, 3], [-1, -2]], project=[1, 2], batch_size=4)
+                for row in batch.tolist()]
+        projected = self._expand_rows(row[:2] for row in rows)
+        self.assertEqual([[-1, -2], [-1, 2], [1, -2]], sorted(projected))
+
+    @_requires_batching
+    def test_sat_all_batches_not_satisfiable(self):
+        """Test batched sat_all without any solutions."""
+        self.assertEqual([], list(sat_all([[1], [-1]], batch_size=4)))
+
+    @_requires_batching
+    def test_sat_all_batch_example(self):
+        """Test the batches of the documented example."""
+        batches = sat_all([[1, 2, 3], [-1, -2]], batch_size=8)
+        self.assertEqual([[[-1, 0, 1], [-1, 1, -1], [1, -1, 0]]],
+                         [batch.tolist() for batch in batches])
+
+    @unittest.skipUnless(sys.version_info < (3,),
+                         'Batched solutions are supported')
+    def test_batch_size_unsupported(self):
+        """Test that the batched mode is rejected on Python 2."""
+        with self.assertRaises(InvalidArgumentValueError):
+            sat_all([[1, 2]], batch_size=1)
+
+    def test_passing_invalid_batch_size(self):
+        """Test passing invalid values as the batch_size argument."""
+        with self.assertRaises(InvalidArgumentTypeError):
+            sat_all([[1, 2]], batch_size='1')
+
+        with self.assertRaises(InvalidArgumentValueError):
+            sat_all([[1, 2]], batch_size=0)
+
+        with self.assertRaises(InvalidArgumentValueError):
+            sat_all([[1, 2]], batch_size=2**31)
+
+    def test_sat_one_clauses_from_generator(self):
+        """Test streaming clauses into the solver from a generator."""
+        clauses = (clause for clause in [[1, 4], [2, 3], [1, -3], [-3]])
+        self.assertEqual([1, 2, -3, -4], sat_one(clauses, assumptions=[-4]))
+
+    def test_sat_all_clauses_from_generator(self):
+        """Test enumerating solutions of clauses streamed from a generator."""
+        clauses = (tuple(clause) for clause in [[1, 2], [-1, -2]])
+        self.assertEqual(
+            sorted([[1, -2], [-1, 2]]),
+            sorted(sat_all(clauses)))
+
+    def test_passing_empty_generator_clauses(self):
+        """Test passing an empty generator as clauses causes an error."""
+        with self.assertRaises(InvalidArgumentValueError):
+            sat_one(clause for clause in [])
+
+        with self.assertRaises(InvalidArgumentValueError):
+            sat_all([[1], iter([])])
+
+    def test_sat_one_decision_limit(self):
+        """Test that reaching the decision limit raises an error."""
+        with self.assertRaises(SolverLimitError) as cm:
+            sat_one([[1, 2], [3, 4]], decision_limit=1)
+        self.assertIn('decision limit', cm.exception.message)
+
+    def test_sat_one_limit_error_stats(self):
+        """Test that the statistics of an abandoned search are attached to
+        the error when requested."""
+        with self.assertRaises(SolverLimitError) as cm:
+            sat_one(_pigeonhole_clauses(10), propagation_limit=10000,
+                    stats=True)
+        self.assertEqual(1, cm.exception.stats.searches)
+        self.assertGreaterEqual(cm.exception.stats.propagations, 10000)
+
+        with self.assertRaises(SolverLimitError) as cm:
+            sat_one([[1, 2], [3, 4]], decision_limit=1)
+        self.assertIsNone(cm.exception.stats)
+
+    def test_sat_one_propagation_limit(self):
+        """Test that reaching the propagation limit raises an error."""
+        with self.assertRaises(SolverLimitError) as cm:
+            sat_one(_pigeonhole_clauses(10), propagation_limit=10000)
+        self.assertIn('propagation limit', cm.exception.message)
+
+    def test_sat_one_timeout(self):
+        """Test that a search is abandoned shortly after its timeout."""
+        start = time.time()
+        with self.assertRaises(SolverLimitError) as cm:
+            sat_one(_pigeonhole_clauses(10), timeout=0.1)
+        self.assertIn('timed out', cm.exception.message)
+        self.assertLess(time.time() - start, 5)
+
+    def test_sat_one_generous_limits(self):
+        """Test that limits which are not reached do not change the result."""
+        self.assertEqual(
+            [-1, 2, 3],
+            sat_one([[1, 2, 3], [-1, 2], [3]], decision_limit=100,
+                    propagation_limit=100, timeout=10))
+        self.assertEqual(
+            None,
+            sat_one([[1, 2], [-1, 2], [-2]], decision_limit=100,
+                    propagation_limit=100, timeout=10))
+
+    def test_sat_all_limits_apply_per_search(self):
+        """Test that limits are counted from the start of each search."""
+        self.assertEqual(
+            9, len(list(sat_all([[1, 2], [3, 4]], decision_limit=4,
+                                propagation_limit=50))))
+
+    def test_sat_all_limit_error_ends_iteration(self):
+        """Test that no solutions are produced after a limit is reached."""
+        # variable 1 satisfies every clause; once it is blocked, the rest of
+        # the search space is a hard pigeonhole problem
+        clauses = [clause + [1] for clause in
+                   _pigeonhole_clauses(8, offset=1)]
+        sols = sat_all(clauses, project=[1], propagation_limit=20000)
+        self.assertEqual(1, next(sols)[0])
+        with self.assertRaises(SolverLimitError):
+            next(sols)
+        self.assertEqual([], list(sols))
+
+    @_requires_batching
+    def test_sat_all_batches_limit_error_deferred(self):
+        """Test that batched models found before a limit are not lost."""
+        clauses = [clause + [1] for clause in
+                   _pigeonhole_clauses(8, offset=1)]
+        batches = sat_all(clauses, batch_size=4, propagation_limit=20000)
+        self.assertEqual(1, next(batches)[0, 0])
+        with self.assertRaises(SolverLimitError):
+            next(batches)
+        self.assertEqual([], list(batches))
+
+    def test_sat_one_stats(self):
+        """Test returning the statistics of a search alongside its result."""
+        solution, stats = sat_one([[1, 2], [-1, -2]], stats=True)
+        self.assertEqual([-1, 2], solution)
+        self.assertIsInstance(stats, SolverStats)
+        self.assertEqual(1, stats.searches)
+        self.assertGreater(stats.decisions, 0)
+        self.assertGreater(stats.propagations, 0)
+        self.assertGreater(stats.max_bytes, 0)
+
+        solution, stats = sat_one(_pigeonhole_clauses(4), stats=True)
+        self.assertIsNone(solution)
+        self.assertGreater(stats.conflicts, 0)
+
+    def test_sat_all_stats(self):
+        """Test the statistics accumulated by a solution iterator."""
+        sols = sat_all([[1, 2], [-1, -2]])
+        self.assertEqual(SolverStats(), sols.stats._replace(max_bytes=0))
+        self.assertEqual(2, len(list(sols)))
+        self.assertEqual(3, sols.stats.searches)
+        self.assertGreater(sols.stats.decisions, 0)
+
+    @_requires_batching
+    def test_sat_all_batches_stats(self):
+        """Test the statistics accumulated by a batch iterator."""
+        batches = sat_all([[1, 2], [-1, -2]], batch_size=8)
+        self.assertEqual(1, len(list(batches)))
+        self.assertEqual(3, batches.stats.searches)
+
+    def test_sat_all_stats_after_limit_error(self):
+        """Test that searches abandoned at a limit are counted."""
+        sols = sat_all(_pigeonhole_clauses(8), propagation_limit=20000)
+        with self.assertRaises(SolverLimitError) as cm:
+            next(sols)
+        self.assertEqual(1, sols.stats.searches)
+        self.assertEqual(sols.stats, cm.exception.stats)
+        self.assertGreaterEqual(sols.stats.propagations, 20000)
+
+    def test_adding_stats(self):
+        """Test combining the statistics of several searches."""
+        a = SolverStats(1, 2, 3, 0.5, 100, 1)
+        b = SolverStats(10, 20, 30, 0.25, 50, 2)
+        self.assertEqual(SolverStats(11, 22, 33, 0.75, 100, 3), a + b)
+        self.assertEqual(a, SolverStats() + a)
+
+    def test_passing_invalid_limits(self):
+        """Test passing invalid resource limits."""
+        for fn in (sat_one, sat_all):
+            with self.assertRaises(InvalidArgumentTypeError):
+                fn([[1]], decision_limit=1.5)
+
+            with self.assertRaises(InvalidArgumentTypeError):
+                fn([[1]], propagation_limit='100')
+
+            with self.assertRaises(InvalidArgumentTypeError):
+                fn([[1]], timeout='1')
+
+            with self.assertRaises(InvalidArgumentValueError):
+                fn([[1]], decision_limit=0)
+
+            with self.assertRaises(InvalidArgumentValueError):
+                fn([[1]], propagation_limit=-5)
+
+            with self.assertRaises(InvalidArgumentValueError):
+                fn([[1]], timeout=0)
+
+            with self.assertRaises(InvalidArgumentValueError):
+                fn([[1]], decision_limit=2**31)
+
+            if sys.version_info >= (3,):
+                # values this large are longs rather than ints on Python 2
+                with self.assertRaises(InvalidArgumentValueError):
+                    fn([[1]], propagation_limit=2**63)
+
+    def test_largest_limits(self):
+        """Test passing the largest limits the extension can store."""
+        # int() gives an int rather than a long on 64-bit Python 2
+        limits = dict(decision_limit=2**31 - 1,
+                      propagation_limit=int(2**63 - 1))
+        self.assertEqual([1], sat_one([[1]], **limits))
+        self.assertEqual([[1]], list(sat_all([[1]], **limits)))
+
     def test_passing_non_list_clauses(self):
         """Test passing a non-list as the clauses argument."""
         with self.assertRaises(InvalidArgumentTypeError):
@@ -0,0 +1,136 @@
+"""Tests for the lazy loading of tt's top-level names."""
+
+import subprocess
+import sys
+import types
+import unittest
+
+import tt
+
+
+# the largest cumulative time, in microseconds, that ``import tt`` may take
+_IMPORT_TIME_BUDGET_US = 10000
+
+
+def _run_python(code, *options):
+    """Run code in a fresh interpreter, returning its stdout and stderr."""
+    process = subprocess.Popen(
+        [sys.executable] + list(options) + ['-c', code],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True)
+    stdout, stderr = process.communicate()
+    if process.returncode:
+        raise AssertionError(stderr)
+    return stdout, stderr
+
+
+def _parse_import_times(stderr):
+    """Map imported modules to their cumulative ``-X importtime`` times."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@unittest.skipIf(sys.version_info < (3, 7),
+                 'Lazy loading requires module __getattr__')
+class TestLazyImports(unittest.TestCase):
+
+    def test_import_loads_no_subpackages(self):
+        """Test that importing tt does not import its sub-packages."""
+        stdout, _ = _run_python(
+            'import sys, tt\n'
+            'print(sorted(m for m in sys.modules if m.startswith("tt")))')
+        self.assertEqual(stdout.strip(), "['tt', 'tt.version']")
+
+    def test_import_time_budget(self):
+        """Test that importing tt stays within its import-time budget."""
+        cumulative_times = []
+        for _ in range(3):
+            _, stderr = _run_python('import tt', '-X', 'importtime')
+            times = _parse_import_times(stderr)
+            self.assertNotIn('tt.expressions', times)
+            cumulative_times.append(times['tt'])
+
+        self.assertLess(min(cumulative_times), _IMPORT_TIME_BUDGET_US)
+
+    def test_picosat_loaded_on_first_sat_call(self):
+        """Test that the PicoSAT extension is only loaded when solving."""
+        stdout, _ = _run_python(
+            'import sys, tt\n'
+            'b = tt.BooleanExpression("A and ~B")\n'
+            'print("tt._clibs.picosat" in sys.modules)\n'
+            'print(b.sat_one())\n'
+            'print("tt._clibs.picosat" in sys.modules)')
+        self.assertEqual(stdout.splitlines(), ['False', 'A=1, B=0', 'True'])
+
+    def test_lazy_names_match_sub_packages(self):
+        """Test that each public name of the sub-packages is listed, and
+        resolves to the same object."""
+        for subpackage_name in tt._SUBPACKAGES:
+            subpackage = getattr(tt, subpackage_name)
+            for name, value in vars(subpackage).items():
+                if (name.startswith('_') or
+                        isinstance(value, types.ModuleType)):
+                    continue
+                self.assertEqual(
+                    tt._LAZY_ATTRIBUTES.get(name), subpackage_name, name)
+                self.assertIs(getattr(tt, name), value)
+
+    def test_lazy_names_match_star_imports(self):
+        """Test that the lazily loaded names are exactly those exposed by
+        star-importing the sub-packages, as before Python 3.7."""
+        namespace = {}
+        for subpackage_name in tt._SUBPACKAGES:
+            exec('from tt.{} import *'.format(subpackage_name), namespace)
+        eager = dict((name, value) for name, value in namespace.items() if
+                     not name.startswith('_'))
+
+        # the eager path also imports, and so exposes, these modules
+        expected_names = set(eager) | set(tt._SUBPACKAGES) | {
+            'satisfiability', 'picosat'}
+        self.assertEqual(
+            expected_names, set(tt._LAZY_ATTRIBUTES) | set(tt._LAZY_MODULES))
+        for name, value in eager.items():
+            self.assertIs(getattr(tt, name), value, name)
+
+    def test_lazy_modules_match_sub_packages(self):
+        """Test that each module exposed by the sub-packages is listed, and
+        resolves to the module of the sub-package with highest precedence."""
+        expected = {}
+        for subpackage_name in tt._SUBPACKAGES:
+            subpackage = getattr(tt, subpackage_name)
+            for name, value in vars(subpackage).items():
+                if (not name.startswith('_') and
+                        isinstance(value, types.ModuleType)):
+                    expected[name] = value
+
+        for name, module in expected.items():
+            self.assertEqual(tt._LAZY_MODULES.get(name), module.__name__, name)
+            self.assertIs(getattr(tt, name), module)
+
+    def test_unknown_name_loads_no_subpackages(self):
+        """Test that accessing an unknown name does not import anything."""
+        stdout, _ = _run_python(
+            'import sys, tt\n'
+            'print(hasattr(tt, "not_a_name"))\n'
+            'print(sorted(m for m in sys.modules if m.startswith("tt")))')
+        self.assertEqual(
+            stdout.splitlines(), ['False', "['tt', 'tt.version']"])
+
+    def test_other_names(self):
+        """Test accessing names other than those of sub-package exports."""
+        self.assertIs(tt.picosat, sys.modules['tt.satisfiability.picosat'])
+        self.assertIs(tt.bexpr, sys.modules['tt.transformations.bexpr'])
+        self.assertIn('BooleanExpression', dir(tt))
+        self.assertIn('TruthTable', tt.__all__)
+
+        with self.assertRaises(AttributeError):
+            tt.not_a_name
+
+        with self.assertRaises(AttributeError):
+            tt._not_a_name
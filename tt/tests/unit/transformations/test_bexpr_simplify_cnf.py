@@ -0,0 +1,103 @@
+"""Tests for the simplify_cnf transformation."""
+
+import itertools
+import unittest
+
+from tt.errors import InvalidArgumentTypeError
+from tt.expressions import (
+    BooleanExpression,
+    ClauseSet)
+from tt.transformations import (
+    simplify_cnf,
+    to_cnf)
+
+
+class TestExpressionSimplifyCnf(unittest.TestCase):
+
+    def assert_simplify_cnf_transformation(self, original, expected):
+        """Helper for asserting correct simplify_cnf transformation."""
+        bexpr = simplify_cnf(original)
+        self.assertTrue(bexpr.is_cnf)
+        self.assertEqual(expected, str(bexpr))
+
+    def assert_simplified_clauses(self, clauses, expected, is_cnf=True):
+        """Helper for asserting the result of simplifying a clause set."""
+        symbols = ['S{}'.format(i) for i in range(
+            max(abs(lit) for clause in clauses for lit in clause))]
+        clause_set = ClauseSet(symbols, clauses, is_cnf=is_cnf)
+        simplified = clause_set.simplify()
+        self.assertEqual([list(clause) for clause in simplified], expected)
+        self.assertEqual(simplified.is_cnf, is_cnf)
+
+        # simplified clauses must keep the values of the original ones
+        combine_clauses, combine_literals = \
+            (all, any) if is_cnf else (any, all)
+        for values in itertools.product((False, True), repeat=len(symbols)):
+            self.assertEqual(
+                *[combine_clauses(
+                    combine_literals(values[abs(lit) - 1] == (lit > 0) for
+                                     lit in clause) for
+                    clause in cs) for cs in (clause_set, simplified)])
+
+    def test_invalid_expr_type(self):
+        """Test passing an invalid type as the argument."""
+        with self.assertRaises(InvalidArgumentTypeError):
+            simplify_cnf(None)
+
+    def test_from_boolean_expression_object(self):
+        """Test transformation when passing an expr object as the argument."""
+        self.assert_simplify_cnf_transformation(
+            BooleanExpression('(A or B) and (A or B or C)'),
+            'A or B')
+
+    def test_constants(self):
+        """Test expressions of only constants."""
+        self.assert_simplify_cnf_transformation('1', '1')
+        self.assert_simplify_cnf_transformation('0', '0')
+        self.assert_simplify_cnf_transformation('A or ~A', '1')
+
+    def test_subsumption(self):
+        """Test removing clauses containing all literals of another."""
+        self.assert_simplified_clauses(
+            [[1, 2, 3], [1, 2], [2, 1, 4], [3, 4]],
+            [[1, 2], [3, 4]])
+
+    def test_duplicates_and_tautologies(self):
+        """Test removing duplicate literals, clauses, and tautologies."""
+        self.assert_simplified_clauses(
+            [[1, 1, 2], [2, 1], [3, -3, 1], [-2, 3]],
+            [[1, 2], [-2, 3]])
+
+    def test_self_subsuming_resolution(self):
+        """Test strengthening clauses by self-subsuming resolution."""
+        self.assert_simplified_clauses(
+            [[1, 2], [-1, 2, 3]],
+            [[1, 2], [2, 3]])
+        self.assert_simplified_clauses(
+            [[1, 2], [-1, 2], [-2, 3, 4]],
+            [[2], [3, 4]])
+
+    def test_unit_propagation(self):
+        """Test propagating unit clauses."""
+        self.assert_simplified_clauses(
+            [[1], [-1, 2], [-2, 3, 4], [1, 4]],
+            [[1], [2], [3, 4]])
+
+    def test_unsatisfiable(self):
+        """Test clauses which propagate to an empty clause."""
+        self.assert_simplified_clauses([[1], [-1, 2], [-2]], [[]])
+        self.assert_simplified_clauses([[1, 2], [1, -2], [-1]], [[]])
+
+    def test_dnf(self):
+        """Test simplifying the terms of a DNF."""
+        self.assert_simplified_clauses(
+            [[1, 2], [1, 2, 3], [-1, 2, 3], [-3]],
+            [[2], [-3]],
+            is_cnf=False)
+
+    def test_to_cnf_simplify_option(self):
+        """Test the simplify option of to_cnf."""
+        expr = '(A or B) and (A or B or C) and (A or ~B)'
+        self.assertEqual(str(to_cnf(expr)), expr)
+        self.assertEqual(str(to_cnf(expr, simplify=True)), 'A')
+        self.assertEqual(to_cnf(expr, simplify=True), simplify_cnf(expr))
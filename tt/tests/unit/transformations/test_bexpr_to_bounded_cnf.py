@@ -0,0 +1,118 @@
+"""Tests for the to_bounded_cnf transformation."""
+
+import itertools
+import unittest
+
+from tt.errors import (
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError)
+from tt.expressions import BooleanExpression
+from tt.transformations import (
+    to_bounded_cnf,
+    to_cnf)
+
+
+class TestToBoundedCnf(unittest.TestCase):
+
+    def assert_equisatisfiable(self, expr, cnf, fresh_symbols):
+        """Assert that each assignment of an expression satisfying it extends
+        to an assignment satisfying its CNF, and vice versa."""
+        b = BooleanExpression(expr)
+        self.assertTrue(cnf.is_cnf)
+        self.assertEqual(
+            set(cnf.symbols) - set(b.symbols), set(fresh_symbols))
+
+        for values in itertools.product((False, True), repeat=len(b.symbols)):
+            input_dict = dict(zip(b.symbols, values))
+            cnf_value = any(
+                cnf.tree.evaluate(dict(input_dict, **dict(
+                    zip(fresh_symbols, fresh_values))))
+                for fresh_values in itertools.product(
+                    (False, True), repeat=len(fresh_symbols)))
+            self.assertEqual(b.tree.evaluate(input_dict), cnf_value)
+
+    def test_distributive_within_budget(self):
+        """Test conversions that fit within their budget."""
+        result = to_bounded_cnf('(A and B) or (C and D)', max_clauses=4)
+        self.assertEqual(result.mode, 'distributive')
+        self.assertEqual(result.fresh_symbols, [])
+        self.assertEqual(
+            str(result.expr),
+            '(A or C) and (A or D) and (B or C) and (B or D)')
+
+        result = to_bounded_cnf('A -> (B and ~C)')
+        self.assertEqual(result.mode, 'distributive')
+        self.assert_equisatisfiable(
+            'A -> (B and ~C)', result.expr, result.fresh_symbols)
+
+    def test_definitional_over_budget(self):
+        """Test conversions switching to a definitional encoding."""
+        expr = '(A and B) or (C and D)'
+        for budget in ({'max_clauses': 3}, {'max_nodes': 7}):
+            result = to_bounded_cnf(expr, **budget)
+            self.assertEqual(result.mode, 'definitional')
+            self.assertEqual(result.fresh_symbols, ['aux1'])
+            self.assert_equisatisfiable(
+                expr, result.expr, result.fresh_symbols)
+
+    def test_equisatisfiable(self):
+        """Test a variety of expressions and budgets."""
+        exprs = [
+            'A xor B xor C xor D',
+            '~((A or ~B) and (C nand D)) iff (A -> (B nor ~C))',
+            '(A and B and C) or (~A and ~B) or (C and ~D) or 0',
+            '(A xnor (B and 1)) or ((C or D) and ~(A xor D))',
+            '~(A and B) and (A or ~(C -> D)) and ~0']
+        for expr in exprs:
+            for max_clauses, max_nodes in ((1, None), (2, None), (5, 9),
+                                           (None, 4), (None, None)):
+                result = to_bounded_cnf(expr, max_clauses, max_nodes)
+                self.assert_equisatisfiable(
+                    expr, result.expr, result.fresh_symbols)
+
+    def test_constants(self):
+        """Test converting expressions that are constant."""
+        self.assertEqual(str(to_bounded_cnf('A or ~A').expr), '1')
+        self.assertEqual(
+            to_bounded_cnf('(A and ~A) or 0', max_clauses=1),
+            (BooleanExpression('A and not A'), 'distributive', []))
+        self.assertEqual(
+            str(to_bounded_cnf('(A or B) and 0', max_clauses=1).expr), '0')
+
+    def test_fresh_symbols_avoid_existing_names(self):
+        """Test that fresh symbols are not named after existing symbols."""
+        expr = '(aux1 and aux3) or (B and C)'
+        result = to_bounded_cnf(expr, max_clauses=1)
+        self.assertEqual(result.fresh_symbols, ['aux2', 'aux4'])
+        self.assert_equisatisfiable(expr, result.expr, result.fresh_symbols)
+
+    def test_large_xor_stays_bounded(self):
+        """Test that a 30-symbol XOR converts to a small CNF."""
+        expr = ' xor '.join('A{}'.format(i) for i in range(30))
+        result = to_bounded_cnf(expr, max_clauses=64)
+        self.assertEqual(result.mode, 'definitional')
+        self.assertLess(len(list(result.expr.iter_cnf_clauses())), 5000)
+        self.assertIsNotNone(result.expr.sat_one())
+
+    def test_to_cnf_budget(self):
+        """Test passing a budget to to_cnf."""
+        b = to_cnf('(A and B) or (C and D)', max_clauses=2)
+        self.assertTrue(b.is_cnf)
+        self.assertIn('aux1', b.symbols)
+
+        b = to_cnf('(A and B) or (A and C)', simplify=True, max_clauses=9)
+        self.assertEqual(str(b), 'A and (B or C)')
+
+    def test_invalid_budgets(self):
+        """Test passing invalid budgets."""
+        with self.assertRaises(InvalidArgumentTypeError):
+            to_bounded_cnf('A or B', max_clauses='1')
+
+        with self.assertRaises(InvalidArgumentTypeError):
+            to_cnf('A or B', max_nodes=True)
+
+        with self.assertRaises(InvalidArgumentValueError):
+            to_bounded_cnf('A or B', max_clauses=0)
+
+        with self.assertRaises(InvalidArgumentValueError):
+            to_bounded_cnf('A or B', max_nodes=-1)
@@ -0,0 +1,113 @@
+"""Tests for the to_dnf transformation."""
+
+import itertools
+import unittest
+
+from tt.errors import InvalidArgumentTypeError
+from tt.expressions import BooleanExpression
+from tt.transformations import to_dnf
+
+
+class TestExpressionToDnf(unittest.TestCase):
+
+    def assert_to_dnf_transformation(self, original, expected):
+        """Helper for asserting correct to_dnf transformation."""
+        bexpr = to_dnf(original)
+        self.assertTrue(bexpr.is_dnf)
+        self.assertEqual(expected, str(bexpr))
+
+    def assert_to_dnf_equivalent(self, original):
+        """Helper for asserting to_dnf preserves an expression's values."""
+        original = BooleanExpression(original)
+        bexpr = to_dnf(original)
+        self.assertTrue(bexpr.is_dnf)
+
+        for values in itertools.product(
+                (False, True), repeat=len(original.symbols)):
+            inputs = dict(zip(original.symbols, values))
+            self.assertEqual(
+                original.evaluate(**inputs),
+                bexpr.evaluate_unchecked(**inputs))
+
+    def test_invalid_expr_type(self):
+        """Test passing an invalid type as the argument."""
+        with self.assertRaises(InvalidArgumentTypeError):
+            to_dnf(None)
+
+    def test_from_boolean_expression_object(self):
+        """Test transformation when passing an expr object as the argument."""
+        self.assert_to_dnf_transformation(
+            BooleanExpression('A and B'),
+            'A and B')
+
+    def test_single_operand_expression(self):
+        """Test expressions of single operands."""
+        self.assert_to_dnf_transformation('A', 'A')
+        self.assert_to_dnf_transformation('0', '0')
+        self.assert_to_dnf_transformation('1', '1')
+
+    def test_only_unary_operand_expression(self):
+        """Test expressions with only unary operators."""
+        self.assert_to_dnf_transformation('not A', 'not A')
+        self.assert_to_dnf_transformation('~A', '~A')
+        self.assert_to_dnf_transformation('~~A', 'A')
+        self.assert_to_dnf_transformation('~~~A', '~A')
+        self.assert_to_dnf_transformation('~0', '1')
+
+    def test_simple_xor(self):
+        """Test simple xor expression."""
+        self.assert_to_dnf_transformation(
+            'A xor B',
+            '(A and not B) or (not A and B)')
+
+    def test_negations_pushed_to_operands(self):
+        """Test that negated sub-expressions are transformed."""
+        self.assert_to_dnf_transformation(
+            '~(A or B) or ~(C and ~D)',
+            '(not A and not B) or not C or D')
+
+    def test_contradictory_cubes_dropped(self):
+        """Test that terms containing a symbol and its negation are dropped."""
+        self.assert_to_dnf_transformation('A and (B or ~A)', 'A and B')
+        self.assert_to_dnf_transformation('A and ~A', '0')
+        self.assert_to_dnf_transformation('(A or B) and ~A and ~B', '0')
+
+    def test_constants(self):
+        """Test expressions including constant operands."""
+        self.assert_to_dnf_transformation('A and 1', 'A')
+        self.assert_to_dnf_transformation('A and 0', '0')
+        self.assert_to_dnf_transformation('(A and B) or 1', '1')
+        self.assert_to_dnf_transformation('(A and B) or 0', 'A and B')
+
+    def test_duplicate_cubes_dropped(self):
+        """Test that duplicate terms are dropped."""
+        self.assert_to_dnf_transformation(
+            '(A and B) or (B and A) or (A and B)',
+            'A and B')
+
+    def test_subsumed_cubes_dropped(self):
+        """Test that terms containing all literals of another are dropped."""
+        self.assert_to_dnf_transformation(
+            '(A or B) and (A or C)',
+            'A or (B and C)')
+        self.assert_to_dnf_transformation(
+            '(A and B and C) or (D and ~E) or (C and A)',
+            '(D and not E) or (A and C)')
+        self.assert_to_dnf_transformation(
+            '(A and ~B) or (A and ~B and C) or ~B',
+            'not B')
+
+    def test_output_near_minimal(self):
+        """Test that absorbed sub-expressions do not multiply terms."""
+        self.assert_to_dnf_transformation(
+            '(A or B) and (A or C) and (A or D) and (A or E)',
+            'A or (B and C and D and E)')
+
+    def test_equivalence(self):
+        """Test that transformed expressions have the same values."""
+        self.assert_to_dnf_equivalent('A xor B xor C xor D')
+        self.assert_to_dnf_equivalent('(A nand B) iff (C nor ~D)')
+        self.assert_to_dnf_equivalent('(A -> B) and (B -> C) and (C -> A)')
+        self.assert_to_dnf_equivalent(
+            '~((A or B) and (C or ~D)) xnor (E and (A or ~E))')
+        self.assert_to_dnf_equivalent('(A or 0) and (~1 or B or C)')
@@ -0,0 +1,153 @@
+"""Tests for rewriting expressions with rule sets."""
+
+import unittest
+
+from tt.errors import (
+    GrammarError,
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError)
+from tt.expressions import BooleanExpression
+from tt.tables import TruthTable
+from tt.transformations import (
+    DE_MORGANS_LAW_RULES,
+    IDENTITY_LAW_RULES,
+    NEGATION_RULES,
+    RewriteRule,
+    RuleSet,
+    SIMPLIFICATION_RULES,
+    to_primitives,
+    tt_compose)
+
+
+class TestRewriteRule(unittest.TestCase):
+
+    def test_parse_rule(self):
+        """Test parsing the two sides of a rule."""
+        rule = RewriteRule('X and not X -> 0')
+        self.assertEqual(rule.lhs.raw_expr, 'X and not X')
+        self.assertEqual(rule.rhs.raw_expr, '0')
+        self.assertEqual(str(rule), 'X and not X -> 0')
+
+        rule = RewriteRule('X <-> Y -> (X and Y) or (~X and ~Y)')
+        self.assertEqual(rule.lhs.raw_expr, 'X <-> Y')
+
+        self.assertEqual(
+            str(RewriteRule('X impl Y', 'not X or Y')),
+            'X impl Y -> not X or Y')
+
+    def test_invalid_rules(self):
+        """Test parsing invalid rules."""
+        with self.assertRaises(InvalidArgumentTypeError):
+            RewriteRule(1)
+
+        with self.assertRaises(InvalidArgumentTypeError):
+            RewriteRule('X and X', 1)
+
+        with self.assertRaises(InvalidArgumentValueError):
+            RewriteRule('X and X')
+
+        with self.assertRaises(InvalidArgumentValueError):
+            RewriteRule('X -> Y -> Z')
+
+        with self.assertRaises(InvalidArgumentValueError):
+            RewriteRule('X -> X and X')
+
+        with self.assertRaises(InvalidArgumentValueError):
+            RewriteRule('X and 1 -> Y')
+
+        with self.assertRaises(GrammarError):
+            RewriteRule('X and -> X')
+
+    def test_match_commutative(self):
+        """Test that operands of commutative operators match in any order."""
+        rule = RewriteRule('X or (X and Y) -> X')
+        bindings = rule.match(BooleanExpression('(B and A) or A').tree)
+        self.assertEqual(sorted(bindings), ['X', 'Y'])
+        self.assertEqual(bindings['X'].raw_expr, 'A')
+        self.assertEqual(bindings['Y'].raw_expr, 'B')
+
+    def test_match_non_commutative(self):
+        """Test that operands of implications match in order only."""
+        rule = RewriteRule('X impl 0 -> not X')
+        self.assertIsNotNone(rule.match(BooleanExpression('A -> 0').tree))
+        self.assertIsNone(rule.match(BooleanExpression('0 -> A').tree))
+
+    def test_match_repeated_variable(self):
+        """Test that repeated variables must match equivalent subtrees."""
+        rule = RewriteRule('X and X -> X')
+        self.assertIsNotNone(
+            rule.match(BooleanExpression(r'(A \/ ~B) and (A or not B)').tree))
+        self.assertIsNone(
+            rule.match(BooleanExpression('(A or B) and (B or A)').tree))
+
+
+class TestRuleSet(unittest.TestCase):
+
+    def assert_rewrites(self, rules, expr, expected):
+        """Assert a rewrite result and that it is logically equivalent."""
+        result = rules(expr)
+        self.assertEqual(str(result), expected)
+        if result.symbols == BooleanExpression(expr).symbols:
+            self.assertTrue(
+                TruthTable(expr).equivalent_to(TruthTable(result)))
+
+    def test_index(self):
+        """Test that rules are indexed by the root of their patterns."""
+        rules = RuleSet(['X and 1 -> X', 'not not X -> X', '~0 -> 1',
+                         'X or 0 -> X', 'X and 0 -> 0'])
+        self.assertEqual(len(rules), 5)
+        self.assertEqual(
+            sorted(len(bucket) for bucket in rules._index.values()),
+            [1, 2, 2])
+
+    def test_invalid_rules(self):
+        """Test creating rule sets from invalid rules."""
+        with self.assertRaises(InvalidArgumentTypeError):
+            RuleSet([1])
+
+    def test_fixpoint_in_one_traversal(self):
+        """Test that replacements are rewritten until no rules match."""
+        self.assert_rewrites(
+            NEGATION_RULES, '~~~~~~~(A and ~~~1)', '~(A and 0)')
+        self.assert_rewrites(
+            IDENTITY_LAW_RULES, '((A or 0) and 1) or (B and (C and 0))', 'A')
+        self.assert_rewrites(
+            DE_MORGANS_LAW_RULES,
+            'not (A and not (B or not C))',
+            'not A or B or not C')
+
+    def test_operator_style(self):
+        """Test that replacements follow the style of the rewritten node."""
+        self.assert_rewrites(
+            DE_MORGANS_LAW_RULES, r'~(A /\ B)', r'~A \/ ~B')
+        self.assert_rewrites(
+            DE_MORGANS_LAW_RULES, 'not (A or B)', 'not A and not B')
+
+    def test_simplification_rules(self):
+        """Test the combined simplification rules."""
+        self.assert_rewrites(SIMPLIFICATION_RULES, 'A and ~A', '0')
+        self.assert_rewrites(SIMPLIFICATION_RULES, '~A or A', '1')
+        self.assert_rewrites(SIMPLIFICATION_RULES, 'A or (A and B)', 'A')
+        self.assert_rewrites(
+            SIMPLIFICATION_RULES, '(A xor B) and ~~(A xor B)', 'A xor B')
+        self.assert_rewrites(
+            SIMPLIFICATION_RULES, '((A -> B) or ~(A -> B)) or C', '1')
+
+    def test_no_rules_match(self):
+        """Test that unmatched trees are returned unchanged."""
+        b = BooleanExpression('A and (B or C)')
+        self.assertIs(SIMPLIFICATION_RULES.rewrite_tree(b.tree), b.tree)
+
+    def test_compose(self):
+        """Test composing rule sets with other transformations."""
+        f = tt_compose(to_primitives, SIMPLIFICATION_RULES)
+        self.assertEqual(
+            str(f), 'to_primitives -> simplification_rules')
+        self.assertEqual(str(f('(A -> B) and (A or 0)')), r'(~A \/ B) and A')
+
+    def test_deep_tree(self):
+        """Test rewriting a tree deeper than the recursion limit."""
+        import sys
+        depth = 2 * sys.getrecursionlimit()
+        expr = BooleanExpression(' and '.join(['1'] * depth + ['A']))
+        self.assertEqual(str(IDENTITY_LAW_RULES(expr)), 'A')
@@ -4,6 +4,7 @@ import unittest
 
 from tt.errors import (
     InvalidArgumentTypeError)
+from tt.expressions import BooleanExpression
 from tt.transformations import (
     apply_de_morgans,
     apply_inverse_law,
@@ -93,3 +94,57 @@ class TestUtilsComposedTransformation(unittest.TestCase):
         ct = ComposedTransformation(apply_de_morgans)
         with self.assertRaises(InvalidArgumentTypeError):
             ct.compose(None)
+
+    def test_stages(self):
+        """Test the stages of a composition."""
+        def custom_fn(expr):
+            return expr
+
+        ct = ComposedTransformation(
+            apply_de_morgans,
+            next_transformation=ComposedTransformation(
+                custom_fn,
+                next_transformation=ComposedTransformation(
+                    coalesce_negations)),
+            times=3)
+        self.assertEqual(
+            ct.stages,
+            (('apply_de_morgans', 3, True),
+             ('custom_fn', 1, False),
+             ('coalesce_negations', 1, True)))
+
+    def test_call_tree_stages(self):
+        """Test calling a composition made only of tree stages."""
+        ct = ComposedTransformation(
+            apply_de_morgans,
+            next_transformation=ComposedTransformation(coalesce_negations),
+            times=2)
+        result = ct('~(~~A and ~(B or ~C))')
+        self.assertIsInstance(result, BooleanExpression)
+        self.assertEqual(str(result), '~A \\/ B \\/ ~C')
+
+    def test_call_mixed_stages(self):
+        """Test calling a composition mixing tree and function stages."""
+        received = []
+
+        def custom_fn(expr):
+            received.append(expr)
+            return BooleanExpression(expr.raw_expr.replace('A', 'D'))
+
+        ct = ComposedTransformation(
+            apply_de_morgans,
+            next_transformation=ComposedTransformation(
+                custom_fn,
+                next_transformation=ComposedTransformation(
+                    coalesce_negations)))
+        self.assertEqual(str(ct('~(A or ~~B)')), '~D /\\ ~B')
+        self.assertEqual(len(received), 1)
+        self.assertIsInstance(received[0], BooleanExpression)
+        self.assertEqual(str(received[0]), '~A /\\ ~~~B')
+
+    def test_call_function_stage_last(self):
+        """Test that the result of a final function stage is returned as-is."""
+        ct = ComposedTransformation(
+            coalesce_negations,
+            next_transformation=ComposedTransformation(lambda e: e.symbols))
+        self.assertEqual(ct('~~B and A'), ['B', 'A'])
@@ -11,6 +11,8 @@ from tt.transformations import (
     coalesce_negations,
     forever,
     repeat,
+    to_bounded_cnf,
+    to_primitives,
     tt_compose,
     twice)
 
@@ -164,3 +166,24 @@ class TestUtilsTtCompose(unittest.TestCase):
             tt_compose(
                 tt_compose(apply_de_morgans, 'string'),
                 twice)
+
+    def test_transformations_not_mirroring_tree_methods(self):
+        """Test composing transformations whose results differ from the tree
+        methods of the same name."""
+        f = tt_compose(to_primitives, to_bounded_cnf)
+        self.assertEqual(
+            [(name, is_tree_stage) for name, _, is_tree_stage in f.stages],
+            [('to_primitives', True), ('to_bounded_cnf', False)])
+
+        result = f('A xor B')
+        self.assertEqual(result.mode, 'distributive')
+        self.assertEqual(str(result.expr), '(A or B) and (not A or not B)')
+
+    def test_custom_function_named_like_tree_method(self):
+        """Test that custom functions are never run as tree methods."""
+        def to_cnf(expr):
+            return 'custom'
+
+        f = tt_compose(coalesce_negations, to_cnf)
+        self.assertEqual(f.stages[-1], ('to_cnf', 1, False))
+        self.assertEqual(f('A or B'), 'custom')
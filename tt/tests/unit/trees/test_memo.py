@@ -0,0 +1,202 @@
+"""Tests for the memo tables of tree transformations."""
+
+import threading
+import unittest
+
+from tt.errors import (
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError)
+from tt.expressions import BooleanExpression
+from tt.trees import (
+    BinaryOperatorExpressionTreeNode,
+    clear_transformation_memos,
+    get_transformation_memo,
+    iter_transformation_memos,
+    OperandExpressionTreeNode,
+    TransformationMemo)
+from tt.transformations import (
+    apply_de_morgans,
+    coalesce_negations,
+    forever,
+    tt_compose)
+
+
+class TestTransformationMemo(unittest.TestCase):
+
+    def setUp(self):
+        self.memos = list(iter_transformation_memos())
+        self.maxsizes = [memo.maxsize for memo in self.memos]
+        for memo in self.memos:
+            memo.cache_clear()
+
+    def tearDown(self):
+        for memo, maxsize in zip(self.memos, self.maxsizes):
+            memo.maxsize = maxsize
+            memo.cache_clear()
+
+    def test_repeated_subtree_transformed_once(self):
+        """Test that repeated subtrees hit the memo."""
+        memo = get_transformation_memo('apply_de_morgans')
+        b = BooleanExpression('~(A and B) or ~(A and B) or ~(A and B)')
+        self.assertEqual(
+            str(apply_de_morgans(b)),
+            r'~A \/ ~B or ~A \/ ~B or ~A \/ ~B')
+        hits, misses, _, currsize = memo.cache_info()
+        self.assertEqual(hits, 2)
+        self.assertEqual(misses, currsize)
+
+        apply_de_morgans(b)
+        self.assertEqual(memo.cache_info().hits, 3)
+
+    def test_operator_strings_are_part_of_key(self):
+        """Test that subtrees differing only in operator strings are kept
+        apart."""
+        self.assertEqual(
+            str(coalesce_negations('~~(A and B)')), 'A and B')
+        self.assertEqual(
+            str(coalesce_negations(r'~~(A /\ B)')), r'A /\ B')
+        self.assertEqual(
+            get_transformation_memo('coalesce_negations').cache_info().hits,
+            0)
+
+    def test_to_primitives_subtrees(self):
+        """Test that to_primitives memoizes the subtrees it folds over."""
+        memo = get_transformation_memo('to_primitives')
+        tree = BooleanExpression('(A xor B) and (C or (A xor B))').tree
+        self.assertEqual(
+            str(BooleanExpression(tree.to_primitives())),
+            '((A and not B) or (not A and B)) and '
+            '(C or (A and not B) or (not A and B))')
+        self.assertEqual(memo.cache_info().hits, 1)
+
+    def test_results_match_without_memo(self):
+        """Test that memoized and unmemoized transformations agree."""
+        exprs = [
+            '~(A nand ~~B) -> (C xor ~(A or B))',
+            '(A or ~A) and (B or B or ~~C) and 1 and (0 or D)',
+            '~(~(A and B) or ~(A and B)) iff ~~(C nor D)']
+        memoized = [str(tt_compose(apply_de_morgans, forever)(expr).tree)
+                    for expr in exprs]
+        memoized.extend(str(BooleanExpression(expr).tree.to_cnf())
+                        for expr in exprs)
+
+        for memo in self.memos:
+            memo.maxsize = 0
+        unmemoized = [str(tt_compose(apply_de_morgans, forever)(expr).tree)
+                      for expr in exprs]
+        unmemoized.extend(str(BooleanExpression(expr).tree.to_cnf())
+                          for expr in exprs)
+
+        self.assertEqual(memoized, unmemoized)
+        for memo in self.memos:
+            self.assertEqual(memo.cache_info().currsize, 0)
+
+    def test_deep_trees(self):
+        """Test that memoized transformations are not limited by the depth of
+        trees."""
+        b = BooleanExpression(
+            ' or '.join('(A{0} and B{0})'.format(i) for i in range(600)))
+        for law in ('apply_de_morgans', 'coalesce_negations',
+                    'apply_identity_law', 'apply_inverse_law',
+                    'apply_idempotent_law'):
+            self.assertEqual(getattr(b.tree, law)(), b.tree)
+
+        # solutions are namedtuples, which cannot have more than 254 fields
+        # before Python 3.7, so the chain repeats its symbols
+        negated = BooleanExpression(
+            '~(' + ' and '.join('A{}'.format(i % 254) for i in range(1000)) +
+            ')')
+        self.assertIsNotNone(negated.sat_one())
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entries are evicted."""
+        memo = get_transformation_memo('coalesce_negations')
+        memo.maxsize = 2
+        for expr in ('~~A', '~~B', '~~A', '~~C', '~~A', '~~B'):
+            coalesce_negations(expr)
+        self.assertEqual(memo.cache_info(), (2, 4, 2, 2))
+
+        memo.maxsize = 1
+        self.assertEqual(memo.cache_info().currsize, 1)
+        coalesce_negations('~~B')
+        self.assertEqual(memo.cache_info().hits, 3)
+
+    def test_unbounded(self):
+        """Test a memo without a size limit."""
+        memo = TransformationMemo('example', maxsize=None)
+        for i in range(10):
+            node = OperandExpressionTreeNode('A{}'.format(i))
+            memo._store(node, node)
+        self.assertEqual(memo.cache_info(), (0, 0, None, 10))
+
+    def test_clear_all_memos(self):
+        """Test clearing the memos of every transformation at once."""
+        coalesce_negations('~~A or ~~B')
+        apply_de_morgans('~(A and B)')
+        self.assertTrue(any(memo.cache_info().currsize for
+                            memo in iter_transformation_memos()))
+
+        clear_transformation_memos()
+        self.assertEqual(
+            [(0, 0, memo.maxsize, 0) for memo in iter_transformation_memos()],
+            [memo.cache_info() for memo in iter_transformation_memos()])
+
+    def test_concurrent_use(self):
+        """Test using a memo from several threads at once."""
+        memo = TransformationMemo('example', maxsize=8)
+        nodes = [OperandExpressionTreeNode('A{}'.format(i)) for i in range(32)]
+        errors = []
+
+        def use_memo():
+            try:
+                for _ in range(200):
+                    for node in nodes:
+                        if memo._lookup(node) is not node:
+                            memo._store(node, node)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=use_memo) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
+        hits, misses, maxsize, currsize = memo.cache_info()
+        self.assertEqual(8 * 200 * 32, hits + misses)
+        self.assertEqual(8, currsize)
+
+    def test_structurally_equal_trees_share_entries(self):
+        """Test that distinct but identical trees share memo entries."""
+        memo = get_transformation_memo('distribute_ors')
+
+        def build():
+            return BinaryOperatorExpressionTreeNode(
+                'or',
+                OperandExpressionTreeNode('A'),
+                BinaryOperatorExpressionTreeNode(
+                    'and',
+                    OperandExpressionTreeNode('B'),
+                    OperandExpressionTreeNode('C')))
+
+        first = build().distribute_ors()
+        self.assertIs(build().distribute_ors(), first)
+        self.assertEqual(memo.cache_info()[:2], (1, 1))
+
+    def test_invalid_maxsize(self):
+        """Test setting invalid memo sizes."""
+        memo = TransformationMemo('example')
+        with self.assertRaises(InvalidArgumentTypeError):
+            memo.maxsize = 1.5
+
+        with self.assertRaises(InvalidArgumentTypeError):
+            TransformationMemo('example', maxsize=True)
+
+        with self.assertRaises(InvalidArgumentValueError):
+            memo.maxsize = -1
+
+    def test_unknown_transformation(self):
+        """Test getting the memo of an unknown transformation."""
+        with self.assertRaises(InvalidArgumentValueError):
+            get_transformation_memo('not_a_transformation')
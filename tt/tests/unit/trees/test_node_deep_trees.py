@@ -0,0 +1,128 @@
+"""Tests for operations on trees deeper than the recursion limit."""
+
+import sys
+import unittest
+
+from tt.expressions import BooleanExpression
+from tt.trees import (
+    BinaryOperatorExpressionTreeNode,
+    ExpressionTreeNode,
+    OperandExpressionTreeNode,
+    UnaryOperatorExpressionTreeNode)
+
+
+class TestNodeDeepTrees(unittest.TestCase):
+
+    def setUp(self):
+        self.depth = 2 * sys.getrecursionlimit()
+        self.symbols = ['A{}'.format(i) for i in range(self.depth)]
+
+        postfix_tokens = [self.symbols[0]]
+        for symbol in self.symbols[1:]:
+            postfix_tokens.extend((symbol, 'and'))
+        self.left_deep_and_chain = ExpressionTreeNode.build_tree(
+            postfix_tokens)
+
+    def test_evaluate(self):
+        """Test evaluating a left-deep chain."""
+        input_dict = dict.fromkeys(self.symbols, True)
+        self.assertTrue(self.left_deep_and_chain.evaluate(input_dict))
+
+        input_dict[self.symbols[0]] = False
+        self.assertFalse(self.left_deep_and_chain.evaluate(input_dict))
+
+    def test_copy_and_eq(self):
+        """Test copying and comparing a left-deep chain."""
+        copied = self.left_deep_and_chain._copy()
+        self.assertIsNot(copied, self.left_deep_and_chain)
+        self.assertEqual(copied, self.left_deep_and_chain)
+
+    def test_not_eq_at_deepest_node(self):
+        """Test comparing left-deep chains differing only at the bottom."""
+        other = OperandExpressionTreeNode('B')
+        for symbol in self.symbols[1:]:
+            other = BinaryOperatorExpressionTreeNode(
+                'and', other, OperandExpressionTreeNode(symbol))
+        self.assertNotEqual(other, self.left_deep_and_chain)
+
+    def test_to_primitives(self):
+        """Test converting a left-deep chain to primitive operators."""
+        self.assertEqual(
+            self.left_deep_and_chain.to_primitives(),
+            self.left_deep_and_chain)
+
+    def test_distribute(self):
+        """Test distributing over a left-deep chain."""
+        self.assertEqual(
+            self.left_deep_and_chain.distribute_ands(),
+            self.left_deep_and_chain)
+        self.assertEqual(
+            self.left_deep_and_chain.distribute_ors(),
+            self.left_deep_and_chain)
+
+    def test_laws(self):
+        """Test applying the laws to a left-deep chain and its negation."""
+        chain = self.left_deep_and_chain
+        for law in ('coalesce_negations', 'apply_de_morgans',
+                    'apply_identity_law', 'apply_idempotent_law',
+                    'apply_inverse_law'):
+            self.assertEqual(getattr(chain, law)(), chain)
+
+        negated = UnaryOperatorExpressionTreeNode('not', chain)
+        expected = UnaryOperatorExpressionTreeNode(
+            'not', OperandExpressionTreeNode(self.symbols[0]))
+        for symbol in self.symbols[1:]:
+            expected = BinaryOperatorExpressionTreeNode(
+                'or', expected, UnaryOperatorExpressionTreeNode(
+                    'not', OperandExpressionTreeNode(symbol)))
+        self.assertEqual(negated.apply_de_morgans(), expected)
+        self.assertEqual(
+            UnaryOperatorExpressionTreeNode('not', negated)
+            .coalesce_negations(),
+            chain)
+
+    def test_to_cnf_and_sat_one_of_negation(self):
+        """Test converting the negation of a left-deep chain to CNF and
+        satisfying it."""
+        negated = UnaryOperatorExpressionTreeNode(
+            'not', self.left_deep_and_chain)
+        self.assertTrue(negated.to_cnf().is_cnf)
+
+        # solutions are namedtuples, which cannot have more than 254 fields
+        # before Python 3.7, so the chain to satisfy repeats its symbols
+        symbols = self.symbols[:254]
+        postfix_tokens = [symbols[0]]
+        for i in range(1, self.depth):
+            postfix_tokens.extend((symbols[i % len(symbols)], 'and'))
+        b = BooleanExpression(UnaryOperatorExpressionTreeNode(
+            'not', ExpressionTreeNode.build_tree(postfix_tokens)))
+        solution = b.sat_one()
+        self.assertIsNotNone(solution)
+        self.assertTrue(b.evaluate(**solution._asdict()))
+
+    def test_iter_cnf_clauses(self):
+        """Test iterating the clauses of a left-deep chain."""
+        self.assertEqual(
+            [clause.symbol_name for clause in
+             self.left_deep_and_chain.iter_cnf_clauses()],
+            self.symbols)
+
+    def test_symbol_sets(self):
+        """Test the symbol sets of a deep chain of negations."""
+        node = OperandExpressionTreeNode('A')
+        for _ in range(self.depth):
+            node = UnaryOperatorExpressionTreeNode('not', node)
+        self.assertEqual(node.non_negated_symbol_set, {'A'})
+        self.assertEqual(node.negated_symbol_set, set())
+
+        node = UnaryOperatorExpressionTreeNode('not', node)
+        self.assertEqual(node.non_negated_symbol_set, set())
+        self.assertEqual(node.negated_symbol_set, {'A'})
+
+    def test_bexpr_from_tree(self):
+        """Test wrapping a left-deep chain in an expression."""
+        b = BooleanExpression(self.left_deep_and_chain)
+        self.assertEqual(b.symbols, self.symbols)
+        self.assertEqual(b.raw_expr, ' and '.join(self.symbols))
+        self.assertEqual(b.postfix_tokens[-1], 'and')
+        self.assertEqual(len(b.tokens), 2 * self.depth - 1)
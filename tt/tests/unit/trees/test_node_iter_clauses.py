@@ -154,3 +154,31 @@ class TestNodeIterClauses(ExpressionTreeAndNodeTestCase):
         self.assertEqual(second_clause.r_child.symbol_name, 'and')
         self.assertEqual(second_clause.r_child.l_child.symbol_name, 'E')
         self.assertEqual(second_clause.r_child.r_child.symbol_name, 'F')
+
+    def test_iter_cnf_clauses_of_sub_chain_after_parent(self):
+        """Test iterating a chain's clauses after iterating its parent's."""
+        root = self.get_tree_root_from_expr_str(
+            '(A or B) and ((C or D) and E) and F')
+        self.assertEqual(
+            [clause.symbol_name for clause in root.iter_cnf_clauses()],
+            ['or', 'or', 'E', 'F'])
+
+        sub_chain = root.r_child
+        self.assertEqual(
+            [clause.symbol_name for clause in sub_chain.iter_cnf_clauses()],
+            ['or', 'E', 'F'])
+        self.assertEqual(
+            [clause.symbol_name for clause in root.iter_cnf_clauses()],
+            ['or', 'or', 'E', 'F'])
+
+    def test_iter_dnf_clauses_re_uses_flattened_sub_chain(self):
+        """Test iterating a chain whose sub-chain was already iterated."""
+        root = self.get_tree_root_from_expr_str(
+            '(A and B) or (C or (D and E)) or F')
+        sub_chain = root.r_child.l_child
+        self.assertEqual(
+            [clause.symbol_name for clause in sub_chain.iter_dnf_clauses()],
+            ['C', 'and'])
+        self.assertEqual(
+            [clause.symbol_name for clause in root.iter_dnf_clauses()],
+            ['and', 'C', 'and', 'F'])
@@ -8,9 +8,24 @@ from .bexpr import (  # noqa
     distribute_ands,
     distribute_ors,
     coalesce_negations,
+    CnfConversion,
+    simplify_cnf,
+    to_bounded_cnf,
     to_cnf,
+    to_dnf,
     to_primitives)
 
+from .rewrite import (  # noqa
+    ABSORPTION_LAW_RULES,
+    DE_MORGANS_LAW_RULES,
+    IDEMPOTENT_LAW_RULES,
+    IDENTITY_LAW_RULES,
+    INVERSE_LAW_RULES,
+    NEGATION_RULES,
+    RewriteRule,
+    RuleSet,
+    SIMPLIFICATION_RULES)
+
 from .utils import ( # noqa
     AbstractTransformationModifier,
     ComposedTransformation,
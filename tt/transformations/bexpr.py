@@ -1,10 +1,23 @@
 """Transformation functions for expressions."""
 
+from collections import namedtuple
+
 from tt.expressions import BooleanExpression
 
 from tt.transformations.utils import ensure_bexpr
 
 
+CnfConversion = namedtuple('CnfConversion', ['expr', 'mode', 'fresh_symbols'])
+"""The result of a CNF conversion performed by :func:`to_bounded_cnf`.
+
+The ``expr`` field holds the converted expression, and the ``mode`` field
+holds either ``'distributive'``, when the expression was converted to an
+equivalent CNF, or ``'definitional'``, when some of its sub-expressions were
+replaced by the symbols listed in the ``fresh_symbols`` field.
+
+"""
+
+
 def apply_de_morgans(expr):
     """Convert an expression to a form with De Morgan's Law applied.
 
@@ -241,21 +254,41 @@ def distribute_ors(expr):
     return BooleanExpression(bexpr.tree.distribute_ors())
 
 
-def to_cnf(expr):
+def to_cnf(expr, simplify=False, max_clauses=None, max_nodes=None):
     """Convert an expression to conjunctive normal form (CNF).
 
     This transformation only guarantees to produce an equivalent form of the
     passed expression in conjunctive normal form; the transformed expression
-    may be an inefficent representation of the passed expression.
+    may be an inefficent representation of the passed expression, unless
+    ``simplify`` is used.
+
+    Converting some expressions to CNF produces exponentially many clauses.
+    Passing ``max_clauses`` or ``max_nodes`` bounds the size of the conversion
+    as described in :func:`to_bounded_cnf`, which may produce an
+    equisatisfiable rather than an equivalent expression.
 
     :param expr: The expression to transform.
     :type expr: :class:`str <python:str>` or :class:`BooleanExpression \
     <tt.expressions.bexpr.BooleanExpression>`
 
+    :param simplify: Whether to additionally remove subsumed clauses and
+        redundant literals from the CNF, with :func:`simplify_cnf`.
+    :type simplify: :class:`bool <python:bool>`, optional
+
+    :param max_clauses: The maximum number of clauses that distributing a
+        single *OR* may produce.
+    :type max_clauses: :class:`int <python:int>`, optional
+
+    :param max_nodes: The maximum number of operands within the clauses that
+        distributing a single *OR* may produce.
+    :type max_nodes: :class:`int <python:int>`, optional
+
     :returns: A new expression object, transformed to be in CNF.
     :rtype: :class:`BooleanExpression <tt.expressions.bexpr.BooleanExpression>`
 
-    :raises InvalidArgumentTypeError: If ``expr`` is not a valid type.
+    :raises InvalidArgumentTypeError: If ``expr`` is not a valid type, or a
+        budget is not an integer.
+    :raises InvalidArgumentValueError: If a budget is less than 1.
 
     Here are a few examples::
 
@@ -270,12 +303,147 @@ def to_cnf(expr):
         <BooleanExpression "(A \/ ~C \/ ~D) /\ (B \/ ~C \/ ~D)">
         >>> b.is_cnf
         True
+        >>> to_cnf('(A or B) and (A or B or C) and (A or ~B)')
+        <BooleanExpression "(A or B) and (A or B or C) and (A or ~B)">
+        >>> to_cnf('(A or B) and (A or B or C) and (A or ~B)', simplify=True)
+        <BooleanExpression "A">
+        >>> to_cnf('(A and B) or (C and D)', max_clauses=2)
+        <BooleanExpression "(C or aux1) and (D or aux1) and (A or not aux1) \
+and (B or not aux1)">
 
     """
+    if max_clauses is not None or max_nodes is not None:
+        bexpr = to_bounded_cnf(expr, max_clauses, max_nodes).expr
+        return simplify_cnf(bexpr) if simplify else bexpr
+    elif simplify:
+        return simplify_cnf(expr)
+
     bexpr = ensure_bexpr(expr)
     return BooleanExpression(bexpr.tree.to_cnf())
 
 
+def to_bounded_cnf(expr, max_clauses=None, max_nodes=None):
+    """Convert an expression to CNF, without exceeding a size budget.
+
+    Distributing *ORs* over *ANDs* can produce exponentially many clauses; for
+    example, the CNF of an *XOR* of ``n`` symbols has ``2 ** (n - 1)``
+    clauses. This transformation checks each distribution against the budget
+    set by ``max_clauses`` and ``max_nodes`` before performing it, and instead
+    replaces sub-expressions that would exceed the budget with fresh symbols,
+    along with clauses defining them (a definitional, or Tseitin, encoding).
+    The converted expression is then no longer equivalent to the passed one,
+    but it is satisfiable exactly when the passed expression is, and its
+    satisfying assignments are those of the passed expression extended with
+    values for the fresh symbols. See :func:`ExpressionTreeNode.to_bounded_cnf
+    <tt.trees.tree_node.ExpressionTreeNode.to_bounded_cnf>` for more details.
+
+    :param expr: The expression to transform.
+    :type expr: :class:`str <python:str>` or :class:`BooleanExpression \
+    <tt.expressions.bexpr.BooleanExpression>`
+
+    :param max_clauses: The maximum number of clauses that distributing a
+        single *OR* may produce, or ``None`` for no limit.
+    :type max_clauses: :class:`int <python:int>`, optional
+
+    :param max_nodes: The maximum number of operands within the clauses that
+        distributing a single *OR* may produce, or ``None`` for no limit.
+    :type max_nodes: :class:`int <python:int>`, optional
+
+    :returns: The converted expression, along with the mode of the conversion
+        and the fresh symbols it introduced.
+    :rtype: :class:`CnfConversion`
+
+    :raises InvalidArgumentTypeError: If ``expr`` is not a valid type, or a
+        budget is not an integer.
+    :raises InvalidArgumentValueError: If a budget is less than 1.
+
+    Here's a look at both modes of conversion::
+
+        >>> from tt import to_bounded_cnf
+        >>> to_bounded_cnf('A xor B xor C', max_clauses=9)
+        CnfConversion(expr=<BooleanExpression "(A or B or C) and \
+(A or not B or not C) and (not A or not B or C) and (not A or B or not C)">, \
+mode='distributive', fresh_symbols=[])
+        >>> result = to_bounded_cnf('A xor B xor C xor D', max_clauses=9)
+        >>> result.mode, result.fresh_symbols
+        ('definitional', ['aux1'])
+        >>> result.expr.sat_one() is not None
+        True
+
+    """
+    bexpr = ensure_bexpr(expr)
+    root, fresh_symbols = bexpr.tree.to_bounded_cnf(max_clauses, max_nodes)
+    mode = 'definitional' if fresh_symbols else 'distributive'
+    return CnfConversion(BooleanExpression(root), mode, fresh_symbols)
+
+
+def simplify_cnf(expr):
+    """Convert an expression to a simplified conjunctive normal form (CNF).
+
+    The expression is converted to CNF (if it is not already in it) and its
+    clauses are simplified with subsumption, self-subsuming resolution, and
+    unit propagation, as described in :func:`ClauseSet.simplify \
+    <tt.expressions.clause_set.ClauseSet.simplify>`. Symbols which no longer
+    affect the value of the expression may be eliminated.
+
+    :param expr: The expression to transform.
+    :type expr: :class:`str <python:str>` or :class:`BooleanExpression \
+    <tt.expressions.bexpr.BooleanExpression>`
+
+    :returns: A new expression object, in simplified CNF.
+    :rtype: :class:`BooleanExpression <tt.expressions.bexpr.BooleanExpression>`
+
+    :raises InvalidArgumentTypeError: If ``expr`` is not a valid type.
+
+    Here are a few examples::
+
+        >>> from tt import simplify_cnf
+        >>> simplify_cnf('(A or B) and (A or B or C) and (~A or B)')
+        <BooleanExpression "B">
+        >>> simplify_cnf('A and (~A or B) and (~B or C or D)')
+        <BooleanExpression "A and B and (C or D)">
+        >>> simplify_cnf('A and (B or ~A) and ~B')
+        <BooleanExpression "0">
+
+    """
+    bexpr = ensure_bexpr(expr)
+    return bexpr.to_clause_set().simplify().bexpr
+
+
+def to_dnf(expr):
+    """Convert an expression to disjunctive normal form (DNF).
+
+    Contradictory, duplicate, and subsumed terms are pruned as the DNF is
+    built, rather than first producing every term of the fully distributed
+    expression; see :func:`ExpressionTreeNode.to_dnf \
+    <tt.trees.tree_node.ExpressionTreeNode.to_dnf>` for more details.
+
+    :param expr: The expression to transform.
+    :type expr: :class:`str <python:str>` or :class:`BooleanExpression \
+    <tt.expressions.bexpr.BooleanExpression>`
+
+    :returns: A new expression object, transformed to be in DNF.
+    :rtype: :class:`BooleanExpression <tt.expressions.bexpr.BooleanExpression>`
+
+    :raises InvalidArgumentTypeError: If ``expr`` is not a valid type.
+
+    Here are a few examples::
+
+        >>> from tt import to_dnf
+        >>> b = to_dnf('(A or B) and (A or C) and ~(A and D)')
+        >>> b
+        <BooleanExpression "(A and not D) or (not A and B and C) or (B and C \
+and not D)">
+        >>> b.is_dnf
+        True
+        >>> to_dnf('A and (B or ~A)')
+        <BooleanExpression "A and B">
+
+    """
+    bexpr = ensure_bexpr(expr)
+    return BooleanExpression(bexpr.tree.to_dnf())
+
+
 def to_primitives(expr):
     """Convert an expression to a form with only primitive operators.
 
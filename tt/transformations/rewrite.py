@@ -0,0 +1,483 @@
+"""Pattern-based rewriting of expressions with user-defined rules.
+
+The rule sets defined in this module, such as :data:`SIMPLIFICATION_RULES`,
+are provided for users to apply and compose with other transformations; the
+library itself does not use them. The built-in transformations in
+:mod:`transformations.bexpr <tt.transformations.bexpr>`, such as
+:func:`apply_inverse_law <tt.transformations.bexpr.apply_inverse_law>`, are
+implemented directly on the expression tree and are not affected by these
+rule sets.
+
+"""
+
+import re
+
+from tt.definitions import (
+    CONSTANT_VALUES,
+    SYMBOLIC_OPERATOR_MAPPING,
+    TT_AND_OP,
+    TT_NAND_OP,
+    TT_NOR_OP,
+    TT_OR_OP,
+    TT_XNOR_OP,
+    TT_XOR_OP)
+from tt.errors import (
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError)
+from tt.expressions import BooleanExpression
+from tt.trees import (
+    BinaryOperatorExpressionTreeNode,
+    OperandExpressionTreeNode,
+    UnaryOperatorExpressionTreeNode)
+
+from tt.transformations.utils import ensure_bexpr
+
+
+_RULE_ARROW_RE = re.compile(r'(?<!<)->')
+
+_COMMUTATIVE_OPERATORS = {
+    TT_AND_OP,
+    TT_NAND_OP,
+    TT_NOR_OP,
+    TT_OR_OP,
+    TT_XNOR_OP,
+    TT_XOR_OP
+}
+
+
+class RewriteRule(object):
+
+    """A rule replacing sub-expressions that match a pattern.
+
+    Rules are written in tt's own expression syntax, with the pattern and its
+    replacement separated by ``->``. Each symbol in the pattern is a variable
+    that matches any sub-expression, while the constants ``0`` and ``1`` only
+    match themselves::
+
+        >>> from tt import RewriteRule
+        >>> rule = RewriteRule('X and not X -> 0')
+        >>> rule
+        <RewriteRule [X and not X -> 0]>
+
+    A variable appearing more than once in a pattern must match equivalent
+    sub-expressions at each of its occurrences. Operands of commutative
+    operators are matched in either order, so the rule above matches both
+    ``A and not A`` and ``not A and A``::
+
+        >>> b = BooleanExpression('(B or C) and ~(B or C)')
+        >>> sorted(rule.match(b.tree).items())
+        [('X', <BooleanExpression "B or C">)]
+        >>> print(rule.match(BooleanExpression('A and ~B').tree))
+        None
+
+    Since ``->`` separates the two sides of a rule, implication must be
+    written as ``impl`` within rules. Rules can also be built from the two
+    sides separately::
+
+        >>> RewriteRule('X impl Y', 'not X or Y')
+        <RewriteRule [X impl Y -> not X or Y]>
+
+    :param lhs: The pattern to match, or the whole rule when ``rhs`` is
+        omitted.
+    :type lhs: :class:`str <python:str>`
+
+    :param rhs: The replacement for sub-expressions matching the pattern.
+    :type rhs: :class:`str <python:str>`
+
+    :raises InvalidArgumentTypeError: If ``lhs`` or ``rhs`` is not a string.
+    :raises InvalidArgumentValueError: If the rule is not made of exactly two
+        sides, if the pattern is a lone variable, or if the replacement uses
+        variables that do not appear in the pattern.
+    :raises GrammarError: If either side of the rule is not a valid
+        expression.
+
+    """
+
+    def __init__(self, lhs, rhs=None):
+        if rhs is None:
+            if not isinstance(lhs, str):
+                raise InvalidArgumentTypeError('Rules must be strings')
+
+            sides = _RULE_ARROW_RE.split(lhs)
+            if len(sides) != 2:
+                raise InvalidArgumentValueError(
+                    'Rules must contain exactly one `->`; use `impl` for '
+                    'implication within rules')
+            lhs, rhs = sides
+        elif not isinstance(lhs, str) or not isinstance(rhs, str):
+            raise InvalidArgumentTypeError(
+                'Both sides of a rule must be strings')
+
+        self._lhs = BooleanExpression(lhs.strip())
+        self._rhs = BooleanExpression(rhs.strip())
+
+        lhs_tree = self._lhs.tree
+        if (isinstance(lhs_tree, OperandExpressionTreeNode) and
+                lhs_tree.symbol_name not in CONSTANT_VALUES):
+            raise InvalidArgumentValueError(
+                'The pattern of a rule cannot be a lone variable')
+
+        unbound_symbols = set(self._rhs.symbols) - set(self._lhs.symbols)
+        if unbound_symbols:
+            raise InvalidArgumentValueError(
+                'Rule replacements cannot use variables missing from their '
+                'pattern: {}'.format(', '.join(sorted(unbound_symbols))))
+
+        self._key = _index_key(lhs_tree)
+
+    @property
+    def lhs(self):
+        """The pattern matched by this rule.
+
+        :type: :class:`BooleanExpression \
+                       <tt.expressions.bexpr.BooleanExpression>`
+
+        """
+        return self._lhs
+
+    @property
+    def rhs(self):
+        """The replacement for sub-expressions matching this rule's pattern.
+
+        :type: :class:`BooleanExpression \
+                       <tt.expressions.bexpr.BooleanExpression>`
+
+        """
+        return self._rhs
+
+    def match(self, node):
+        """Match this rule's pattern against the root of a tree.
+
+        :param node: The root of the tree to match.
+        :type node: :class:`ExpressionTreeNode \
+                            <tt.trees.tree_node.ExpressionTreeNode>`
+
+        :returns: A dictionary mapping each variable in the pattern to the
+            expression it matched, or ``None`` if the pattern does not match.
+        :rtype: Dict{:class:`str <python:str>`: :class:`BooleanExpression \
+                <tt.expressions.bexpr.BooleanExpression>`}
+
+        """
+        for bindings in _iter_matches(self._lhs.tree, node, {}):
+            return dict((name, BooleanExpression(bound))
+                        for name, bound in bindings.items())
+        return None
+
+    def _rewrite(self, node):
+        """Rewrite the root of a tree, or return None if it does not match."""
+        for bindings in _iter_matches(self._lhs.tree, node, {}):
+            symbolic = node.symbol_name in SYMBOLIC_OPERATOR_MAPPING
+            return _instantiate(self._rhs.tree, bindings, symbolic)
+        return None
+
+    def __str__(self):
+        return '{} -> {}'.format(self._lhs.raw_expr, self._rhs.raw_expr)
+
+    def __repr__(self):
+        return '<RewriteRule [{}]>'.format(str(self))
+
+
+class RuleSet(object):
+
+    """An indexed set of rules, applied to expressions until none match.
+
+    Rules are indexed by the operator at the root of their patterns, so only
+    the rules that could possibly match are tried at each node. Calling a rule
+    set rewrites an expression in a single bottom-up traversal of its tree:
+    once the children of a node have been rewritten, the first rule matching
+    the node is applied, and the replacement is rewritten in turn, so the
+    result is a fixpoint of the rules. Sub-expressions that have already been
+    rewritten are never revisited::
+
+        >>> from tt import RuleSet
+        >>> rules = RuleSet([
+        ...     'X and not X -> 0',
+        ...     'X or 0 -> X',
+        ...     'not not X -> X'])
+        >>> rules('~~A or (B and ~B)')
+        <BooleanExpression "A">
+
+    Rule sets are callable transformations, so they can be composed with the
+    other transformations in tt::
+
+        >>> from tt import to_primitives, tt_compose
+        >>> f = tt_compose(to_primitives, rules)
+        >>> f
+        <ComposedTransformation [to_primitives -> rewrite]>
+        >>> f('(A -> ~~B) or (C and ~C)')
+        <BooleanExpression "~A \\/ B">
+
+    A handful of rule sets covering tt's built-in laws are provided in this
+    module, such as :data:`SIMPLIFICATION_RULES`; these are for users to
+    apply, and are not used by the library's own transformations. Rule sets
+    must terminate, so rules should make expressions smaller or push them
+    towards a normal form; a rule such as ``X and Y -> Y and X`` would be
+    applied forever.
+
+    Rules match binary operators as they appear in the tree, so patterns are
+    not matched across the operands of longer chains of *ANDs* or *ORs*.
+
+    :param rules: The rules of this set, in the order they are tried.
+    :type rules: Iterable[:class:`RewriteRule` or :class:`str <python:str>`]
+
+    :param name: The name of this set when composed with other
+        transformations.
+    :type name: :class:`str <python:str>`
+
+    :raises InvalidArgumentTypeError: If a rule is not a string or
+        :class:`RewriteRule`.
+
+    """
+
+    def __init__(self, rules, name='rewrite'):
+        self._rules = []
+        self._index = {}
+        for rule in rules:
+            if isinstance(rule, str):
+                rule = RewriteRule(rule)
+            elif not isinstance(rule, RewriteRule):
+                raise InvalidArgumentTypeError(
+                    'Rules must be strings or RewriteRule objects')
+
+            self._rules.append(rule)
+            self._index.setdefault(rule._key, []).append(rule)
+
+        self.__name__ = name
+
+    @property
+    def rules(self):
+        """The rules of this set, in the order they are tried.
+
+        :type: List[:class:`RewriteRule`]
+
+        """
+        return list(self._rules)
+
+    def __call__(self, expr):
+        """Rewrite an expression until none of the rules match.
+
+        :param expr: The expression to rewrite.
+        :type expr: :class:`BooleanExpression \
+                            <tt.expressions.bexpr.BooleanExpression>` or
+                    :class:`str <python:str>`
+
+        :returns: The rewritten expression.
+        :rtype: :class:`BooleanExpression \
+                        <tt.expressions.bexpr.BooleanExpression>`
+
+        :raises InvalidArgumentTypeError: If ``expr`` is not a valid type.
+
+        """
+        bexpr = ensure_bexpr(expr)
+        return BooleanExpression(self.rewrite_tree(bexpr.tree))
+
+    def __len__(self):
+        return len(self._rules)
+
+    def __iter__(self):
+        return iter(self._rules)
+
+    def __repr__(self):
+        return '<RuleSet [{}: {} rule{}]>'.format(
+            self.__name__, len(self._rules),
+            '' if len(self._rules) == 1 else 's')
+
+    def rewrite_tree(self, root):
+        """Rewrite a tree until none of the rules match.
+
+        :param root: The root of the tree to rewrite.
+        :type root: :class:`ExpressionTreeNode \
+                            <tt.trees.tree_node.ExpressionTreeNode>`
+
+        :returns: The root of the rewritten tree, which may share nodes with
+            the passed tree.
+        :rtype: :class:`ExpressionTreeNode \
+                        <tt.trees.tree_node.ExpressionTreeNode>`
+
+        """
+        index = self._index
+
+        # nodes known to match no rule, along with their descendants
+        rewritten = {}
+        results = []
+        stack = [(root, False)]
+        while stack:
+            node, children_rewritten = stack.pop()
+            if id(node) in rewritten:
+                results.append(node)
+                continue
+
+            l_child, r_child = node._l_child, node._r_child
+            if l_child is not None and not children_rewritten:
+                stack.append((node, True))
+                if r_child is not None:
+                    stack.append((r_child, False))
+                stack.append((l_child, False))
+                continue
+
+            if r_child is not None:
+                new_r_child = results.pop()
+                new_l_child = results.pop()
+                if new_l_child is not l_child or new_r_child is not r_child:
+                    node = BinaryOperatorExpressionTreeNode(
+                        node.symbol_name, new_l_child, new_r_child)
+            elif l_child is not None:
+                new_l_child = results.pop()
+                if new_l_child is not l_child:
+                    node = UnaryOperatorExpressionTreeNode(
+                        node.symbol_name, new_l_child)
+
+            for rule in index.get(_index_key(node), ()):
+                replacement = rule._rewrite(node)
+                if replacement is not None:
+                    stack.append((replacement, False))
+                    break
+            else:
+                rewritten[id(node)] = node
+                results.append(node)
+
+        return results.pop()
+
+
+def _index_key(node):
+    """Get the key under which rules for a node's root are indexed."""
+    if node._l_child is None:
+        return node.symbol_name
+    return node.operator
+
+
+def _iter_matches(pattern, node, bindings):
+    """Iterate over the variable bindings matching a pattern to a node."""
+    if isinstance(pattern, OperandExpressionTreeNode):
+        name = pattern.symbol_name
+        if name in CONSTANT_VALUES:
+            if (isinstance(node, OperandExpressionTreeNode) and
+                    node.symbol_name == name):
+                yield bindings
+        elif name not in bindings:
+            new_bindings = dict(bindings)
+            new_bindings[name] = node
+            yield new_bindings
+        elif bindings[name] == node:
+            yield bindings
+    elif isinstance(pattern, UnaryOperatorExpressionTreeNode):
+        if isinstance(node, UnaryOperatorExpressionTreeNode):
+            for b in _iter_matches(pattern.l_child, node.l_child, bindings):
+                yield b
+    elif (isinstance(node, BinaryOperatorExpressionTreeNode) and
+            node.operator == pattern.operator):
+        orders = [(node.l_child, node.r_child)]
+        if node.operator in _COMMUTATIVE_OPERATORS:
+            orders.append((node.r_child, node.l_child))
+
+        for l_child, r_child in orders:
+            for l_bindings in _iter_matches(
+                    pattern.l_child, l_child, bindings):
+                for b in _iter_matches(pattern.r_child, r_child, l_bindings):
+                    yield b
+
+
+def _instantiate(template, bindings, symbolic):
+    """Build a rule's replacement from the variables bound by its pattern."""
+    if isinstance(template, OperandExpressionTreeNode):
+        name = template.symbol_name
+        if name in CONSTANT_VALUES:
+            return OperandExpressionTreeNode(name)
+        return bindings[name]
+
+    op = template.operator
+    op_str = op.default_symbol_str if symbolic else (
+        op.default_plain_english_str)
+    if isinstance(template, UnaryOperatorExpressionTreeNode):
+        return UnaryOperatorExpressionTreeNode(
+            op_str, _instantiate(template.l_child, bindings, symbolic))
+
+    return BinaryOperatorExpressionTreeNode(
+        op_str,
+        _instantiate(template.l_child, bindings, symbolic),
+        _instantiate(template.r_child, bindings, symbolic))
+
+
+NEGATION_RULES = RuleSet([
+    'not not X -> X',
+    'not 0 -> 1',
+    'not 1 -> 0'
+], name='negation_rules')
+"""Rules coalescing consecutive negations and negated constants.
+
+:type: :class:`RuleSet`
+
+"""
+
+DE_MORGANS_LAW_RULES = RuleSet([
+    'not (X and Y) -> not X or not Y',
+    'not (X or Y) -> not X and not Y',
+    'not not X -> X'
+], name='de_morgans_law_rules')
+"""Rules pushing negations down to operands with De Morgan's Law.
+
+:type: :class:`RuleSet`
+
+"""
+
+IDENTITY_LAW_RULES = RuleSet([
+    'X and 1 -> X',
+    'X and 0 -> 0',
+    'X or 0 -> X',
+    'X or 1 -> 1'
+], name='identity_law_rules')
+"""Rules applying the Identity Law, and annihilating terms with constants.
+
+:type: :class:`RuleSet`
+
+"""
+
+IDEMPOTENT_LAW_RULES = RuleSet([
+    'X and X -> X',
+    'X or X -> X'
+], name='idempotent_law_rules')
+"""Rules applying the Idempotent Law.
+
+:type: :class:`RuleSet`
+
+"""
+
+INVERSE_LAW_RULES = RuleSet([
+    'X and not X -> 0',
+    'X or not X -> 1'
+], name='inverse_law_rules')
+"""Rules applying the Inverse Law.
+
+:type: :class:`RuleSet`
+
+"""
+
+ABSORPTION_LAW_RULES = RuleSet([
+    'X and (X or Y) -> X',
+    'X or (X and Y) -> X'
+], name='absorption_law_rules')
+"""Rules applying the Absorption Law.
+
+:type: :class:`RuleSet`
+
+"""
+
+SIMPLIFICATION_RULES = RuleSet(
+    NEGATION_RULES.rules +
+    IDENTITY_LAW_RULES.rules +
+    INVERSE_LAW_RULES.rules +
+    IDEMPOTENT_LAW_RULES.rules +
+    ABSORPTION_LAW_RULES.rules,
+    name='simplification_rules')
+"""The negation, Identity, Inverse, Idempotent, and Absorption Law rules,
+applied together in a single traversal.
+
+Here's a look at these rules working together::
+
+    >>> from tt import SIMPLIFICATION_RULES
+    >>> SIMPLIFICATION_RULES('(A or ~~A) and (1 and (B or ~B)) or (C and 0)')
+    <BooleanExpression "A">
+
+:type: :class:`RuleSet`
+
+"""
@@ -12,6 +12,20 @@ from tt.expressions import BooleanExpression
 
 _DEFAULT_TIMES = 1
 
+# the transformations of tt.transformations.bexpr that return the same tree
+# as the ExpressionTreeNode method of the same name
+_TREE_METHOD_TRANSFORMATIONS = frozenset([
+    'apply_de_morgans',
+    'apply_idempotent_law',
+    'apply_identity_law',
+    'apply_inverse_law',
+    'coalesce_negations',
+    'distribute_ands',
+    'distribute_ors',
+    'to_cnf',
+    'to_dnf',
+    'to_primitives'])
+
 
 def ensure_bexpr(expr):
     """Return an expression object or raise an InvalidArgumentTypeError.
@@ -199,6 +213,24 @@ ComposedTransformation.compose>` function.
     updated, so meddling with ``ComposedTransformation`` instances will likely
     have unintended consequences for you.
 
+    When called, the whole composition runs as a single pipeline of stages.
+    The transformation functions of tt that mirror a method of
+    :class:`ExpressionTreeNode <tt.trees.tree_node.ExpressionTreeNode>` (such
+    as the ones shown above, but not :func:`to_bounded_cnf \
+    <tt.transformations.bexpr.to_bounded_cnf>`, whose tree method returns
+    more than a tree) are applied directly to the expression's tree, and a run
+    of consecutive stages of this kind passes a bare tree from one stage to
+    the next. Only the final tree, or the input to a stage that is not a tree
+    method, is wrapped in a :class:`BooleanExpression <tt.expressions.bexpr.\
+BooleanExpression>`. We can inspect the stages of a composition::
+
+        >>> from tt import apply_de_morgans, twice
+        >>> f = tt_compose(apply_de_morgans, twice, coalesce_negations)
+        >>> for stage in f.stages:
+        ...     print(stage)
+        ('apply_de_morgans', 2, True)
+        ('coalesce_negations', 1, True)
+
     :param fn: The callable transformation function wrapped by this class.
     :type fn: :data:`Callable <python:typing.Callable>`
 
@@ -237,38 +269,51 @@ ComposedTransformation.compose>` function.
         self._computed_hash = hash(
             (self._fn, self._next_transformation, self.times))
 
-    def __call__(self, expr):
-        bexpr = ensure_bexpr(expr)
-        prev_tree = bexpr.tree
-        transformed_expr = None
-
-        t = 0
-        if hasattr(prev_tree, self._fn_name):
-            next_tree = prev_tree
-            while t < self._times:
-                t += 1
-                prev_tree = next_tree
-                next_tree = getattr(next_tree, self._fn_name)()
-                if next_tree == prev_tree:
-                    break
-
-            transformed_expr = BooleanExpression(next_tree)
-        else:
-            prev_expr = expr
-            next_expr = prev_expr
-            while t < self._times:
-                t += 1
-                prev_expr = next_expr
-                next_expr = self._fn(next_expr)
-                if next_expr == prev_expr:
-                    break
-
-            transformed_expr = next_expr
-
+        self._is_tree_stage = (
+            self._fn_name in _TREE_METHOD_TRANSFORMATIONS and
+            getattr(fn, '__module__', None) == 'tt.transformations.bexpr')
+        self._stages = (self,)
         if self._next_transformation is not None:
-            return self._next_transformation(transformed_expr)
-        else:
-            return transformed_expr
+            self._stages += self._next_transformation._stages
+
+    def __call__(self, expr):
+        # the current value is a bare tree while in a run of tree stages
+        value = expr
+        is_tree = False
+
+        for stage in self._stages:
+            times = stage._times
+            t = 0
+            if stage._is_tree_stage:
+                if not is_tree:
+                    value = ensure_bexpr(value).tree
+                    is_tree = True
+
+                method_name = stage._fn_name
+                next_tree = value
+                while t < times:
+                    t += 1
+                    prev_tree = next_tree
+                    next_tree = getattr(next_tree, method_name)()
+                    if next_tree == prev_tree:
+                        break
+                value = next_tree
+            else:
+                if is_tree:
+                    value = BooleanExpression(value)
+                    is_tree = False
+
+                fn = stage._fn
+                next_expr = value
+                while t < times:
+                    t += 1
+                    prev_expr = next_expr
+                    next_expr = fn(next_expr)
+                    if next_expr == prev_expr:
+                        break
+                value = next_expr
+
+        return BooleanExpression(value) if is_tree else value
 
     def __rshift__(self, other):
         return self.compose(other)
@@ -369,6 +414,21 @@ bexpr.BooleanExpression>` class.
         """
         return self._next_transformation
 
+    @property
+    def stages(self):
+        """The stages run, in order, when this composition is called.
+
+        Each stage is described by a tuple of the name of its transformation
+        function, the number of times it is repeated, and whether it is
+        applied directly to expression trees.
+
+        :type: Tuple[Tuple[:class:`str <python:str>`, :class:`int \
+<python:int>`, :class:`bool <python:bool>`]]
+
+        """
+        return tuple((stage._fn_name, stage._times, stage._is_tree_stage)
+                     for stage in self._stages)
+
 
 class AbstractTransformationModifier(object):
 
@@ -11,3 +11,9 @@ from .tree_node import (  # noqa
     ExpressionTreeNode,
     OperandExpressionTreeNode,
     UnaryOperatorExpressionTreeNode)
+from .memo import (  # noqa
+    CacheInfo,
+    clear_transformation_memos,
+    get_transformation_memo,
+    iter_transformation_memos,
+    TransformationMemo)
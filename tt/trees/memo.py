@@ -0,0 +1,306 @@
+"""Memo tables for the results of tree transformations."""
+
+import functools
+import threading
+
+from collections import (
+    namedtuple,
+    OrderedDict)
+
+from tt.errors import (
+    InvalidArgumentTypeError,
+    InvalidArgumentValueError)
+
+
+_DEFAULT_MAXSIZE = 4096
+
+_MISSING = object()
+
+_TRANSFORMATION_MEMOS = OrderedDict()
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+"""Statistics about the use of a :class:`TransformationMemo`.
+
+The fields mirror those reported by :func:`functools.lru_cache \
+<python:functools.lru_cache>`.
+
+"""
+
+
+class TransformationMemo(object):
+
+    """A bounded table of the results of a tree transformation.
+
+    Each transformation of :class:`ExpressionTreeNode \
+    <tt.trees.tree_node.ExpressionTreeNode>` objects keeps one of these tables,
+    mapping the subtrees it has been applied to onto the trees it produced.
+    Subtrees are keyed by their structure, including the exact operator and
+    operand strings they contain, so a subtree repeated within an expression,
+    or shared among several expressions, is only transformed once. The least
+    recently used entries are evicted once the table holds ``maxsize`` of
+    them.
+
+    Memos are looked up by the name of the transformation they belong to::
+
+        >>> from tt import BooleanExpression
+        >>> from tt.trees import get_transformation_memo
+        >>> memo = get_transformation_memo('coalesce_negations')
+        >>> memo.cache_clear()
+        >>> tree = BooleanExpression('~~(A or B) and ~~(A or B)').tree
+        >>> print(tree.coalesce_negations())
+        and
+        `----or
+        |    `----A
+        |    `----B
+        `----or
+             `----A
+             `----B
+        >>> memo.cache_info()
+        CacheInfo(hits=1, misses=3, maxsize=4096, currsize=3)
+
+    Since trees are immutable, the transformed trees handed out by a memo may
+    share nodes with one another.
+
+    A memo holds on to the trees it stores until they are evicted, so the
+    memos of large trees can keep a lot of memory alive after the trees are
+    no longer used elsewhere. Lower ``maxsize``, or clear the memos with
+    :func:`clear_transformation_memos` once a batch of work is done, to
+    release it. Memos may be used from several threads at once.
+
+    :param name: The name of the transformation whose results are stored.
+    :type name: :class:`str <python:str>`
+
+    :param maxsize: The maximum number of results to store; ``None`` for no
+        limit, or ``0`` to disable memoization.
+    :type maxsize: :class:`int <python:int>`
+
+    """
+
+    def __init__(self, name, maxsize=_DEFAULT_MAXSIZE):
+        self._name = name
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self.maxsize = maxsize
+
+    @property
+    def name(self):
+        """The name of the transformation whose results are stored.
+
+        :type: :class:`str <python:str>`
+
+        """
+        return self._name
+
+    @property
+    def maxsize(self):
+        """The maximum number of results stored in this memo.
+
+        A value of ``None`` means that the memo is unbounded, and a value of
+        ``0`` that memoization is disabled. Shrinking the memo evicts its least
+        recently used entries::
+
+            >>> from tt.trees import TransformationMemo
+            >>> memo = TransformationMemo('example', maxsize=0)
+            >>> memo.maxsize = -1
+            Traceback (most recent call last):
+                ...
+            tt.errors.arguments.InvalidArgumentValueError: `maxsize` must be \
+non-negative
+
+        :type: :class:`int <python:int>`
+
+        :raises InvalidArgumentTypeError: If set to a value that is not an
+            integer or ``None``.
+        :raises InvalidArgumentValueError: If set to a negative value.
+
+        """
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        if value is not None:
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise InvalidArgumentTypeError(
+                    '`maxsize` must be an int or None')
+            elif value < 0:
+                raise InvalidArgumentValueError(
+                    '`maxsize` must be non-negative')
+
+        with self._lock:
+            self._maxsize = value
+            self._evict()
+
+    def cache_info(self):
+        """Get the hit and miss counts and current size of this memo.
+
+        :rtype: :class:`CacheInfo`
+
+        """
+        with self._lock:
+            return CacheInfo(
+                self._hits, self._misses, self._maxsize, len(self._entries))
+
+    def cache_clear(self):
+        """Remove all entries from this memo and reset its statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def __repr__(self):
+        return '<TransformationMemo [{}: {}]>'.format(
+            self._name, self.cache_info())
+
+    def _lookup(self, node):
+        """Get the stored result for ``node``, or ``_MISSING`` if absent."""
+        key = _NodeKey(node)
+        with self._lock:
+            result = self._entries.pop(key, _MISSING)
+            if result is _MISSING:
+                self._misses += 1
+                return _MISSING
+
+            self._hits += 1
+            self._entries[key] = result
+            return result
+
+    def _store(self, node, result):
+        """Store the result of transforming ``node``."""
+        key = _NodeKey(node)
+        with self._lock:
+            self._entries[key] = result
+            self._evict()
+
+    def _evict(self):
+        """Evict the least recently used entries beyond the size limit.
+
+        The lock of this memo must be held by the caller.
+
+        """
+        if self._maxsize is not None:
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+
+def get_transformation_memo(name):
+    """Get the memo storing the results of a tree transformation.
+
+    :param name: The name of the transformation method of
+        :class:`ExpressionTreeNode <tt.trees.tree_node.ExpressionTreeNode>`
+        whose memo is requested, such as ``'apply_de_morgans'``.
+    :type name: :class:`str <python:str>`
+
+    :returns: The memo for the named transformation.
+    :rtype: :class:`TransformationMemo`
+
+    :raises InvalidArgumentValueError: If ``name`` is not the name of a
+        memoized transformation.
+
+    """
+    try:
+        return _TRANSFORMATION_MEMOS[name]
+    except KeyError:
+        raise InvalidArgumentValueError(
+            'No memoized transformation named "{}"'.format(name))
+
+
+def iter_transformation_memos():
+    """Iterate over the memos of all memoized tree transformations.
+
+    This is a convenient way to report on or resize every memo at once::
+
+        >>> from tt.trees import iter_transformation_memos
+        >>> for memo in iter_transformation_memos():
+        ...     memo.maxsize = 1024
+        >>> for memo in iter_transformation_memos():
+        ...     memo.maxsize = 4096
+
+    :rtype: Iterator[:class:`TransformationMemo`]
+
+    """
+    return iter(list(_TRANSFORMATION_MEMOS.values()))
+
+
+def clear_transformation_memos():
+    """Clear the memos of all memoized tree transformations.
+
+    This releases the trees held by the memos, for example once a batch of
+    large expressions has been transformed::
+
+        >>> from tt import to_cnf
+        >>> from tt.trees import (clear_transformation_memos,
+        ...                       iter_transformation_memos)
+        >>> def memoized_results():
+        ...     return sum(memo.cache_info().currsize for
+        ...                memo in iter_transformation_memos())
+        ...
+        >>> cnf = to_cnf('(A and B) or (C and D)')
+        >>> memoized_results() > 0
+        True
+        >>> clear_transformation_memos()
+        >>> memoized_results()
+        0
+
+    """
+    for memo in iter_transformation_memos():
+        memo.cache_clear()
+
+
+def _memo_for(name):
+    """Get the memo for the named transformation, creating it if needed."""
+    memo = _TRANSFORMATION_MEMOS.get(name)
+    if memo is None:
+        memo = _TRANSFORMATION_MEMOS[name] = TransformationMemo(name)
+    return memo
+
+
+def _memoized(method):
+    """Decorate a transformation method of tree nodes to use its memo.
+
+    All methods of the same name share a single memo, so the overriding
+    implementations of each kind of node store their results together.
+
+    The wrapper adds a stack frame to each call, so it is only meant for
+    transformations that do not call themselves on the children of a node;
+    transformations that walk the tree are instead memoized within the
+    iterative :func:`_fold <tt.trees.tree_node.ExpressionTreeNode._fold>`.
+
+    """
+    memo = _memo_for(method.__name__)
+
+    @functools.wraps(method)
+    def wrapper(self):
+        if memo._maxsize == 0:
+            return method(self)
+
+        result = memo._lookup(self)
+        if result is _MISSING:
+            result = method(self)
+            memo._store(self, result)
+        return result
+
+    return wrapper
+
+
+class _NodeKey(object):
+
+    """A dictionary key comparing trees by their exact structure."""
+
+    __slots__ = ('node', '_hash')
+
+    def __init__(self, node):
+        self.node = node
+        self._hash = node._structural_hash()
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return (self._hash == other._hash and
+                self.node._is_identical(other.node))
+
+    def __ne__(self, other):
+        return not (self == other)
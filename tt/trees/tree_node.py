@@ -5,6 +5,7 @@ import itertools
 from collections import deque
 
 from tt.definitions import (
+    CONSTANT_VALUES,
     MAX_OPERATOR_STR_LEN,
     OPERATOR_MAPPING,
     SYMBOLIC_OPERATOR_MAPPING,
@@ -20,10 +21,22 @@ from tt.errors import (
     InvalidArgumentTypeError,
     InvalidArgumentValueError,
     RequiresNormalFormError)
+from tt.instrumentation import recorder as _instrumentation
+from tt.trees.memo import (
+    _MISSING,
+    _memo_for,
+    _memoized)
 
 
 _DEFAULT_INDENT_SIZE = MAX_OPERATOR_STR_LEN + 1
 
+_TO_PRIMITIVES_MEMO = _memo_for('to_primitives')
+_COALESCE_NEGATIONS_MEMO = _memo_for('coalesce_negations')
+_APPLY_DE_MORGANS_MEMO = _memo_for('apply_de_morgans')
+_APPLY_IDENTITY_LAW_MEMO = _memo_for('apply_identity_law')
+_APPLY_IDEMPOTENT_LAW_MEMO = _memo_for('apply_idempotent_law')
+_APPLY_INVERSE_LAW_MEMO = _memo_for('apply_inverse_law')
+
 
 class ExpressionTreeNode(object):
 
@@ -34,10 +47,23 @@ class ExpressionTreeNode(object):
 
     If you plan to extend it, note that descendants of this class
     must compute the ``_is_cnf``, ``_is_dnf``, and ``_is_really_unary`` boolean
-    attributes and the ``_non_negated_symbol_set`` and ``_negated_symbol_set``
-    set attributes within their initialization. Additionally, descendants of
-    this class must implemented the ``__eq__`` magic method (but not
-    ``__ne__``) as well as the private ``_copy`` transformation.
+    attributes within their initialization, and either compute the
+    ``_non_negated_symbol_set`` and ``_negated_symbol_set`` set attributes or
+    set them to ``None`` to have them computed on first access. Additionally,
+    descendants of this class must implement the private ``_shallow_eq``
+    comparison and the private ``_fold_evaluate``, ``_fold_copy``,
+    ``_fold_to_primitives``, and ``_fold_apply_identity_law`` hooks, which
+    receive the already-processed results for the node's children. Operator
+    nodes may also implement ``_expand_<transformation>`` hooks, which can
+    short-circuit a transformation before the node's children are processed.
+
+    Traversals of entire trees (evaluation, copying, comparison, the
+    transformations, and the like) are driven by explicit stacks rather than
+    recursion, so they are not limited by the depth of the tree.
+
+    The results of transformations are memoized per subtree, in the
+    :class:`TransformationMemo <tt.trees.memo.TransformationMemo>` of each
+    transformation, so transformed trees may share nodes with one another.
 
     """
 
@@ -45,6 +71,9 @@ class ExpressionTreeNode(object):
         self._symbol_name = symbol_name
         self._l_child = l_child
         self._r_child = r_child
+        self._hash = None
+        if _instrumentation.enabled:
+            _instrumentation.count('trees.nodes')
 
     @property
     def symbol_name(self):
@@ -98,6 +127,8 @@ class ExpressionTreeNode(object):
         :type: Set[:class:`str <python:str>`]
 
         """
+        if self._non_negated_symbol_set is None:
+            self._compute_symbol_sets()
         return self._non_negated_symbol_set
 
     @property
@@ -107,6 +138,8 @@ class ExpressionTreeNode(object):
         :type: Set[:class:`str <python:str>`]
 
         """
+        if self._negated_symbol_set is None:
+            self._compute_symbol_sets()
         return self._negated_symbol_set
 
     @property
@@ -148,19 +181,20 @@ class ExpressionTreeNode(object):
         stack = []
         operators = OPERATOR_MAPPING.keys()
 
-        for token in postfix_tokens:
-            if token in operators:
-                if OPERATOR_MAPPING[token] == TT_NOT_OP:
-                    node = UnaryOperatorExpressionTreeNode(
-                        token, stack.pop())
+        with _instrumentation.phase('build_tree'):
+            for token in postfix_tokens:
+                if token in operators:
+                    if OPERATOR_MAPPING[token] == TT_NOT_OP:
+                        node = UnaryOperatorExpressionTreeNode(
+                            token, stack.pop())
+                    else:
+                        right, left = stack.pop(), stack.pop()
+                        node = BinaryOperatorExpressionTreeNode(
+                            token, left, right)
                 else:
-                    right, left = stack.pop(), stack.pop()
-                    node = BinaryOperatorExpressionTreeNode(
-                        token, left, right)
-            else:
-                node = OperandExpressionTreeNode(token)
+                    node = OperandExpressionTreeNode(token)
 
-            stack.append(node)
+                stack.append(node)
 
         return stack.pop()
 
@@ -203,15 +237,9 @@ class ExpressionTreeNode(object):
         if not self._is_cnf:
             raise RequiresNormalFormError(
                 'Must be in conjunctive normal form to iterate CNF clauses')
-        elif (isinstance(self, BinaryOperatorExpressionTreeNode) and
-                self._operator == TT_AND_OP):
-            child_iter = itertools.chain(
-                self._l_child.iter_cnf_clauses(),
-                self._r_child.iter_cnf_clauses())
-            for node in child_iter:
-                yield node
-        else:
-            yield self
+
+        for node in self._flatten(TT_AND_OP):
+            yield node
 
     def iter_dnf_clauses(self):
         """Iterate the clauses in disjunctive normal form order.
@@ -227,22 +255,15 @@ class ExpressionTreeNode(object):
         if not self._is_dnf:
             raise RequiresNormalFormError(
                 'Must be in conjunctive normal form to iterate DNF clauses')
-        elif (isinstance(self, BinaryOperatorExpressionTreeNode) and
-                self._operator == TT_OR_OP):
-            child_iter = itertools.chain(
-                self._l_child.iter_dnf_clauses(),
-                self._r_child.iter_dnf_clauses())
-            for node in child_iter:
-                yield node
-        else:
-            yield self
+
+        for node in self._flatten(TT_OR_OP):
+            yield node
 
     def evaluate(self, input_dict):
-        """Recursively evaluate this node.
+        """Evaluate the tree rooted at this node.
 
-        This is an interface that should be defined in sub-classes. Node
-        evaluation does no checking of the validity of inputs; they should be
-        check before being passed here.
+        Node evaluation does no checking of the validity of inputs; they should
+        be checked before being passed here.
 
         :param input_dict: A dictionary mapping expression symbols to the value
             for which they should be subsituted in expression evaluation.
@@ -252,94 +273,207 @@ class ExpressionTreeNode(object):
         :rtype: :class:`bool <python:bool>`
 
         """
-        raise NotImplementedError(
-            'Expression tree nodes must implement evaluate().')
+        return self._fold('_fold_evaluate', (input_dict,))
 
     def _copy(self):
-        """Recursively return a copy of the tree rooted at this node."""
-        raise NotImplementedError(
-            'Expression tree nodes must implement _copy()')
+        """Return a copy of the tree rooted at this node."""
+        return self._fold('_fold_copy')
 
+    def _cost_metrics(self):
+        """Measure the tree rooted at this node, without transforming it.
+
+        The result is a tuple of the number of nodes in the tree, its depth,
+        the numbers of *XOR*, *XNOR*, and *IMPL* operators in it, and the
+        estimated numbers of clauses in the CNF of the tree and of its
+        negation, as floats that become infinite when too large to represent.
+        Each clause estimate is the count that distribution would produce
+        before any simplification, so it is an upper bound of the clauses
+        produced by :func:`to_cnf`.
+
+        """
+        return self._fold('_fold_cost_metrics')
+
+    @_memoized
     def to_cnf(self):
         """Return a transformed node, in conjunctive normal form.
 
-        Since nodes are immutable, the returned node, and all descendants, are
-        new objects.
+        Since nodes are immutable, the returned node and its descendants may
+        be shared with the results of other transformations, which are
+        memoized; see :class:`TransformationMemo \
+        <tt.trees.memo.TransformationMemo>`.
+
+        When the result is found in the memo of this transformation, no
+        ``to_cnf`` phase or iteration counters are recorded by
+        :mod:`tt.instrumentation`.
 
         :returns: An expression tree node with all operators transformed to
             consist only of NOTs, ANDs, and ORs.
         :rtype: :class:`ExpressionTreeNode`
 
         """
-        prev_node = self.to_primitives()
-        if prev_node.is_cnf:
-            return prev_node
+        with _instrumentation.phase('to_cnf'):
+            node = self.to_primitives()
+            if node.is_cnf:
+                return node
 
-        next_node = prev_node
-        while True:
-            prev_node = next_node
-            next_node = next_node.apply_de_morgans()
-            if next_node == prev_node:
-                break
+            for law in ('apply_de_morgans', 'distribute_ors',
+                        'apply_inverse_law', 'apply_idempotent_law',
+                        'apply_identity_law', 'apply_idempotent_law',
+                        'coalesce_negations'):
+                node = node._apply_to_fixpoint(law)
 
-        prev_node = next_node.coalesce_negations()
-        while True:
-            prev_node = next_node
-            next_node = next_node.distribute_ors()
-            if next_node == prev_node:
-                break
+            return node
 
-        while True:
-            prev_node = next_node
-            next_node = prev_node.apply_inverse_law()
-            if next_node == prev_node:
-                break
+    def _apply_to_fixpoint(self, law):
+        """Apply the named transformation until it no longer changes the tree.
 
-        while True:
-            prev_node = next_node
-            next_node = prev_node.apply_idempotent_law()
-            if next_node == prev_node:
-                break
-
-        while True:
-            prev_node = next_node
-            next_node = prev_node.apply_identity_law()
-            if next_node == prev_node:
-                break
+        The number of passes made is added to the ``to_cnf.iterations.<law>``
+        instrumentation counter.
 
+        """
+        iterations = 0
+        prev_node = self
         while True:
-            prev_node = next_node
-            next_node = prev_node.apply_idempotent_law()
+            next_node = getattr(prev_node, law)()
+            iterations += 1
             if next_node == prev_node:
                 break
-
-        while True:
             prev_node = next_node
-            next_node = prev_node.coalesce_negations()
-            if next_node == prev_node:
-                break
 
+        if _instrumentation.enabled:
+            _instrumentation.count('to_cnf.iterations.' + law, iterations)
         return next_node
 
+    @_memoized
+    def to_dnf(self):
+        """Return a transformed node, in disjunctive normal form.
+
+        Since nodes are immutable, the returned node and its descendants may
+        be shared with the results of other transformations, which are
+        memoized; see :class:`TransformationMemo \
+        <tt.trees.memo.TransformationMemo>`.
+
+        Rather than distributing *ANDs* across the whole tree and cleaning up
+        afterwards, the terms (or cubes) of the result are built directly,
+        bottom-up. As sub-expressions are combined, cubes containing both a
+        symbol and its negation are dropped, as are duplicate cubes and cubes
+        subsumed by (that is, containing every literal of) another cube, so
+        the result stays close to minimal in size::
+
+            >>> from tt import BooleanExpression
+            >>> tree = BooleanExpression('(A or B) and (A or C)').tree
+            >>> print(tree.to_dnf())
+            or
+            `----A
+            `----and
+                 `----B
+                 `----C
+
+        :returns: An expression tree node in disjunctive normal form,
+            consisting only of NOTs, ANDs, and ORs.
+        :rtype: :class:`ExpressionTreeNode`
+
+        """
+        not_str, and_str, or_str = self._get_op_strs(
+            TT_NOT_OP, TT_AND_OP, TT_OR_OP)
+        symbols, cubes = _to_dnf_cubes(self.to_primitives())
+        return _build_normal_form(symbols, cubes, or_str, and_str, not_str)
+
+    def to_bounded_cnf(self, max_clauses=None, max_nodes=None,
+                       fresh_symbol_prefix='aux'):
+        """Return a transformed node in CNF, without exceeding a size budget.
+
+        Distributing *ORs* over *ANDs* can produce exponentially many clauses,
+        so this transformation builds the clauses of the result bottom-up and
+        checks each distribution against the budget before performing it.
+        Sub-expressions that would exceed the budget are instead replaced by
+        fresh symbols, each implying the clauses of the sub-expression it
+        stands for (a definitional, or Tseitin, encoding). The result is then
+        equisatisfiable with, rather than equivalent to, the original tree,
+        but its size grows linearly with the tree rather than exponentially::
+
+            >>> from tt import BooleanExpression
+            >>> tree = BooleanExpression('(A and B) or (C and D)').tree
+            >>> cnf, fresh_symbols = tree.to_bounded_cnf()
+            >>> print(BooleanExpression(cnf))
+            (A or C) and (A or D) and (B or C) and (B or D)
+            >>> fresh_symbols
+            []
+            >>> cnf, fresh_symbols = tree.to_bounded_cnf(max_clauses=2)
+            >>> print(BooleanExpression(cnf))
+            (C or aux1) and (D or aux1) and (A or not aux1) and \
+(B or not aux1)
+            >>> fresh_symbols
+            ['aux1']
+
+        Fresh symbols are named with ``fresh_symbol_prefix`` followed by a
+        number, skipping any names already used in the tree.
+
+        :param max_clauses: The maximum number of clauses that distributing a
+            single *OR* may produce, or ``None`` for no limit.
+        :type max_clauses: :class:`int <python:int>`
+
+        :param max_nodes: The maximum number of operands within the clauses
+            that distributing a single *OR* may produce, or ``None`` for no
+            limit.
+        :type max_nodes: :class:`int <python:int>`
+
+        :param fresh_symbol_prefix: The prefix of the names of fresh symbols.
+        :type fresh_symbol_prefix: :class:`str <python:str>`
+
+        :returns: An expression tree node in conjunctive normal form,
+            consisting only of NOTs, ANDs, and ORs, along with the list of
+            fresh symbols introduced in it.
+        :rtype: Tuple[:class:`ExpressionTreeNode`, \
+List[:class:`str <python:str>`]]
+
+        :raises InvalidArgumentTypeError: If a budget is not an integer.
+        :raises InvalidArgumentValueError: If a budget is less than 1.
+
+        """
+        for name, budget in (('max_clauses', max_clauses),
+                             ('max_nodes', max_nodes)):
+            if budget is None:
+                continue
+            elif isinstance(budget, bool) or not isinstance(budget, int):
+                raise InvalidArgumentTypeError(
+                    '`{}` must be an int'.format(name))
+            elif budget < 1:
+                raise InvalidArgumentValueError(
+                    '`{}` must be at least 1'.format(name))
+
+        not_str, and_str, or_str = self._get_op_strs(
+            TT_NOT_OP, TT_AND_OP, TT_OR_OP)
+        used_symbols = self.non_negated_symbol_set | self.negated_symbol_set
+        symbols, clauses, fresh_symbols = _to_cnf_clauses(
+            self.to_primitives(), max_clauses, max_nodes,
+            fresh_symbol_prefix, used_symbols)
+        root = _build_normal_form(symbols, clauses, and_str, or_str, not_str)
+        return root, fresh_symbols
+
     def to_primitives(self):
         """Return a transformed node, containing only NOTs, ANDs, and ORs.
 
-        Since nodes are immutable, the returned node, and all descendants, are
-        new objects.
+        Since nodes are immutable, the returned node and its descendants may
+        be shared with the results of other transformations, which are
+        memoized; see :class:`TransformationMemo \
+        <tt.trees.memo.TransformationMemo>`.
 
         :returns: An expression tree node with all operators transformed to
             consist only of NOTs, ANDs, and ORs.
         :rtype: :class:`ExpressionTreeNode`
 
         """
-        raise NotImplementedError(
-            'Expression tree nodes must implement to_primitives()')
+        return self._fold(
+            '_fold_to_primitives', memo=_TO_PRIMITIVES_MEMO)
 
     def coalesce_negations(self):
         """Return a transformed node, with consecutive negations coalesced.
 
-        Since nodes are immutable, the returned node, and all descendants, are
-        new objects.
+        Since nodes are immutable, the returned node and its descendants may
+        be shared with the results of other transformations, which are
+        memoized; see :class:`TransformationMemo \
+        <tt.trees.memo.TransformationMemo>`.
 
         :returns: An expression tree node with all consecutive negations
             compressed into the minimal number of equivalent negations (either
@@ -347,28 +481,34 @@ class ExpressionTreeNode(object):
         :rtype: :class:`ExpressionTreeNode`
 
         """
-        raise NotImplementedError(
-            'Expression tree nodes must implement coalesce_negations()')
+        return self._fold(
+            '_fold_copy', memo=_COALESCE_NEGATIONS_MEMO,
+            expand_hook_name='_expand_coalesce_negations')
 
     def apply_de_morgans(self):
         """Return a transformed node, with De Morgan's Law applied.
 
-        Since nodes are immutable, the returned node, and all descendants, are
-        new objects.
+        Since nodes are immutable, the returned node and its descendants may
+        be shared with the results of other transformations, which are
+        memoized; see :class:`TransformationMemo \
+        <tt.trees.memo.TransformationMemo>`.
 
         :returns: An expression tree node with all negated AND and OR operators
             transformed, following De Morgan's Law.
         :rtype: :class:`ExpressionTreeNode`
 
         """
-        raise NotImplementedError(
-            'Expression tree nodes must implement apply_de_morgans()')
+        return self._fold(
+            '_fold_copy', memo=_APPLY_DE_MORGANS_MEMO,
+            expand_hook_name='_expand_apply_de_morgans')
 
     def apply_identity_law(self):
         """Return a transformed node, with the Identity Law applied.
 
-        Since nodes are immutable, the returned node, and all descendants, are
-        new objects.
+        Since nodes are immutable, the returned node and its descendants may
+        be shared with the results of other transformations, which are
+        memoized; see :class:`TransformationMemo \
+        <tt.trees.memo.TransformationMemo>`.
 
         This transformation will achieve the following effects by applying the
         Inverse Law to the *AND* and *OR* operators::
@@ -398,14 +538,16 @@ class ExpressionTreeNode(object):
         :rtype: :class:`ExpressionTreeNode`
 
         """
-        raise NotImplementedError(
-            'Expression tree nodes must implement apply_identity_law()')
+        return self._fold(
+            '_fold_apply_identity_law', memo=_APPLY_IDENTITY_LAW_MEMO)
 
     def apply_idempotent_law(self):
         """Returns a transformed node, with the Idempotent Law applied.
 
-        Since nodes are immutable, the returned node, and all descendants, are
-        new objects
+        Since nodes are immutable, the returned node and its descendants may
+        be shared with the results of other transformations, which are
+        memoized; see :class:`TransformationMemo \
+        <tt.trees.memo.TransformationMemo>`.
 
         :returns: An expression tree node with the Idempotent Law applied to
             *AND* and *OR* operators.
@@ -444,14 +586,17 @@ and D').tree
             `----D
 
         """
-        raise NotImplementedError(
-            'Expression tree nodes must implement apply_idempotent_law()')
+        return self._fold(
+            '_fold_copy', memo=_APPLY_IDEMPOTENT_LAW_MEMO,
+            expand_hook_name='_expand_apply_idempotent_law')
 
     def apply_inverse_law(self):
         """Return a transformed node, with the Inverse Law applied.
 
-        Since nodes are immutable, the returned node, and all descendants, are
-        new objects.
+        Since nodes are immutable, the returned node and its descendants may
+        be shared with the results of other transformations, which are
+        memoized; see :class:`TransformationMemo \
+        <tt.trees.memo.TransformationMemo>`.
 
         :returns: An expression tree node with the Inverse Law applied to
             applicable clauses.
@@ -487,42 +632,62 @@ and D').tree
             0
 
         """
-        raise NotImplementedError(
-            'Expression tree nodes must implement apply_inverse_law()')
+        return self._fold(
+            '_fold_copy', memo=_APPLY_INVERSE_LAW_MEMO,
+            expand_hook_name='_expand_apply_inverse_law')
 
+    @_memoized
     def distribute_ands(self):
         """Return a transformed nodes, with ANDs recursively distributed across
         ORed sub-expressions.
 
-        Since nodes are immutable, the returned node, and all descendants, are
-        new objects.
+        Since nodes are immutable, the returned node and its descendants may
+        be shared with the results of other transformations, which are
+        memoized; see :class:`TransformationMemo \
+        <tt.trees.memo.TransformationMemo>`.
 
         :returns: An expression tree node with all applicable AND operators
             distributed across ORed sub-expressions.
         :rtype: :class:`ExpressionTreeNode`
 
         """
-        raise NotImplementedError(
-            'Expression tree nodes must implement distribute_ands()')
+        return _distribute(self, TT_AND_OP, TT_OR_OP)
 
+    @_memoized
     def distribute_ors(self):
         """Return a transformed nodes, with ORs recursively distributed across
         ANDed sub-expressions.
 
-        Since nodes are immutable, the returned node, and all descendants, are
-        new objects.
+        Since nodes are immutable, the returned node and its descendants may
+        be shared with the results of other transformations, which are
+        memoized; see :class:`TransformationMemo \
+        <tt.trees.memo.TransformationMemo>`.
 
         :returns: An expression tree node with all applicable OR operators
             distributed across ANDed sub-expressions.
         :rtype: :class:`ExpressionTreeNode`
 
         """
-        raise NotImplementedError(
-            'Expression tree nodes must implement distribute_ors()')
+        return _distribute(self, TT_OR_OP, TT_AND_OP)
 
     def __eq__(self, other):
-        raise NotImplementedError(
-            'Expression tree nodes must implement __eq__')
+        if not isinstance(other, ExpressionTreeNode):
+            return NotImplemented
+
+        stack = [(self, other)]
+        while stack:
+            node, other_node = stack.pop()
+            if node is other_node:
+                continue
+            elif not node._shallow_eq(other_node):
+                return False
+
+            if node._l_child is not None:
+                stack.append((node._l_child, other_node._l_child))
+            if node._r_child is not None:
+                stack.append((node._r_child, other_node._r_child))
+
+        return True
 
     def __ne__(self, other):
         return not (self == other)
@@ -530,36 +695,200 @@ and D').tree
     def __str__(self):
         return self._str_helper()[:-1]
 
-    def _str_helper(self, depth=0, indent_size=_DEFAULT_INDENT_SIZE,
-                    stem_list=[]):
+    def _str_helper(self, indent_size=_DEFAULT_INDENT_SIZE):
         """Helper method for __str__."""
-        ret = ''
+        lines = []
+        pad = (indent_size - 1) * ' '
+        stem = '`' + (indent_size - 1) * '-'
+
+        # each entry holds a node and the stems drawn at each level above it
+        stack = [(self, [])]
+        while stack:
+            node, stem_list = stack.pop()
+            if stem_list:
+                trunk = ''.join(s + pad for s in stem_list[:-1])
+                lines.append(trunk + stem + node._symbol_name)
+            else:
+                lines.append(node._symbol_name)
 
-        if depth > 0:
-            trunk = ('{}' + (indent_size - 1) * ' ') * (depth - 1)
-            trunk = trunk.format(*stem_list)
-            stem = '`' + (indent_size - 1) * '-'
-            ret += trunk + stem + self._symbol_name
-        else:
-            ret += self._symbol_name
+            if node._r_child is not None:
+                stack.append((node._r_child, stem_list + [' ']))
+            if node._l_child is not None:
+                l_child_stem = '|' if node._r_child is not None else ' '
+                stack.append((node._l_child, stem_list + [l_child_stem]))
+
+        lines.append('')
+        return '\n'.join(lines)
+
+    def _fold(self, hook_name, args=(), memo=None, expand_hook_name=None):
+        """Combine the results of a hook over the tree rooted at this node.
+
+        The hook named ``hook_name`` is called on every node in the tree,
+        children before their parents, with ``args`` followed by the hook's
+        results for the node's children. The tree is walked with an explicit
+        stack, so trees of any depth can be folded.
+
+        When a :class:`TransformationMemo <tt.trees.memo.TransformationMemo>`
+        is passed as ``memo``, the results for operator nodes are stored in it,
+        and subtrees with a stored result are not walked at all.
+
+        When ``expand_hook_name`` is passed, operator nodes implementing the
+        hook of that name have it called, with ``args``, before their children
+        are walked. The hook returns ``None`` to have the node folded as usual,
+        or else a pair of a node and a flag. If the flag is set, the returned
+        node is walked in place of this one; otherwise, the returned node is
+        the result for this one.
+
+        """
+        if memo is not None and memo._maxsize == 0:
+            memo = None
+
+        results = []
+        stack = [(self, False)]
+        while stack:
+            node, children_folded = stack.pop()
+            if node is None:
+                # the result of the walked replacement for a node is that of
+                # the node itself
+                if memo is not None:
+                    memo._store(children_folded, results[-1])
+                continue
+
+            l_child = node._l_child
+            if l_child is None:
+                results.append(getattr(node, hook_name)(*args))
+                continue
+            elif not children_folded:
+                if memo is not None:
+                    result = memo._lookup(node)
+                    if result is not _MISSING:
+                        results.append(result)
+                        continue
+
+                if expand_hook_name is not None:
+                    expand_hook = getattr(node, expand_hook_name, None)
+                    expanded = (None if expand_hook is None else
+                                expand_hook(*args))
+                    if expanded is not None:
+                        new_node, walk = expanded
+                        if walk:
+                            stack.append((None, node))
+                            stack.append((new_node, False))
+                        else:
+                            results.append(new_node)
+                            if memo is not None:
+                                memo._store(node, new_node)
+                        continue
+
+                stack.append((node, True))
+                if node._r_child is not None:
+                    stack.append((node._r_child, False))
+                stack.append((l_child, False))
+                continue
+            elif node._r_child is None:
+                results[-1] = getattr(node, hook_name)(
+                    *(args + (results[-1],)))
+            else:
+                r_result = results.pop()
+                results[-1] = getattr(node, hook_name)(
+                    *(args + (results[-1], r_result)))
+
+            if memo is not None:
+                memo._store(node, results[-1])
 
-        ret += '\n'
+        return results.pop()
 
-        l_child_stem = '|' if self._r_child is not None else ' '
+    def _flatten(self, op):
+        """Get the operands of the chain of ``op`` operators rooted here.
 
-        if self._l_child is not None:
-            ret += self._l_child._str_helper(
-                depth=depth+1,
-                indent_size=indent_size,
-                stem_list=stem_list + [l_child_stem])
+        Chains of the associative *AND* and *OR* operators are viewed as a
+        single n-ary operator, whose operands are returned as a tuple in
+        left-to-right order. Nodes other than a binary node for ``op`` are
+        returned as a chain of one operand.
 
-        if self.r_child is not None:
-            ret += self.r_child._str_helper(
-                depth=depth+1,
-                indent_size=indent_size,
-                stem_list=stem_list + [' '])
+        :rtype: Tuple[:class:`ExpressionTreeNode`]
 
-        return ret
+        """
+        return (self,)
+
+    def _structural_hash(self):
+        """Get a hash of the exact structure of the tree rooted at this node.
+
+        Unlike comparisons with ``==``, the hash takes the operator strings
+        used in the tree into account. Hashes are cached on each node, and
+        descendants whose hashes are already known are not walked.
+
+        """
+        if self._hash is not None:
+            return self._hash
+
+        stack = [self]
+        while stack:
+            node = stack[-1]
+            l_child, r_child = node._l_child, node._r_child
+            if l_child is not None and l_child._hash is None:
+                stack.append(l_child)
+            elif r_child is not None and r_child._hash is None:
+                stack.append(r_child)
+            else:
+                stack.pop()
+                node._hash = hash((
+                    node._symbol_name,
+                    None if l_child is None else l_child._hash,
+                    None if r_child is None else r_child._hash))
+
+        return self._hash
+
+    def _is_identical(self, other):
+        """Check whether two trees have exactly the same structure.
+
+        Unlike comparisons with ``==``, the operator strings used in the trees
+        must also match.
+
+        """
+        stack = [(self, other)]
+        while stack:
+            node, other_node = stack.pop()
+            if node is other_node:
+                continue
+            elif (node._symbol_name != other_node._symbol_name or
+                    type(node) is not type(other_node)):
+                return False
+
+            if node._l_child is not None:
+                stack.append((node._l_child, other_node._l_child))
+            if node._r_child is not None:
+                stack.append((node._r_child, other_node._r_child))
+
+        return True
+
+    def _compute_symbol_sets(self):
+        """Compute and store the symbol sets of the tree rooted at this node.
+
+        Each entry on the stack tracks the number of consecutive negations
+        directly above a node; operands below an odd number of them are
+        negated. Descendants whose sets are already known are not walked.
+
+        """
+        non_negated_symbol_set, negated_symbol_set = set(), set()
+        stack = [(self, 0)]
+        while stack:
+            node, num_negations = stack.pop()
+            if node._non_negated_symbol_set is not None:
+                if node._is_really_unary and num_negations % 2:
+                    non_negated_symbol_set |= node._negated_symbol_set
+                    negated_symbol_set |= node._non_negated_symbol_set
+                else:
+                    non_negated_symbol_set |= node._non_negated_symbol_set
+                    negated_symbol_set |= node._negated_symbol_set
+            elif node._r_child is not None:
+                stack.append((node._r_child, 0))
+                stack.append((node._l_child, 0))
+            else:
+                stack.append((node._l_child, num_negations + 1))
+
+        self._non_negated_symbol_set = non_negated_symbol_set
+        self._negated_symbol_set = negated_symbol_set
 
     def _get_op_strs(self, *ops):
         """Get the appropriate operator strings for the passed operators."""
@@ -581,10 +910,9 @@ class BinaryOperatorExpressionTreeNode(ExpressionTreeNode):
         self._is_cnf = self._cnf_status()
         self._is_dnf = self._dnf_status()
         self._is_really_unary = False
-        self._non_negated_symbol_set = \
-            l_child._non_negated_symbol_set | r_child._non_negated_symbol_set
-        self._negated_symbol_set = \
-            l_child._negated_symbol_set | r_child._negated_symbol_set
+        self._non_negated_symbol_set = None
+        self._negated_symbol_set = None
+        self._chain_operands = None
 
     @property
     def operator(self):
@@ -596,31 +924,79 @@ class BinaryOperatorExpressionTreeNode(ExpressionTreeNode):
         """
         return self._operator
 
-    def evaluate(self, input_dict):
-        return self.operator.eval_func(
-            self.l_child.evaluate(input_dict),
-            self.r_child.evaluate(input_dict))
+    def _flatten(self, op):
+        if self._operator != op:
+            return (self,)
+        elif self._chain_operands is not None:
+            return self._chain_operands
+
+        # walk the chain, re-using the operands of any already-flattened
+        # sub-chains
+        operands = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if (not isinstance(node, BinaryOperatorExpressionTreeNode) or
+                    node._operator != op):
+                operands.append(node)
+            elif node._chain_operands is not None:
+                operands.extend(node._chain_operands)
+            else:
+                stack.append(node._r_child)
+                stack.append(node._l_child)
 
-    def _copy(self):
-        return BinaryOperatorExpressionTreeNode(
-            self.symbol_name,
-            self._l_child._copy(),
-            self._r_child._copy())
+        self._chain_operands = tuple(operands)
+        return self._chain_operands
 
-    def to_primitives(self):
+    def _fold_evaluate(self, input_dict, l_value, r_value):
+        return self._operator.eval_func(l_value, r_value)
+
+    def _fold_copy(self, new_l_child, new_r_child):
+        return BinaryOperatorExpressionTreeNode(
+            self.symbol_name, new_l_child, new_r_child)
+
+    def _fold_cost_metrics(self, l_metrics, r_metrics):
+        l_nodes, l_depth, l_xors, l_xnors, l_impls, l_pos, l_neg = l_metrics
+        r_nodes, r_depth, r_xors, r_xnors, r_impls, r_pos, r_neg = r_metrics
+
+        # the clauses of a conjunction are those of both of its operands,
+        # while distributing a disjunction pairs up their clauses
+        operator = self._operator
+        if operator == TT_AND_OP:
+            pos, neg = l_pos + r_pos, l_neg * r_neg
+        elif operator == TT_NAND_OP:
+            pos, neg = l_neg * r_neg, l_pos + r_pos
+        elif operator == TT_OR_OP:
+            pos, neg = l_pos * r_pos, l_neg + r_neg
+        elif operator == TT_NOR_OP:
+            pos, neg = l_neg + r_neg, l_pos * r_pos
+        elif operator == TT_IMPL_OP:
+            pos, neg = l_neg * r_pos, l_pos + r_neg
+        elif operator == TT_XOR_OP:
+            pos, neg = (l_pos + r_neg) * (l_neg + r_pos), \
+                (l_pos + r_pos) * (l_neg + r_neg)
+        else:
+            pos, neg = (l_pos + r_pos) * (l_neg + r_neg), \
+                (l_pos + r_neg) * (l_neg + r_pos)
+
+        return (l_nodes + r_nodes + 1,
+                max(l_depth, r_depth) + 1,
+                l_xors + r_xors + (operator == TT_XOR_OP),
+                l_xnors + r_xnors + (operator == TT_XNOR_OP),
+                l_impls + r_impls + (operator == TT_IMPL_OP),
+                pos,
+                neg)
+
+    def _fold_to_primitives(self, new_l_child, new_r_child):
         not_str, and_str, or_str = self._get_op_strs(
             TT_NOT_OP, TT_AND_OP, TT_OR_OP)
 
         if self._operator == TT_IMPL_OP:
             return BinaryOperatorExpressionTreeNode(
                 or_str,
-                UnaryOperatorExpressionTreeNode(
-                    not_str, self._l_child.to_primitives()),
-                self._r_child.to_primitives())
+                UnaryOperatorExpressionTreeNode(not_str, new_l_child),
+                new_r_child)
         elif self._operator == TT_XOR_OP:
-            new_l_child = self._l_child.to_primitives()
-            new_r_child = self._r_child.to_primitives()
-
             return BinaryOperatorExpressionTreeNode(
                 or_str,
                 BinaryOperatorExpressionTreeNode(
@@ -632,287 +1008,126 @@ class BinaryOperatorExpressionTreeNode(ExpressionTreeNode):
                     UnaryOperatorExpressionTreeNode(not_str, new_l_child),
                     new_r_child))
         elif self._operator == TT_XNOR_OP:
-            new_l_prim = self._l_child.to_primitives()
-            new_r_prim = self._r_child.to_primitives()
-
             return BinaryOperatorExpressionTreeNode(
                 or_str,
                 BinaryOperatorExpressionTreeNode(
                     and_str,
-                    new_l_prim,
-                    new_r_prim),
+                    new_l_child,
+                    new_r_child),
                 BinaryOperatorExpressionTreeNode(
                     and_str,
-                    UnaryOperatorExpressionTreeNode(not_str, new_l_prim),
-                    UnaryOperatorExpressionTreeNode(not_str, new_r_prim)))
+                    UnaryOperatorExpressionTreeNode(not_str, new_l_child),
+                    UnaryOperatorExpressionTreeNode(not_str, new_r_child)))
         elif self._operator == TT_AND_OP:
             return BinaryOperatorExpressionTreeNode(
-                and_str,
-                self._l_child.to_primitives(), self._r_child.to_primitives())
+                and_str, new_l_child, new_r_child)
         elif self._operator == TT_NAND_OP:
-            new_l_child = self._l_child.to_primitives()
-            new_r_child = self._r_child.to_primitives()
-
             return BinaryOperatorExpressionTreeNode(
                 or_str,
                 UnaryOperatorExpressionTreeNode(not_str, new_l_child),
                 UnaryOperatorExpressionTreeNode(not_str, new_r_child))
         elif self._operator == TT_OR_OP:
             return BinaryOperatorExpressionTreeNode(
-                or_str,
-                self._l_child.to_primitives(), self._r_child.to_primitives())
+                or_str, new_l_child, new_r_child)
         elif self._operator == TT_NOR_OP:
-            new_l_child = self._l_child.to_primitives()
-            new_r_child = self._r_child.to_primitives()
-
             return BinaryOperatorExpressionTreeNode(
                 and_str,
                 UnaryOperatorExpressionTreeNode(not_str, new_l_child),
                 UnaryOperatorExpressionTreeNode(not_str, new_r_child))
 
-    def coalesce_negations(self):
-        return BinaryOperatorExpressionTreeNode(
-            self.symbol_name,
-            self._l_child.coalesce_negations(),
-            self._r_child.coalesce_negations())
-
-    def apply_de_morgans(self):
-        return BinaryOperatorExpressionTreeNode(
-            self.symbol_name,
-            self._l_child.apply_de_morgans(),
-            self._r_child.apply_de_morgans())
-
-    def apply_identity_law(self):
+    def _fold_apply_identity_law(self, new_l_child, new_r_child):
         op_is_and = self._operator == TT_AND_OP
         op_is_or = self._operator == TT_OR_OP
 
-        new_l_child = self._l_child.apply_identity_law()
-        if new_l_child.symbol_name == '1':
-            if op_is_and:
-                return self._r_child.apply_identity_law()
-            elif op_is_or:
-                return OperandExpressionTreeNode('1')
-        elif new_l_child.symbol_name == '0':
-            if op_is_and:
-                return OperandExpressionTreeNode('0')
-            elif op_is_or:
-                return self._r_child.apply_identity_law()
-
-        new_r_child = self._r_child.apply_identity_law()
-        if new_r_child.symbol_name == '1':
-            if op_is_and:
-                return new_l_child
-            elif op_is_or:
-                return OperandExpressionTreeNode('1')
-        elif new_r_child.symbol_name == '0':
-            if op_is_and:
-                return OperandExpressionTreeNode('0')
-            elif op_is_or:
-                return new_l_child
+        for child, other_child in ((new_l_child, new_r_child),
+                                   (new_r_child, new_l_child)):
+            if child.symbol_name == '1':
+                if op_is_and:
+                    return other_child
+                elif op_is_or:
+                    return OperandExpressionTreeNode('1')
+            elif child.symbol_name == '0':
+                if op_is_and:
+                    return OperandExpressionTreeNode('0')
+                elif op_is_or:
+                    return other_child
 
         return BinaryOperatorExpressionTreeNode(
             self.symbol_name,
             new_l_child,
             new_r_child)
 
-    def apply_idempotent_law(self):
+    def _expand_apply_idempotent_law(self):
         negations_applied = self.coalesce_negations()
-        if negations_applied._is_cnf and negations_applied._is_dnf:
-            negated_symbols_added = set()
-            non_negated_symbols_added = set()
-            filtered_clauses = deque()
-
-            total_clause_count = 0
-            clause_iter = (negations_applied.iter_cnf_clauses() if
-                           self._operator == TT_AND_OP else
-                           negations_applied.iter_dnf_clauses())
-            for clause in clause_iter:
-                total_clause_count += 1
-                if isinstance(clause, OperandExpressionTreeNode):
-                    if clause.symbol_name in non_negated_symbols_added:
-                        continue
-                    non_negated_symbols_added |= clause.non_negated_symbol_set
-                    filtered_clauses.append(clause._copy())
-                elif clause._l_child.symbol_name not in negated_symbols_added:
-                    negated_symbols_added |= clause.negated_symbol_set
-                    filtered_clauses.append(clause._copy())
-
-            if len(filtered_clauses) == total_clause_count:
-                # no redundant operands were pruned
-                return self._copy()
-
-            while len(filtered_clauses) > 1:
-                filtered_clauses.appendleft(
-                    BinaryOperatorExpressionTreeNode(
-                        self.symbol_name,
-                        filtered_clauses.popleft(),
-                        filtered_clauses.popleft()))
-            return filtered_clauses.pop()
-
-        return BinaryOperatorExpressionTreeNode(
-            self.symbol_name,
-            self._l_child.apply_idempotent_law(),
-            self._r_child.apply_idempotent_law())
-
-    def apply_inverse_law(self):
+        if not (negations_applied._is_cnf and negations_applied._is_dnf):
+            return None
+
+        negated_symbols_added = set()
+        non_negated_symbols_added = set()
+        filtered_clauses = []
+
+        clauses = negations_applied._flatten(
+            TT_AND_OP if self._operator == TT_AND_OP else TT_OR_OP)
+        for clause in clauses:
+            if isinstance(clause, OperandExpressionTreeNode):
+                if clause.symbol_name in non_negated_symbols_added:
+                    continue
+                non_negated_symbols_added |= clause.non_negated_symbol_set
+                filtered_clauses.append(clause._copy())
+            elif clause._l_child.symbol_name not in negated_symbols_added:
+                negated_symbols_added |= clause.negated_symbol_set
+                filtered_clauses.append(clause._copy())
+
+        if len(filtered_clauses) == len(clauses):
+            # no redundant operands were pruned
+            return self._copy(), False
+
+        return _join_left(self.symbol_name, filtered_clauses), False
+
+    def _expand_apply_inverse_law(self):
         negations_applied = self.coalesce_negations()
         if negations_applied._is_cnf and negations_applied._is_dnf:
-            if self._negated_symbol_set & self._non_negated_symbol_set:
+            if self.negated_symbol_set & self.non_negated_symbol_set:
                 return OperandExpressionTreeNode(
-                    '1' if self._operator == TT_OR_OP else '0')
-        elif self._is_cnf:
-            and_str = self.symbol_name
-            inverted_clause_count = 0
-            transformed_clauses = deque()
-            for clause in self.iter_cnf_clauses():
-                if clause.negated_symbol_set & clause.non_negated_symbol_set:
-                    inverted_clause_count += 1
-                    transformed_clauses.append(OperandExpressionTreeNode('1'))
-                else:
-                    transformed_clauses.append(clause._copy())
+                    '1' if self._operator == TT_OR_OP else '0'), False
 
-            if not inverted_clause_count:
-                # we didn't change anything, so just return ourselves
-                return self._copy()
-
-            while len(transformed_clauses) > 1:
-                transformed_clauses.append(
-                    BinaryOperatorExpressionTreeNode(
-                        and_str,
-                        transformed_clauses.popleft(),
-                        transformed_clauses.popleft()))
-            return transformed_clauses.pop()
+            # neither can any part of the clause, so it is left unchanged
+            return self._copy(), False
+        elif self._is_cnf:
+            clauses = self.iter_cnf_clauses()
+            inverted_str = '1'
         elif self._is_dnf:
-            or_str = self.symbol_name
-            inverted_clause_count = 0
-            transformed_clauses = deque()
-            for clause in self.iter_dnf_clauses():
-                if clause.negated_symbol_set & clause.non_negated_symbol_set:
-                    inverted_clause_count += 1
-                    transformed_clauses.append(OperandExpressionTreeNode('0'))
-                else:
-                    transformed_clauses.append(clause._copy())
-
-            if not inverted_clause_count:
-                # we didn't change anything, so just return ourselves
-                return self._copy()
-
-            while len(transformed_clauses) > 1:
+            clauses = self.iter_dnf_clauses()
+            inverted_str = '0'
+        else:
+            return None
+
+        op_str = self.symbol_name
+        inverted_clause_count = 0
+        transformed_clauses = deque()
+        for clause in clauses:
+            if clause.negated_symbol_set & clause.non_negated_symbol_set:
+                inverted_clause_count += 1
                 transformed_clauses.append(
-                    BinaryOperatorExpressionTreeNode(
-                        or_str,
-                        transformed_clauses.popleft(),
-                        transformed_clauses.popleft()))
-            return transformed_clauses.pop()
-
-        return BinaryOperatorExpressionTreeNode(
-            self.symbol_name,
-            self._l_child.apply_inverse_law(),
-            self._r_child.apply_inverse_law())
-
-    def distribute_ands(self):
-        if self._operator == TT_AND_OP:
-            (or_str,) = self._get_op_strs(TT_OR_OP)
-            and_str = self.symbol_name
-
-            if (isinstance(self._r_child, BinaryOperatorExpressionTreeNode) and
-                    self._r_child.operator == TT_OR_OP):
-                child_to_distribute = self._l_child.distribute_ands()
-                child_distributed_upon = \
-                    self._r_child._l_child.distribute_ands()
-                child_to_be_distributed_upon = \
-                    self._r_child._r_child.distribute_ands()
-
-                return BinaryOperatorExpressionTreeNode(
-                    or_str,
-                    BinaryOperatorExpressionTreeNode(
-                        and_str,
-                        child_to_distribute,
-                        child_distributed_upon).distribute_ands(),
-                    BinaryOperatorExpressionTreeNode(
-                        and_str,
-                        child_to_distribute,
-                        child_to_be_distributed_upon).distribute_ands())
-            elif (isinstance(self._l_child, BinaryOperatorExpressionTreeNode)
-                    and self._l_child.operator == TT_OR_OP):
-                child_to_distribute = self._r_child.distribute_ands()
-                child_distributed_upon = \
-                    self._l_child._l_child.distribute_ands()
-                child_to_be_distributed_upon = \
-                    self._l_child._r_child.distribute_ands()
-
-                return BinaryOperatorExpressionTreeNode(
-                    or_str,
-                    BinaryOperatorExpressionTreeNode(
-                        and_str,
-                        child_distributed_upon,
-                        child_to_distribute).distribute_ands(),
-                    BinaryOperatorExpressionTreeNode(
-                        and_str,
-                        child_to_be_distributed_upon,
-                        child_to_distribute).distribute_ands())
-
-        return BinaryOperatorExpressionTreeNode(
-            self.symbol_name,
-            self._l_child.distribute_ands(),
-            self._r_child.distribute_ands())
+                    OperandExpressionTreeNode(inverted_str))
+            else:
+                transformed_clauses.append(clause._copy())
 
-    def distribute_ors(self):
-        if self._operator == TT_OR_OP:
-            (and_str,) = self._get_op_strs(TT_AND_OP)
-            or_str = self.symbol_name
-
-            if (isinstance(self._r_child, BinaryOperatorExpressionTreeNode) and
-                    self._r_child.operator == TT_AND_OP):
-                child_to_distribute = self._l_child.distribute_ors()
-                child_distributed_upon = \
-                    self._r_child._l_child.distribute_ors()
-                child_to_be_distributed_upon = \
-                    self._r_child._r_child.distribute_ors()
-
-                return BinaryOperatorExpressionTreeNode(
-                    and_str,
-                    BinaryOperatorExpressionTreeNode(
-                        or_str,
-                        child_to_distribute,
-                        child_distributed_upon).distribute_ors(),
-                    BinaryOperatorExpressionTreeNode(
-                        or_str,
-                        child_to_distribute,
-                        child_to_be_distributed_upon).distribute_ors())
-            elif (isinstance(self._l_child, BinaryOperatorExpressionTreeNode)
-                    and self._l_child.operator == TT_AND_OP):
-                child_to_distribute = self._r_child.distribute_ors()
-                child_distributed_upon = \
-                    self._l_child._l_child.distribute_ors()
-                child_to_be_distributed_upon = \
-                    self._l_child._r_child.distribute_ors()
-
-                return BinaryOperatorExpressionTreeNode(
-                    and_str,
-                    BinaryOperatorExpressionTreeNode(
-                        or_str,
-                        child_distributed_upon,
-                        child_to_distribute).distribute_ors(),
-                    BinaryOperatorExpressionTreeNode(
-                        or_str,
-                        child_to_be_distributed_upon,
-                        child_to_distribute).distribute_ors())
+        if not inverted_clause_count:
+            # we didn't change anything, so just return ourselves
+            return self._copy(), False
 
-        return BinaryOperatorExpressionTreeNode(
-            self.symbol_name,
-            self._l_child.distribute_ors(),
-            self._r_child.distribute_ors())
+        while len(transformed_clauses) > 1:
+            transformed_clauses.append(
+                BinaryOperatorExpressionTreeNode(
+                    op_str,
+                    transformed_clauses.popleft(),
+                    transformed_clauses.popleft()))
+        return transformed_clauses.pop(), False
 
-    def __eq__(self, other):
-        if isinstance(other, BinaryOperatorExpressionTreeNode):
-            return (self._operator == other._operator and
-                    self._l_child == other._l_child and
-                    self._r_child == other._r_child)
-        elif isinstance(other, ExpressionTreeNode):
-            return False
-        else:
-            return NotImplemented
+    def _shallow_eq(self, other):
+        return (isinstance(other, BinaryOperatorExpressionTreeNode) and
+                self._operator == other._operator)
 
     def _cnf_status(self):
         """Helper to determine CNF status of the tree rooted at this node.
@@ -977,16 +1192,8 @@ class UnaryOperatorExpressionTreeNode(ExpressionTreeNode):
         self._is_cnf = isinstance(self.l_child, OperandExpressionTreeNode)
         self._is_dnf = self._is_cnf
         self._is_really_unary = l_child._is_really_unary
-
-        if self._is_really_unary:
-            # this node has the opposite of its children
-            self._non_negated_symbol_set, self._negated_symbol_set = (
-                set(l_child._negated_symbol_set),
-                set(l_child._non_negated_symbol_set))
-        else:
-            self._non_negated_symbol_set, self._negated_symbol_set = (
-                set(l_child._non_negated_symbol_set),
-                set(l_child._negated_symbol_set))
+        self._non_negated_symbol_set = None
+        self._negated_symbol_set = None
 
     @property
     def operator(self):
@@ -998,85 +1205,53 @@ class UnaryOperatorExpressionTreeNode(ExpressionTreeNode):
         """
         return self._operator
 
-    def evaluate(self, input_dict):
-        return self.operator.eval_func(
-            self.l_child.evaluate(input_dict))
+    def _fold_evaluate(self, input_dict, value):
+        return self._operator.eval_func(value)
 
-    def _copy(self):
-        return UnaryOperatorExpressionTreeNode(
-            self.symbol_name, self._l_child._copy())
+    def _fold_copy(self, new_l_child):
+        return UnaryOperatorExpressionTreeNode(self.symbol_name, new_l_child)
 
-    def to_primitives(self):
-        return UnaryOperatorExpressionTreeNode(
-            self.symbol_name, self._l_child.to_primitives())
+    def _fold_to_primitives(self, new_l_child):
+        return UnaryOperatorExpressionTreeNode(self.symbol_name, new_l_child)
 
-    def coalesce_negations(self):
+    def _fold_cost_metrics(self, metrics):
+        nodes, depth, xors, xnors, impls, pos, neg = metrics
+        return nodes + 1, depth + 1, xors, xnors, impls, neg, pos
+
+    _fold_apply_identity_law = _fold_copy
+
+    def _expand_coalesce_negations(self):
         if isinstance(self._l_child, UnaryOperatorExpressionTreeNode):
-            return self._l_child._l_child.coalesce_negations()
+            return self._l_child._l_child, True
         elif self._l_child.symbol_name == '0':
-            return OperandExpressionTreeNode('1')
+            return OperandExpressionTreeNode('1'), False
         elif self._l_child.symbol_name == '1':
-            return OperandExpressionTreeNode('0')
-        else:
-            return UnaryOperatorExpressionTreeNode(
-                self.symbol_name,
-                self._l_child.coalesce_negations())
+            return OperandExpressionTreeNode('0'), False
 
-    def apply_de_morgans(self):
-        if isinstance(self._l_child, BinaryOperatorExpressionTreeNode):
-            binary_node = self._l_child
-            op = binary_node._operator
-            not_str, and_str, or_str = self._get_op_strs(
-                TT_NOT_OP, TT_AND_OP, TT_OR_OP)
-
-            notted_l_child = UnaryOperatorExpressionTreeNode(
-                not_str, binary_node._l_child).apply_de_morgans()
-            notted_r_child = UnaryOperatorExpressionTreeNode(
-                not_str, binary_node._r_child).apply_de_morgans()
-
-            if op == TT_AND_OP:
-                return BinaryOperatorExpressionTreeNode(
-                    or_str, notted_l_child, notted_r_child)
-            elif op == TT_OR_OP:
-                return BinaryOperatorExpressionTreeNode(
-                    and_str, notted_l_child, notted_r_child)
-
-        return UnaryOperatorExpressionTreeNode(
-            self.symbol_name,
-            self._l_child.apply_de_morgans())
+        return None
 
-    def apply_identity_law(self):
-        return UnaryOperatorExpressionTreeNode(
-            self.symbol_name,
-            self._l_child.apply_identity_law())
+    def _expand_apply_de_morgans(self):
+        if not isinstance(self._l_child, BinaryOperatorExpressionTreeNode):
+            return None
 
-    def apply_idempotent_law(self):
-        return UnaryOperatorExpressionTreeNode(
-            self.symbol_name,
-            self._l_child.apply_idempotent_law())
+        binary_node = self._l_child
+        op = binary_node._operator
+        if op == TT_AND_OP:
+            not_str, new_op_str = self._get_op_strs(TT_NOT_OP, TT_OR_OP)
+        elif op == TT_OR_OP:
+            not_str, new_op_str = self._get_op_strs(TT_NOT_OP, TT_AND_OP)
+        else:
+            return None
 
-    def apply_inverse_law(self):
-        return UnaryOperatorExpressionTreeNode(
-            self.symbol_name,
-            self._l_child.apply_inverse_law())
+        # the negations pushed down onto the operands are walked in turn
+        return BinaryOperatorExpressionTreeNode(
+            new_op_str,
+            UnaryOperatorExpressionTreeNode(not_str, binary_node._l_child),
+            UnaryOperatorExpressionTreeNode(not_str, binary_node._r_child)), \
+            True
 
-    def distribute_ands(self):
-        return UnaryOperatorExpressionTreeNode(
-            self.symbol_name,
-            self._l_child.distribute_ands())
-
-    def distribute_ors(self):
-        return UnaryOperatorExpressionTreeNode(
-            self.symbol_name,
-            self._l_child.distribute_ors())
-
-    def __eq__(self, other):
-        if isinstance(other, UnaryOperatorExpressionTreeNode):
-            return self._l_child == other._l_child
-        elif isinstance(other, ExpressionTreeNode):
-            return False
-        else:
-            return NotImplemented
+    def _shallow_eq(self, other):
+        return isinstance(other, UnaryOperatorExpressionTreeNode)
 
 
 class OperandExpressionTreeNode(ExpressionTreeNode):
@@ -1095,7 +1270,7 @@ class OperandExpressionTreeNode(ExpressionTreeNode):
         self._non_negated_symbol_set = {self.symbol_name}
         self._negated_symbol_set = set()
 
-    def evaluate(self, input_dict):
+    def _fold_evaluate(self, input_dict):
         if self.symbol_name == '0':
             return False
         elif self.symbol_name == '1':
@@ -1103,37 +1278,362 @@ class OperandExpressionTreeNode(ExpressionTreeNode):
         else:
             return input_dict[self.symbol_name]
 
-    def _copy(self):
+    def _fold_copy(self):
         return OperandExpressionTreeNode(self.symbol_name)
 
-    def to_primitives(self):
+    def _fold_to_primitives(self):
         return OperandExpressionTreeNode(self.symbol_name)
 
-    def coalesce_negations(self):
-        return OperandExpressionTreeNode(self.symbol_name)
+    def _fold_cost_metrics(self):
+        return 1, 0, 0, 0, 0, 1.0, 1.0
 
-    def apply_de_morgans(self):
-        return OperandExpressionTreeNode(self.symbol_name)
+    _fold_apply_identity_law = _fold_copy
 
-    def apply_identity_law(self):
-        return OperandExpressionTreeNode(self.symbol_name)
+    def _shallow_eq(self, other):
+        return (isinstance(other, OperandExpressionTreeNode) and
+                self.symbol_name == other.symbol_name)
 
-    def apply_idempotent_law(self):
-        return OperandExpressionTreeNode(self.symbol_name)
 
-    def apply_inverse_law(self):
-        return OperandExpressionTreeNode(self.symbol_name)
+def _distribute(root, outer_op, inner_op):
+    """Distribute one operator across sub-expressions joined by another.
 
-    def distribute_ands(self):
-        return OperandExpressionTreeNode(self.symbol_name)
+    This is the shared implementation of :func:`distribute_ands \
+    <ExpressionTreeNode.distribute_ands>` and :func:`distribute_ors \
+    <ExpressionTreeNode.distribute_ors>`. An ``outer_op`` node with an
+    ``inner_op`` child is rewritten as an ``inner_op`` node joining two new
+    ``outer_op`` nodes, each of which is distributed in turn.
 
-    def distribute_ors(self):
-        return OperandExpressionTreeNode(self.symbol_name)
+    Rather than recursing, pending work is kept on a stack of tasks. A task is
+    either a node still to be distributed, or a tuple describing how to
+    combine the most recent results once they are available.
 
-    def __eq__(self, other):
-        if isinstance(other, OperandExpressionTreeNode):
-            return self.symbol_name == other.symbol_name
-        elif isinstance(other, ExpressionTreeNode):
-            return False
+    """
+    results = []
+    tasks = [root]
+    while tasks:
+        task = tasks.pop()
+        if isinstance(task, OperandExpressionTreeNode):
+            results.append(OperandExpressionTreeNode(task.symbol_name))
+        elif isinstance(task, UnaryOperatorExpressionTreeNode):
+            tasks.append(('unary', task.symbol_name))
+            tasks.append(task._l_child)
+        elif isinstance(task, BinaryOperatorExpressionTreeNode):
+            l_child, r_child = task._l_child, task._r_child
+            if task._operator != outer_op:
+                tasks.append(('binary', task.symbol_name))
+                tasks.extend((r_child, l_child))
+            elif _is_binary_op_node(r_child, inner_op):
+                (inner_str,) = task._get_op_strs(inner_op)
+                tasks.append(('split', task.symbol_name, inner_str, False))
+                tasks.extend((r_child._r_child, r_child._l_child, l_child))
+            elif _is_binary_op_node(l_child, inner_op):
+                (inner_str,) = task._get_op_strs(inner_op)
+                tasks.append(('split', task.symbol_name, inner_str, True))
+                tasks.extend((l_child._r_child, l_child._l_child, r_child))
+            else:
+                tasks.append(('binary', task.symbol_name))
+                tasks.extend((r_child, l_child))
+        elif task[0] == 'unary':
+            results[-1] = UnaryOperatorExpressionTreeNode(task[1], results[-1])
+        elif task[0] == 'binary':
+            r_result = results.pop()
+            results[-1] = BinaryOperatorExpressionTreeNode(
+                task[1], results[-1], r_result)
         else:
-            return NotImplemented
+            # the distributed child, followed by the two children of the
+            # sub-expression it is being distributed across
+            _, outer_str, inner_str, child_is_right = task
+            upon_r, upon_l, child = results.pop(), results.pop(), results.pop()
+            if child_is_right:
+                new_l = BinaryOperatorExpressionTreeNode(
+                    outer_str, upon_l, child)
+                new_r = BinaryOperatorExpressionTreeNode(
+                    outer_str, upon_r, child)
+            else:
+                new_l = BinaryOperatorExpressionTreeNode(
+                    outer_str, child, upon_l)
+                new_r = BinaryOperatorExpressionTreeNode(
+                    outer_str, child, upon_r)
+
+            tasks.append(('binary', inner_str))
+            tasks.extend((new_r, new_l))
+
+    return results.pop()
+
+
+def _to_dnf_cubes(root):
+    """Compute the cubes of a DNF equivalent to a tree of primitive operators.
+
+    Each cube is represented as a pair of bit sets, of the symbols appearing
+    positively and negatively within it; bit ``i`` stands for the ``i``-th
+    symbol of the returned list. The tree is walked once with an explicit
+    stack, with negations pushed down to the operands (following De Morgan's
+    Law) along the way, and the cubes of each sub-expression are pruned as
+    they are combined.
+
+    :returns: The symbols and cubes of the DNF.
+    :rtype: Tuple[List[:class:`str <python:str>`], List[Tuple[int, int]]]
+
+    """
+    symbols = []
+    symbol_bits = {}
+    results = []
+
+    # each entry holds a node, whether it is negated, and whether its children
+    # have already been processed
+    stack = [(root, False, False)]
+    while stack:
+        node, negated, children_done = stack.pop()
+        if isinstance(node, OperandExpressionTreeNode):
+            symbol_str = node.symbol_name
+            if symbol_str in CONSTANT_VALUES:
+                is_true = (symbol_str == '1') != negated
+                results.append([(0, 0)] if is_true else [])
+                continue
+
+            bit = symbol_bits.get(symbol_str)
+            if bit is None:
+                bit = symbol_bits[symbol_str] = 1 << len(symbols)
+                symbols.append(symbol_str)
+            results.append([(0, bit)] if negated else [(bit, 0)])
+        elif isinstance(node, UnaryOperatorExpressionTreeNode):
+            stack.append((node._l_child, not negated, False))
+        elif not children_done:
+            stack.append((node, negated, True))
+            stack.append((node._r_child, negated, False))
+            stack.append((node._l_child, negated, False))
+        else:
+            r_cubes = results.pop()
+            l_cubes = results.pop()
+            if (node._operator == TT_AND_OP) != negated:
+                results.append(_prune_cubes(
+                    [(l_pos | r_pos, l_neg | r_neg) for
+                     l_pos, l_neg in l_cubes for
+                     r_pos, r_neg in r_cubes if
+                     not (l_pos | r_pos) & (l_neg | r_neg)]))
+            else:
+                results.append(_prune_cubes(l_cubes + r_cubes))
+
+    return symbols, results.pop()
+
+
+def _to_cnf_clauses(root, max_clauses, max_nodes, fresh_symbol_prefix,
+                    used_symbols):
+    """Compute the clauses of a CNF for a tree of primitive operators.
+
+    Clauses are represented and pruned like the cubes of
+    :func:`_to_dnf_cubes`. Before the clauses of the two operands of an *OR*
+    are distributed over one another, the number of clauses and literals this
+    would produce is checked against ``max_clauses`` and ``max_nodes``; if
+    either would be exceeded, operands with more than one clause are replaced
+    by fresh symbols, each added alongside clauses stating that it implies
+    every clause of the operand it replaces. Since negations are pushed down
+    to the operands, every sub-expression appears positively, so these
+    one-sided definitions keep the result equisatisfiable.
+
+    Converting to primitive operators shares the operands of *XORs* and
+    *XNORs* between their two expansions, so the clauses of each node are
+    computed only once for each polarity in which it appears; fresh symbols
+    are never named after any of the ``used_symbols``.
+
+    :returns: The symbols, clauses, and fresh symbols of the CNF.
+    :rtype: Tuple[List[:class:`str <python:str>`], List[Tuple[int, int]], \
+List[:class:`str <python:str>`]]
+
+    """
+    symbols = []
+    symbol_bits = {}
+    fresh_symbols = []
+    definitions = []
+    fresh_names = ('{}{}'.format(fresh_symbol_prefix, i) for
+                   i in itertools.count(1))
+
+    def define(clauses):
+        """Replace a list of clauses with a fresh symbol implying them."""
+        name = next(fresh_names)
+        while name in used_symbols:
+            name = next(fresh_names)
+
+        bit = 1 << len(symbols)
+        symbols.append(name)
+        fresh_symbols.append(name)
+        definitions.extend((pos, neg | bit) for pos, neg in clauses)
+        return [(bit, 0)]
+
+    def exceeds_budget(l_clauses, r_clauses):
+        """Whether distributing two lists of clauses exceeds the budget."""
+        num_clauses = len(l_clauses) * len(r_clauses)
+        if max_clauses is not None and num_clauses > max_clauses:
+            return True
+        elif max_nodes is not None:
+            num_nodes = (
+                sum(_bit_count(pos | neg) for pos, neg in l_clauses) *
+                len(r_clauses) +
+                sum(_bit_count(pos | neg) for pos, neg in r_clauses) *
+                len(l_clauses))
+            return num_nodes > max_nodes
+        return False
+
+    # the clauses of each binary node, by its identity and polarity
+    done = {}
+    results = []
+    stack = [(root, False, False)]
+    while stack:
+        node, negated, children_done = stack.pop()
+        if isinstance(node, OperandExpressionTreeNode):
+            symbol_str = node.symbol_name
+            if symbol_str in CONSTANT_VALUES:
+                is_true = (symbol_str == '1') != negated
+                results.append([] if is_true else [(0, 0)])
+                continue
+
+            bit = symbol_bits.get(symbol_str)
+            if bit is None:
+                bit = symbol_bits[symbol_str] = 1 << len(symbols)
+                symbols.append(symbol_str)
+            results.append([(0, bit)] if negated else [(bit, 0)])
+        elif isinstance(node, UnaryOperatorExpressionTreeNode):
+            stack.append((node._l_child, not negated, False))
+        elif not children_done:
+            clauses = done.get((id(node), negated))
+            if clauses is not None:
+                results.append(clauses)
+                continue
+
+            stack.append((node, negated, True))
+            stack.append((node._r_child, negated, False))
+            stack.append((node._l_child, negated, False))
+        else:
+            r_clauses = results.pop()
+            l_clauses = results.pop()
+            if (node._operator == TT_OR_OP) != negated:
+                if l_clauses == [(0, 0)] or r_clauses == [(0, 0)]:
+                    # one of the operands is always false
+                    results.append(
+                        r_clauses if l_clauses == [(0, 0)] else l_clauses)
+                    done[id(node), negated] = results[-1]
+                    continue
+                elif exceeds_budget(l_clauses, r_clauses):
+                    if len(l_clauses) < len(r_clauses):
+                        l_clauses, r_clauses = r_clauses, l_clauses
+                    if len(l_clauses) > 1:
+                        l_clauses = define(l_clauses)
+                    if (len(r_clauses) > 1 and
+                            exceeds_budget(l_clauses, r_clauses)):
+                        r_clauses = define(r_clauses)
+
+                results.append(_prune_cubes(
+                    [(l_pos | r_pos, l_neg | r_neg) for
+                     l_pos, l_neg in l_clauses for
+                     r_pos, r_neg in r_clauses if
+                     not (l_pos | r_pos) & (l_neg | r_neg)]))
+            else:
+                results.append(_prune_cubes(l_clauses + r_clauses))
+            done[id(node), negated] = results[-1]
+
+    return symbols, _prune_cubes(results.pop() + definitions), fresh_symbols
+
+
+def _build_normal_form(symbols, terms, outer_op_str, inner_op_str, not_str):
+    """Build a tree from the terms of a normal form.
+
+    ``terms`` are pairs of bit sets as computed by :func:`_to_dnf_cubes`, each
+    built as a chain of the ``inner_op_str`` operator, and these are joined in
+    a chain of the ``outer_op_str`` operator. A normal form without terms, or
+    with a term without literals, is built as the appropriate constant.
+
+    """
+    is_cnf = OPERATOR_MAPPING[outer_op_str] == TT_AND_OP
+    if not terms:
+        return OperandExpressionTreeNode('1' if is_cnf else '0')
+
+    term_roots = []
+    for pos, neg in terms:
+        if not pos | neg:
+            # an empty clause is always false, and an empty cube always true
+            return OperandExpressionTreeNode('0' if is_cnf else '1')
+
+        literal_nodes = []
+        for bit in _iter_bits(pos | neg):
+            node = OperandExpressionTreeNode(symbols[bit.bit_length() - 1])
+            if neg & bit:
+                node = UnaryOperatorExpressionTreeNode(not_str, node)
+            literal_nodes.append(node)
+        term_roots.append(_join_right(inner_op_str, literal_nodes))
+
+    return _join_right(outer_op_str, term_roots)
+
+
+def _prune_cubes(cubes):
+    """Remove duplicate and subsumed cubes, preserving the order of the rest.
+
+    Cubes are considered from fewest to most literals, so any cube that could
+    subsume another is kept (or discarded) first. Kept cubes are indexed by
+    their lowest literal; a cube can then only be subsumed by the kept cubes
+    indexed under one of its own literals.
+
+    """
+    if len(cubes) < 2:
+        return cubes
+
+    order = sorted(range(len(cubes)),
+                   key=lambda i: _bit_count(cubes[i][0] | cubes[i][1]))
+    index = {}
+    kept = []
+    for i in order:
+        pos, neg = cubes[i]
+        candidates = index.get((False, 0), [])
+        for is_neg, bits in ((False, pos), (True, neg)):
+            for bit in _iter_bits(bits):
+                candidates = itertools.chain(
+                    candidates, index.get((is_neg, bit), []))
+
+        if any(not (k_pos & ~pos or k_neg & ~neg) for
+               k_pos, k_neg in candidates):
+            continue
+
+        key = (False, pos & -pos) if pos else (True, neg & -neg)
+        if key == (True, 0):
+            # a cube without literals subsumes all others
+            key = (False, 0)
+        index.setdefault(key, []).append((pos, neg))
+        kept.append(i)
+
+    kept.sort()
+    return [cubes[i] for i in kept]
+
+
+def _iter_bits(bits):
+    """Yield each set bit of an int, from lowest to highest."""
+    while bits:
+        bit = bits & -bits
+        yield bit
+        bits ^= bit
+
+
+def _bit_count(bits):
+    """Count the set bits of an int."""
+    return bin(bits).count('1')
+
+
+def _join_right(op_str, nodes):
+    """Join a list of nodes into a right-deep chain, as the parser would."""
+    root = nodes[-1]
+    for node in reversed(nodes[:-1]):
+        root = BinaryOperatorExpressionTreeNode(op_str, node, root)
+    return root
+
+
+def _join_left(op_str, nodes):
+    """Join a sequence of nodes into a left-deep chain of an operator."""
+    nodes = iter(nodes)
+    root = next(nodes)
+    for node in nodes:
+        root = BinaryOperatorExpressionTreeNode(op_str, root, node)
+    return root
+
+
+def _is_binary_op_node(node, op):
+    """Whether a node is a binary operator node for the specified operator."""
+    return (isinstance(node, BinaryOperatorExpressionTreeNode) and
+            node._operator == op)
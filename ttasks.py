@@ -8,9 +8,15 @@ import platform
 import subprocess
 import sys
 import tt
+import tt.benchmarks
+import tt.benchmarks.runner
+import tt.generators
+import tt.instrumentation
+import tt.satisfiability.dimacs
+import tt.satisfiability.parallel
 import unittest
 
-from argparse import ArgumentParser, RawTextHelpFormatter
+from argparse import REMAINDER, ArgumentParser, RawTextHelpFormatter
 from contextlib import contextmanager
 
 
@@ -26,6 +32,10 @@ class AppVeyorApiError(Exception):
     """An exception type for failed interactions with the AppVeyor API."""
 
 
+class BenchmarkFailureError(Exception):
+    """An exception type for regressed or failed benchmark runs."""
+
+
 class SubprocessFailureError(Exception):
     """An exception type for a subprocess exiting with a non-zero exit code."""
 
@@ -111,6 +121,19 @@ def pull_latest_win_wheels():
     print('All done!')
 
 
+def bench(task_args=None):
+    """Run tt performance benchmarks.
+
+    The benchmark suite lives in :mod:`tt.benchmarks`; ``task_args`` are its
+    command-line arguments (see ``python -m tt.benchmarks --help``).
+
+    """
+    _print_sys_info()
+
+    if tt.benchmarks.main(task_args or []):
+        raise BenchmarkFailureError
+
+
 def build_docs():
     """Build the documentation from source into HTML."""
     with _cwd(DOCS_DIR):
@@ -147,18 +170,29 @@ def test():
         top_level_dir=HERE)
 
     doctest_modules = [
+        tt.benchmarks.runner,
         tt.definitions.operands,
         tt.definitions.operators,
         tt.expressions.bexpr,
+        tt.expressions.clause_set,
+        tt.expressions.cost,
+        tt.instrumentation.recorder,
+        tt.generators.cnf,
+        tt.generators.expressions,
         tt.errors.arguments,
         tt.errors.evaluation,
         tt.errors.grammar,
+        tt.errors.solver,
         tt.errors.state,
         tt.errors.symbols,
+        tt.satisfiability.dimacs,
+        tt.satisfiability.parallel,
         tt.satisfiability.picosat,
         tt.tables.truth_table,
         tt.transformations.bexpr,
+        tt.transformations.rewrite,
         tt.transformations.utils,
+        tt.trees.memo,
         tt.trees.tree_node
     ]
 
@@ -195,6 +229,7 @@ def test():
 
 
 TASKS = {
+    'bench': bench,
     'build-docs': build_docs,
     'pull-latest-win-wheels': pull_latest_win_wheels,
     'serve-docs': serve_docs,
@@ -226,6 +261,12 @@ def get_parsed_args(args=None):
         type=str,
         choices=sorted(TASKS.keys()),
         help='the ttask to run')
+    parser.add_argument(
+        'task_args',
+        nargs=REMAINDER,
+        metavar='ARGS',
+        help='arguments passed on to the ttask; only the bench ttask\n'
+             'accepts any (see python -m tt.benchmarks --help)')
 
     if args is None:
         args = sys.argv[1:]
@@ -246,9 +287,17 @@ def main(args=None):
     try:
         opts = get_parsed_args()
         task = TASKS[opts.task]
-        task()
+        if opts.task == 'bench':
+            task(opts.task_args)
+        elif opts.task_args:
+            print('The', opts.task, 'ttask does not accept arguments',
+                  file=sys.stderr)
+            return 1
+        else:
+            task()
         return 0
-    except (AppVeyorApiError, SubprocessFailureError, TestFailureError):
+    except (AppVeyorApiError, BenchmarkFailureError, SubprocessFailureError,
+            TestFailureError):
         return 1
     except Exception as e:
         print('Received unexpected exception; re-raising it.', file=sys.stderr)